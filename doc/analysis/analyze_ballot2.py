@@ -36,7 +36,8 @@ def call(row):
     if uri in done:
         return done[uri]
     payload = json.dumps({"ballot_rkey": BALLOT, "lang": LANG,
-                          "title": title, "body": body, "type": typ}).encode()
+                          "title": title, "body": body, "type": typ,
+                          "no_cache": True}).encode()  # Evaluation: immer frisch
     obj = {"status": "unavailable"}
     for attempt in range(4):
         try:
@@ -520,6 +520,26 @@ CREATE INDEX idx_auth_sessions_token ON auth.auth_sessions (session_token);
 CREATE INDEX idx_auth_sessions_did ON auth.auth_sessions (did);
 CREATE INDEX idx_auth_sessions_expires_at ON auth.auth_sessions (expires_at);
 
+-- Logout/Revocation → `session`-Event auf dem Invalidierungs-Bus (Key =
+-- Token-Hash): jede AppView-Replica verwirft den gecachten Session-Eintrag
+-- (src/auth/session_cache.py). Bereits abgelaufene Zeilen werden übersprungen
+-- (Bulk-Purges fluten den Kanal nicht). app_publish_invalidation() siehe unten.
+-- (Spiegelt services/appview/migrations/014_notify_session_revoked.sql und
+-- 016_create_invalidation_bus.sql.)
+CREATE OR REPLACE FUNCTION auth.notify_session_revoked() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF OLD.expires_at > now() THEN
+        PERFORM public.app_publish_invalidation('session', OLD.session_token);
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+CREATE TRIGGER auth_sessions_notify_revoked
+    AFTER DELETE ON auth.auth_sessions
+    FOR EACH ROW EXECUTE FUNCTION auth.notify_session_revoked();
+
 CREATE TABLE auth.auth_pending_logins (
   id              serial PRIMARY KEY,
   -- Peppered HMAC of the email (NOT plaintext) — same digest as auth_creds.email_hmac.
@@ -587,6 +607,80 @@ CREATE TABLE auth.auth_email_sends (
 
 CREATE INDEX idx_auth_email_sends_created_at ON auth.auth_email_sends (created_at);
 
+-- Ausgangs-Warteschlange für E-Mails (appview src/core/email_outbox.py): Auth-
+-- Handler legen eine Zeile an und antworten sofort, ein Hintergrund-Sender je
+-- Replica (FOR UPDATE SKIP LOCKED + Lease) verschickt per SMTP mit Retry/Backoff
+-- und Dead-Letter. Empfänger + Link nur verschlüsselt (USER-Key), Payload wird
+-- nach Versand/Dead gelöscht; im Klartext nur die Empfänger-Domain (Rate-Limit).
+-- (Spiegelt services/appview/migrations/017_create_auth_email_outbox.sql.)
+CREATE TABLE auth.auth_email_outbox (
+  id                 bigserial PRIMARY KEY,
+  purpose            varchar(20) NOT NULL,
+  recipient_domain   varchar(255) NOT NULL,
+  payload_ciphertext bytea,
+  payload_nonce      bytea,
+  status             varchar(10) NOT NULL DEFAULT 'pending',  -- pending | sent | dead
+  attempts           integer NOT NULL DEFAULT 0,
+  next_attempt_at    timestamp NOT NULL DEFAULT now(),
+  locked_until       timestamp,
+  expires_at         timestamp NOT NULL,
+  last_error         text,
+  created_at         timestamp NOT NULL DEFAULT now(),
+  sent_at            timestamp
+);
+
+CREATE INDEX idx_auth_email_outbox_due
+  ON auth.auth_email_outbox (next_attempt_at) WHERE status = 'pending';
+CREATE INDEX idx_auth_email_outbox_created_at ON auth.auth_email_outbox (created_at);
+
+-- PDS-Session-Tokens (TokenBroker, appview src/atproto/pds_tokens.py + Kopie im
+-- community-writer): Access- UND Refresh-JWT je Account, verschlüsselt, damit
+-- Neustarts und andere Replicas per refreshSession weitermachen statt Passwort
+-- entschlüsseln + createSession. Je Credential-Scope eine Tabelle (Key-Split wie
+-- pds_creds.py): auth_pds_tokens = User (USER-Key, nur appview),
+-- community_pds_tokens = Community-Accounts (COMMUNITY-Key, nur writer).
+-- (Spiegelt services/appview/migrations/018_create_pds_tokens.sql.)
+CREATE TABLE auth.auth_pds_tokens (
+  id                 bigserial PRIMARY KEY,
+  did                varchar(255) NOT NULL UNIQUE,
+  tokens_ciphertext  bytea NOT NULL,
+  tokens_nonce       bytea NOT NULL,
+  refresh_expires_at timestamp NOT NULL,
+  updated_at         timestamp NOT NULL DEFAULT now()
+);
+
+CREATE INDEX idx_auth_pds_tokens_refresh_expires_at ON auth.auth_pds_tokens (refresh_expires_at);
+
+CREATE TABLE auth.community_pds_tokens (
+  id                 bigserial PRIMARY KEY,
+  did                varchar(255) NOT NULL UNIQUE,
+  tokens_ciphertext  bytea NOT NULL,
+  tokens_nonce       bytea NOT NULL,
+  refresh_expires_at timestamp NOT NULL,
+  updated_at         timestamp NOT NULL DEFAULT now()
+);
+
+-- Warm-Pool vorprovisionierter PDS-Accounts (appview src/auth/account_pool.py):
+-- ein Hintergrund-Provisioner hält APPVIEW_PDS_POOL_SIZE Accounts bereit (PDS-
+-- Account, PLC aufgelöst, Relay indexiert, Platzhalter-Profil). Die Registrierung
+-- claimt einen (FOR UPDATE SKIP LOCKED), schreibt nur noch das Pseudonym-Profil
+-- und löscht die Zeile in derselben Transaktion wie der auth_creds-INSERT.
+-- App-Passwort verschlüsselt wie auth_creds.app_pw_* (USER-Key).
+-- (Spiegelt services/appview/migrations/019_create_auth_pds_account_pool.sql.)
+CREATE TABLE auth.auth_pds_account_pool (
+  id                bigserial PRIMARY KEY,
+  did               varchar(255) NOT NULL UNIQUE,
+  handle            varchar(255) NOT NULL UNIQUE,
+  app_pw_ciphertext bytea NOT NULL,
+  app_pw_nonce      bytea NOT NULL,
+  status            varchar(10) NOT NULL DEFAULT 'ready',  -- ready | claimed
+  created_at        timestamp NOT NULL DEFAULT now(),
+  claimed_at        timestamp
+);
+
+CREATE INDEX idx_auth_pds_account_pool_ready
+  ON auth.auth_pds_account_pool (id) WHERE status = 'ready';
+
 CREATE TABLE auth.mountain_templates (
   id        serial PRIMARY KEY,
   name      varchar(150) NOT NULL,
@@ -715,6 +809,7 @@ ALTER DEFAULT PRIVILEGES IN SCHEMA auth   GRANT USAGE, SELECT ON SEQUENCES TO ap
 -- daraus nur did/ballot_rkey (ballots.py-JOIN + get_did_for_ballot).
 REVOKE ALL ON auth.community_accounts FROM appview;
 GRANT SELECT (did, handle, ballot_rkey, ballot_uri) ON auth.community_accounts TO appview;
+REVOKE ALL ON auth.community_pds_tokens FROM appview;   -- Community-Tokens: nur writer
 -- ALTER ROLE appview WITH PASSWORD 'CHANGE_ME';
 
 -- writer: die interne Schreib-Seite (community-writer). Wie der Indexer auf das
@@ -731,6 +826,8 @@ ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT USAGE, SELECT ON SEQUENCES TO wr
 GRANT USAGE ON SCHEMA auth TO writer;
 GRANT SELECT ON auth.community_accounts TO writer;        -- inkl. pw_* → Community-Sessions
 GRANT SELECT ON auth.v_eligible_participants TO writer;     -- Eligibility-Gate
+GRANT SELECT, INSERT, UPDATE, DELETE ON auth.community_pds_tokens TO writer;  -- TokenBroker
+GRANT USAGE, SELECT ON SEQUENCE auth.community_pds_tokens_id_seq TO writer;
 
 -- =============================================================================
 -- app_embeddings — pgvector embeddings für Argumente + Taxonomie-Nodes (LM-
@@ -758,4 +855,518 @@ CREATE INDEX IF NOT EXISTS app_embeddings_scope_idx
 
 GRANT SELECT, INSERT, UPDATE, DELETE ON app_embeddings TO calculator;
 GRANT SELECT ON app_embeddings TO appview;
--- ALTER ROLE writer WITH PASSWORD 'CHANGE_ME';
\ No newline at end of file
+
+-- =============================================================================
+-- app_stance_review — Ergebnisse des Stance-Batch (Calculator,
+-- src/review/batch.py): Stance-/Kohärenz-/Thematik-Check für alle Argumente
+-- eines Ballots. Eine Zeile je (Argument, Modell, Prompt-Version); text_hash =
+-- Stance-Cache-Schlüssel → unveränderte Argumente werden übersprungen.
+-- Regenerierbar, daher kein FK.
+-- (Spiegelt services/appview/migrations/013_create_app_stance_review.sql.)
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS app_stance_review (
+    argument_uri      text NOT NULL,          -- app_arguments.uri
+    model             text NOT NULL,
+    prompt_version    text NOT NULL,          -- sha256(System-Prompt)[:12]
+    ballot_rkey       text NOT NULL,
+    lang              text NOT NULL,
+    text_hash         text NOT NULL,
+    declared          text NOT NULL,          -- 'PRO' | 'CONTRA'
+    severity          text,                   -- 'ok' | 'hint' | 'warn'
+    reads_as          text,                   -- 'pro' | 'contra' | 'unclear'
+    matches_selected  boolean,
+    is_argument       boolean,
+    on_topic          boolean,
+    topic             text,                   -- Hauptthema | 'ANDERES' | NULL
+    tone              text,                   -- 'ok' | 'harsh'
+    single_thought    boolean,
+    feedback          text,
+    run_id            text,
+    evaluated_at      timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (argument_uri, model, prompt_version)
+);
+CREATE INDEX IF NOT EXISTS app_stance_review_ballot_idx
+    ON app_stance_review (ballot_rkey, model, prompt_version, severity);
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON app_stance_review TO calculator;
+GRANT SELECT ON app_stance_review TO appview;
+-- ALTER ROLE writer WITH PASSWORD 'CHANGE_ME';
+
+-- =============================================================================
+-- app_ballot_version — Änderungszähler je Ballot für ETag/304 (appview,
+-- src/core/ballot_version.py). Row-Trigger auf Argumenten, Kommentaren,
+-- Kommentar-Übersetzungen, Taxonomie, Bewertungen und Profilen erhöhen
+-- `version` bei jeder inhaltlichen Änderung — unabhängig davon, welcher Dienst
+-- schreibt. Bump-Funktion ist SECURITY DEFINER (keine Grants für Schreiber nötig).
+-- (Spiegelt services/appview/migrations/015_create_app_ballot_version.sql.)
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS app_ballot_version (
+    ballot_rkey  text PRIMARY KEY,
+    version      bigint NOT NULL DEFAULT 1,
+    updated_at   timestamptz NOT NULL DEFAULT now()
+);
+
+GRANT SELECT ON app_ballot_version TO appview;
+
+CREATE OR REPLACE FUNCTION app_bump_ballot_version(rkeys text[]) RETURNS void
+LANGUAGE sql SECURITY DEFINER SET search_path = public AS $$
+    INSERT INTO app_ballot_version AS v (ballot_rkey)
+    SELECT DISTINCT r FROM unnest(rkeys) AS r WHERE r IS NOT NULL
+    ORDER BY 1                                   -- fixed lock order, no deadlocks
+    ON CONFLICT (ballot_rkey) DO UPDATE
+        SET version = v.version + 1, updated_at = now();
+$$;
+
+-- Tables carrying ballot_rkey directly.
+CREATE OR REPLACE FUNCTION app_ballot_version_trg() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN
+        RETURN NULL;
+    END IF;
+    PERFORM app_bump_ballot_version(ARRAY[
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.ballot_rkey END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.ballot_rkey END
+    ]);
+    RETURN NULL;
+END;
+$$;
+
+-- Ratings: resolve the ballot via the rated argument or comment.
+CREATE OR REPLACE FUNCTION app_ballot_version_like_trg() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    subject text := CASE WHEN TG_OP = 'DELETE' THEN OLD.subject_uri ELSE NEW.subject_uri END;
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN
+        RETURN NULL;
+    END IF;
+    PERFORM app_bump_ballot_version(ARRAY(
+        SELECT ballot_rkey FROM app_arguments WHERE uri = subject
+        UNION
+        SELECT ballot_rkey FROM app_comments WHERE uri = subject
+    ));
+    RETURN NULL;
+END;
+$$;
+
+-- Profiles: author name/canton/colour are embedded in argument + comment lists.
+CREATE OR REPLACE FUNCTION app_ballot_version_profile_trg() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF (NEW.display_name, NEW.canton, NEW.color)
+       IS NOT DISTINCT FROM (OLD.display_name, OLD.canton, OLD.color) THEN
+        RETURN NULL;
+    END IF;
+    PERFORM app_bump_ballot_version(ARRAY(
+        SELECT ballot_rkey FROM app_arguments WHERE author_did = NEW.did
+        UNION
+        SELECT ballot_rkey FROM app_comments WHERE did = NEW.did
+    ));
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS app_arguments_ballot_version ON app_arguments;
+CREATE TRIGGER app_arguments_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_arguments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_comments_ballot_version ON app_comments;
+CREATE TRIGGER app_comments_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_comments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_comment_translations_ballot_version ON app_comment_translations;
+CREATE TRIGGER app_comment_translations_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_comment_translations
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_taxonomy_node_ballot_version ON app_taxonomy_node;
+CREATE TRIGGER app_taxonomy_node_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_taxonomy_node
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_taxonomy_membership_ballot_version ON app_taxonomy_membership;
+CREATE TRIGGER app_taxonomy_membership_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_taxonomy_membership
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_likes_ballot_version ON app_likes;
+CREATE TRIGGER app_likes_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_likes
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_like_trg();
+
+DROP TRIGGER IF EXISTS app_profiles_ballot_version ON app_profiles;
+CREATE TRIGGER app_profiles_ballot_version
+    AFTER UPDATE ON app_profiles
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_profile_trg();
+
+-- =============================================================================
+-- Invalidierungs-Bus — replikaübergreifendes Verwerfen der In-Process-Caches
+-- (appview, src/core/invalidation_bus.py). Jede Replica LISTENt auf
+-- `appview_invalidate`; Events {"s": seq, "t": typ, "k": key} tragen eine
+-- globale Sequenznummer, eine Lücke (verpasstes Event) führt zum Full-Flush.
+-- Alle Publisher (appview, Session-Trigger oben) gehen über
+-- app_publish_invalidation() (SECURITY DEFINER).
+-- (Spiegelt services/appview/migrations/016_create_invalidation_bus.sql.)
+CREATE SEQUENCE IF NOT EXISTS app_invalidation_seq;
+
+CREATE OR REPLACE FUNCTION app_publish_invalidation(kind text, key text DEFAULT NULL)
+RETURNS bigint
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    seq bigint := nextval('app_invalidation_seq');
+BEGIN
+    PERFORM pg_notify(
+        'appview_invalidate',
+        json_build_object('s', seq, 't', kind, 'k', key)::text
+    );
+    RETURN seq;
+END;
+$$;
+
+-- =============================================================================
+-- app_ballot_stats — inkrementelle Zähler je Ballot (appview,
+-- src/core/ballot_stats.py): Argumente gesamt/PRO/CONTRA, Kommentare,
+-- Teilnehmende, letzte Aktivität. Row-Trigger auf Argumenten und Kommentaren
+-- ziehen den alten Beitrag ab und zählen den neuen dazu; app_ballot_participant
+-- ist das Teilnehmer-Set mit Beitragszähler. app_ballot_stats_reconcile()
+-- rechnet aus den Quelltabellen nach, korrigiert Drift und erhöht für die
+-- korrigierten Ballots app_ballot_version, damit deren ETags wechseln
+-- (Advisory-Lock, periodisch vom appview aufgerufen). Funktionen SECURITY DEFINER.
+-- (Spiegelt services/appview/migrations/020_create_app_ballot_stats.sql.)
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS app_ballot_stats (
+    ballot_rkey        text PRIMARY KEY,
+    argument_count     integer NOT NULL DEFAULT 0,
+    pro_count          integer NOT NULL DEFAULT 0,
+    contra_count       integer NOT NULL DEFAULT 0,
+    comment_count      integer NOT NULL DEFAULT 0,
+    participant_count  integer NOT NULL DEFAULT 0,
+    last_activity_at   timestamptz,
+    updated_at         timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS app_ballot_participant (
+    ballot_rkey    text NOT NULL,
+    did            text NOT NULL,
+    contributions  integer NOT NULL DEFAULT 1,
+    PRIMARY KEY (ballot_rkey, did)
+);
+
+GRANT SELECT ON app_ballot_stats TO appview;
+GRANT SELECT ON app_ballot_participant TO appview;
+
+-- Counted rows per ballot; `kind` is the argument type or 'comment'. Source of
+-- truth for the reconcile.
+CREATE OR REPLACE VIEW app_ballot_contributions AS
+    SELECT ga.ballot_rkey, a.type AS kind, a.author_did AS did, a.created_at
+    FROM app_arguments a
+    JOIN auth.community_accounts ga ON ga.did = a.did
+    WHERE NOT a.deleted
+    UNION ALL
+    SELECT ga.ballot_rkey, 'comment', c.did, c.created_at
+    FROM app_comments c
+    JOIN app_arguments a ON a.uri = c.argument_uri
+    JOIN auth.community_accounts ga ON ga.did = a.did
+    WHERE NOT c.deleted;
+
+GRANT SELECT ON app_ballot_contributions TO appview;
+
+-- Add (sign = 1) or retract (sign = -1) one counted row.
+CREATE OR REPLACE FUNCTION app_ballot_stats_apply(
+    rkey text, sign integer, kind text, participant text, created timestamptz
+) RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    joined integer := 0;  -- +1 new participant, -1 participant gone
+    left_over integer;
+BEGIN
+    IF rkey IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF participant IS NOT NULL AND sign > 0 THEN
+        INSERT INTO app_ballot_participant AS p (ballot_rkey, did)
+        VALUES (rkey, participant)
+        ON CONFLICT (ballot_rkey, did) DO UPDATE SET contributions = p.contributions + 1
+        RETURNING CASE WHEN p.contributions = 1 THEN 1 ELSE 0 END INTO joined;
+    ELSIF participant IS NOT NULL THEN
+        UPDATE app_ballot_participant SET contributions = contributions - 1
+        WHERE ballot_rkey = rkey AND did = participant
+        RETURNING contributions INTO left_over;
+        IF left_over IS NOT NULL AND left_over <= 0 THEN
+            DELETE FROM app_ballot_participant WHERE ballot_rkey = rkey AND did = participant;
+            joined := -1;
+        END IF;
+    END IF;
+
+    INSERT INTO app_ballot_stats AS s (
+        ballot_rkey, argument_count, pro_count, contra_count, comment_count,
+        participant_count, last_activity_at
+    )
+    VALUES (
+        rkey,
+        CASE WHEN kind <> 'comment' THEN greatest(sign, 0) ELSE 0 END,
+        CASE WHEN kind = 'PRO' THEN greatest(sign, 0) ELSE 0 END,
+        CASE WHEN kind = 'CONTRA' THEN greatest(sign, 0) ELSE 0 END,
+        CASE WHEN kind = 'comment' THEN greatest(sign, 0) ELSE 0 END,
+        greatest(joined, 0),
+        CASE WHEN sign > 0 THEN created END
+    )
+    ON CONFLICT (ballot_rkey) DO UPDATE SET
+        argument_count = s.argument_count + CASE WHEN kind <> 'comment' THEN sign ELSE 0 END,
+        pro_count = s.pro_count + CASE WHEN kind = 'PRO' THEN sign ELSE 0 END,
+        contra_count = s.contra_count + CASE WHEN kind = 'CONTRA' THEN sign ELSE 0 END,
+        comment_count = s.comment_count + CASE WHEN kind = 'comment' THEN sign ELSE 0 END,
+        participant_count = s.participant_count + joined,
+        last_activity_at = CASE WHEN sign > 0
+            THEN greatest(s.last_activity_at, created) ELSE s.last_activity_at END,
+        updated_at = now();
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app_ballot_stats_argument_trg() RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (NEW.did, NEW.type, NEW.author_did, NEW.created_at, NEW.deleted)
+       IS NOT DISTINCT FROM (OLD.did, OLD.type, OLD.author_did, OLD.created_at, OLD.deleted) THEN
+        RETURN NULL;  -- upsert re-writing the same values
+    END IF;
+    IF TG_OP <> 'INSERT' AND NOT OLD.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ballot_rkey FROM auth.community_accounts WHERE did = OLD.did),
+            -1, OLD.type, OLD.author_did, OLD.created_at);
+    END IF;
+    IF TG_OP <> 'DELETE' AND NOT NEW.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ballot_rkey FROM auth.community_accounts WHERE did = NEW.did),
+            1, NEW.type, NEW.author_did, NEW.created_at);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app_ballot_stats_comment_trg() RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (NEW.did, NEW.argument_uri, NEW.created_at, NEW.deleted)
+       IS NOT DISTINCT FROM (OLD.did, OLD.argument_uri, OLD.created_at, OLD.deleted) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' AND NOT OLD.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ga.ballot_rkey FROM app_arguments a
+             JOIN auth.community_accounts ga ON ga.did = a.did
+             WHERE a.uri = OLD.argument_uri),
+            -1, 'comment', OLD.did, OLD.created_at);
+    END IF;
+    IF TG_OP <> 'DELETE' AND NOT NEW.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ga.ballot_rkey FROM app_arguments a
+             JOIN auth.community_accounts ga ON ga.did = a.did
+             WHERE a.uri = NEW.argument_uri),
+            1, 'comment', NEW.did, NEW.created_at);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS app_arguments_ballot_stats ON app_arguments;
+CREATE TRIGGER app_arguments_ballot_stats
+    AFTER INSERT OR DELETE OR UPDATE OF did, type, author_did, created_at, deleted
+    ON app_arguments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_stats_argument_trg();
+
+DROP TRIGGER IF EXISTS app_comments_ballot_stats ON app_comments;
+CREATE TRIGGER app_comments_ballot_stats
+    AFTER INSERT OR DELETE OR UPDATE OF did, argument_uri, created_at, deleted
+    ON app_comments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_stats_comment_trg();
+
+-- Recompute everything from app_ballot_contributions. Returns the number of
+-- stats rows that were corrected, NULL if another session is reconciling.
+CREATE OR REPLACE FUNCTION app_ballot_stats_reconcile() RETURNS integer
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    corrected text[];
+    emptied text[];
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('app_ballot_stats_reconcile')) THEN
+        RETURN NULL;
+    END IF;
+
+    DELETE FROM app_ballot_participant p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM app_ballot_contributions c
+        WHERE c.ballot_rkey = p.ballot_rkey AND c.did = p.did
+    );
+    INSERT INTO app_ballot_participant AS p (ballot_rkey, did, contributions)
+    SELECT ballot_rkey, did, count(*)
+    FROM app_ballot_contributions
+    WHERE did IS NOT NULL
+    GROUP BY ballot_rkey, did
+    ON CONFLICT (ballot_rkey, did) DO UPDATE SET contributions = EXCLUDED.contributions
+    WHERE p.contributions <> EXCLUDED.contributions;
+
+    WITH actual AS (
+        SELECT ballot_rkey,
+               count(*) FILTER (WHERE kind <> 'comment') AS argument_count,
+               count(*) FILTER (WHERE kind = 'PRO') AS pro_count,
+               count(*) FILTER (WHERE kind = 'CONTRA') AS contra_count,
+               count(*) FILTER (WHERE kind = 'comment') AS comment_count,
+               count(DISTINCT did) AS participant_count,
+               max(created_at) AS last_activity_at
+        FROM app_ballot_contributions
+        GROUP BY ballot_rkey
+    ), fixed AS (
+        INSERT INTO app_ballot_stats AS s (
+            ballot_rkey, argument_count, pro_count, contra_count, comment_count,
+            participant_count, last_activity_at
+        )
+        SELECT * FROM actual
+        ON CONFLICT (ballot_rkey) DO UPDATE SET
+            argument_count = EXCLUDED.argument_count,
+            pro_count = EXCLUDED.pro_count,
+            contra_count = EXCLUDED.contra_count,
+            comment_count = EXCLUDED.comment_count,
+            participant_count = EXCLUDED.participant_count,
+            last_activity_at = EXCLUDED.last_activity_at,
+            updated_at = now()
+        WHERE (s.argument_count, s.pro_count, s.contra_count, s.comment_count,
+               s.participant_count, s.last_activity_at)
+              IS DISTINCT FROM
+              (EXCLUDED.argument_count, EXCLUDED.pro_count, EXCLUDED.contra_count,
+               EXCLUDED.comment_count, EXCLUDED.participant_count, EXCLUDED.last_activity_at)
+        RETURNING s.ballot_rkey
+    )
+    SELECT COALESCE(array_agg(ballot_rkey), '{}') INTO corrected FROM fixed;
+
+    -- Ballots whose counted rows are all gone.
+    WITH zeroed AS (
+        UPDATE app_ballot_stats s SET
+            argument_count = 0, pro_count = 0, contra_count = 0, comment_count = 0,
+            participant_count = 0, last_activity_at = NULL, updated_at = now()
+        WHERE NOT EXISTS (SELECT 1 FROM app_ballot_contributions c WHERE c.ballot_rkey = s.ballot_rkey)
+          AND (s.argument_count, s.comment_count, s.participant_count, s.last_activity_at)
+              IS DISTINCT FROM (0, 0, 0, NULL::timestamptz)
+        RETURNING s.ballot_rkey
+    )
+    SELECT COALESCE(array_agg(ballot_rkey), '{}') INTO emptied FROM zeroed;
+
+    -- The ballot ETags are built from app_ballot_version: without a bump,
+    -- clients would keep getting 304 with the drifted counts.
+    PERFORM app_bump_ballot_version(corrected || emptied);
+
+    RETURN cardinality(corrected) + cardinality(emptied);
+END;
+$$;
+
+SELECT app_ballot_stats_reconcile();
+
+-- =============================================================================
+-- app_activity_log — materialisierter Aktivitäts-Feed je Ballot (appview,
+-- activity.list): append-only, ein Eintrag pro neuem Argument, Meilenstein
+-- (User-Argument approved/rejected), Kommentar und Antwort, geschrieben von
+-- Row-Triggern auf app_arguments/app_comments. Der Feed ist ein Index-Range-Scan
+-- über (ballot_rkey, ts DESC, seq DESC) mit (ts, seq)-Keyset-Cursor.
+-- app_activity_watermark hält pro User und Ballot die höchste gesehene `seq`
+-- (Ungelesen-Zähler). Trigger-Funktion SECURITY DEFINER.
+-- (Spiegelt services/appview/migrations/021_create_app_activity_log.sql.)
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS app_activity_log (
+    seq            bigserial PRIMARY KEY,
+    ballot_rkey    text NOT NULL,
+    kind           text NOT NULL CHECK (kind IN ('new_argument', 'milestone', 'comment', 'reply')),
+    ts             timestamptz NOT NULL,
+    activity_uri   text NOT NULL UNIQUE,
+    argument_uri   text NOT NULL,
+    comment_uri    text,
+    actor_did      text
+);
+
+CREATE INDEX IF NOT EXISTS idx_activity_log_ballot_ts
+    ON app_activity_log (ballot_rkey, ts DESC, seq DESC);
+CREATE INDEX IF NOT EXISTS idx_activity_log_ballot_seq
+    ON app_activity_log (ballot_rkey, seq);
+
+CREATE TABLE IF NOT EXISTS app_activity_watermark (
+    did          text NOT NULL,
+    ballot_rkey  text NOT NULL,
+    seen_seq     bigint NOT NULL,
+    updated_at   timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (did, ballot_rkey)
+);
+
+GRANT SELECT ON app_activity_log TO appview;
+GRANT SELECT, INSERT, UPDATE, DELETE ON app_activity_watermark TO appview;
+
+CREATE OR REPLACE FUNCTION app_activity_log_trg() RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF NEW.deleted THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_TABLE_NAME = 'app_comments' THEN
+        IF NEW.origin = 'intern' AND NEW.argument_uri IS NOT NULL THEN
+            INSERT INTO app_activity_log
+                (ballot_rkey, kind, ts, activity_uri, argument_uri, comment_uri, actor_did)
+            VALUES (
+                NEW.ballot_rkey, CASE WHEN NEW.parent_uri IS NULL THEN 'comment' ELSE 'reply' END,
+                NEW.created_at, NEW.uri, NEW.argument_uri, NEW.uri, NEW.did
+            )
+            ON CONFLICT (activity_uri) DO NOTHING;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO app_activity_log (ballot_rkey, kind, ts, activity_uri, argument_uri, actor_did)
+        VALUES (NEW.ballot_rkey, 'new_argument', NEW.created_at, NEW.uri, NEW.uri, NEW.author_did)
+        ON CONFLICT (activity_uri) DO NOTHING;
+    END IF;
+    IF NEW.source_type = 'user' AND NEW.peerreview_status IN ('approved', 'rejected')
+       AND (TG_OP = 'INSERT' OR OLD.peerreview_status IS DISTINCT FROM NEW.peerreview_status) THEN
+        INSERT INTO app_activity_log (ballot_rkey, kind, ts, activity_uri, argument_uri, actor_did)
+        VALUES (NEW.ballot_rkey, 'milestone', now(), 'milestone:' || NEW.uri, NEW.uri, NEW.author_did)
+        ON CONFLICT (activity_uri) DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS app_arguments_activity_log ON app_arguments;
+CREATE TRIGGER app_arguments_activity_log
+    AFTER INSERT OR UPDATE OF peerreview_status ON app_arguments
+    FOR EACH ROW EXECUTE FUNCTION app_activity_log_trg();
+
+DROP TRIGGER IF EXISTS app_comments_activity_log ON app_comments;
+CREATE TRIGGER app_comments_activity_log
+    AFTER INSERT ON app_comments
+    FOR EACH ROW EXECUTE FUNCTION app_activity_log_trg();
+
+-- Backfill (gleiche Auswahl wie die frühere UNION ALL), zeitlich geordnet,
+-- damit `seq` der Historie folgt.
+INSERT INTO app_activity_log (ballot_rkey, kind, ts, activity_uri, argument_uri, comment_uri, actor_did)
+SELECT ballot_rkey, kind, ts, activity_uri, argument_uri, comment_uri, actor_did
+FROM (
+    SELECT a.ballot_rkey, 'new_argument' AS kind, a.created_at AS ts, a.uri AS activity_uri,
+           a.uri AS argument_uri, NULL::text AS comment_uri, a.author_did AS actor_did
+    FROM app_arguments a
+    WHERE NOT a.deleted
+    UNION ALL
+    SELECT a.ballot_rkey, 'milestone', a.indexed_at, 'milestone:' || a.uri,
+           a.uri, NULL, a.author_did
+    FROM app_arguments a
+    WHERE NOT a.deleted AND a.source_type = 'user'
+      AND a.peerreview_status IN ('approved', 'rejected')
+    UNION ALL
+    SELECT c.ballot_rkey, CASE WHEN c.parent_uri IS NULL THEN 'comment' ELSE 'reply' END,
+           c.created_at, c.uri, c.argument_uri, c.uri, c.did
+    FROM app_comments c
+    WHERE NOT c.deleted AND c.origin = 'intern' AND c.argument_uri IS NOT NULL
+) backlog
+ORDER BY ts, activity_uri
+ON CONFLICT (activity_uri) DO NOTHING;
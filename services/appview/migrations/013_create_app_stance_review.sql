@@ -0,0 +1,39 @@
+-- app_stance_review: persisted results of the calculator's stance batch
+-- (services/calculator/src/review/batch.py) — the composition-time stance /
+-- coherence / topic check run over every argument of a ballot.
+--
+-- One row per (argument, model, prompt_version), so results of different
+-- models/prompt revisions sit side by side and reviewers can filter on them.
+-- text_hash = the stance cache key (ballot, lang, declared side, normalised
+-- text, main topics, model, prompt version); the batch skips arguments whose
+-- stored hash still matches → re-runs are incremental and resumable.
+-- Derived, regenerable data → no FK (same as app_embeddings).
+-- Idempotent (IF NOT EXISTS); GRANT is idempotent in Postgres.
+
+CREATE TABLE IF NOT EXISTS app_stance_review (
+    argument_uri      text NOT NULL,          -- app_arguments.uri
+    model             text NOT NULL,          -- e.g. 'google/gemma-4-31B-it'
+    prompt_version    text NOT NULL,          -- sha256(system prompt)[:12]
+    ballot_rkey       text NOT NULL,
+    lang              text NOT NULL,          -- language the check ran in
+    text_hash         text NOT NULL,
+    declared          text NOT NULL,          -- 'PRO' | 'CONTRA'
+    severity          text,                   -- 'ok' | 'hint' | 'warn'
+    reads_as          text,                   -- 'pro' | 'contra' | 'unclear'
+    matches_selected  boolean,
+    is_argument       boolean,
+    on_topic          boolean,
+    topic             text,                   -- main topic name | 'ANDERES' | NULL
+    tone              text,                   -- 'ok' | 'harsh'
+    single_thought    boolean,
+    feedback          text,
+    run_id            text,
+    evaluated_at      timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (argument_uri, model, prompt_version)
+);
+
+CREATE INDEX IF NOT EXISTS app_stance_review_ballot_idx
+    ON app_stance_review (ballot_rkey, model, prompt_version, severity);
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON app_stance_review TO calculator;
+GRANT SELECT ON app_stance_review TO appview;
@@ -0,0 +1,26 @@
+-- NOTIFY session_revoked on logout / revocation.
+--
+-- The appview caches validated sessions in-process (src/auth/session_cache.py)
+-- and writes last_accessed_at behind in batches. Every replica LISTENs on
+-- `session_revoked` and drops the cached entry whose token hash is the payload,
+-- so a deleted session stops working everywhere immediately — regardless of who
+-- deleted it (logout, admin, cleanup job).
+--
+-- Rows that are already expired are skipped: the cache checks expires_at
+-- itself, and bulk purges of old sessions should not flood the channel.
+-- Idempotent (CREATE OR REPLACE / DROP TRIGGER IF EXISTS).
+
+CREATE OR REPLACE FUNCTION auth.notify_session_revoked() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF OLD.expires_at > now() THEN
+        PERFORM pg_notify('session_revoked', OLD.session_token);
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS auth_sessions_notify_revoked ON auth.auth_sessions;
+CREATE TRIGGER auth_sessions_notify_revoked
+    AFTER DELETE ON auth.auth_sessions
+    FOR EACH ROW EXECUTE FUNCTION auth.notify_session_revoked();
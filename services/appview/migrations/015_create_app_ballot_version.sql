@@ -0,0 +1,119 @@
+-- app_ballot_version: per-ballot change counter for ETag / 304 responses.
+--
+-- Every write that changes what the ballot, argument, comment or taxonomy
+-- endpoints return bumps the ballot's `version` (monotonic). The appview builds
+-- strong ETags from it (src/core/ballot_version.py) and answers If-None-Match
+-- with 304 after ONE primary-key lookup, before running the list queries.
+--
+-- Bumped by row triggers, so every writer (indexer, community-writer,
+-- calculator, appview, CMS) is covered without code changes:
+--   app_arguments, app_comments, app_comment_translations,
+--   app_taxonomy_node, app_taxonomy_membership   → NEW/OLD.ballot_rkey
+--   app_likes    → ballot of the rated argument/comment (viewer ratings are
+--                  part of the personalized payloads)
+--   app_profiles → every ballot the author wrote in (display name/colour)
+-- No-op UPDATEs (all columns unchanged) do not bump. The bump function is
+-- SECURITY DEFINER so writer roles need no grant on the counter table.
+-- Idempotent (IF NOT EXISTS / CREATE OR REPLACE / DROP TRIGGER IF EXISTS).
+
+CREATE TABLE IF NOT EXISTS app_ballot_version (
+    ballot_rkey  text PRIMARY KEY,
+    version      bigint NOT NULL DEFAULT 1,
+    updated_at   timestamptz NOT NULL DEFAULT now()
+);
+
+GRANT SELECT ON app_ballot_version TO appview;
+
+CREATE OR REPLACE FUNCTION app_bump_ballot_version(rkeys text[]) RETURNS void
+LANGUAGE sql SECURITY DEFINER SET search_path = public AS $$
+    INSERT INTO app_ballot_version AS v (ballot_rkey)
+    SELECT DISTINCT r FROM unnest(rkeys) AS r WHERE r IS NOT NULL
+    ORDER BY 1                                   -- fixed lock order, no deadlocks
+    ON CONFLICT (ballot_rkey) DO UPDATE
+        SET version = v.version + 1, updated_at = now();
+$$;
+
+-- Tables carrying ballot_rkey directly.
+CREATE OR REPLACE FUNCTION app_ballot_version_trg() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN
+        RETURN NULL;
+    END IF;
+    PERFORM app_bump_ballot_version(ARRAY[
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.ballot_rkey END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.ballot_rkey END
+    ]);
+    RETURN NULL;
+END;
+$$;
+
+-- Ratings: resolve the ballot via the rated argument or comment.
+CREATE OR REPLACE FUNCTION app_ballot_version_like_trg() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    subject text := CASE WHEN TG_OP = 'DELETE' THEN OLD.subject_uri ELSE NEW.subject_uri END;
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN
+        RETURN NULL;
+    END IF;
+    PERFORM app_bump_ballot_version(ARRAY(
+        SELECT ballot_rkey FROM app_arguments WHERE uri = subject
+        UNION
+        SELECT ballot_rkey FROM app_comments WHERE uri = subject
+    ));
+    RETURN NULL;
+END;
+$$;
+
+-- Profiles: author name/canton/colour are embedded in argument + comment lists.
+CREATE OR REPLACE FUNCTION app_ballot_version_profile_trg() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF (NEW.display_name, NEW.canton, NEW.color)
+       IS NOT DISTINCT FROM (OLD.display_name, OLD.canton, OLD.color) THEN
+        RETURN NULL;
+    END IF;
+    PERFORM app_bump_ballot_version(ARRAY(
+        SELECT ballot_rkey FROM app_arguments WHERE author_did = NEW.did
+        UNION
+        SELECT ballot_rkey FROM app_comments WHERE did = NEW.did
+    ));
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS app_arguments_ballot_version ON app_arguments;
+CREATE TRIGGER app_arguments_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_arguments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_comments_ballot_version ON app_comments;
+CREATE TRIGGER app_comments_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_comments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_comment_translations_ballot_version ON app_comment_translations;
+CREATE TRIGGER app_comment_translations_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_comment_translations
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_taxonomy_node_ballot_version ON app_taxonomy_node;
+CREATE TRIGGER app_taxonomy_node_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_taxonomy_node
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_taxonomy_membership_ballot_version ON app_taxonomy_membership;
+CREATE TRIGGER app_taxonomy_membership_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_taxonomy_membership
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_trg();
+
+DROP TRIGGER IF EXISTS app_likes_ballot_version ON app_likes;
+CREATE TRIGGER app_likes_ballot_version
+    AFTER INSERT OR UPDATE OR DELETE ON app_likes
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_like_trg();
+
+DROP TRIGGER IF EXISTS app_profiles_ballot_version ON app_profiles;
+CREATE TRIGGER app_profiles_ballot_version
+    AFTER UPDATE ON app_profiles
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_version_profile_trg();
@@ -0,0 +1,55 @@
+-- Cross-replica cache invalidation bus (appview src/core/invalidation_bus.py).
+--
+-- Every appview replica LISTENs on the channel `appview_invalidate` and evicts
+-- its in-process caches on compact, typed events:
+--     {"s": <seq>, "t": "<type>", "k": "<key>"}
+-- types: ballot (catalog), session (token hash), pds_token (DID),
+--        peerreview_day (DID).
+--
+-- `s` comes from ONE global sequence, so a listener that sees a gap knows it
+-- missed events and flushes everything (as it does after a reconnect).
+-- Publishers — appview code and the session trigger below — all go through app_publish_invalidation(), which numbers and sends
+-- the event in one statement.
+--
+-- Replaces the dedicated `session_revoked` channel from migration 014: the
+-- same trigger now publishes a `session` event on the bus.
+-- Idempotent (IF NOT EXISTS / CREATE OR REPLACE / DROP TRIGGER IF EXISTS).
+
+CREATE SEQUENCE IF NOT EXISTS app_invalidation_seq;
+
+CREATE OR REPLACE FUNCTION app_publish_invalidation(kind text, key text DEFAULT NULL)
+RETURNS bigint
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    seq bigint := nextval('app_invalidation_seq');
+BEGIN
+    PERFORM pg_notify(
+        'appview_invalidate',
+        json_build_object('s', seq, 't', kind, 'k', key)::text
+    );
+    RETURN seq;
+END;
+$$;
+
+-- Session revocation (see 014): publish on the bus instead of session_revoked.
+CREATE OR REPLACE FUNCTION auth.notify_session_revoked() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF OLD.expires_at > now() THEN
+        PERFORM public.app_publish_invalidation('session', OLD.session_token);
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+-- Taxonomy changes are not published on the bus: the appview keeps no
+-- taxonomy state in process, and the calculator's ballot context cache listens
+-- on `taxonomy_changed` (indexer). Drop the statement triggers an earlier
+-- revision of this migration installed.
+DROP TRIGGER IF EXISTS app_taxonomy_node_invalidate_ins ON app_taxonomy_node;
+DROP TRIGGER IF EXISTS app_taxonomy_node_invalidate_upd ON app_taxonomy_node;
+DROP TRIGGER IF EXISTS app_taxonomy_node_invalidate_del ON app_taxonomy_node;
+DROP TRIGGER IF EXISTS app_taxonomy_membership_invalidate_ins ON app_taxonomy_membership;
+DROP TRIGGER IF EXISTS app_taxonomy_membership_invalidate_upd ON app_taxonomy_membership;
+DROP TRIGGER IF EXISTS app_taxonomy_membership_invalidate_del ON app_taxonomy_membership;
+DROP FUNCTION IF EXISTS app_taxonomy_invalidate_trg();
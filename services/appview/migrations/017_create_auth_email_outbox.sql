@@ -0,0 +1,36 @@
+-- Outbound email queue (appview src/core/email_outbox.py).
+--
+-- Auth handlers used to send magic-link mails with blocking smtplib inside the
+-- request. Now they insert one row here and return; a background sender
+-- (every replica, rows claimed with FOR UPDATE SKIP LOCKED + a lease) delivers
+-- it over a reused SMTP connection, retries with backoff and dead-letters
+-- what cannot be delivered.
+--
+-- Privacy: the recipient address and the link never sit here in plaintext —
+-- the message is SecretBox-encrypted with the appview USER key (like
+-- auth_creds.app_pw_*), and the payload is wiped as soon as the row is sent or
+-- dead. Only the recipient DOMAIN is stored in clear (per-domain rate limit).
+-- A mail that is still undelivered at expires_at (magic-link TTL) is useless
+-- and goes to 'dead'. Sent/dead rows are purged after a day (src/auth/purge.py).
+-- Idempotent (IF NOT EXISTS).
+
+CREATE TABLE IF NOT EXISTS auth_email_outbox (
+    id                 bigserial PRIMARY KEY,
+    purpose            varchar(20) NOT NULL,
+    recipient_domain   varchar(255) NOT NULL,
+    payload_ciphertext bytea,
+    payload_nonce      bytea,
+    status             varchar(10) NOT NULL DEFAULT 'pending',  -- pending | sent | dead
+    attempts           integer NOT NULL DEFAULT 0,
+    next_attempt_at    timestamp NOT NULL DEFAULT now(),
+    locked_until       timestamp,
+    expires_at         timestamp NOT NULL,
+    last_error         text,
+    created_at         timestamp NOT NULL DEFAULT now(),
+    sent_at            timestamp
+);
+
+CREATE INDEX IF NOT EXISTS idx_auth_email_outbox_due
+    ON auth_email_outbox (next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_auth_email_outbox_created_at
+    ON auth_email_outbox (created_at);
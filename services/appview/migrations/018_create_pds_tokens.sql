@@ -0,0 +1,43 @@
+-- Persisted PDS session tokens (TokenBroker, src/atproto/pds_tokens.py).
+--
+-- The appview and the community-writer used to keep PDS access tokens only in
+-- process memory with a fixed TTL and logged in again (decrypt the stored
+-- password + createSession, subject to the PDS login rate limit) whenever the
+-- cache was empty — after every restart and on every replica. The broker now
+-- keeps the access AND refresh JWT per account, renews via refreshSession and
+-- stores the pair here so a restart or another replica reuses it.
+--
+-- One table per credential scope, matching the key split in pds_creds.py:
+--   auth_pds_tokens       user accounts, USER key, appview only
+--   community_pds_tokens  ballot community accounts, COMMUNITY key, writer
+-- tokens_ciphertext is the SecretBox-encrypted JSON {access, refresh,
+-- access_exp, refresh_exp}. Rows whose refresh token expired are useless;
+-- the appview auth purge deletes them for auth_pds_tokens (community accounts
+-- are one per ballot, their rows are simply overwritten).
+-- Idempotent (IF NOT EXISTS); GRANT is idempotent in Postgres.
+
+CREATE TABLE IF NOT EXISTS auth_pds_tokens (
+    id                  bigserial PRIMARY KEY,
+    did                 varchar(255) NOT NULL UNIQUE,
+    tokens_ciphertext   bytea NOT NULL,
+    tokens_nonce        bytea NOT NULL,
+    refresh_expires_at  timestamp NOT NULL,
+    updated_at          timestamp NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_auth_pds_tokens_refresh_expires_at
+    ON auth_pds_tokens (refresh_expires_at);
+
+CREATE TABLE IF NOT EXISTS community_pds_tokens (
+    id                  bigserial PRIMARY KEY,
+    did                 varchar(255) NOT NULL UNIQUE,
+    tokens_ciphertext   bytea NOT NULL,
+    tokens_nonce        bytea NOT NULL,
+    refresh_expires_at  timestamp NOT NULL,
+    updated_at          timestamp NOT NULL DEFAULT now()
+);
+
+-- The writer has no access to user identity data; it only gets its own table.
+GRANT SELECT, INSERT, UPDATE, DELETE ON community_pds_tokens TO writer;
+GRANT USAGE, SELECT ON SEQUENCE community_pds_tokens_id_seq TO writer;
+REVOKE ALL ON community_pds_tokens FROM appview;
@@ -0,0 +1,27 @@
+-- Warm pool of pre-provisioned PDS accounts (appview src/auth/account_pool.py).
+--
+-- Registration used to create the PDS account inside the request and wait for
+-- PLC resolution and relay indexing (up to ~40 s). A background provisioner
+-- now keeps APPVIEW_PDS_POOL_SIZE accounts ready here — created, PLC-resolved,
+-- relay-indexed with a placeholder profile. Registration claims one
+-- (FOR UPDATE SKIP LOCKED → status 'claimed'), writes the pseudonym profile and
+-- deletes the row in the same transaction that inserts auth_creds.
+--
+-- The app password is encrypted with the appview USER key, exactly like
+-- auth_creds.app_pw_* (the row moves there on claim). No user data: the
+-- handle is random and the PDS only knows a synthetic email.
+-- Idempotent (IF NOT EXISTS).
+
+CREATE TABLE IF NOT EXISTS auth_pds_account_pool (
+    id                 bigserial PRIMARY KEY,
+    did                varchar(255) NOT NULL UNIQUE,
+    handle             varchar(255) NOT NULL UNIQUE,
+    app_pw_ciphertext  bytea NOT NULL,
+    app_pw_nonce       bytea NOT NULL,
+    status             varchar(10) NOT NULL DEFAULT 'ready',  -- ready | claimed
+    created_at         timestamp NOT NULL DEFAULT now(),
+    claimed_at         timestamp
+);
+
+CREATE INDEX IF NOT EXISTS idx_auth_pds_account_pool_ready
+    ON auth_pds_account_pool (id) WHERE status = 'ready';
@@ -0,0 +1,262 @@
+-- app_ballot_stats: incrementally maintained per-ballot counters.
+--
+-- GET /api/ballots used to count arguments and comments with two GROUP BY
+-- joins over app_arguments / app_comments / auth.community_accounts on every
+-- (uncached) request — cost grows with the ballot's content, not with the
+-- number of ballots listed. The appview now reads one row per ballot by
+-- primary key (src/core/ballot_stats.py).
+--
+-- What counts (same rules as the old queries):
+--   arguments  rows in a ballot community repo (app_arguments.did is the
+--              community account of the ballot), NOT deleted; split by type
+--   comments   NOT deleted comments on such an argument (via argument_uri)
+--   participants  distinct authors of counted arguments (author_did; official
+--              and organization arguments have none) and comments (did)
+--   last_activity_at  newest created_at among counted rows
+--
+-- Kept up to date by row triggers on app_arguments and app_comments, so every
+-- writer (indexer, community-writer, ...) is covered without code changes.
+-- Each trigger retracts the OLD row's contribution and adds the NEW one; UPDATEs
+-- that leave the counted columns unchanged are skipped. app_ballot_participant is the
+-- participant set with a per-author contribution count, so participant_count
+-- only moves when an author's first row arrives or last row goes away.
+--
+-- Triggers cannot see everything (e.g. a comment indexed before its argument
+-- is not counted when the argument arrives; a retracted row keeps
+-- last_activity_at). app_ballot_stats_reconcile() recomputes all rows from the
+-- source tables, bumps app_ballot_version (migration 015) for the ballots it
+-- corrected so their ETags change, and returns how many were wrong; the
+-- appview runs it periodically (APPVIEW_BALLOT_STATS_RECONCILE_SECONDS). It takes a
+-- transaction-level advisory lock, so concurrent callers skip (NULL).
+--
+-- Functions are SECURITY DEFINER so writer roles need no grant on the stats
+-- tables. Idempotent (IF NOT EXISTS / CREATE OR REPLACE / DROP TRIGGER IF
+-- EXISTS); ends with a reconcile as backfill.
+
+CREATE TABLE IF NOT EXISTS app_ballot_stats (
+    ballot_rkey        text PRIMARY KEY,
+    argument_count     integer NOT NULL DEFAULT 0,
+    pro_count          integer NOT NULL DEFAULT 0,
+    contra_count       integer NOT NULL DEFAULT 0,
+    comment_count      integer NOT NULL DEFAULT 0,
+    participant_count  integer NOT NULL DEFAULT 0,
+    last_activity_at   timestamptz,
+    updated_at         timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS app_ballot_participant (
+    ballot_rkey    text NOT NULL,
+    did            text NOT NULL,
+    contributions  integer NOT NULL DEFAULT 1,
+    PRIMARY KEY (ballot_rkey, did)
+);
+
+GRANT SELECT ON app_ballot_stats TO appview;
+GRANT SELECT ON app_ballot_participant TO appview;
+
+-- Counted rows per ballot; `kind` is the argument type or 'comment'. Source of
+-- truth for the reconcile.
+CREATE OR REPLACE VIEW app_ballot_contributions AS
+    SELECT ga.ballot_rkey, a.type AS kind, a.author_did AS did, a.created_at
+    FROM app_arguments a
+    JOIN auth.community_accounts ga ON ga.did = a.did
+    WHERE NOT a.deleted
+    UNION ALL
+    SELECT ga.ballot_rkey, 'comment', c.did, c.created_at
+    FROM app_comments c
+    JOIN app_arguments a ON a.uri = c.argument_uri
+    JOIN auth.community_accounts ga ON ga.did = a.did
+    WHERE NOT c.deleted;
+
+GRANT SELECT ON app_ballot_contributions TO appview;
+
+-- Add (sign = 1) or retract (sign = -1) one counted row.
+CREATE OR REPLACE FUNCTION app_ballot_stats_apply(
+    rkey text, sign integer, kind text, participant text, created timestamptz
+) RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    joined integer := 0;  -- +1 new participant, -1 participant gone
+    left_over integer;
+BEGIN
+    IF rkey IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF participant IS NOT NULL AND sign > 0 THEN
+        INSERT INTO app_ballot_participant AS p (ballot_rkey, did)
+        VALUES (rkey, participant)
+        ON CONFLICT (ballot_rkey, did) DO UPDATE SET contributions = p.contributions + 1
+        RETURNING CASE WHEN p.contributions = 1 THEN 1 ELSE 0 END INTO joined;
+    ELSIF participant IS NOT NULL THEN
+        UPDATE app_ballot_participant SET contributions = contributions - 1
+        WHERE ballot_rkey = rkey AND did = participant
+        RETURNING contributions INTO left_over;
+        IF left_over IS NOT NULL AND left_over <= 0 THEN
+            DELETE FROM app_ballot_participant WHERE ballot_rkey = rkey AND did = participant;
+            joined := -1;
+        END IF;
+    END IF;
+
+    INSERT INTO app_ballot_stats AS s (
+        ballot_rkey, argument_count, pro_count, contra_count, comment_count,
+        participant_count, last_activity_at
+    )
+    VALUES (
+        rkey,
+        CASE WHEN kind <> 'comment' THEN greatest(sign, 0) ELSE 0 END,
+        CASE WHEN kind = 'PRO' THEN greatest(sign, 0) ELSE 0 END,
+        CASE WHEN kind = 'CONTRA' THEN greatest(sign, 0) ELSE 0 END,
+        CASE WHEN kind = 'comment' THEN greatest(sign, 0) ELSE 0 END,
+        greatest(joined, 0),
+        CASE WHEN sign > 0 THEN created END
+    )
+    ON CONFLICT (ballot_rkey) DO UPDATE SET
+        argument_count = s.argument_count + CASE WHEN kind <> 'comment' THEN sign ELSE 0 END,
+        pro_count = s.pro_count + CASE WHEN kind = 'PRO' THEN sign ELSE 0 END,
+        contra_count = s.contra_count + CASE WHEN kind = 'CONTRA' THEN sign ELSE 0 END,
+        comment_count = s.comment_count + CASE WHEN kind = 'comment' THEN sign ELSE 0 END,
+        participant_count = s.participant_count + joined,
+        last_activity_at = CASE WHEN sign > 0
+            THEN greatest(s.last_activity_at, created) ELSE s.last_activity_at END,
+        updated_at = now();
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app_ballot_stats_argument_trg() RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (NEW.did, NEW.type, NEW.author_did, NEW.created_at, NEW.deleted)
+       IS NOT DISTINCT FROM (OLD.did, OLD.type, OLD.author_did, OLD.created_at, OLD.deleted) THEN
+        RETURN NULL;  -- upsert re-writing the same values
+    END IF;
+    IF TG_OP <> 'INSERT' AND NOT OLD.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ballot_rkey FROM auth.community_accounts WHERE did = OLD.did),
+            -1, OLD.type, OLD.author_did, OLD.created_at);
+    END IF;
+    IF TG_OP <> 'DELETE' AND NOT NEW.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ballot_rkey FROM auth.community_accounts WHERE did = NEW.did),
+            1, NEW.type, NEW.author_did, NEW.created_at);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app_ballot_stats_comment_trg() RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (NEW.did, NEW.argument_uri, NEW.created_at, NEW.deleted)
+       IS NOT DISTINCT FROM (OLD.did, OLD.argument_uri, OLD.created_at, OLD.deleted) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' AND NOT OLD.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ga.ballot_rkey FROM app_arguments a
+             JOIN auth.community_accounts ga ON ga.did = a.did
+             WHERE a.uri = OLD.argument_uri),
+            -1, 'comment', OLD.did, OLD.created_at);
+    END IF;
+    IF TG_OP <> 'DELETE' AND NOT NEW.deleted THEN
+        PERFORM app_ballot_stats_apply(
+            (SELECT ga.ballot_rkey FROM app_arguments a
+             JOIN auth.community_accounts ga ON ga.did = a.did
+             WHERE a.uri = NEW.argument_uri),
+            1, 'comment', NEW.did, NEW.created_at);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS app_arguments_ballot_stats ON app_arguments;
+CREATE TRIGGER app_arguments_ballot_stats
+    AFTER INSERT OR DELETE OR UPDATE OF did, type, author_did, created_at, deleted
+    ON app_arguments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_stats_argument_trg();
+
+DROP TRIGGER IF EXISTS app_comments_ballot_stats ON app_comments;
+CREATE TRIGGER app_comments_ballot_stats
+    AFTER INSERT OR DELETE OR UPDATE OF did, argument_uri, created_at, deleted
+    ON app_comments
+    FOR EACH ROW EXECUTE FUNCTION app_ballot_stats_comment_trg();
+
+-- Recompute everything from app_ballot_contributions. Returns the number of
+-- stats rows that were corrected, NULL if another session is reconciling.
+CREATE OR REPLACE FUNCTION app_ballot_stats_reconcile() RETURNS integer
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    corrected text[];
+    emptied text[];
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('app_ballot_stats_reconcile')) THEN
+        RETURN NULL;
+    END IF;
+
+    DELETE FROM app_ballot_participant p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM app_ballot_contributions c
+        WHERE c.ballot_rkey = p.ballot_rkey AND c.did = p.did
+    );
+    INSERT INTO app_ballot_participant AS p (ballot_rkey, did, contributions)
+    SELECT ballot_rkey, did, count(*)
+    FROM app_ballot_contributions
+    WHERE did IS NOT NULL
+    GROUP BY ballot_rkey, did
+    ON CONFLICT (ballot_rkey, did) DO UPDATE SET contributions = EXCLUDED.contributions
+    WHERE p.contributions <> EXCLUDED.contributions;
+
+    WITH actual AS (
+        SELECT ballot_rkey,
+               count(*) FILTER (WHERE kind <> 'comment') AS argument_count,
+               count(*) FILTER (WHERE kind = 'PRO') AS pro_count,
+               count(*) FILTER (WHERE kind = 'CONTRA') AS contra_count,
+               count(*) FILTER (WHERE kind = 'comment') AS comment_count,
+               count(DISTINCT did) AS participant_count,
+               max(created_at) AS last_activity_at
+        FROM app_ballot_contributions
+        GROUP BY ballot_rkey
+    ), fixed AS (
+        INSERT INTO app_ballot_stats AS s (
+            ballot_rkey, argument_count, pro_count, contra_count, comment_count,
+            participant_count, last_activity_at
+        )
+        SELECT * FROM actual
+        ON CONFLICT (ballot_rkey) DO UPDATE SET
+            argument_count = EXCLUDED.argument_count,
+            pro_count = EXCLUDED.pro_count,
+            contra_count = EXCLUDED.contra_count,
+            comment_count = EXCLUDED.comment_count,
+            participant_count = EXCLUDED.participant_count,
+            last_activity_at = EXCLUDED.last_activity_at,
+            updated_at = now()
+        WHERE (s.argument_count, s.pro_count, s.contra_count, s.comment_count,
+               s.participant_count, s.last_activity_at)
+              IS DISTINCT FROM
+              (EXCLUDED.argument_count, EXCLUDED.pro_count, EXCLUDED.contra_count,
+               EXCLUDED.comment_count, EXCLUDED.participant_count, EXCLUDED.last_activity_at)
+        RETURNING s.ballot_rkey
+    )
+    SELECT COALESCE(array_agg(ballot_rkey), '{}') INTO corrected FROM fixed;
+
+    -- Ballots whose counted rows are all gone.
+    WITH zeroed AS (
+        UPDATE app_ballot_stats s SET
+            argument_count = 0, pro_count = 0, contra_count = 0, comment_count = 0,
+            participant_count = 0, last_activity_at = NULL, updated_at = now()
+        WHERE NOT EXISTS (SELECT 1 FROM app_ballot_contributions c WHERE c.ballot_rkey = s.ballot_rkey)
+          AND (s.argument_count, s.comment_count, s.participant_count, s.last_activity_at)
+              IS DISTINCT FROM (0, 0, 0, NULL::timestamptz)
+        RETURNING s.ballot_rkey
+    )
+    SELECT COALESCE(array_agg(ballot_rkey), '{}') INTO emptied FROM zeroed;
+
+    -- The ballot ETags are built from app_ballot_version: without a bump,
+    -- clients would keep getting 304 with the drifted counts.
+    PERFORM app_bump_ballot_version(corrected || emptied);
+
+    RETURN cardinality(corrected) + cardinality(emptied);
+END;
+$$;
+
+SELECT app_ballot_stats_reconcile();
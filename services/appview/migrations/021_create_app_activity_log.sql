@@ -0,0 +1,122 @@
+-- app_activity_log: materialized, append-only ballot activity feed.
+--
+-- activity.list used to rebuild the feed on every request from a UNION ALL
+-- over all arguments, milestones, comments and replies of the ballot (with
+-- correlated reply-count subqueries), sort it and cut one page — cost grew
+-- with the ballot's whole history. It also paged by timestamp alone, so
+-- items sharing a timestamp were skipped or repeated across pages.
+--
+-- Row triggers now append one entry per activity as it is indexed:
+--   new_argument  INSERT into app_arguments (ts = created_at)
+--   milestone     user argument reaching peer-review status approved/rejected
+--                 (ts = time of the status change, once per argument)
+--   comment       INSERT of an intern top-level comment (ts = created_at)
+--   reply         INSERT of an intern reply (ts = created_at)
+-- `seq` is the append order. The feed is one index range scan over
+-- (ballot_rkey, ts DESC, seq DESC) with a (ts, seq) keyset cursor; deleted
+-- subjects are filtered by the join to their row. activity_uri is UNIQUE, so
+-- re-indexing never duplicates an entry.
+--
+-- app_activity_watermark holds the highest `seq` a user has seen per ballot;
+-- entries above it (by others) are the unread count, entries at or below it
+-- are marked seen without a row per item in app_activity_seen.
+--
+-- The trigger function is SECURITY DEFINER so the indexer needs no grant on
+-- the log. Idempotent (IF NOT EXISTS / CREATE OR REPLACE / DROP TRIGGER IF
+-- EXISTS / ON CONFLICT); ends with a backfill from the existing tables.
+
+CREATE TABLE IF NOT EXISTS app_activity_log (
+    seq            bigserial PRIMARY KEY,
+    ballot_rkey    text NOT NULL,
+    kind           text NOT NULL CHECK (kind IN ('new_argument', 'milestone', 'comment', 'reply')),
+    ts             timestamptz NOT NULL,
+    activity_uri   text NOT NULL UNIQUE,
+    argument_uri   text NOT NULL,
+    comment_uri    text,
+    actor_did      text
+);
+
+CREATE INDEX IF NOT EXISTS idx_activity_log_ballot_ts
+    ON app_activity_log (ballot_rkey, ts DESC, seq DESC);
+CREATE INDEX IF NOT EXISTS idx_activity_log_ballot_seq
+    ON app_activity_log (ballot_rkey, seq);
+
+CREATE TABLE IF NOT EXISTS app_activity_watermark (
+    did          text NOT NULL,
+    ballot_rkey  text NOT NULL,
+    seen_seq     bigint NOT NULL,
+    updated_at   timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (did, ballot_rkey)
+);
+
+GRANT SELECT ON app_activity_log TO appview;
+GRANT SELECT, INSERT, UPDATE, DELETE ON app_activity_watermark TO appview;
+
+CREATE OR REPLACE FUNCTION app_activity_log_trg() RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF NEW.deleted THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_TABLE_NAME = 'app_comments' THEN
+        IF NEW.origin = 'intern' AND NEW.argument_uri IS NOT NULL THEN
+            INSERT INTO app_activity_log
+                (ballot_rkey, kind, ts, activity_uri, argument_uri, comment_uri, actor_did)
+            VALUES (
+                NEW.ballot_rkey, CASE WHEN NEW.parent_uri IS NULL THEN 'comment' ELSE 'reply' END,
+                NEW.created_at, NEW.uri, NEW.argument_uri, NEW.uri, NEW.did
+            )
+            ON CONFLICT (activity_uri) DO NOTHING;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO app_activity_log (ballot_rkey, kind, ts, activity_uri, argument_uri, actor_did)
+        VALUES (NEW.ballot_rkey, 'new_argument', NEW.created_at, NEW.uri, NEW.uri, NEW.author_did)
+        ON CONFLICT (activity_uri) DO NOTHING;
+    END IF;
+    IF NEW.source_type = 'user' AND NEW.peerreview_status IN ('approved', 'rejected')
+       AND (TG_OP = 'INSERT' OR OLD.peerreview_status IS DISTINCT FROM NEW.peerreview_status) THEN
+        INSERT INTO app_activity_log (ballot_rkey, kind, ts, activity_uri, argument_uri, actor_did)
+        VALUES (NEW.ballot_rkey, 'milestone', now(), 'milestone:' || NEW.uri, NEW.uri, NEW.author_did)
+        ON CONFLICT (activity_uri) DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS app_arguments_activity_log ON app_arguments;
+CREATE TRIGGER app_arguments_activity_log
+    AFTER INSERT OR UPDATE OF peerreview_status ON app_arguments
+    FOR EACH ROW EXECUTE FUNCTION app_activity_log_trg();
+
+DROP TRIGGER IF EXISTS app_comments_activity_log ON app_comments;
+CREATE TRIGGER app_comments_activity_log
+    AFTER INSERT ON app_comments
+    FOR EACH ROW EXECUTE FUNCTION app_activity_log_trg();
+
+-- Backfill (same selection as the former UNION ALL), in time order so `seq`
+-- follows history.
+INSERT INTO app_activity_log (ballot_rkey, kind, ts, activity_uri, argument_uri, comment_uri, actor_did)
+SELECT ballot_rkey, kind, ts, activity_uri, argument_uri, comment_uri, actor_did
+FROM (
+    SELECT a.ballot_rkey, 'new_argument' AS kind, a.created_at AS ts, a.uri AS activity_uri,
+           a.uri AS argument_uri, NULL::text AS comment_uri, a.author_did AS actor_did
+    FROM app_arguments a
+    WHERE NOT a.deleted
+    UNION ALL
+    SELECT a.ballot_rkey, 'milestone', a.indexed_at, 'milestone:' || a.uri,
+           a.uri, NULL, a.author_did
+    FROM app_arguments a
+    WHERE NOT a.deleted AND a.source_type = 'user'
+      AND a.peerreview_status IN ('approved', 'rejected')
+    UNION ALL
+    SELECT c.ballot_rkey, CASE WHEN c.parent_uri IS NULL THEN 'comment' ELSE 'reply' END,
+           c.created_at, c.uri, c.argument_uri, c.uri, c.did
+    FROM app_comments c
+    WHERE NOT c.deleted AND c.origin = 'intern' AND c.argument_uri IS NOT NULL
+) backlog
+ORDER BY ts, activity_uri
+ON CONFLICT (activity_uri) DO NOTHING;
@@ -20,6 +20,8 @@ import logging
 import os
 from datetime import date, datetime, timezone
 
+from src.core import invalidation_bus
+
 logger = logging.getLogger("peer_review_assign")
 
 
@@ -31,9 +33,29 @@ REQUEST_NSID = "app.ch.poltr.peerreview.request"
 
 # did -> last UTC day we wrote a review request. Bounds request records to ~1/day
 # per active user (lost on restart → at most a couple extra/day, "Müll in Grenzen").
+# Shared across replicas via `peerreview_day` events on the invalidation bus.
 _last_request_day: dict[str, date] = {}
 
 
+def _mark_requested(did: str | None) -> None:
+    if did:
+        _last_request_day[did] = datetime.now(timezone.utc).date()
+
+
+invalidation_bus.subscribe(invalidation_bus.PEERREVIEW_DAY, _mark_requested)
+
+
+def prune() -> int:
+    """Forget users whose last request day is before today (only today's
+    entries can still suppress a request). Returns the number removed; called
+    by the auth purge job."""
+    today = datetime.now(timezone.utc).date()
+    stale = [did for did, day in _last_request_day.items() if day != today]
+    for did in stale:
+        _last_request_day.pop(did, None)
+    return len(stale)
+
+
 async def request_peer_review(session) -> None:
     """Write a peerreview.request into the user's OWN repo, at most once per active
     UTC day. The writer picks it up off the firehose and runs the assignment there."""
@@ -57,6 +79,8 @@ async def request_peer_review(session) -> None:
     except Exception as err:
         _last_request_day.pop(did, None)  # allow another try today on failure
         logger.warning(f"peer_review request failed for {did}: {err}")
+        return
+    await invalidation_bus.publish(invalidation_bus.PEERREVIEW_DAY, did)
 
 
 async def _review_hook(session) -> None:
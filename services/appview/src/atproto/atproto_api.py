@@ -5,7 +5,7 @@ import os
 from datetime import datetime, timezone
 import httpx
 from pydantic import BaseModel
-from src.core import db
+from src.core import db, http_clients, invalidation_bus
 from src.auth.middleware import TSession
 from src.config import DUMMY_BIRTHDATE
 from src.atproto.errors import (
@@ -14,6 +14,8 @@ from src.atproto.errors import (
     from_network_error,
     from_response,
 )
+from src.atproto.pds_creds import decrypt_user_tokens, encrypt_user_tokens
+from src.atproto.pds_tokens import TokenBroker
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +64,7 @@ async def _pds_admin_create_invite() -> str:
     auth_bytes = base64.b64encode(auth_string.encode()).decode()
     headers = {"Authorization": f"Basic {auth_bytes}"}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.use("pds", timeout=30.0) as client:
         resp = await client.post(
             f"{pds_internal_url}/xrpc/com.atproto.server.createInviteCode",
             headers=headers,
@@ -95,7 +97,7 @@ async def pds_admin_create_account(
     logger.info(f"Generated invite code for new account: {handle}")
 
     # Step 2: Create account with the invite code
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.use("pds", timeout=30.0) as client:
         try:
             resp = await client.post(
                 f"{pds_internal_url}/xrpc/com.atproto.server.createAccount",
@@ -131,7 +133,7 @@ async def wait_for_plc_resolution(did: str, timeout: float = 10.0, interval: flo
     """
     plc_url = os.getenv("PLC_DIRECTORY_URL", "https://plc.directory")
     elapsed = 0.0
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with http_clients.use("bsky", timeout=5.0) as client:
         while elapsed < timeout:
             try:
                 resp = await client.get(f"{plc_url}/{did}")
@@ -164,7 +166,7 @@ async def wait_for_relay_repo_indexed(
     """
     relay_url = os.getenv("BSKY_RELAY_URL", "https://bsky.network")
     elapsed = 0.0
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with http_clients.use("bsky", timeout=5.0) as client:
         while elapsed < timeout:
             try:
                 resp = await client.get(
@@ -207,7 +209,7 @@ async def pds_admin_delete_account(did: str) -> None:
     auth_bytes = base64.b64encode(auth_string.encode()).decode()
     headers = {"Authorization": f"Basic {auth_bytes}"}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.use("pds", timeout=30.0) as client:
         resp = await client.post(
             f"{pds_internal_url}/xrpc/com.atproto.admin.deleteAccount",
             headers=headers,
@@ -232,7 +234,7 @@ async def pds_put_record(access_jwt: str, did: str, collection: str, rkey: str,
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.use("pds", timeout=30.0) as client:
         resp = await client.post(
             f"{pds_internal_url}/xrpc/com.atproto.repo.putRecord",
             headers=headers,
@@ -283,7 +285,7 @@ async def pds_admin_toggle_handle(did: str, handle: str):
         base, domain = handle.split(".", 1)
         tmp_handle = f"{base}-tmp.{domain}"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.use("pds", timeout=30.0) as client:
             # Step 1: temporary handle
             resp = await client.post(
                 f"{pds_internal_url}/xrpc/com.atproto.admin.updateAccountHandle",
@@ -317,7 +319,7 @@ async def relay_request_crawl(hostname: str | None = None):
         logger.warning("PDS_HOSTNAME not set, skipping requestCrawl")
         return
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
+    async with http_clients.use("bsky", timeout=15.0) as client:
         try:
             resp = await client.post(
                 f"{relay_url}/xrpc/com.atproto.sync.requestCrawl",
@@ -342,7 +344,7 @@ async def pds_login(did: str, password: str) -> TLoginAccountResponse:
     if not pds_url:
         raise ValueError("PDS_HOSTNAME not set in environment")
 
-    async with httpx.AsyncClient(http2=True, timeout=30.0) as client:
+    async with http_clients.use("pds", timeout=30.0) as client:
         try:
             resp = await client.post(
                 f"https://{pds_url}/xrpc/com.atproto.server.createSession",
@@ -360,37 +362,21 @@ async def pds_login(did: str, password: str) -> TLoginAccountResponse:
     return TLoginAccountResponse(**resp.json())
 
 
-# In-memory cache for PDS access tokens: did -> (access_jwt, expires_at)
-import time as _time
-_pds_token_cache: dict[str, tuple[str, float]] = {}
-_PDS_TOKEN_TTL = 3600  # 1 hour
-
-
-async def _ensure_fresh_token(session: TSession, client: httpx.AsyncClient, pds_url: str):
-    """Check if the PDS access token is still valid; re-login if expired or missing."""
-    # Check in-memory cache first
-    cached = _pds_token_cache.get(session.did)
-    if cached and _time.monotonic() < cached[1]:
-        session.access_token = cached[0]
-        return
-
-    # Cache miss or expired — re-login using stored app password
-    logger.info(f"PDS token cache miss, re-logging in for {session.did}")
-    session_data = await _relogin_from_stored_creds(session.did, client, pds_url)
-    session.access_token = session_data["accessJwt"]
-
-    # Cache the new token
-    _pds_token_cache[session.did] = (session.access_token, _time.monotonic() + _PDS_TOKEN_TTL)
-
-
-async def _relogin_from_stored_creds(did: str, client: httpx.AsyncClient, pds_url: str) -> dict:
-    """Re-authenticate with the PDS using the encrypted password stored in auth_creds."""
+async def _load_user_password(did: str) -> str:
+    """Decrypt the app password stored in auth_creds (broker login fallback).
+    Warm-pool accounts not bound to a user yet keep theirs in
+    auth_pds_account_pool."""
     from src.atproto.pds_creds import decrypt_app_password
 
     db_pool = await db.get_pool()
     async with db_pool.acquire() as conn:
         row = await conn.fetchrow(
-            "SELECT app_pw_ciphertext, app_pw_nonce FROM auth_creds WHERE did = $1",
+            """
+            SELECT app_pw_ciphertext, app_pw_nonce FROM auth_creds WHERE did = $1
+            UNION ALL
+            SELECT app_pw_ciphertext, app_pw_nonce FROM auth_pds_account_pool WHERE did = $1
+            LIMIT 1
+            """,
             did,
         )
 
@@ -399,22 +385,46 @@ async def _relogin_from_stored_creds(did: str, client: httpx.AsyncClient, pds_ur
             PDSErrorCategory.AUTH_REQUIRED, log_detail=f"no stored creds did={did}"
         )
 
-    password = decrypt_app_password(row["app_pw_ciphertext"], row["app_pw_nonce"])
+    return decrypt_app_password(row["app_pw_ciphertext"], row["app_pw_nonce"])
 
-    try:
-        res = await client.post(
-            f"https://{pds_url}/xrpc/com.atproto.server.createSession",
-            json={"identifier": did, "password": password},
-        )
-    except httpx.RequestError as exc:
-        raise from_network_error(exc, op="relogin", did=did) from exc
 
-    if res.status_code != 200:
-        logger.error(f"Re-login failed for {did}: {res.status_code} {res.text}")
-        raise from_response(res, op="relogin", did=did)
+# PDS access/refresh tokens per user DID: refreshSession instead of re-login,
+# single-flight, persisted encrypted in auth_pds_tokens (see pds_tokens.py).
+pds_tokens = TokenBroker(
+    "pds",
+    table="auth_pds_tokens",
+    pds_url=lambda: f"https://{os.getenv('PDS_HOSTNAME')}",
+    load_password=_load_user_password,
+    encrypt=encrypt_user_tokens,
+    decrypt=decrypt_user_tokens,
+    get_pool=lambda: db.get_pool(),
+)
+
+
+def prune_token_cache() -> int:
+    """Drop expired PDS tokens from memory (called by the auth purge job).
+    Returns the number removed."""
+    return pds_tokens.prune()
+
+
+def drop_cached_token(did: str | None = None) -> None:
+    """Forget the cached PDS token of one DID, or (no args) all of them."""
+    pds_tokens.drop(did)
+
+
+async def forget_token(did: str) -> None:
+    """Logout: drop the DID's PDS tokens from memory and storage."""
+    await pds_tokens.forget(did)
+
+
+invalidation_bus.subscribe(invalidation_bus.PDS_TOKEN, drop_cached_token)
+invalidation_bus.on_flush(drop_cached_token)
+
 
-    logger.info(f"Re-login successful for {did}")
-    return res.json()
+async def _ensure_fresh_token(session: TSession, client: httpx.AsyncClient):
+    """Put a valid PDS access token on the session (broker: memory, stored
+    pair, refreshSession, login — in that order)."""
+    session.access_token = await pds_tokens.access_token(client, session.did)
 
 
 async def pds_create_app_password(
@@ -431,8 +441,8 @@ async def pds_create_app_password(
     if not pds_url:
         raise ValueError("PDS_HOSTNAME not set in environment")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        await _ensure_fresh_token(session, client, pds_url)
+    async with http_clients.use("pds", timeout=30.0) as client:
+        await _ensure_fresh_token(session, client)
 
         res = await client.post(
             f"https://{pds_url}/xrpc/com.atproto.server.createAppPassword",
@@ -458,8 +468,8 @@ async def pds_create_record(session: TSession, collection: str, record: dict) ->
     if not pds_url:
         raise ValueError("PDS_HOSTNAME not set")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        await _ensure_fresh_token(session, client, pds_url)
+    async with http_clients.use("pds", timeout=30.0) as client:
+        await _ensure_fresh_token(session, client)
 
         try:
             resp = await client.post(
@@ -496,8 +506,8 @@ async def pds_put_record_session(
     if not pds_url:
         raise ValueError("PDS_HOSTNAME not set")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        await _ensure_fresh_token(session, client, pds_url)
+    async with http_clients.use("pds", timeout=30.0) as client:
+        await _ensure_fresh_token(session, client)
 
         try:
             resp = await client.post(
@@ -531,8 +541,8 @@ async def pds_delete_record(session: TSession, collection: str, rkey: str):
     if not pds_url:
         raise ValueError("PDS_HOSTNAME not set")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        await _ensure_fresh_token(session, client, pds_url)
+    async with http_clients.use("pds", timeout=30.0) as client:
+        await _ensure_fresh_token(session, client)
 
         try:
             resp = await client.post(
@@ -573,7 +583,7 @@ async def pds_set_birthdate(session: TSession) -> bool:
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.use("pds", timeout=30.0) as client:
         # Step 1: Get current preferences from Bluesky
         try:
             res = await client.get(
@@ -0,0 +1,259 @@
+"""
+PDS token broker: one access/refresh JWT pair per account, shared by every
+caller in the process and persisted (encrypted) across restarts.
+
+Used by the appview for user accounts (auth_pds_tokens, USER key) and by the
+community-writer for ballot community accounts (community_pds_tokens,
+COMMUNITY key). The writer keeps a manual copy in src/shared/pds_tokens.py —
+change both together (only the errors import differs).
+
+    broker = TokenBroker("user", table="auth_pds_tokens", ...)
+    jwt = await broker.access_token(client, did)
+
+  - Validity comes from the JWTs' own `exp` claim minus
+    APPVIEW_PDS_TOKEN_MARGIN_SECONDS (default 300), not from a fixed TTL.
+  - An expired access token is renewed with com.atproto.server.refreshSession.
+    createSession (password decrypt + PDS login rate limit) only runs when
+    there is no usable refresh token or the PDS rejects it.
+  - Concurrent callers for the same DID share ONE renewal (single-flight).
+  - Renewed pairs are written encrypted to `table`; on a memory miss the
+    stored pair is tried first, so a restart or another replica does not log
+    in again. The stored row is also re-read before refreshing, because a
+    refresh rotates the refresh token and another replica may have done it.
+
+Persistence is best-effort: a DB error is logged and the broker keeps working
+from memory.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import httpx
+
+from src.atproto.errors import from_network_error, from_response
+
+logger = logging.getLogger("pds_tokens")
+
+# Used when a JWT carries no readable `exp` (should not happen with a PDS).
+_FALLBACK_ACCESS_TTL = 3600
+_FALLBACK_REFRESH_TTL = 7 * 24 * 3600
+
+
+def _margin() -> float:
+    return float(os.getenv("APPVIEW_PDS_TOKEN_MARGIN_SECONDS", "300"))
+
+
+def jwt_exp(jwt: str) -> float | None:
+    """`exp` claim (epoch seconds) of a JWT. Not verified — only used to
+    schedule renewals; the PDS still verifies the token itself."""
+    try:
+        payload = jwt.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class Tokens:
+    access: str
+    refresh: str
+    access_exp: float   # epoch seconds
+    refresh_exp: float
+
+    @classmethod
+    def from_session(cls, data: dict) -> "Tokens":
+        """From a createSession / refreshSession response."""
+        now = time.time()
+        return cls(
+            access=data["accessJwt"],
+            refresh=data["refreshJwt"],
+            access_exp=jwt_exp(data["accessJwt"]) or now + _FALLBACK_ACCESS_TTL,
+            refresh_exp=jwt_exp(data["refreshJwt"]) or now + _FALLBACK_REFRESH_TTL,
+        )
+
+    def access_valid(self) -> bool:
+        return time.time() < self.access_exp - _margin()
+
+    def refresh_valid(self) -> bool:
+        return time.time() < self.refresh_exp - _margin()
+
+
+class TokenBroker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        table: str,
+        pds_url: Callable[[], str],
+        load_password: Callable[[str], Awaitable[str]],
+        encrypt: Callable[[str], tuple[bytes, bytes]],
+        decrypt: Callable[[bytes, bytes], str],
+        get_pool: Callable[[], Awaitable],
+    ):
+        self.name = name
+        self.table = table
+        self._pds_url = pds_url
+        self._load_password = load_password
+        self._encrypt = encrypt
+        self._decrypt = decrypt
+        self._get_pool = get_pool
+        self._tokens: dict[str, Tokens] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.counters = {"hits": 0, "loaded": 0, "refreshed": 0, "logins": 0, "refresh_rejected": 0}
+
+    async def access_token(self, client: httpx.AsyncClient, did: str) -> str:
+        """A valid access JWT for `did`, renewing it if needed."""
+        tokens = self._tokens.get(did)
+        if tokens is not None and tokens.access_valid():
+            self.counters["hits"] += 1
+            return tokens.access
+        task = self._inflight.get(did)
+        if task is None:
+            task = asyncio.create_task(self._renew(client, did))
+            self._inflight[did] = task
+            task.add_done_callback(lambda t, d=did: self._release(d, t))
+        # shield: a cancelled caller must not cancel the renewal for the others
+        return (await asyncio.shield(task)).access
+
+    def _release(self, did: str, task: asyncio.Task) -> None:
+        if self._inflight.get(did) is task:
+            del self._inflight[did]
+        if not task.cancelled():
+            task.exception()  # retrieved: waiters re-raise it
+
+    async def _renew(self, client: httpx.AsyncClient, did: str) -> Tokens:
+        tokens = self._tokens.get(did)
+        stored = await self._load(did)
+        if stored is not None and (tokens is None or stored.refresh_exp >= tokens.refresh_exp):
+            tokens = stored
+        if tokens is not None and tokens.access_valid():
+            self.counters["loaded"] += 1
+            self._tokens[did] = tokens
+            return tokens
+
+        fresh = None
+        if tokens is not None and tokens.refresh_valid():
+            fresh = await self._refresh(client, did, tokens.refresh)
+        if fresh is None:
+            fresh = await self._login(client, did)
+        self._tokens[did] = fresh
+        await self._store(did, fresh)
+        return fresh
+
+    async def _refresh(self, client: httpx.AsyncClient, did: str, refresh_jwt: str) -> Tokens | None:
+        """refreshSession; None if the PDS rejects the refresh token."""
+        try:
+            res = await client.post(
+                f"{self._pds_url()}/xrpc/com.atproto.server.refreshSession",
+                headers={"Authorization": f"Bearer {refresh_jwt}"},
+            )
+        except httpx.RequestError as exc:
+            raise from_network_error(exc, op=f"{self.name}.refreshSession", did=did) from exc
+        if res.status_code in (400, 401):
+            # Expired / revoked / already rotated — fall back to a login.
+            self.counters["refresh_rejected"] += 1
+            logger.info(f"{self.name}: refresh rejected for {did} ({res.status_code}), logging in")
+            return None
+        if res.status_code != 200:
+            raise from_response(res, op=f"{self.name}.refreshSession", did=did)
+        self.counters["refreshed"] += 1
+        return Tokens.from_session(res.json())
+
+    async def _login(self, client: httpx.AsyncClient, did: str) -> Tokens:
+        password = await self._load_password(did)
+        try:
+            res = await client.post(
+                f"{self._pds_url()}/xrpc/com.atproto.server.createSession",
+                json={"identifier": did, "password": password},
+            )
+        except httpx.RequestError as exc:
+            raise from_network_error(exc, op=f"{self.name}.createSession", did=did) from exc
+        if res.status_code != 200:
+            logger.error(f"{self.name}: createSession failed for {did}: {res.status_code} {res.text}")
+            raise from_response(res, op=f"{self.name}.createSession", did=did)
+        self.counters["logins"] += 1
+        logger.info(f"{self.name}: logged in {did}")
+        return Tokens.from_session(res.json())
+
+    # --- persistence ---------------------------------------------------------
+
+    async def _load(self, did: str) -> Tokens | None:
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    f"SELECT tokens_ciphertext, tokens_nonce FROM {self.table} WHERE did = $1",
+                    did,
+                )
+            if not row:
+                return None
+            return Tokens(**json.loads(self._decrypt(row["tokens_ciphertext"], row["tokens_nonce"])))
+        except Exception as err:
+            logger.warning(f"{self.name}: stored tokens unusable for {did}: {err}")
+            return None
+
+    async def _store(self, did: str, tokens: Tokens) -> None:
+        try:
+            ciphertext, nonce = self._encrypt(json.dumps(asdict(tokens)))
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    f"""
+                    INSERT INTO {self.table}
+                        (did, tokens_ciphertext, tokens_nonce, refresh_expires_at, updated_at)
+                    VALUES ($1, $2, $3, $4, now())
+                    ON CONFLICT (did) DO UPDATE SET
+                        tokens_ciphertext = EXCLUDED.tokens_ciphertext,
+                        tokens_nonce = EXCLUDED.tokens_nonce,
+                        refresh_expires_at = EXCLUDED.refresh_expires_at,
+                        updated_at = now()
+                    """,
+                    did, ciphertext, nonce, datetime.utcfromtimestamp(tokens.refresh_exp),
+                )
+        except Exception as err:
+            logger.warning(f"{self.name}: could not persist tokens for {did}: {err}")
+
+    async def seed(self, did: str, session: dict) -> None:
+        """Adopt the tokens of a session created elsewhere (createAccount)."""
+        tokens = Tokens.from_session(session)
+        self._tokens[did] = tokens
+        await self._store(did, tokens)
+
+    # --- eviction --------------------------------------------------------------
+
+    def drop(self, did: str | None = None) -> None:
+        """Forget the in-memory pair of one DID, or (no args) all of them.
+        The stored pair stays; use `forget` to remove it too."""
+        if did is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(did, None)
+
+    async def forget(self, did: str) -> None:
+        """Drop the pair from memory AND storage (logout)."""
+        self.drop(did)
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(f"DELETE FROM {self.table} WHERE did = $1", did)
+        except Exception as err:
+            logger.warning(f"{self.name}: could not delete stored tokens for {did}: {err}")
+
+    def prune(self) -> int:
+        """Drop in-memory pairs whose access token expired (the stored pair
+        still allows a refresh). Returns the number removed."""
+        stale = [did for did, t in self._tokens.items() if not t.access_valid()]
+        for did in stale:
+            self._tokens.pop(did, None)
+        return len(stale)
+
+    def stats(self) -> dict:
+        return {**self.counters, "cached": len(self._tokens), "inflight": len(self._inflight)}
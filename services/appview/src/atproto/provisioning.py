@@ -2,19 +2,22 @@
 PDS account provisioning for new users.
 
 Creates the ATProto identity: PDS account, profile, relay sync.
-Called by register.py after Phase 1 (prepare) succeeds.
+Called by register.py after Phase 1 (prepare) succeeds, or ahead of time by
+the warm pool (src/auth/account_pool.py).
 """
 
 import logging
 
 from src.auth.email_hmac import mask_email
 from src.config import PROFILE_BIO_TEMPLATE
+from src.core import http_clients
 from src.atproto.atproto_api import (
     TCreateAccountResponse,
     pds_admin_create_account,
     pds_admin_delete_account,
     pds_admin_toggle_handle,
     pds_put_record,
+    pds_tokens,
     relay_request_crawl,
     wait_for_plc_resolution,
     wait_for_relay_repo_indexed,
@@ -32,22 +35,25 @@ class ProvisioningError(Exception):
         super().__init__(message)
 
 
-async def provision_pds_account(
-    handle: str,
-    password: str,
-    email: str,
-    pseudonym: dict,
-) -> tuple[str, str]:
-    """Provision a PDS account for a new user. Returns (did, access_token).
+def _profile_record(pseudonym: dict | None) -> dict:
+    """app.bsky.actor.profile for a pseudonym; a bare placeholder for warm-pool
+    accounts that are not bound to a user yet."""
+    if pseudonym is None:
+        return {"$type": "app.bsky.actor.profile"}
+    bio_data = {
+        **pseudonym,
+        "mountainFullname": pseudonym.get("mountainFullname") or pseudonym["mountainName"],
+    }
+    return {
+        "$type": "app.bsky.actor.profile",
+        "displayName": pseudonym["displayName"],
+        "description": PROFILE_BIO_TEMPLATE.format(**bio_data),
+    }
 
-    Creates the account, writes the profile, syncs with the relay.
-    On failure, cleans up the PDS account and raises ProvisioningError.
-    """
-    # Create PDS account
+
+async def _create_account(handle: str, password: str, email: str) -> TCreateAccountResponse:
     try:
-        user_session: TCreateAccountResponse = await pds_admin_create_account(
-            handle, password, email
-        )
+        return await pds_admin_create_account(handle, password, email)
     except RuntimeError as e:
         error_msg = str(e)
         logger.error(f"PDS account creation failed for {mask_email(email)}: {error_msg}")
@@ -57,34 +63,47 @@ async def provision_pds_account(
             raise ProvisioningError("Generated handle conflict, please try again", "handle_taken", 409)
         raise ProvisioningError("Could not create account on PDS, please try again later")
 
+
+async def _publish_identity(user_session: TCreateAccountResponse, handle: str, pseudonym: dict | None):
+    """PLC resolution, profile record, relay sync, handle toggle."""
     did = user_session.did
-    logger.debug(f"PDS account created: {did}")
+    await wait_for_plc_resolution(did)
 
-    try:
-        await wait_for_plc_resolution(did)
-
-        # Write profile to PDS
-        bio_data = {
-            **pseudonym,
-            "mountainFullname": pseudonym.get("mountainFullname") or pseudonym["mountainName"],
-        }
-        bio = PROFILE_BIO_TEMPLATE.format(**bio_data)
-
-        profile_result = await pds_put_record(
-            user_session.accessJwt, did, "app.bsky.actor.profile", "self",
-            {
-                "$type": "app.bsky.actor.profile",
-                "displayName": pseudonym["displayName"],
-                "description": bio,
-            },
-        )
-        profile_commit_rev = profile_result.get("commit", {}).get("rev")
+    # Write profile to PDS
+    profile_result = await pds_put_record(
+        user_session.accessJwt, did, "app.bsky.actor.profile", "self",
+        _profile_record(pseudonym),
+    )
+    profile_commit_rev = profile_result.get("commit", {}).get("rev")
+
+    # Relay sync
+    await relay_request_crawl()
+    await wait_for_relay_repo_indexed(did, expected_rev=profile_commit_rev)
+    await pds_admin_toggle_handle(did, handle)
+
+
+async def provision_pds_account(
+    handle: str,
+    password: str,
+    email: str,
+    pseudonym: dict | None,
+) -> tuple[str, str]:
+    """Provision a PDS account for a new user. Returns (did, access_token).
 
-        # Relay sync
-        await relay_request_crawl()
-        await wait_for_relay_repo_indexed(did, expected_rev=profile_commit_rev)
-        await pds_admin_toggle_handle(did, handle)
+    Creates the account, writes the profile, syncs with the relay.
+    On failure, cleans up the PDS account and raises ProvisioningError.
+    With `pseudonym=None` the profile is a placeholder (warm pool, see
+    src/auth/account_pool.py); the session tokens are then handed to the token
+    broker so binding the account later needs no login.
+    """
+    user_session = await _create_account(handle, password, email)
+    did = user_session.did
+    logger.debug(f"PDS account created: {did}")
 
+    try:
+        await _publish_identity(user_session, handle, pseudonym)
+        if pseudonym is None:
+            await pds_tokens.seed(did, user_session.model_dump())
         logger.debug(f"PDS provisioning complete for {did}")
 
     except Exception as e:
@@ -96,3 +115,20 @@ async def provision_pds_account(
         raise ProvisioningError("Account creation failed, please try again", "registration_failed", 500)
 
     return did, user_session.accessJwt
+
+
+async def bind_pool_account(did: str, pseudonym: dict) -> None:
+    """Give a warm-pool account its user's pseudonym profile.
+
+    The account is already PLC-resolved and relay-indexed, so this is a plain
+    putRecord (the update reaches the relay on its own); no waits.
+    """
+    try:
+        async with http_clients.use("pds", timeout=30.0) as client:
+            access_jwt = await pds_tokens.access_token(client, did)
+        await pds_put_record(
+            access_jwt, did, "app.bsky.actor.profile", "self", _profile_record(pseudonym)
+        )
+    except Exception as e:
+        logger.error(f"Binding pool account {did} failed: {e}")
+        raise ProvisioningError("Account creation failed, please try again", "registration_failed", 500)
@@ -0,0 +1,209 @@
+"""
+Warm pool of pre-provisioned PDS accounts.
+
+Provisioning a PDS account inside the registration request waits for PLC
+resolution (up to 10 s) and relay indexing (up to 30 s). With
+APPVIEW_PDS_POOL_SIZE > 0 a background provisioner keeps that many accounts
+ready in auth_pds_account_pool (migration 019_create_auth_pds_account_pool.sql):
+created with a random handle and password, PLC-resolved, relay-indexed with a
+placeholder profile, tokens handed to the token broker. Registration then only
+`claim()`s one and binds it (pseudonym profile + auth_creds), see
+src/auth/register.py. An empty pool falls back to inline provisioning.
+
+  - Claim: one row, FOR UPDATE SKIP LOCKED, marked 'claimed'. Registration
+    deletes it in the same transaction that inserts auth_creds; on failure it
+    is `release()`d. A claim older than _CLAIM_TIMEOUT (crashed request) goes
+    back to 'ready' on the next refill round.
+  - Refill: one replica at a time (session-level advisory lock on a dedicated
+    connection, like the auth purge), woken by claims or every
+    APPVIEW_PDS_POOL_INTERVAL_SECONDS. At most APPVIEW_PDS_POOL_CONCURRENCY
+    accounts are provisioned in parallel. Pool accounts are PDS accounts too:
+    auth_creds + pool never exceed MAX_PDS_ACCOUNTS (relay limit).
+
+Depth and counters: GET /healthz/pdspool.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+
+import src.core.db as db
+from src.config import MAX_PDS_ACCOUNTS
+
+logger = logging.getLogger("account_pool")
+
+_LOCK_KEY = int.from_bytes(
+    hashlib.blake2b(b"appview|pds-account-pool", digest_size=8).digest(), "big", signed=True
+)
+_CLAIM_TIMEOUT_MINUTES = 5
+
+_wake = asyncio.Event()
+_stats = {"claimed": 0, "released": 0, "provisioned": 0, "failed": 0, "empty": 0}
+
+
+def _size() -> int:
+    return int(os.getenv("APPVIEW_PDS_POOL_SIZE", "0"))
+
+
+def _interval_seconds() -> float:
+    return float(os.getenv("APPVIEW_PDS_POOL_INTERVAL_SECONDS", "60"))
+
+
+def _concurrency() -> int:
+    return max(1, int(os.getenv("APPVIEW_PDS_POOL_CONCURRENCY", "2")))
+
+
+# -----------------------------------------------------------------------------
+# Registration side
+# -----------------------------------------------------------------------------
+
+
+async def claim():
+    """Claim a ready account. Returns the row (did, handle, app_pw_ciphertext,
+    app_pw_nonce) or None if the pool is empty."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            UPDATE auth_pds_account_pool
+            SET status = 'claimed', claimed_at = now()
+            WHERE id = (
+                SELECT id FROM auth_pds_account_pool
+                WHERE status = 'ready'
+                ORDER BY id
+                LIMIT 1 FOR UPDATE SKIP LOCKED
+            )
+            RETURNING did, handle, app_pw_ciphertext, app_pw_nonce
+            """
+        )
+    if row is None:
+        if _size() > 0:
+            _stats["empty"] += 1
+            logger.warning("PDS account pool empty, provisioning inline")
+        return None
+    _stats["claimed"] += 1
+    _wake.set()
+    return row
+
+
+async def release(did: str) -> None:
+    """Return a claimed account whose binding failed to the pool."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            """
+            UPDATE auth_pds_account_pool SET status = 'ready', claimed_at = NULL
+            WHERE did = $1 AND status = 'claimed'
+            """,
+            did,
+        )
+    _stats["released"] += 1
+
+
+# -----------------------------------------------------------------------------
+# Provisioner
+# -----------------------------------------------------------------------------
+
+
+async def _provision_one() -> None:
+    from src.atproto.pds_creds import encrypt_app_password
+    from src.atproto.provisioning import provision_pds_account
+    from src.auth.register import _gen_handle, _gen_password, _synthetic_pds_email
+
+    handle = _gen_handle()
+    password = _gen_password()
+    did, _ = await provision_pds_account(handle, password, _synthetic_pds_email(handle), None)
+    ciphertext, nonce = encrypt_app_password(password)
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO auth_pds_account_pool (did, handle, app_pw_ciphertext, app_pw_nonce)
+            VALUES ($1, $2, $3, $4)
+            """,
+            did, handle, ciphertext, nonce,
+        )
+    logger.info(f"PDS account pool: provisioned {did}")
+
+
+async def _missing(conn) -> int:
+    """How many accounts to provision now (target depth minus ready, capped by
+    MAX_PDS_ACCOUNTS)."""
+    ready = await conn.fetchval(
+        "SELECT count(*) FROM auth_pds_account_pool WHERE status = 'ready'"
+    )
+    missing = _size() - ready
+    if MAX_PDS_ACCOUNTS > 0:
+        total = await conn.fetchval(
+            "SELECT (SELECT count(*) FROM auth_creds) + (SELECT count(*) FROM auth_pds_account_pool)"
+        )
+        missing = min(missing, MAX_PDS_ACCOUNTS - total)
+    return max(0, missing)
+
+
+async def refill_once() -> int | None:
+    """One refill round. Returns the number provisioned, None if another
+    replica holds the lock."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", _LOCK_KEY):
+            return None
+        try:
+            await conn.execute(
+                f"""
+                UPDATE auth_pds_account_pool SET status = 'ready', claimed_at = NULL
+                WHERE status = 'claimed'
+                  AND claimed_at < now() - interval '{_CLAIM_TIMEOUT_MINUTES} minutes'
+                """
+            )
+            provisioned = 0
+            while (missing := await _missing(conn)) > 0:
+                results = await asyncio.gather(
+                    *(_provision_one() for _ in range(min(missing, _concurrency()))),
+                    return_exceptions=True,
+                )
+                ok = sum(1 for r in results if not isinstance(r, Exception))
+                for err in (r for r in results if isinstance(r, Exception)):
+                    logger.warning(f"PDS account pool: provisioning failed: {err}")
+                provisioned += ok
+                _stats["provisioned"] += ok
+                _stats["failed"] += len(results) - ok
+                if ok == 0:
+                    break  # PDS/relay trouble: retry next round
+            return provisioned
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", _LOCK_KEY)
+
+
+async def provision_forever() -> None:
+    """Lifespan task: keep the pool at APPVIEW_PDS_POOL_SIZE."""
+    if _size() <= 0:
+        return
+    logger.info(f"PDS account pool: target depth {_size()}")
+    while True:
+        try:
+            await refill_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.warning(f"PDS account pool: refill round failed: {err}")
+        try:
+            await asyncio.wait_for(_wake.wait(), _interval_seconds())
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+async def depth() -> dict:
+    """Accounts per status (GET /healthz/pdspool)."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT status, count(*) AS n FROM auth_pds_account_pool GROUP BY status"
+        )
+    return {r["status"]: r["n"] for r in rows}
+
+
+def stats() -> dict:
+    return {"target": _size(), **_stats}
@@ -227,8 +227,9 @@ async def start_handler(
 
         # Email carries ONLY the magic link now — no short code (the code is shown
         # in-browser only when the link opens in a different browser).
-        success = email_service.send_confirmation_link(
-            email, token, purpose=purpose, locale=locale
+        # Queued, not sent inline: a slow relay no longer blocks the request.
+        success = await email_service.queue_confirmation_link(
+            email, token, purpose=purpose, locale=locale, expires_at=expires_at
         )
         if not success:
             return JSONResponse(
@@ -0,0 +1,135 @@
+"""
+Periodic purge of expired auth data (DB) and unbounded in-process dicts.
+
+DB (one replica at a time — session-level pg_try_advisory_lock on a dedicated
+connection; the others skip the round):
+  - auth_sessions                expired sessions
+  - auth_pending_logins          expired magic-link codes whose per-email send
+  - auth_pending_registrations   window is over (the row carries the throttle
+                                 counter, see doc/SECURITY_AUTH.md #2)
+  - auth_email_sends             ledger rows older than 2h (normally pruned on
+                                 insert; this covers idle periods)
+  - auth_email_outbox            sent / dead-lettered mails older than 1 day
+                                 (payload already wiped on delivery)
+  - auth_pds_tokens              stored PDS token pairs whose refresh token
+                                 expired (unusable, next use logs in again)
+
+Used magic-link tokens are already deleted on verification. Deletes run in
+batches of APPVIEW_PURGE_BATCH_SIZE rows (short statements, no long locks), at
+most APPVIEW_PURGE_MAX_BATCHES per table and run.
+
+In-process (every replica): session cache, PDS token cache and the peer-review
+request-day dict drop entries that can no longer be hit.
+
+Runs every APPVIEW_PURGE_INTERVAL_SECONDS (default 900) as a lifespan task.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+
+import src.core.db as db
+from src.auth.magic_link_handler import SEND_WINDOW_MINUTES
+
+logger = logging.getLogger("auth_purge")
+
+_LOCK_KEY = int.from_bytes(
+    hashlib.blake2b(b"appview|auth-purge", digest_size=8).digest(), "big", signed=True
+)
+
+# (table, WHERE clause selecting purgeable rows). Batched via the id column.
+_TARGETS = [
+    ("auth_sessions", "expires_at < now()"),
+    ("auth_pending_logins",
+     f"expires_at < now() AND window_started_at < now() - interval '{SEND_WINDOW_MINUTES} minutes'"),
+    ("auth_pending_registrations",
+     f"expires_at < now() AND window_started_at < now() - interval '{SEND_WINDOW_MINUTES} minutes'"),
+    ("auth_email_sends", "created_at < now() - interval '2 hours'"),
+    ("auth_email_outbox", "status IN ('sent', 'dead') AND created_at < now() - interval '1 day'"),
+    ("auth_pds_tokens", "refresh_expires_at < now()"),
+]
+
+
+def _interval_seconds() -> float:
+    return float(os.getenv("APPVIEW_PURGE_INTERVAL_SECONDS", "900"))
+
+
+def _batch_size() -> int:
+    return int(os.getenv("APPVIEW_PURGE_BATCH_SIZE", "1000"))
+
+
+def _max_batches() -> int:
+    return int(os.getenv("APPVIEW_PURGE_MAX_BATCHES", "50"))
+
+
+def _deleted(status) -> int:
+    """asyncpg execute() status 'DELETE <n>' → n."""
+    try:
+        return int(str(status).rsplit(" ", 1)[-1])
+    except (TypeError, ValueError):
+        return 0
+
+
+async def _purge_table(conn, table: str, where: str) -> int:
+    size = _batch_size()
+    total = 0
+    for _ in range(_max_batches()):
+        n = _deleted(await conn.execute(
+            f"""
+            DELETE FROM {table} WHERE id IN (
+                SELECT id FROM {table} WHERE {where}
+                LIMIT $1 FOR UPDATE SKIP LOCKED
+            )
+            """,
+            size,
+        ))
+        total += n
+        if n < size:
+            break
+    return total
+
+
+def purge_memory() -> dict:
+    """Drop dead entries from in-process dicts. Returns removed counts."""
+    from src.arguments import peer_review_assign
+    from src.atproto import atproto_api
+    from src.auth import session_cache
+
+    return {
+        "session_cache": session_cache.prune(),
+        "pds_token_cache": atproto_api.prune_token_cache(),
+        "peer_review_days": peer_review_assign.prune(),
+    }
+
+
+async def purge_db() -> dict | None:
+    """One batched DB purge round. None if another replica holds the lock."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", _LOCK_KEY):
+            return None
+        try:
+            return {table: await _purge_table(conn, table, where)
+                    for table, where in _TARGETS}
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", _LOCK_KEY)
+
+
+async def run_purge() -> dict:
+    """Memory + DB purge. Returns {"memory": {...}, "db": {...} | None}."""
+    result = {"memory": purge_memory(), "db": None}
+    try:
+        result["db"] = await purge_db()
+    except Exception as err:
+        logger.warning(f"auth purge: DB round failed: {err}")
+    if any(result["memory"].values()) or any((result["db"] or {}).values()):
+        logger.info(f"auth purge: {result}")
+    return result
+
+
+async def purge_forever() -> None:
+    """Lifespan task: run the purge every interval."""
+    while True:
+        await asyncio.sleep(_interval_seconds())
+        await run_purge()
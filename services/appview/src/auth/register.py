@@ -15,7 +15,8 @@ from src.auth.login import create_session_cookie
 from src.auth.pseudonym_generator import generate_pseudonym
 from src.config import MAX_PDS_ACCOUNTS
 from src.atproto.pds_creds import encrypt_app_password
-from src.atproto.provisioning import provision_pds_account, ProvisioningError
+from src.atproto.provisioning import bind_pool_account, provision_pds_account, ProvisioningError
+from src.auth import account_pool
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +52,9 @@ async def create_account(
 ) -> JSONResponse | RedirectResponse:
     """Register a new user. Three phases:
     1. Prepare: generate handle, password, pseudonym
-    2. PDS provisioning: create account, write profile, relay sync
+    2. PDS provisioning: create account, write profile, relay sync — or claim a
+       ready account from the warm pool and only write the profile
+       (src/auth/account_pool.py)
     3. AppView registration: store credentials + pseudonym in DB, create session
 
     `email_hmac` is the peppered digest (the pending-registration row stored only
@@ -78,20 +81,32 @@ async def create_account(
             )
 
     # Phase 1: Prepare
-    handle = _gen_handle()
-    password = _gen_password()
-    ciphertext, nonce = encrypt_app_password(password)
     pseudonym = await generate_pseudonym()
-
-    logger.debug(f"Registering new account: handle={handle}, pseudonym={pseudonym['displayName']}")
+    pooled = await account_pool.claim()
 
     # Phase 2: PDS provisioning.
     # The PDS gets a synthetic email, NOT the user's real address — see
     # _synthetic_pds_email. The real email is used only for the HMAC in Phase 3.
     try:
-        did, access_token = await provision_pds_account(
-            handle, password, _synthetic_pds_email(handle), pseudonym
-        )
+        if pooled:
+            # Warm pool: account, handle and password already exist, PLC and
+            # relay are done — only the pseudonym profile is written.
+            did, handle = pooled["did"], pooled["handle"]
+            ciphertext, nonce = pooled["app_pw_ciphertext"], pooled["app_pw_nonce"]
+            logger.debug(f"Registering pool account: handle={handle}, pseudonym={pseudonym['displayName']}")
+            try:
+                await bind_pool_account(did, pseudonym)
+            except ProvisioningError:
+                await account_pool.release(did)
+                raise
+        else:
+            handle = _gen_handle()
+            password = _gen_password()
+            ciphertext, nonce = encrypt_app_password(password)
+            logger.debug(f"Registering new account: handle={handle}, pseudonym={pseudonym['displayName']}")
+            did, _ = await provision_pds_account(
+                handle, password, _synthetic_pds_email(handle), pseudonym
+            )
     except ProvisioningError as e:
         return JSONResponse(
             status_code=e.status_code,
@@ -102,25 +117,34 @@ async def create_account(
     # We store only the peppered HMAC of the email, never the plaintext — the
     # plaintext was needed transiently for the PDS createAccount call above and
     # for the magic-link send, but is not persisted here. See email_hmac.py.
-    async with db.pool.acquire() as conn:
-        await conn.execute(
-            """
-            INSERT INTO auth_creds (did, handle, email_hmac, pds_url, app_pw_ciphertext, app_pw_nonce, pseudonym_template_id)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
-            """,
-            did, handle, email_hmac, os.getenv("PDS_HOSTNAME"),
-            ciphertext, nonce, pseudonym["templateId"],
-        )
-        await conn.execute(
-            """
-            INSERT INTO app_profiles (did, display_name, mountain_name, mountain_fullname, canton, height, color, created_at)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
-            ON CONFLICT (did) DO NOTHING
-            """,
-            did, pseudonym["displayName"], pseudonym["mountainName"],
-            pseudonym.get("mountainFullname") or pseudonym["mountainName"],
-            pseudonym["canton"], pseudonym["height"], pseudonym["color"],
-        )
+    # A failure here must not strand a claimed pool account: hand it back so
+    # the next registration can bind it (the pseudonym is rewritten anyway).
+    try:
+        async with db.pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                """
+                INSERT INTO auth_creds (did, handle, email_hmac, pds_url, app_pw_ciphertext, app_pw_nonce, pseudonym_template_id)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
+                """,
+                did, handle, email_hmac, os.getenv("PDS_HOSTNAME"),
+                ciphertext, nonce, pseudonym["templateId"],
+            )
+            await conn.execute(
+                """
+                INSERT INTO app_profiles (did, display_name, mountain_name, mountain_fullname, canton, height, color, created_at)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
+                ON CONFLICT (did) DO NOTHING
+                """,
+                did, pseudonym["displayName"], pseudonym["mountainName"],
+                pseudonym.get("mountainFullname") or pseudonym["mountainName"],
+                pseudonym["canton"], pseudonym["height"], pseudonym["color"],
+            )
+            if pooled:
+                await conn.execute("DELETE FROM auth_pds_account_pool WHERE did = $1", did)
+    except Exception:
+        if pooled:
+            await account_pool.release(did)
+        raise
 
     response = await create_session_cookie(
         did=did, handle=handle,
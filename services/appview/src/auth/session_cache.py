@@ -0,0 +1,200 @@
+"""
+In-process cache of validated sessions + write-behind for last_accessed_at.
+
+verify_session_token used to SELECT the session row and UPDATE
+last_accessed_at/expires_at on every authenticated request — one write per read
+call. Instead:
+
+  - Validated sessions are cached by token hash for APPVIEW_SESSION_CACHE_TTL
+    seconds (default 30). A hit needs no DB round trip.
+  - Activity is recorded in memory (`touch`) and flushed by a background task
+    every APPVIEW_SESSION_FLUSH_SECONDS (default 5) in ONE UPDATE for all touched
+    sessions. A session is re-touched at most every
+    APPVIEW_SESSION_TOUCH_INTERVAL seconds (default 60), so a busy reader writes
+    ~1 row/minute instead of one per request. The interval outlives the cache
+    TTL, so a re-cached entry starts from the row's last_accessed_at (or from a
+    write still pending) instead of counting as never touched.
+  - Logout/revocation: a trigger on auth_sessions publishes a `session` event
+    with the token hash of every deleted, still-valid row on the invalidation
+    bus (src/core/invalidation_bus.py, migrations 014/016); every replica drops
+    that entry. When the bus may have missed events (reconnect, sequence gap)
+    the whole cache is dropped. The TTL bounds staleness if NOTIFY is
+    unavailable.
+
+The sliding expiry (expires_at = now + lifetime) is extended by the same flush,
+so it lags real activity by at most the touch interval.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import src.core.db as db
+from src.core import invalidation_bus
+
+logger = logging.getLogger("session_cache")
+
+def _ttl() -> float:
+    return float(os.getenv("APPVIEW_SESSION_CACHE_TTL", "30"))
+
+
+def _max_entries() -> int:
+    return int(os.getenv("APPVIEW_SESSION_CACHE_MAX", "10000"))
+
+
+def _touch_interval() -> float:
+    return float(os.getenv("APPVIEW_SESSION_TOUCH_INTERVAL", "60"))
+
+
+def _flush_seconds() -> float:
+    return float(os.getenv("APPVIEW_SESSION_FLUSH_SECONDS", "5"))
+
+
+def lifetime_days() -> int:
+    return int(os.getenv("APPVIEW_SESSION_LIFETIME_DAYS", "7"))
+
+
+@dataclass
+class CachedSession:
+    did: str
+    user_data: dict
+    expires_at: datetime      # naive UTC, as stored in auth_sessions
+    cached_until: float       # time.monotonic()
+    touched_at: float         # last time a DB write was scheduled for it
+
+
+_sessions: "OrderedDict[str, CachedSession]" = OrderedDict()
+_dirty: set[str] = set()
+_stats = {"hits": 0, "misses": 0, "flushed": 0, "invalidated": 0}
+
+
+def get(token_hash: str) -> CachedSession | None:
+    """Cached, unexpired session or None."""
+    entry = _sessions.get(token_hash)
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+    if entry.cached_until <= time.monotonic() or datetime.utcnow() > entry.expires_at:
+        _sessions.pop(token_hash, None)
+        _stats["misses"] += 1
+        return None
+    _sessions.move_to_end(token_hash)
+    _stats["hits"] += 1
+    return entry
+
+
+def _touched_at(token_hash: str, last_accessed_at: datetime | None, now: float) -> float:
+    """Monotonic time of the last write for a session being (re-)cached."""
+    if token_hash in _dirty:
+        return now  # a write is already pending
+    if last_accessed_at is None:
+        return float("-inf")
+    if last_accessed_at.tzinfo is not None:
+        last_accessed_at = last_accessed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    age = (datetime.utcnow() - last_accessed_at).total_seconds()
+    return now - max(age, 0.0)
+
+
+def put(token_hash: str, did: str, user_data: dict, expires_at: datetime,
+        *, last_accessed_at: datetime | None = None,
+        touched: bool = False) -> CachedSession:
+    """Cache a session just validated against the DB. `last_accessed_at` = the
+    row's value, so `touch` only schedules a write once the interval since then
+    has passed. `touched` = the caller already wrote it just now."""
+    now = time.monotonic()
+    entry = CachedSession(
+        did=did, user_data=user_data, expires_at=expires_at,
+        cached_until=now + _ttl(),
+        touched_at=now if touched else _touched_at(token_hash, last_accessed_at, now),
+    )
+    _sessions[token_hash] = entry
+    _sessions.move_to_end(token_hash)
+    while len(_sessions) > _max_entries():
+        _sessions.popitem(last=False)
+    return entry
+
+
+def touch(token_hash: str, entry: CachedSession) -> None:
+    """Record activity. Schedules a write-behind at most every touch interval."""
+    now = time.monotonic()
+    if now - entry.touched_at < _touch_interval():
+        return
+    entry.touched_at = now
+    entry.expires_at = datetime.utcnow() + timedelta(days=lifetime_days())
+    _dirty.add(token_hash)
+
+
+def invalidate(token_hash: str | None = None, *, did: str | None = None) -> None:
+    """Drop one session, all sessions of a DID, or (no args) everything."""
+    if token_hash is None and did is None:
+        _stats["invalidated"] += len(_sessions)
+        _sessions.clear()
+        _dirty.clear()
+        return
+    if token_hash is not None:
+        if _sessions.pop(token_hash, None) is not None:
+            _stats["invalidated"] += 1
+        _dirty.discard(token_hash)
+    if did is not None:
+        for h in [h for h, e in _sessions.items() if e.did == did]:
+            del _sessions[h]
+            _dirty.discard(h)
+            _stats["invalidated"] += 1
+
+
+def prune() -> int:
+    """Drop expired entries (the LRU bound alone keeps dead ones around).
+    Returns the number removed."""
+    now, utc = time.monotonic(), datetime.utcnow()
+    dead = [h for h, e in _sessions.items() if e.cached_until <= now or utc > e.expires_at]
+    for h in dead:
+        del _sessions[h]
+    return len(dead)
+
+
+def stats() -> dict:
+    return {**_stats, "size": len(_sessions), "dirty": len(_dirty)}
+
+
+async def flush() -> int:
+    """Write all pending last-access updates in one statement. Returns the
+    number of sessions flushed; on failure they stay pending for the next run."""
+    if not _dirty:
+        return 0
+    batch = list(_dirty)
+    _dirty.clear()
+    try:
+        pool = await db.get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE auth_sessions
+                SET last_accessed_at = NOW(),
+                    expires_at = NOW() + $2 * INTERVAL '1 day'
+                WHERE session_token = ANY($1::varchar[])
+                """,
+                batch,
+                lifetime_days(),
+            )
+    except Exception as err:
+        # Keep only those still cached — revoked sessions need no extension.
+        _dirty.update(h for h in batch if h in _sessions)
+        logger.warning(f"session touch flush failed ({len(batch)} pending): {err}")
+        return 0
+    _stats["flushed"] += len(batch)
+    return len(batch)
+
+
+async def flush_forever() -> None:
+    """Lifespan task: flush the write-behind buffer periodically."""
+    while True:
+        await asyncio.sleep(_flush_seconds())
+        await flush()
+
+
+invalidation_bus.subscribe(invalidation_bus.SESSION, invalidate)
+invalidation_bus.on_flush(invalidate)
@@ -0,0 +1,297 @@
+"""
+In-process cache of the published ballot catalog (CMS), stale-while-revalidate.
+
+`list_ballots` used to call the CMS for the list and then once more per ballot
+(`?locale=all`) for `availableLangs`; `get_ballot` did the same for one ballot.
+A traffic spike on the list page therefore multiplied into CMS requests, and
+the CMS (a single Node process) is the weakest link.
+
+Instead the catalog is filled with ONE request — all published ballots with
+`locale=all&depth=0` — and every language variant and `availableLangs` is
+derived from that snapshot in memory:
+
+  - `refresh_forever` (lifespan task) reloads it every
+    APPVIEW_BALLOT_CATALOG_TTL seconds (default 60).
+  - The CMS calls POST /api/ballots/catalog/refresh after a ballot change
+    (webhook, shared secret BALLOT_CATALOG_WEBHOOK_SECRET) for a prompt reload
+    on every replica (the receiving one publishes a `ballot` event on the
+    invalidation bus); the TTL bounds staleness if that event is lost.
+  - Reads never wait for the CMS once a snapshot exists: a snapshot older than
+    the TTL is served as-is and a background reload is kicked off. Only a cold
+    start (or a snapshot older than APPVIEW_BALLOT_CATALOG_MAX_STALE, default
+    24h) waits for the CMS. Concurrent reloads share one request.
+  - A failed reload keeps the previous snapshot.
+
+Ballots that are not published (drafts opened by editors) are not in the
+catalog; `get_ballot` falls back to a direct CMS fetch for those.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from src.core import http_clients, invalidation_bus
+from src.core.languages import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES, SUPPORTED_LANGUAGES_SET
+
+logger = logging.getLogger("ballot_catalog")
+
+CMS_INTERNAL_SERVER_URL = os.getenv("CMS_INTERNAL_SERVER_URL")
+
+# Payload fields with `localized: true` (services/cms/src/collections/Ballots.ts).
+LOCALIZED_FIELDS = ("title", "description", "topic")
+
+
+class CMSError(Exception):
+    """Distinguishes network vs. HTTP-error vs. parse-error from the CMS so
+    the route handler can return a useful (and never-empty) details string.
+
+    `category` maps to a stable error code for the JSON response:
+      - 'cms_unreachable'    network failure (DNS, refused, timeout) → 502
+      - 'cms_http_error'     CMS responded but with non-2xx status → 502
+      - 'cms_invalid_response' 2xx but body is not JSON / wrong shape → 502
+    """
+
+    def __init__(self, category: str, message: str, status_code: int | None = None):
+        self.category = category
+        self.status_code = status_code
+        super().__init__(message)
+
+
+def require_cms_url() -> str:
+    """Fail fast (and visibly) if the CMS URL env var is missing — without this
+    httpx silently builds a malformed URL and surfaces an opaque RequestError."""
+    if not CMS_INTERNAL_SERVER_URL:
+        raise CMSError(
+            "cms_unreachable",
+            "CMS_INTERNAL_SERVER_URL env var is not set on the appview pod",
+        )
+    return CMS_INTERNAL_SERVER_URL
+
+
+def _ttl() -> float:
+    return float(os.getenv("APPVIEW_BALLOT_CATALOG_TTL", "60"))
+
+
+def _max_stale() -> float:
+    return float(os.getenv("APPVIEW_BALLOT_CATALOG_MAX_STALE", "86400"))
+
+
+# -----------------------------------------------------------------------------
+# Localization of `locale=all` documents
+# -----------------------------------------------------------------------------
+
+
+def _is_locale_map(value) -> bool:
+    """`locale=all` shape of a localized field: {"de-CH": ..., "fr-CH": ...}.
+    Rich text (`description`) is itself a dict, but keyed by "root"."""
+    return isinstance(value, dict) and bool(value) and set(value) <= SUPPORTED_LANGUAGES_SET
+
+
+def _filled(value) -> bool:
+    if isinstance(value, str):
+        return bool(value.strip())
+    return value is not None
+
+
+def localize(doc: dict, lang: str) -> dict:
+    """One language variant of a `locale=all` document — same fallback as
+    Payload's `fallback-locale`: requested → DEFAULT_LANGUAGE → any filled."""
+    out = dict(doc)
+    for name in LOCALIZED_FIELDS:
+        value = doc.get(name)
+        if not _is_locale_map(value):
+            continue
+        for code in (lang, DEFAULT_LANGUAGE, *SUPPORTED_LANGUAGES):
+            if _filled(value.get(code)):
+                out[name] = value[code]
+                break
+        else:
+            out[name] = None
+    return out
+
+
+def available_langs(doc: dict) -> list[str]:
+    """Locales in which the ballot is filled in (non-empty `title`).
+
+    Payload returns `title` as either {de: "...", fr: "..."} (preferred) or
+    per-locale subdocs depending on the version — handle both.
+    """
+    available: list[str] = []
+    title_field = doc.get("title")
+    if isinstance(title_field, dict):
+        for code in SUPPORTED_LANGUAGES:
+            val = title_field.get(code)
+            if isinstance(val, str) and val.strip():
+                available.append(code)
+    else:
+        for code in SUPPORTED_LANGUAGES:
+            slot = doc.get(code)
+            if isinstance(slot, dict):
+                val = slot.get("title")
+                if isinstance(val, str) and val.strip():
+                    available.append(code)
+    return available or [DEFAULT_LANGUAGE]
+
+
+def doc_rkey(doc: dict) -> str:
+    return doc.get("rkey", str(doc.get("id", "")))
+
+
+# -----------------------------------------------------------------------------
+# Snapshot
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class Snapshot:
+    docs: list[dict]                 # locale=all, CMS order (-voteDate)
+    loaded_at: float                 # time.monotonic()
+    by_rkey: dict[str, dict] = field(default_factory=dict)
+    langs: dict[str, list[str]] = field(default_factory=dict)
+    stamp: str = ""                  # changes whenever any ballot changes (ETags)
+
+    def __post_init__(self):
+        for doc in self.docs:
+            rkey = doc_rkey(doc)
+            self.by_rkey[rkey] = doc
+            self.langs[rkey] = available_langs(doc)
+        self.stamp = hashlib.blake2b(
+            "|".join(f"{doc_rkey(d)}@{d.get('updatedAt')}" for d in self.docs).encode(),
+            digest_size=8,
+        ).hexdigest()
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+_snapshot: Snapshot | None = None
+_inflight: asyncio.Task | None = None
+_stats = {"refreshes": 0, "failures": 0, "stale_served": 0}
+
+
+async def _fetch_all() -> list[dict]:
+    """All published ballots with every locale in one CMS request."""
+    cms_url = require_cms_url()
+    url = (
+        f"{cms_url}/api/ballots"
+        f"?where[status][equals]=published&sort=-voteDate&limit=100"
+        f"&locale=all&depth=0"
+    )
+    try:
+        async with http_clients.use("cms", timeout=30.0) as client:
+            resp = await client.get(url)
+    except httpx.RequestError as err:
+        detail = str(err) or repr(err)
+        raise CMSError(
+            "cms_unreachable",
+            f"CMS request to /api/ballots failed: {detail}",
+        ) from err
+
+    if resp.status_code != 200:
+        body_preview = (resp.text or "").strip()[:300] or "<empty body>"
+        raise CMSError(
+            "cms_http_error",
+            f"CMS /api/ballots returned {resp.status_code}: {body_preview}",
+            status_code=resp.status_code,
+        )
+
+    try:
+        docs = resp.json().get("docs", [])
+    except (ValueError, AttributeError) as err:
+        raise CMSError(
+            "cms_invalid_response",
+            f"CMS /api/ballots returned non-JSON body: {(resp.text or '').strip()[:200]!r}",
+        ) from err
+    if not isinstance(docs, list):
+        raise CMSError("cms_invalid_response", "CMS /api/ballots: `docs` is not a list")
+    return docs
+
+
+async def _load() -> Snapshot:
+    global _snapshot
+    try:
+        docs = await _fetch_all()
+    except Exception:
+        _stats["failures"] += 1
+        raise
+    _snapshot = Snapshot(docs=docs, loaded_at=time.monotonic())
+    _stats["refreshes"] += 1
+    return _snapshot
+
+
+def _reload_task() -> asyncio.Task:
+    """The running reload, or a new one (concurrent callers share it)."""
+    global _inflight
+    if _inflight is None or _inflight.done():
+        _inflight = asyncio.create_task(_load())
+        _inflight.add_done_callback(_log_failure)
+    return _inflight
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    err = task.exception()
+    if err is not None:
+        logger.warning(f"ballot catalog reload failed (keeping previous snapshot): {err}")
+
+
+async def refresh() -> Snapshot:
+    """Reload now (joins a reload already in flight). Raises CMSError."""
+    return await asyncio.shield(_reload_task())
+
+
+def schedule_refresh() -> None:
+    """Reload in the background (webhook / stale read)."""
+    _reload_task()
+
+
+async def get() -> Snapshot:
+    """The current snapshot, without waiting for the CMS whenever one exists.
+
+    Raises CMSError only if there is no usable snapshot and the CMS fails."""
+    snap = _snapshot
+    if snap is None or snap.age() > _max_stale():
+        return await refresh()
+    if snap.age() > _ttl():
+        _stats["stale_served"] += 1
+        schedule_refresh()
+    return snap
+
+
+def invalidate() -> None:
+    """Forget the snapshot (next read reloads). For tests and admin use."""
+    global _snapshot
+    _snapshot = None
+
+
+def stats() -> dict:
+    snap = _snapshot
+    return {
+        **_stats,
+        "ballots": len(snap.docs) if snap else 0,
+        "age": round(snap.age(), 1) if snap else None,
+    }
+
+
+async def refresh_forever() -> None:
+    """Lifespan task: load the catalog at startup, then every TTL seconds."""
+    while True:
+        try:
+            await refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass  # logged by _log_failure; previous snapshot stays
+        await asyncio.sleep(_ttl())
+
+
+# Another replica got the CMS webhook, or the bus may have missed events:
+# reload, but keep serving the current snapshot meanwhile.
+invalidation_bus.subscribe(invalidation_bus.BALLOT, lambda _key: schedule_refresh())
+invalidation_bus.on_flush(schedule_refresh)
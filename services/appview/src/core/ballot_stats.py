@@ -0,0 +1,97 @@
+"""
+Per-ballot counters from app_ballot_stats.
+
+Argument, comment and participant counts are maintained by row triggers on
+app_arguments / app_comments (migration 020_create_app_ballot_stats.sql), so
+the ballot list reads ONE primary-key row per ballot instead of counting the
+ballots' content on every request.
+
+The triggers can drift (e.g. a comment indexed before its argument), so
+`reconcile_forever()` periodically calls app_ballot_stats_reconcile(), which
+recomputes every row from the source tables and returns how many it had to
+correct. The function takes an advisory lock itself; replicas that lose the
+race skip the round. APPVIEW_BALLOT_STATS_RECONCILE_SECONDS (default 3600)
+sets the interval, 0 disables it.
+
+Counters: GET /healthz/ballotstats.
+"""
+
+import asyncio
+import logging
+import os
+
+import src.core.db as db
+
+logger = logging.getLogger("ballot_stats")
+
+_stats = {"reconciles": 0, "skipped": 0, "corrected": 0, "failed": 0}
+
+
+def _interval_seconds() -> float:
+    return float(os.getenv("APPVIEW_BALLOT_STATS_RECONCILE_SECONDS", "3600"))
+
+
+def _empty() -> dict:
+    return {
+        "argument_count": 0, "pro_count": 0, "contra_count": 0,
+        "comment_count": 0, "participant_count": 0, "last_activity_at": None,
+        "like_count": 0,
+    }
+
+
+async def counts_of(ballot_rkeys: list[str]) -> dict[str, dict]:
+    """{rkey: counters} for several ballots (no row yet → zeros)."""
+    result = {rkey: _empty() for rkey in ballot_rkeys}
+    if not ballot_rkeys:
+        return result
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT ballot_rkey, argument_count, pro_count, contra_count,
+                   comment_count, participant_count, last_activity_at
+            FROM app_ballot_stats
+            WHERE ballot_rkey = ANY($1::text[])
+            """,
+            ballot_rkeys,
+        )
+    for row in rows:
+        result[row["ballot_rkey"]].update(
+            {k: row[k] for k in row.keys() if k != "ballot_rkey"}
+        )
+    return result
+
+
+async def reconcile() -> int | None:
+    """Run one reconcile. Returns the number of corrected rows, None if
+    another replica is reconciling."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        corrected = await conn.fetchval("SELECT app_ballot_stats_reconcile()")
+    if corrected is None:
+        _stats["skipped"] += 1
+        return None
+    _stats["reconciles"] += 1
+    _stats["corrected"] += corrected
+    if corrected:
+        logger.warning(f"Ballot stats: reconcile corrected {corrected} drifted row(s)")
+    return corrected
+
+
+async def reconcile_forever() -> None:
+    """Lifespan task: reconcile every interval."""
+    if _interval_seconds() <= 0:
+        return
+    while True:
+        await asyncio.sleep(_interval_seconds())
+        try:
+            await reconcile()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _stats["failed"] += 1
+            logger.warning(f"Ballot stats: reconcile failed: {err}")
+
+
+def stats() -> dict:
+    return dict(_stats)
@@ -0,0 +1,156 @@
+"""
+Strong ETags / 304 Not Modified from per-ballot version counters.
+
+Clients poll ballot, argument, comment and taxonomy endpoints. Every content
+write bumps `app_ballot_version.version` for the affected ballot (row triggers,
+migration 015_create_app_ballot_version.sql), so a response is fully
+determined by:
+
+  endpoint + ballot version(s) + the request parameters that shape the output
+  (sort, filters, lang, …) + the viewer (personalized ratings / shuffle order)
+
+Handlers compute that ETag with ONE primary-key lookup and answer a matching
+If-None-Match with 304 before running their list queries:
+
+    etag = await ballot_etag(ballot_rkey, "argument.list", sort, lang, viewer)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    ...
+    return with_etag(JSONResponse(...), etag)
+
+Ballots with no recorded write yet have version 0. If the version lookup
+fails the handler simply runs without an ETag (etag None).
+APPVIEW_ETAGS_ENABLED=false switches the whole mechanism off.
+"""
+
+import hashlib
+import logging
+import os
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+import src.core.db as db
+
+logger = logging.getLogger("ballot_version")
+
+
+def _enabled() -> bool:
+    return os.getenv("APPVIEW_ETAGS_ENABLED", "true").lower() == "true"
+
+
+async def version_of(ballot_rkey: str) -> int:
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        version = await conn.fetchval(
+            "SELECT version FROM app_ballot_version WHERE ballot_rkey = $1",
+            ballot_rkey,
+        )
+    return version or 0
+
+
+async def versions_of(ballot_rkeys: list[str]) -> dict[str, int]:
+    """{rkey: version} for several ballots (missing → 0)."""
+    if not ballot_rkeys:
+        return {}
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT ballot_rkey, version FROM app_ballot_version WHERE ballot_rkey = ANY($1::text[])",
+            ballot_rkeys,
+        )
+    found = {r["ballot_rkey"]: r["version"] for r in rows}
+    return {rkey: found.get(rkey, 0) for rkey in ballot_rkeys}
+
+
+async def version_of_argument(argument_uri: str) -> tuple[str, int] | None:
+    """(ballot_rkey, version) of the ballot an argument belongs to, or None
+    if the argument is unknown."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT a.ballot_rkey, COALESCE(v.version, 0) AS version
+            FROM app_arguments a
+            LEFT JOIN app_ballot_version v ON v.ballot_rkey = a.ballot_rkey
+            WHERE a.uri = $1
+            """,
+            argument_uri,
+        )
+    return (row["ballot_rkey"], row["version"]) if row else None
+
+
+async def current(ballot_rkey: str) -> int | None:
+    """Version of a ballot, None if the lookup failed. Also keys the payload
+    cache (src/core/payload_cache.py), so it is looked up even with ETags off."""
+    try:
+        return await version_of(ballot_rkey)
+    except Exception as err:
+        logger.warning(f"ballot version lookup failed for {ballot_rkey}: {err}")
+        return None
+
+
+async def current_of_argument(argument_uri: str) -> tuple[str, int] | None:
+    """(ballot_rkey, version) for an argument, None if unknown or the lookup
+    failed."""
+    try:
+        return await version_of_argument(argument_uri)
+    except Exception as err:
+        logger.warning(f"ballot version lookup failed for {argument_uri}: {err}")
+        return None
+
+
+def etag_for(ballot_rkey: str, version: int | None, *parts) -> str | None:
+    """ETag from an already looked-up version (None: disabled / no version)."""
+    if version is None or not _enabled():
+        return None
+    return make_etag(ballot_rkey, version, *parts)
+
+
+async def ballot_etag(ballot_rkey: str, *parts) -> str | None:
+    """ETag for a response about one ballot, or None (disabled / lookup failed)."""
+    if not _enabled():
+        return None
+    return etag_for(ballot_rkey, await current(ballot_rkey), *parts)
+
+
+async def argument_etag(argument_uri: str, *parts) -> str | None:
+    """ETag for a response about one argument (e.g. its comments), keyed on
+    the version of the argument's ballot. None for unknown arguments."""
+    if not _enabled():
+        return None
+    found = await current_of_argument(argument_uri)
+    if found is None:
+        return None
+    ballot_rkey, version = found
+    return make_etag(ballot_rkey, version, argument_uri, *parts)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over all parts that determine the response body."""
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+def not_modified(request: Request | None, etag: str | None) -> bool:
+    """True if the client's If-None-Match already names `etag`."""
+    if request is None or etag is None or not _enabled():
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): proxies may add W/ when re-encoding.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def with_etag(response: JSONResponse, etag: str | None) -> JSONResponse:
+    if etag is not None and _enabled():
+        response.headers["ETag"] = etag
+    return response
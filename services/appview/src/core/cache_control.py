@@ -0,0 +1,52 @@
+"""
+Cache-Control for the public read endpoints (ballots, arguments, comments,
+taxonomy).
+
+With APPVIEW_PUBLIC_READ_ENABLED=true these endpoints also answer requests
+without a session (src/auth/middleware.optional_session_token). Such anonymous
+responses carry no viewer fields at all — the same rows as for a logged-in
+user, without the per-viewer overlay — so they are identical for every
+logged-out visitor and a front cache / CDN may share them:
+
+    Cache-Control: public, max-age=0, s-maxage=30, stale-while-revalidate=300
+
+max-age=0 keeps browsers revalidating (cheap: ETag → 304), while the shared
+cache absorbs the burst. Responses for a session are `private, no-cache`.
+Both vary on Cookie/Authorization (anonymous vs. personal) and Accept-Language
+(the language fallback when `?lang=` is absent).
+
+    return cache_control.apply(with_etag(JSONResponse(...), etag), viewer_did)
+
+Only successful responses (200/304) are marked cacheable.
+"""
+
+import os
+
+from fastapi.responses import Response
+
+VARY = "Cookie, Authorization, Accept-Language"
+
+
+def _s_maxage() -> int:
+    return int(os.getenv("APPVIEW_PUBLIC_S_MAXAGE", "30"))
+
+
+def _stale_while_revalidate() -> int:
+    return int(os.getenv("APPVIEW_PUBLIC_STALE_WHILE_REVALIDATE", "300"))
+
+
+def header_for(viewer_did: str | None) -> str:
+    if viewer_did:
+        return "private, no-cache"
+    return (
+        f"public, max-age=0, s-maxage={_s_maxage()}, "
+        f"stale-while-revalidate={_stale_while_revalidate()}"
+    )
+
+
+def apply(response: Response, viewer_did: str | None) -> Response:
+    """Set Cache-Control/Vary on a 200 or 304; other statuses are left as-is."""
+    if response.status_code in (200, 304):
+        response.headers["Cache-Control"] = header_for(viewer_did)
+        response.headers["Vary"] = VARY
+    return response
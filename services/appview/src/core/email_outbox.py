@@ -0,0 +1,467 @@
+"""
+Persistent email outbox + async background sender.
+
+Magic-link mails used to go out with blocking `smtplib` inside the request
+handler: a slow or hanging relay stalled the event loop for every request.
+Now handlers only `enqueue()` (one INSERT into auth_email_outbox, migration
+017_create_auth_email_outbox.sql) and return; `send_forever` (lifespan task,
+every replica) delivers:
+
+  - Claim: due rows are claimed with FOR UPDATE SKIP LOCKED and a lease
+    (`locked_until`), so replicas never send the same row twice and a crashed
+    sender's rows become due again after the lease. The lease covers ONE send
+    (two attempts at the SMTP timeout each); right before each send of a batch
+    the row's lease is renewed, fenced on the `locked_until` we were handed —
+    a row whose lease ran out behind a slow send (and may now belong to
+    another replica) is skipped, not sent twice.
+  - Sink: APPVIEW_EMAIL_SINK = smtp | log | file:<dir>. Default: smtp when an
+    SMTP relay with credentials is configured, else log (dev: prints the link,
+    never the address). `file:<dir>` writes one .eml per mail (tests, staging).
+    The SMTP sink keeps ONE connection open while there is work and closes it
+    after APPVIEW_EMAIL_SMTP_IDLE_SECONDS without sends.
+  - Retry: transient failures back off exponentially
+    (APPVIEW_EMAIL_RETRY_BASE_SECONDS · 2^attempt, capped at
+    APPVIEW_EMAIL_RETRY_MAX_SECONDS, with jitter) up to
+    APPVIEW_EMAIL_MAX_ATTEMPTS.
+  - Dead letter: permanent SMTP rejections (5xx), exhausted retries and mails
+    whose link expired before delivery end as status 'dead' with last_error.
+  - Rate limit: at most APPVIEW_EMAIL_DOMAIN_RATE_PER_MINUTE mails per
+    recipient domain and minute (per replica); excess rows are deferred, not
+    failed.
+
+Sent and dead rows have their encrypted payload wiped immediately and are
+deleted after a day by the auth purge job. Stats: GET /healthz/email.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime
+from email.message import EmailMessage
+from pathlib import Path
+
+import src.core.db as db
+from src.atproto.pds_creds import decrypt_outbox_payload, encrypt_outbox_payload
+
+logger = logging.getLogger("email_outbox")
+
+_SMTP_TIMEOUT_SECONDS = 30
+# One send: up to two attempts of connect + send at the SMTP timeout, plus slack.
+_LEASE_SECONDS = 4 * _SMTP_TIMEOUT_SECONDS + 30
+_BATCH_SIZE = 20
+
+_wake = asyncio.Event()
+_stats = {"queued": 0, "sent": 0, "retried": 0, "deferred": 0, "dead": 0, "lease_lost": 0}
+
+
+def _max_attempts() -> int:
+    return int(os.getenv("APPVIEW_EMAIL_MAX_ATTEMPTS", "6"))
+
+
+def _retry_base() -> float:
+    return float(os.getenv("APPVIEW_EMAIL_RETRY_BASE_SECONDS", "5"))
+
+
+def _retry_max() -> float:
+    return float(os.getenv("APPVIEW_EMAIL_RETRY_MAX_SECONDS", "300"))
+
+
+def _domain_rate() -> int:
+    return int(os.getenv("APPVIEW_EMAIL_DOMAIN_RATE_PER_MINUTE", "30"))
+
+
+def _poll_seconds() -> float:
+    return float(os.getenv("APPVIEW_EMAIL_POLL_SECONDS", "2"))
+
+
+def _smtp_idle_seconds() -> float:
+    return float(os.getenv("APPVIEW_EMAIL_SMTP_IDLE_SECONDS", "30"))
+
+
+class PermanentEmailError(Exception):
+    """The relay rejected the mail for good (5xx) — do not retry."""
+
+
+def recipient_domain(address: str) -> str:
+    return address.rsplit("@", 1)[-1].strip().lower()
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number `attempts` (1-based), with ±20% jitter."""
+    delay = min(_retry_base() * (2 ** (attempts - 1)), _retry_max())
+    return delay * random.uniform(0.8, 1.2)
+
+
+# -----------------------------------------------------------------------------
+# Enqueue (request path)
+# -----------------------------------------------------------------------------
+
+
+async def enqueue(
+    to_email: str,
+    purpose: str,
+    subject: str,
+    text: str,
+    html: str | None = None,
+    *,
+    expires_at: datetime,
+    link: str | None = None,
+) -> int:
+    """Queue one mail. Returns the outbox id. `link` is only used by the log
+    sink (dev). `expires_at` (naive UTC): undelivered by then → dead."""
+    payload = json.dumps({
+        "to": to_email, "subject": subject, "text": text, "html": html, "link": link,
+    })
+    ciphertext, nonce = encrypt_outbox_payload(payload)
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        outbox_id = await conn.fetchval(
+            """
+            INSERT INTO auth_email_outbox
+                (purpose, recipient_domain, payload_ciphertext, payload_nonce, expires_at)
+            VALUES ($1, $2, $3, $4, $5)
+            RETURNING id
+            """,
+            purpose, recipient_domain(to_email), ciphertext, nonce, expires_at,
+        )
+    _stats["queued"] += 1
+    _wake.set()  # the local sender picks it up right away
+    return outbox_id
+
+
+# -----------------------------------------------------------------------------
+# Sinks
+# -----------------------------------------------------------------------------
+
+
+def build_message(payload: dict) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = payload["subject"]
+    msg["From"] = os.getenv("APPVIEW_FROM_EMAIL", "noreply@poltr.info")
+    msg["To"] = payload["to"]
+    msg.set_content(payload["text"])
+    if payload.get("html"):
+        msg.add_alternative(payload["html"], subtype="html")
+    return msg
+
+
+class LogSink:
+    """Development: log the link instead of sending (never the address)."""
+
+    name = "log"
+
+    async def send(self, msg: EmailMessage, payload: dict) -> None:
+        print(f"\n{'='*60}")
+        print("EMAIL LINK (dev mode - localhost or no SMTP configured):")
+        print("Email: ****")  # never log the plaintext address (even in dev)
+        print(f"Subject: {payload['subject']}")
+        print(f"Link: {payload.get('link')}")
+        print(f"{'='*60}\n")
+
+    async def idle(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class FileSink:
+    """Write each mail as an .eml file into a directory (tests, staging)."""
+
+    name = "file"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    async def send(self, msg: EmailMessage, payload: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{time.time_ns()}.eml"
+        await asyncio.to_thread(path.write_bytes, msg.as_bytes())
+
+    async def idle(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class SmtpSink:
+    """aiosmtplib client that reuses one connection across mails."""
+
+    name = "smtp"
+
+    def __init__(self):
+        self.host = os.getenv("APPVIEW_SMTP_HOST", "localhost")
+        self.port = int(os.getenv("APPVIEW_SMTP_PORT", "587"))
+        self.user = os.getenv("APPVIEW_SMTP_USER", "")
+        self.password = os.getenv("APPVIEW_SMTP_PASSWORD", "")
+        self.use_tls = os.getenv("APPVIEW_SMTP_USE_TLS", "true").lower() == "true"
+        self._client = None
+        self._last_used = 0.0
+
+    async def _connect(self):
+        import aiosmtplib
+
+        client = aiosmtplib.SMTP(
+            hostname=self.host, port=self.port, start_tls=self.use_tls,
+            username=self.user or None, password=self.password or None,
+            timeout=_SMTP_TIMEOUT_SECONDS,
+        )
+        await client.connect()
+        return client
+
+    async def send(self, msg: EmailMessage, payload: dict) -> None:
+        import aiosmtplib
+
+        for attempt in (1, 2):
+            if self._client is None or not self._client.is_connected:
+                self._client = await self._connect()
+            try:
+                await self._client.send_message(msg)
+                self._last_used = time.monotonic()
+                return
+            except aiosmtplib.SMTPServerDisconnected:
+                # Relay dropped the idle connection: reconnect once.
+                self._client = None
+                if attempt == 2:
+                    raise
+            except aiosmtplib.SMTPRecipientsRefused as err:
+                raise PermanentEmailError(str(err)) from err
+            except aiosmtplib.SMTPResponseException as err:
+                if err.code >= 500:
+                    raise PermanentEmailError(f"{err.code} {err.message}") from err
+                raise
+
+    async def idle(self) -> None:
+        if self._client is not None and time.monotonic() - self._last_used > _smtp_idle_seconds():
+            await self.close()
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and client.is_connected:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+
+def make_sink():
+    spec = os.getenv("APPVIEW_EMAIL_SINK", "")
+    if spec.startswith("file:"):
+        return FileSink(spec[len("file:"):])
+    if spec == "log":
+        return LogSink()
+    if spec == "smtp":
+        return SmtpSink()
+    # Default: same rule as the old synchronous sender's dev mode.
+    host = os.getenv("APPVIEW_SMTP_HOST", "localhost")
+    configured = host != "localhost" and os.getenv("APPVIEW_SMTP_USER") and os.getenv("APPVIEW_SMTP_PASSWORD")
+    return SmtpSink() if configured else LogSink()
+
+
+# -----------------------------------------------------------------------------
+# Per-domain rate limit
+# -----------------------------------------------------------------------------
+
+
+class DomainLimiter:
+    """Sliding one-minute window of sends per recipient domain."""
+
+    def __init__(self):
+        self._sent: dict[str, deque] = {}
+
+    def reserve(self, domain: str) -> float:
+        """0 and counts the send if allowed, else seconds until a slot frees."""
+        now = time.monotonic()
+        window = self._sent.setdefault(domain, deque())
+        while window and window[0] <= now - 60:
+            window.popleft()
+        if len(window) >= _domain_rate():
+            return window[0] + 60 - now
+        window.append(now)
+        return 0.0
+
+    def prune(self) -> None:
+        cutoff = time.monotonic() - 60
+        for domain in [d for d, w in self._sent.items() if not w or w[-1] <= cutoff]:
+            del self._sent[domain]
+
+
+_limiter = DomainLimiter()
+
+
+# -----------------------------------------------------------------------------
+# Sender
+# -----------------------------------------------------------------------------
+
+
+async def _update(sql: str, *args) -> None:
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(sql, *args)
+
+
+async def _mark_sent(outbox_id: int) -> None:
+    await _update(
+        """
+        UPDATE auth_email_outbox
+        SET status = 'sent', sent_at = now(), attempts = attempts + 1,
+            payload_ciphertext = NULL, payload_nonce = NULL, locked_until = NULL
+        WHERE id = $1
+        """,
+        outbox_id,
+    )
+    _stats["sent"] += 1
+
+
+async def _mark_dead(outbox_id: int, error: str) -> None:
+    await _update(
+        """
+        UPDATE auth_email_outbox
+        SET status = 'dead', attempts = attempts + 1, last_error = $2,
+            payload_ciphertext = NULL, payload_nonce = NULL, locked_until = NULL
+        WHERE id = $1
+        """,
+        outbox_id, error[:1000],
+    )
+    _stats["dead"] += 1
+    logger.error(f"email {outbox_id} dead-lettered: {error}")
+
+
+async def _reschedule(outbox_id: int, delay: float, error: str | None = None) -> None:
+    """Due again after `delay`; counts as an attempt only with an error."""
+    await _update(
+        """
+        UPDATE auth_email_outbox
+        SET next_attempt_at = now() + make_interval(secs => $2),
+            attempts = attempts + CASE WHEN $3::text IS NULL THEN 0 ELSE 1 END,
+            last_error = COALESCE($3, last_error), locked_until = NULL
+        WHERE id = $1
+        """,
+        outbox_id, delay, error,
+    )
+
+
+async def _claim(limit: int) -> list:
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        return await conn.fetch(
+            """
+            UPDATE auth_email_outbox o
+            SET locked_until = now() + make_interval(secs => $2)
+            WHERE o.id IN (
+                SELECT id FROM auth_email_outbox
+                WHERE status = 'pending' AND next_attempt_at <= now()
+                  AND (locked_until IS NULL OR locked_until < now())
+                ORDER BY next_attempt_at
+                LIMIT $1 FOR UPDATE SKIP LOCKED
+            )
+            RETURNING o.id, o.recipient_domain, o.payload_ciphertext,
+                      o.payload_nonce, o.attempts, o.expires_at, o.locked_until
+            """,
+            limit, _LEASE_SECONDS,
+        )
+
+
+async def _renew_lease(outbox_id: int, held_until: datetime) -> bool:
+    """Extend our lease on a claimed row before sending it. False if the lease
+    already ran out (or another replica re-claimed the row meanwhile)."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        renewed = await conn.fetchval(
+            """
+            UPDATE auth_email_outbox
+            SET locked_until = now() + make_interval(secs => $3)
+            WHERE id = $1 AND status = 'pending'
+              AND locked_until = $2 AND locked_until > now()
+            RETURNING locked_until
+            """,
+            outbox_id, held_until, _LEASE_SECONDS,
+        )
+    return renewed is not None
+
+
+async def _deliver(row, sink) -> None:
+    outbox_id = row["id"]
+    if not await _renew_lease(outbox_id, row["locked_until"]):
+        _stats["lease_lost"] += 1
+        logger.warning(f"email {outbox_id}: lease expired before its turn in the batch, skipped")
+        return
+    if row["expires_at"] <= datetime.utcnow():
+        await _mark_dead(outbox_id, "expired before delivery")
+        return
+    wait = _limiter.reserve(row["recipient_domain"])
+    if wait:
+        _stats["deferred"] += 1
+        await _reschedule(outbox_id, wait)
+        return
+    try:
+        payload = json.loads(decrypt_outbox_payload(row["payload_ciphertext"], row["payload_nonce"]))
+        await sink.send(build_message(payload), payload)
+    except asyncio.CancelledError:
+        raise
+    except PermanentEmailError as err:
+        await _mark_dead(outbox_id, f"rejected: {err}")
+    except Exception as err:
+        attempts = row["attempts"] + 1
+        error = str(err) or repr(err)
+        if attempts >= _max_attempts():
+            await _mark_dead(outbox_id, f"gave up after {attempts} attempts: {error}")
+        else:
+            _stats["retried"] += 1
+            logger.warning(f"email {outbox_id} attempt {attempts} failed, retrying: {error}")
+            await _reschedule(outbox_id, backoff_seconds(attempts), error)
+    else:
+        await _mark_sent(outbox_id)
+
+
+async def run_once(sink) -> int:
+    """Deliver one batch of due mails. Returns the number claimed."""
+    rows = await _claim(_BATCH_SIZE)
+    for row in rows:
+        await _deliver(row, sink)
+    return len(rows)
+
+
+async def send_forever() -> None:
+    """Lifespan task: deliver due mails; wake on local enqueue or poll."""
+    sink = make_sink()
+    logger.info(f"Email outbox: sender started ({sink.name} sink)")
+    try:
+        while True:
+            try:
+                claimed = await run_once(sink)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logger.warning(f"Email outbox: send round failed: {err}")
+                claimed = 0
+            if claimed:
+                continue  # more may be due right now
+            await sink.idle()
+            _limiter.prune()
+            try:
+                await asyncio.wait_for(_wake.wait(), _poll_seconds())
+            except asyncio.TimeoutError:
+                pass
+            _wake.clear()
+    finally:
+        await sink.close()
+
+
+def stats() -> dict:
+    return dict(_stats)
+
+
+async def backlog() -> dict:
+    """Row counts per status (GET /healthz/email)."""
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT status, count(*) AS n FROM auth_email_outbox GROUP BY status"
+        )
+    return {r["status"]: r["n"] for r in rows}
@@ -1,8 +1,8 @@
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Literal, Optional
+from datetime import datetime, timedelta
+from typing import Literal
+
+from src.core import email_outbox
 
 # Email translations keyed by locale. The email carries ONLY the magic link now
 # (no short code). The two purposes are STRONGLY contrasted — "new account" vs
@@ -52,47 +52,31 @@ _EMAIL_STRINGS: dict[str, dict] = {
 
 class EmailService:
     def __init__(self):
-        self.smtp_host = os.getenv("APPVIEW_SMTP_HOST", "localhost")
-        self.smtp_port = int(os.getenv("APPVIEW_SMTP_PORT", "587"))
-        self.smtp_user = os.getenv("APPVIEW_SMTP_USER", "")
-        self.smtp_password = os.getenv("APPVIEW_SMTP_PASSWORD", "")
-        self.from_email = os.getenv("APPVIEW_FROM_EMAIL", "noreply@poltr.info")
         self.frontend_url = os.getenv("APPVIEW_FRONTEND_URL", "http://localhost:5173")
-        self.use_tls = os.getenv("APPVIEW_SMTP_USE_TLS", "true").lower() == "true"
 
-    def send_confirmation_link(
+    def render_confirmation_link(
         self,
-        to_email: str,
         token: str,
         purpose: Literal["registration", "login"] = "registration",
-        short_code: str | None = None,  # DEPRECATED: ignored — the email is link-only now
         locale: str = "de",
-    ) -> bool:
-        """Send a magic-link email for registration or login.
-
-        The email contains ONLY the link. The 6-char short code is never emailed;
-        it is shown in-browser and only when the link opens in a different browser.
-        """
-        try:
-            strings = _EMAIL_STRINGS.get(locale, _EMAIL_STRINGS["de"])
-            purpose_strings = strings[purpose]
-            subject = purpose_strings["subject"]
-            heading = purpose_strings["heading"]
-            intro = purpose_strings["intro"]
-            action_text = purpose_strings["action_text"]
-            expiry_text = purpose_strings["expiry_text"]
-
-            # Unified verify page for both purposes (the email text already tells
-            # the user which one it is). Referrer-Policy: no-referrer is set on
-            # that page so the token does not leak via Referer.
-            link = f"{self.frontend_url}/auth/verify?token={token}"
-
-            expires_sentence = strings["expires"].format(expiry=expiry_text)
-
-            # Plain, single-column layout. Inline styles + a table-wrapped button
-            # for broad email-client compatibility (incl. Outlook). Brand orange
-            # #F29400, muted secondary text; no images, no tracking.
-            html_body = f"""\
+    ) -> dict:
+        """Subject, text, html and link of a magic-link email."""
+        strings = _EMAIL_STRINGS.get(locale, _EMAIL_STRINGS["de"])
+        purpose_strings = strings[purpose]
+        subject = purpose_strings["subject"]
+        heading = purpose_strings["heading"]
+        intro = purpose_strings["intro"]
+        action_text = purpose_strings["action_text"]
+        expiry_text = purpose_strings["expiry_text"]
+
+        # Unified verify page for both purposes (the email text already tells
+        # the user which one it is). Referrer-Policy: no-referrer is set on
+        # that page so the token does not leak via Referer.
+        link = f"{self.frontend_url}/auth/verify?token={token}"
+
+        expires_sentence = strings["expires"].format(expiry=expiry_text)
+
+        html_body = f"""\
 <!DOCTYPE html>
 <html lang="{locale}">
   <head>
@@ -131,50 +115,49 @@ class EmailService:
 </html>
 """
 
-            text_body = f"""
-            {heading}
+        text_body = f"""
+        {heading}
 
-            {intro}
-            {link}
+        {intro}
+        {link}
 
-            {expires_sentence}
-            {strings["ignore"]}
-            """
-
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.from_email
-            msg["To"] = to_email
+        {expires_sentence}
+        {strings["ignore"]}
+        """
 
-            part1 = MIMEText(text_body, "plain")
-            part2 = MIMEText(html_body, "html")
+        return {"subject": subject, "text": text_body, "html": html_body, "link": link}
 
-            msg.attach(part1)
-            msg.attach(part2)
+    async def queue_confirmation_link(
+        self,
+        to_email: str,
+        token: str,
+        purpose: Literal["registration", "login"] = "registration",
+        short_code: str | None = None,  # DEPRECATED: ignored — the email is link-only now
+        locale: str = "de",
+        *,
+        expires_at: datetime | None = None,
+    ) -> bool:
+        """Queue a magic-link email for registration or login.
 
-            # Send email
-            is_dev_mode = self.smtp_host == "localhost" or not (
-                self.smtp_user and self.smtp_password
+        The email contains ONLY the link. The 6-char short code is never emailed;
+        it is shown in-browser and only when the link opens in a different browser.
+        Delivery happens in the background (src/core/email_outbox.py); a mail
+        still undelivered at `expires_at` (the link's expiry) is dropped.
+        """
+        try:
+            rendered = self.render_confirmation_link(token, purpose, locale)
+            await email_outbox.enqueue(
+                to_email,
+                purpose,
+                rendered["subject"],
+                rendered["text"],
+                rendered["html"],
+                expires_at=expires_at or datetime.utcnow() + timedelta(minutes=10),
+                link=rendered["link"],
             )
-
-            if not is_dev_mode:
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    if self.use_tls:
-                        server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                # For development: just log the link
-                print(f"\n{'='*60}")
-                print(f"EMAIL LINK (dev mode - localhost or no SMTP configured):")
-                print(f"Email: ****")  # never log the plaintext address (even in dev)
-                print(f"Purpose: {purpose}")
-                print(f"Link: {link}")
-                print(f"{'='*60}\n")
-
             return True
         except Exception as e:
-            print(f"Failed to send email: {e}")
+            print(f"Failed to queue email: {e}")
             return False
 
 
@@ -0,0 +1,113 @@
+"""
+Opt-in fast JSON path for list endpoints (APPVIEW_FAST_JSON=true).
+
+The default path builds nested dicts per row (translation pick, record
+reconstruction, author block) and lets Starlette's JSONResponse run
+json.dumps over the whole page. With the fast path on, argument.list and
+comment.list instead:
+
+  - render the STATIC part of each item (record, author, langs — everything
+    that only changes with the record, its translations or the author
+    profile) once per (uri, lang) into a JSON fragment kept in a
+    `FragmentCache`. The fragment is validated against a stamp of the row
+    columns it was built from (cid, indexed_at, translation state, profile
+    fields), so a write or a new translation re-renders it on the next read;
+  - append the DYNAMIC fields (like/comment counts, review status) with
+    orjson, splice the viewer block into the few rated items, and
+    concatenate the items into the response body as bytes;
+  - return a plain `RawJSONResponse` — no encoder pass over the page.
+
+    fragment = _fragments.render((uri, lang), stamp, lambda: static_dict)
+    item = fast_json.close(fragment, {"likeCount": 3})
+    body = fast_json.page("arguments", [item, ...], cursor=None)
+
+The output is the same JSON as the default path (key order aside).
+APPVIEW_FRAGMENT_CACHE_ENTRIES (default 20000, read at startup) bounds each
+fragment cache.
+Fragment counters: GET /healthz/payloadcache. Benchmark:
+`python -m tests.fast_json_bench`.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import orjson
+from fastapi.responses import Response
+
+
+_caches: dict[str, "FragmentCache"] = {}
+
+
+def enabled() -> bool:
+    return os.getenv("APPVIEW_FAST_JSON", "false").lower() == "true"
+
+
+def _max_entries() -> int:
+    return int(os.getenv("APPVIEW_FRAGMENT_CACHE_ENTRIES", "20000"))
+
+
+class RawJSONResponse(Response):
+    """Response around an already encoded JSON body."""
+
+    media_type = "application/json"
+
+
+class FragmentCache:
+    """Open JSON objects (`{"a":1,"b":2` — no closing brace) per key, valid
+    while the row stamp they were rendered from is unchanged."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._entries: OrderedDict[Hashable, tuple[Hashable, bytes]] = OrderedDict()
+        self.max_entries = _max_entries()
+        self.counters = {"hits": 0, "renders": 0}
+        _caches[name] = self
+
+    def render(self, key: Hashable, stamp: Hashable, build: Callable[[], dict]) -> bytes:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry[1]
+        fragment = orjson.dumps(build())[:-1]
+        self.counters["renders"] += 1
+        self._entries[key] = (stamp, fragment)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self.counters, "entries": len(self._entries)}
+
+
+def stats() -> dict:
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def close(fragment: bytes, dynamic: dict) -> bytes:
+    """Complete an open fragment with the dynamic fields (None values are
+    dropped, like in the dict serializers)."""
+    fields = {k: v for k, v in dynamic.items() if v is not None}
+    if not fields:
+        return fragment + b"}"
+    tail = orjson.dumps(fields)[1:]  # '"k":v,...}'
+    return fragment + (tail if fragment == b"{" else b"," + tail)
+
+
+def with_viewer(item: bytes, viewer: dict) -> bytes:
+    """A closed item with a `viewer` block appended (per-viewer overlay)."""
+    return item[:-1] + b',"viewer":' + orjson.dumps(viewer) + b"}"
+
+
+def page(list_key: str, items: list[bytes], **extra) -> bytes:
+    """`{"<list_key>": [items...], <extra fields>}` with None extras dropped."""
+    body = b'{"' + list_key.encode() + b'":[' + b",".join(items) + b"]"
+    for key, value in extra.items():
+        if value is not None:
+            body += b"," + orjson.dumps(key) + b":" + orjson.dumps(value)
+    return body + b"}"
@@ -1,9 +1,10 @@
+import asyncio
 import os
 import hmac
 import logging
 from pathlib import Path
-from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager, suppress
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
@@ -12,6 +13,13 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import src.core.db as db
 from src.atproto.errors import PDSError
+from src.auth import account_pool
+from src.auth import purge as auth_purge
+from src.auth import session_cache
+from src.core import (
+    ballot_catalog, ballot_stats, email_outbox, fast_json, http_clients, invalidation_bus,
+    payload_cache, single_flight,
+)
 # Background community loops moved to the dedicated community-writer SERVICE
 # (services/community-writer, eigenes Image): cross-posting (Phase 1) and
 # translation (Phase 5). The appview API runs NO background community loops anymore.
@@ -50,6 +58,18 @@ def _client_ip_key(request: Request) -> str:
 
 limiter = Limiter(key_func=_client_ip_key)
 
+# Shared secret for the /healthz/* stats endpoints (X-Stats-Secret header).
+# They expose internal counters, so they are not public like /healthz itself.
+# Unset → the stats endpoints are disabled.
+_STATS_SECRET = os.getenv("APPVIEW_STATS_SECRET", "")
+
+
+def _require_stats_secret(x_stats_secret: str | None = Header(None)) -> None:
+    if not _STATS_SECRET:
+        raise HTTPException(status_code=404, detail="not_found")
+    if not hmac.compare_digest(x_stats_secret or "", _STATS_SECRET):
+        raise HTTPException(status_code=403, detail="forbidden")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -58,9 +78,32 @@ async def lifespan(app: FastAPI):
     success = await db.check_db_connection()
     if not success:
         logger.warning("Database connection failed, but continuing...")
+    # Shared outbound HTTP clients (keep-alive pools per target).
+    http_clients.startup()
+    # Session cache: batched last_accessed_at writes.
+    tasks = [asyncio.create_task(session_cache.flush_forever())]
+    # Cross-replica cache invalidation (sessions, PDS tokens, catalog, …).
+    # Started even if the DB is down at boot: it reconnects with backoff.
+    tasks.append(asyncio.create_task(invalidation_bus.listen_forever()))
+    # Expired sessions / pending logins + in-memory dicts (one replica per round).
+    tasks.append(asyncio.create_task(auth_purge.purge_forever()))
+    # Published ballot catalog from the CMS (one locale=all request per TTL).
+    tasks.append(asyncio.create_task(ballot_catalog.refresh_forever()))
+    # Drift repair for the trigger-maintained app_ballot_stats counters.
+    tasks.append(asyncio.create_task(ballot_stats.reconcile_forever()))
+    # Outbound mail: delivers the auth_email_outbox queue (every replica).
+    tasks.append(asyncio.create_task(email_outbox.send_forever()))
+    # Warm pool of ready PDS accounts (no-op unless APPVIEW_PDS_POOL_SIZE > 0).
+    tasks.append(asyncio.create_task(account_pool.provision_forever()))
     logger.info("API listening on :3000")
     yield
     # Shutdown
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await session_cache.flush()
+    await http_clients.shutdown()
     await db.close_pool()
     logger.info("=== Application Shutdown ===")
 
@@ -123,3 +166,67 @@ async def healthz():
         return JSONResponse(
             status_code=503, content={"status": "error", "error": str(err)}
         )
+
+
+@app.get("/healthz/http", dependencies=[Depends(_require_stats_secret)])
+async def healthz_http():
+    """Outbound HTTP client pools: requests, errors, in-flight, open/idle connections."""
+    return JSONResponse(status_code=200, content=http_clients.stats())
+
+
+@app.get("/healthz/singleflight", dependencies=[Depends(_require_stats_secret)])
+async def healthz_singleflight():
+    """Request coalescing per read endpoint: calls vs. queries actually run."""
+    return JSONResponse(status_code=200, content=single_flight.stats())
+
+
+@app.get("/healthz/payloadcache", dependencies=[Depends(_require_stats_secret)])
+async def healthz_payloadcache():
+    """Public list payloads: hits, misses, stale versions, evictions per endpoint;
+    fast-path JSON fragments (APPVIEW_FAST_JSON) under "fragments"."""
+    content = {**payload_cache.stats(), "fragments": fast_json.stats()}
+    return JSONResponse(status_code=200, content=content)
+
+
+@app.get("/healthz/invalidation", dependencies=[Depends(_require_stats_secret)])
+async def healthz_invalidation():
+    """Invalidation bus: events received/published, full flushes, sequence gaps."""
+    return JSONResponse(status_code=200, content=invalidation_bus.stats())
+
+
+@app.get("/healthz/ballotstats", dependencies=[Depends(_require_stats_secret)])
+async def healthz_ballotstats():
+    """Ballot counters: reconcile rounds and rows corrected (drift)."""
+    return JSONResponse(status_code=200, content=ballot_stats.stats())
+
+
+@app.get("/healthz/pdstokens", dependencies=[Depends(_require_stats_secret)])
+async def healthz_pdstokens():
+    """PDS token broker: memory hits, stored pairs reused, refreshes, logins."""
+    from src.atproto.atproto_api import pds_tokens
+
+    return JSONResponse(status_code=200, content=pds_tokens.stats())
+
+
+@app.get("/healthz/pdspool", dependencies=[Depends(_require_stats_secret)])
+async def healthz_pdspool():
+    """Warm PDS account pool: target and current depth, claims, refills."""
+    content = {**account_pool.stats(), "depth": None}
+    try:
+        content["depth"] = await account_pool.depth()
+    except Exception:
+        logger.exception("healthz/pdspool: depth query failed")
+        content["status"] = "error"
+    return JSONResponse(status_code=200, content=content)
+
+
+@app.get("/healthz/email", dependencies=[Depends(_require_stats_secret)])
+async def healthz_email():
+    """Email outbox: sender counters and queued rows per status."""
+    content = {"sender": email_outbox.stats(), "outbox": None}
+    try:
+        content["outbox"] = await email_outbox.backlog()
+    except Exception:
+        logger.exception("healthz/email: backlog query failed")
+        content["status"] = "error"
+    return JSONResponse(status_code=200, content=content)
@@ -0,0 +1,178 @@
+"""Shared, lifespan-managed httpx clients for all outbound calls.
+
+Call sites used to open a fresh `httpx.AsyncClient` per request, paying a TCP
+(+TLS) handshake to the CMS/calculator/PDS on every ballot page and precheck.
+Instead there is one long-lived client per target, with its own connection
+limits and keep-alive:
+
+  cms         Payload CMS (CMS_INTERNAL_SERVER_URL)
+  calculator  calculator service (precheck, review duplicates)
+  pds         our PDS (internal + public hostname) and Ozone
+  bsky        public Bluesky network: AppView, relay, plc.directory
+
+Usage keeps the call-site timeout (per request, the shared client is not
+closed on exit):
+
+    async with http_clients.use("cms", timeout=30.0) as client:
+        resp = await client.get(url)
+
+Limits per target via env: APPVIEW_HTTP_<NAME>_MAX_CONNECTIONS,
+APPVIEW_HTTP_<NAME>_KEEPALIVE, APPVIEW_HTTP_<NAME>_HTTP2 (true/false).
+`stats()` reports requests, errors, in-flight requests, latency and open/idle
+pool connections per client (GET /healthz/http).
+"""
+
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger("http_clients")
+
+
+@dataclass(frozen=True)
+class ClientSpec:
+    timeout: float
+    max_connections: int
+    max_keepalive: int
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+
+_DEFAULTS: dict[str, ClientSpec] = {
+    "cms": ClientSpec(timeout=30.0, max_connections=20, max_keepalive=10),
+    "calculator": ClientSpec(timeout=45.0, max_connections=20, max_keepalive=10),
+    "pds": ClientSpec(timeout=30.0, max_connections=50, max_keepalive=20, http2=True),
+    "bsky": ClientSpec(timeout=30.0, max_connections=30, max_keepalive=10, http2=True),
+}
+
+
+def _spec(name: str) -> ClientSpec:
+    base = _DEFAULTS[name]
+    prefix = f"APPVIEW_HTTP_{name.upper()}_"
+    http2 = os.getenv(prefix + "HTTP2")
+    return ClientSpec(
+        timeout=base.timeout,
+        max_connections=int(os.getenv(prefix + "MAX_CONNECTIONS", base.max_connections)),
+        max_keepalive=int(os.getenv(prefix + "KEEPALIVE", base.max_keepalive)),
+        keepalive_expiry=base.keepalive_expiry,
+        http2=base.http2 if http2 is None else http2.lower() == "true",
+    )
+
+
+class _MeteredTransport(httpx.AsyncHTTPTransport):
+    """Connection-pooling transport that counts requests per client."""
+
+    def __init__(self, name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.inflight = 0
+        self.seconds = 0.0
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        self.inflight += 1
+        t0 = time.perf_counter()
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.inflight -= 1
+            self.seconds += time.perf_counter() - t0
+
+    def pool_stats(self) -> dict:
+        conns = getattr(self._pool, "connections", [])
+        return {
+            "open": len(conns),
+            "idle": sum(1 for c in conns if c.is_idle()),
+        }
+
+
+class _Bound:
+    """Shared client with a default per-request timeout for one call site."""
+
+    __slots__ = ("_client", "_timeout")
+
+    def __init__(self, client: httpx.AsyncClient, timeout: float | None):
+        self._client = client
+        self._timeout = timeout
+
+    def _kw(self, kwargs: dict) -> dict:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return kwargs
+
+    async def get(self, url, **kwargs) -> httpx.Response:
+        return await self._client.get(url, **self._kw(kwargs))
+
+    async def post(self, url, **kwargs) -> httpx.Response:
+        return await self._client.post(url, **self._kw(kwargs))
+
+    async def request(self, method: str, url, **kwargs) -> httpx.Response:
+        return await self._client.request(method, url, **self._kw(kwargs))
+
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_transports: dict[str, _MeteredTransport] = {}
+
+
+def get(name: str) -> httpx.AsyncClient:
+    """The shared client for a target (created on first use)."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        spec = _spec(name)
+        transport = _MeteredTransport(
+            name,
+            http2=spec.http2,
+            limits=httpx.Limits(
+                max_connections=spec.max_connections,
+                max_keepalive_connections=spec.max_keepalive,
+                keepalive_expiry=spec.keepalive_expiry,
+            ),
+        )
+        client = httpx.AsyncClient(transport=transport, timeout=spec.timeout)
+        _clients[name] = client
+        _transports[name] = transport
+    return client
+
+
+@asynccontextmanager
+async def use(name: str, *, timeout: float | None = None):
+    """Borrow the shared client for a block (drop-in for `async with
+    httpx.AsyncClient(timeout=...) as client`). Does not close it."""
+    yield _Bound(get(name), timeout)
+
+
+def startup() -> None:
+    for name in _DEFAULTS:
+        get(name)
+
+
+async def shutdown() -> None:
+    for name, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as err:
+            logger.warning(f"closing http client {name} failed: {err}")
+    _clients.clear()
+    _transports.clear()
+
+
+def stats() -> dict:
+    out = {}
+    for name, t in _transports.items():
+        out[name] = {
+            "requests": t.requests,
+            "errors": t.errors,
+            "inflight": t.inflight,
+            "avg_ms": round(1000 * t.seconds / t.requests, 1) if t.requests else None,
+            "pool": t.pool_stats(),
+        }
+    return out
@@ -0,0 +1,212 @@
+"""
+Cross-replica invalidation bus for in-process caches (Postgres LISTEN/NOTIFY).
+
+The appview keeps state in process memory — validated sessions, PDS access
+tokens, the ballot catalog, the peer-review request day. With more than one
+replica a write on one replica has to reach the others, or they keep serving
+what they cached. Every replica therefore LISTENs on ONE channel and evicts on
+compact, typed events:
+
+    {"s": 42, "t": "ballot", "k": null}
+
+  s  global sequence number (app_invalidation_seq)
+  t  event type (BALLOT, SESSION, PDS_TOKEN, PEERREVIEW_DAY)
+  k  key within the type (token hash, DID, ballot rkey) or null for "all"
+
+Publishers call `publish(type, key)` (appview code) or the SQL function
+app_publish_invalidation() directly (triggers, other services); see migration
+016_create_invalidation_bus.sql. Both number and send the event in one
+statement, so NOTIFY is delivered on commit like any other write.
+
+Subscribers register handlers at import time:
+
+    invalidation_bus.subscribe(invalidation_bus.SESSION, lambda key: ...)
+    invalidation_bus.on_flush(lambda: ...)   # drop everything
+
+Missed events: sequence numbers are allocated in publish order but delivered in
+commit order, and a rolled-back publisher leaves a hole for good. A gap is
+therefore given APPVIEW_INVALIDATION_GAP_GRACE seconds (default 2) to fill;
+if it does not, the listener assumes it lost an event and calls every flush
+handler. The same full flush runs after every (re)connect of the LISTEN
+connection, since nothing is delivered while it is down.
+
+Handlers must be cheap and must not raise; they run in the asyncpg callback.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Callable
+
+import src.core.db as db
+
+logger = logging.getLogger("invalidation_bus")
+
+CHANNEL = "appview_invalidate"
+
+# Event types
+BALLOT = "ballot"                  # CMS ballot catalog changed (key: rkey or None)
+SESSION = "session"                # auth session revoked (key: token hash)
+PDS_TOKEN = "pds_token"            # cached PDS access token is void (key: DID)
+PEERREVIEW_DAY = "peerreview_day"  # peer-review request written today (key: DID)
+
+_RECONNECT_DELAY = 5.0
+_CHECK_INTERVAL = 1.0
+_MAX_GAP = 1000  # larger jumps are not worth waiting for
+
+_handlers: dict[str, list[Callable[[str | None], None]]] = {}
+_flush_handlers: list[Callable[[], None]] = []
+_stats = {"received": 0, "published": 0, "flushes": 0, "gaps": 0, "errors": 0}
+
+
+def _gap_grace() -> float:
+    return float(os.getenv("APPVIEW_INVALIDATION_GAP_GRACE", "2"))
+
+
+def subscribe(kind: str, handler: Callable[[str | None], None]) -> None:
+    """Call `handler(key)` for every event of `kind` (from any replica,
+    including this one)."""
+    _handlers.setdefault(kind, []).append(handler)
+
+
+def on_flush(handler: Callable[[], None]) -> None:
+    """Call `handler()` when events may have been missed (reconnect, gap)."""
+    _flush_handlers.append(handler)
+
+
+async def publish(kind: str, key: str | None = None) -> int | None:
+    """Send an event to all replicas. Returns its sequence number, or None if
+    it could not be sent (logged; callers still evict their own cache)."""
+    try:
+        pool = await db.get_pool()
+        async with pool.acquire() as conn:
+            seq = await conn.fetchval("SELECT app_publish_invalidation($1, $2)", kind, key)
+    except Exception as err:
+        _stats["errors"] += 1
+        logger.warning(f"invalidation publish failed ({kind} {key}): {err}")
+        return None
+    _stats["published"] += 1
+    return seq
+
+
+# -----------------------------------------------------------------------------
+# Receiving side
+# -----------------------------------------------------------------------------
+
+
+def flush_all(reason: str) -> None:
+    """Run every flush handler (missed events)."""
+    _stats["flushes"] += 1
+    logger.info(f"invalidation bus: full flush ({reason})")
+    for handler in _flush_handlers:
+        try:
+            handler()
+        except Exception as err:
+            logger.warning(f"invalidation flush handler failed: {err}")
+
+
+def dispatch(kind: str, key: str | None) -> None:
+    for handler in _handlers.get(kind, ()):
+        try:
+            handler(key)
+        except Exception as err:
+            logger.warning(f"invalidation handler for {kind} failed: {err}")
+
+
+class Sequencer:
+    """Tracks the sequence numbers seen on one LISTEN connection."""
+
+    def __init__(self):
+        self.next: int | None = None        # next expected sequence number
+        self.missing: dict[int, float] = {}  # seq -> deadline (time.monotonic())
+
+    def observe(self, seq: int) -> bool:
+        """Record `seq`. True if a full flush is needed right away."""
+        if self.next is None or seq == self.next:
+            self.next = seq + 1
+            return False
+        if seq < self.next:
+            self.missing.pop(seq, None)  # late, out of commit order
+            return False
+        if seq - self.next > _MAX_GAP:
+            self.next = seq + 1
+            self.missing.clear()
+            return True
+        deadline = time.monotonic() + _gap_grace()
+        for hole in range(self.next, seq):
+            self.missing.setdefault(hole, deadline)
+        self.next = seq + 1
+        return False
+
+    def expired(self) -> bool:
+        """True (and forgets the holes) if a hole outlived the grace period."""
+        now = time.monotonic()
+        if any(deadline <= now for deadline in self.missing.values()):
+            self.missing.clear()
+            return True
+        return False
+
+
+def handle_payload(seq_state: Sequencer, payload: str) -> None:
+    """Apply one NOTIFY payload."""
+    try:
+        event = json.loads(payload)
+        seq, kind, key = int(event["s"]), event["t"], event.get("k")
+    except (ValueError, KeyError, TypeError) as err:
+        _stats["errors"] += 1
+        logger.warning(f"invalidation bus: bad payload {payload!r}: {err}")
+        return
+    _stats["received"] += 1
+    dispatch(kind, key)
+    if seq_state.observe(seq):
+        _stats["gaps"] += 1
+        flush_all(f"sequence jumped to {seq}")
+
+
+def stats() -> dict:
+    return {
+        **_stats,
+        "subscriptions": {kind: len(hs) for kind, hs in _handlers.items()},
+    }
+
+
+async def listen_forever() -> None:
+    """Lifespan task: LISTEN on a dedicated pool connection, reconnecting
+    after errors; full flush after every (re)connect and on expired gaps."""
+    seq_state = Sequencer()
+
+    def _on_notify(_conn, _pid, _channel, payload):
+        handle_payload(seq_state, payload)
+
+    while True:
+        pool = conn = None
+        try:
+            pool = await db.get_pool()
+            conn = await pool.acquire()
+            await conn.add_listener(CHANNEL, _on_notify)
+            seq_state = Sequencer()
+            flush_all("connected")  # events missed while disconnected
+            logger.info(f"Invalidation bus: LISTEN {CHANNEL}")
+            while not conn.is_closed():
+                await asyncio.sleep(_CHECK_INTERVAL)
+                if seq_state.expired():
+                    _stats["gaps"] += 1
+                    flush_all("missed event")
+            logger.warning("Invalidation bus: LISTEN connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.warning(f"Invalidation bus: LISTEN failed ({err}) — retrying")
+        finally:
+            if conn is not None:
+                try:
+                    await conn.remove_listener(CHANNEL, _on_notify)
+                except Exception:
+                    pass
+                try:
+                    await pool.release(conn)
+                except Exception:
+                    pass
+        await asyncio.sleep(_RECONNECT_DELAY)
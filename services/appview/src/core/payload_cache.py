@@ -0,0 +1,93 @@
+"""
+Viewer-independent payload cache for list endpoints, versioned per ballot.
+
+Argument and comment lists are the same for every viewer except for the
+viewer's own like / preference. Handlers therefore build responses in two
+layers:
+
+  1. the public page — rows serialized WITHOUT viewer fields — cached here,
+     keyed by the endpoint parameters that shape it (ballot / argument,
+     filters, sort, page, lang) and stamped with the ballot version
+     (src/core/ballot_version.py);
+  2. a per-viewer overlay — ONE batched query for the viewer's ratings on the
+     URIs of that page (likes.fetch_viewer_ratings) merged into copies of the
+     affected items.
+
+    page = _pages.get(ballot_rkey, version, key)
+    if page is None:
+        page = await _flight.do((key, version), build)   # one build per burst
+        _pages.put(ballot_rkey, version, key, page)
+
+Every content write bumps the ballot version (row triggers, migration 015),
+and every request looks the version up anyway for its ETag, so an entry with
+an older version is simply a miss — no cross-replica invalidation is needed.
+Storing a newer version for a key replaces the old entry; LRU eviction keeps
+at most APPVIEW_PAYLOAD_CACHE_ENTRIES (default 2000, 0 = off; read at startup)
+per cache.
+
+Cached payloads are shared between requests: treat them as read-only.
+Counters: GET /healthz/payloadcache.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_caches: dict[str, "PayloadCache"] = {}
+
+
+def _max_entries() -> int:
+    return int(os.getenv("APPVIEW_PAYLOAD_CACHE_ENTRIES", "2000"))
+
+
+class PayloadCache:
+    def __init__(self, name: str):
+        self.name = name
+        self._entries: OrderedDict[tuple, tuple[int, Any]] = OrderedDict()
+        self.max_entries = _max_entries()
+        self.counters = {"hits": 0, "misses": 0, "stale": 0, "evicted": 0}
+        _caches[name] = self
+
+    def get(self, scope: str, version: int | None, key: Hashable) -> Any | None:
+        """Cached payload for (scope, key) at exactly `version`, else None."""
+        if version is None:
+            return None
+        entry = self._entries.get((scope, key))
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        if entry[0] != version:
+            self.counters["stale"] += 1
+            del self._entries[(scope, key)]
+            return None
+        self._entries.move_to_end((scope, key))
+        self.counters["hits"] += 1
+        return entry[1]
+
+    def put(self, scope: str, version: int | None, key: Hashable, payload: Any) -> None:
+        limit = self.max_entries
+        if version is None or limit <= 0:
+            return
+        current = self._entries.get((scope, key))
+        if current is not None and current[0] > version:
+            return  # a concurrent build already stored a newer version
+        self._entries[(scope, key)] = (version, payload)
+        self._entries.move_to_end((scope, key))
+        while len(self._entries) > limit:
+            self._entries.popitem(last=False)
+            self.counters["evicted"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self.counters, "entries": len(self._entries)}
+
+
+def clear_all() -> None:
+    for cache in _caches.values():
+        cache.clear()
+
+
+def stats() -> dict:
+    return {name: cache.stats() for name, cache in _caches.items()}
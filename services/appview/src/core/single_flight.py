@@ -0,0 +1,78 @@
+"""
+Single-flight request coalescing for expensive, viewer-independent reads.
+
+When a ballot link is shared, hundreds of identical argument.list / taxonomy.get
+requests arrive within a second, each running the same heavy SQL. A
+`SingleFlight` group lets concurrent callers with the same key share ONE
+in-flight computation:
+
+    _rows = SingleFlight("argument.list", timeout=10.0)
+
+    rows = await _rows.do(("b1", "PRO", None), lambda: _fetch_rows(...))
+
+  - The first caller for a key starts the computation; callers arriving while
+    it runs await the same result (or the same exception).
+  - Nothing is cached: once the computation finishes the key is released and
+    the next caller starts a fresh one. (Cache layers sit on top of this.)
+  - `timeout` bounds the shared computation per key; on expiry every waiter
+    gets asyncio.TimeoutError and the key is released.
+  - A waiter that is cancelled (client disconnect) does not cancel the shared
+    computation for the others.
+
+Keys must only contain viewer-independent parameters — per-viewer data (likes,
+preferences) is fetched separately and overlaid by the caller.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+logger = logging.getLogger("single_flight")
+
+T = TypeVar("T")
+
+_groups: dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    def __init__(self, name: str, *, timeout: float | None = None):
+        self.name = name
+        self.timeout = timeout
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0       # do() invocations
+        self.flights = 0     # computations actually started
+        _groups[name] = self
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        # Only drop our own flight — a newer one may already own the key.
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved: waiters re-raise it, no "never retrieved" warning
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]],
+                 *, timeout: float | None = None) -> T:
+        """Run `fn()` once for all concurrent callers of `key`."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            limit = timeout if timeout is not None else self.timeout
+            coro = fn() if limit is None else asyncio.wait_for(fn(), limit)
+            task = asyncio.create_task(coro)
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._release(k, t))
+            self.flights += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "flights": self.flights,
+            "coalesced": self.calls - self.flights,
+            "inflight": len(self._inflight),
+        }
+
+
+def stats() -> dict:
+    """Per-group counters (GET /healthz/singleflight)."""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -9,6 +9,7 @@ import httpx
 from fastapi import APIRouter, Request
 from fastapi.responses import Response
 
+from src.core import http_clients
 from src.core.fastapi import logger
 from src.config import (
     BLUESKY_APPVIEW_URL,
@@ -64,7 +65,7 @@ async def get_profile(request: Request):
 
     logger.debug(f"Fetching profile for {actor}")
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.use("bsky") as client:
         try:
             profile_response = await client.get(
                 upstream_url, headers=headers, timeout=30.0
@@ -167,7 +168,7 @@ async def get_preferences(request: Request):
 
     headers = _forward_headers(request)
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.use("bsky") as client:
         try:
             upstream_response = await client.get(
                 url=upstream_url, headers=headers, timeout=30.0
@@ -208,7 +209,7 @@ async def get_profiles(request: Request):
 
     headers = _forward_headers(request)
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.use("bsky") as client:
         try:
             response = await client.get(upstream_url, headers=headers, timeout=30.0)
         except httpx.RequestError as e:
@@ -243,7 +244,7 @@ async def search_actors(request: Request):
 
     headers = _forward_headers(request)
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.use("bsky") as client:
         try:
             response = await client.get(upstream_url, headers=headers, timeout=30.0)
         except httpx.RequestError as e:
@@ -12,6 +12,7 @@ import httpx
 from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse, Response
 
+from src.core import http_clients
 from src.core.db import get_pool
 from src.core.fastapi import logger
 from src.config import (
@@ -152,7 +153,7 @@ async def _proxy_to_bluesky(request: Request, method: str) -> Response:
 
     headers = _forward_headers(request)
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.use("bsky") as client:
         try:
             response = await client.get(upstream_url, headers=headers, timeout=30.0)
         except httpx.RequestError as e:
@@ -10,6 +10,7 @@ import httpx
 from fastapi import APIRouter, Request
 from fastapi.responses import Response
 
+from src.core import http_clients
 from src.core.fastapi import logger
 from src.core.db import get_pool
 from src.config import (
@@ -147,7 +148,7 @@ async def get_record(request: Request):
 
     headers = _forward_headers(request)
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.use("pds") as client:
         # Fetch record from PDS
         pds_url = f"{PDS_URL}/xrpc/com.atproto.repo.getRecord?repo={did}&collection={collection}&rkey={rkey}"
         try:
@@ -14,8 +14,10 @@ from fastapi.responses import JSONResponse
 
 logger = logging.getLogger(__name__)
 
+from src.core import http_clients, invalidation_bus
 from src.auth.login import check_email_availability, login_account
 from src.auth.register import create_account
+from src.auth import session_cache
 from src.auth.middleware import TSession, verify_session_token
 import src.core.db as db
 from src.core.db import get_pool
@@ -33,7 +35,7 @@ from src.auth.magic_link_handler import (
     check_link_handler,
     wait_status_handler,
 )
-from src.atproto.atproto_api import pds_create_app_password, pds_set_birthdate
+from src.atproto.atproto_api import forget_token, pds_create_app_password, pds_set_birthdate
 from src.core.fastapi import limiter
 
 EIDPROTO_URL = os.getenv("EIDPROTO_URL", "https://eidproto.poltr.info")
@@ -223,6 +225,11 @@ async def logout(request: Request, session: TSession = Depends(verify_session_to
             "DELETE FROM auth.auth_sessions WHERE did = $1",
             session.did,
         )
+    # Other replicas drop their cached sessions via the `session` events the
+    # auth_sessions trigger publishes on the invalidation bus.
+    session_cache.invalidate(did=session.did)
+    await forget_token(session.did)
+    await invalidation_bus.publish(invalidation_bus.PDS_TOKEN, session.did)
     return JSONResponse(content={"success": True})
 
 
@@ -264,12 +271,11 @@ async def initiate_eid_verification(
     pds_url = os.getenv("PDS_HOSTNAME", "pds2.poltr.info")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Get a fresh access token before sending to eidproto
-            from src.atproto.atproto_api import _relogin_from_stored_creds
+        async with http_clients.use("pds", timeout=30.0) as client:
+            # Valid for at least the broker's safety margin (refreshed if not).
+            from src.atproto.atproto_api import pds_tokens
 
-            fresh = await _relogin_from_stored_creds(session.did, client, pds_url)
-            fresh_access_token = fresh["accessJwt"]
+            fresh_access_token = await pds_tokens.access_token(client, session.did)
 
             response = await client.post(
                 f"{EIDPROTO_URL}/api/verify/create-session",
@@ -7,31 +7,35 @@ shape under `/api/ballots*` so the URL path itself reflects the architecture
 split (basis-app REST vs. deliberation XRPC — see doc/RECORD_TRANSLATIONS.md
 §5b).
 
-Multilingual reads are forwarded transparently to Payload via `?locale=` on
-the CMS REST API. `availableLangs` is computed from a second CMS call using
-`?locale=all`.
+Published ballots come from the in-process catalog (src/core/ballot_catalog.py),
+loaded from the CMS with one `?locale=all` request and localized here;
+`availableLangs` is derived from the same documents. Only unpublished ballots
+are fetched from the CMS per request.
 """
 
+import asyncio
+import hmac
 import os
+import time
 from typing import Optional
 
 import httpx
 from fastapi import APIRouter, Depends, Header, Query, Request
 from fastapi.responses import JSONResponse
 
-from src.auth.middleware import TSession, verify_session_token
-from src.core.db import get_pool
+from src.core import ballot_catalog, ballot_stats, ballot_version, cache_control, http_clients, invalidation_bus
+from src.auth.middleware import TSession, optional_session_token
+from src.core.ballot_catalog import CMSError, require_cms_url
 from src.core.fastapi import logger
-from src.core.languages import (
-    DEFAULT_LANGUAGE,
-    SUPPORTED_LANGUAGES,
-    SUPPORTED_LANGUAGES_SET,
-)
+from src.core.languages import DEFAULT_LANGUAGE
+from src.core.single_flight import SingleFlight
 from src.routes.deliberation._lang import resolve_requested_lang
 
 router = APIRouter(prefix="/api", tags=["poltr-ballots"])
 
-CMS_INTERNAL_SERVER_URL = os.getenv("CMS_INTERNAL_SERVER_URL")
+# Shared secret of the CMS catalog webhook (POST /api/ballots/catalog/refresh).
+# Unset → the webhook is disabled and the catalog only refreshes on its TTL.
+CATALOG_WEBHOOK_SECRET = os.getenv("BALLOT_CATALOG_WEBHOOK_SECRET", "")
 
 
 # -----------------------------------------------------------------------------
@@ -39,22 +43,6 @@ CMS_INTERNAL_SERVER_URL = os.getenv("CMS_INTERNAL_SERVER_URL")
 # -----------------------------------------------------------------------------
 
 
-class CMSError(Exception):
-    """Distinguishes network vs. HTTP-error vs. parse-error from the CMS so
-    the route handler can return a useful (and never-empty) details string.
-
-    `category` maps to a stable error code for the JSON response:
-      - 'cms_unreachable'    network failure (DNS, refused, timeout) → 502
-      - 'cms_http_error'     CMS responded but with non-2xx status → 502
-      - 'cms_invalid_response' 2xx but body is not JSON / wrong shape → 502
-    """
-
-    def __init__(self, category: str, message: str, status_code: int | None = None):
-        self.category = category
-        self.status_code = status_code
-        super().__init__(message)
-
-
 def _cms_error_payload(err: CMSError) -> dict:
     return {
         "error": err.category,
@@ -63,68 +51,19 @@ def _cms_error_payload(err: CMSError) -> dict:
     }
 
 
-def _require_cms_url() -> str:
-    """Fail fast (and visibly) if the CMS URL env var is missing — without this
-    httpx silently builds a malformed URL and surfaces an opaque RequestError."""
-    if not CMS_INTERNAL_SERVER_URL:
-        raise CMSError(
-            "cms_unreachable",
-            "CMS_INTERNAL_SERVER_URL env var is not set on the appview pod",
-        )
-    return CMS_INTERNAL_SERVER_URL
-
-
-async def _fetch_cms_ballots(locale: str, status: str = "published") -> list[dict]:
-    """Fetch published ballots from CMS REST API in the requested locale.
+async def _fetch_cms_ballot(rkey: str) -> dict | None:
+    """Fetch a single ballot from CMS by rkey, all locales (`locale=all`).
 
-    Payload returns localized text fields directly when `locale=<code>` is set;
-    non-localized fields are returned as-is.
+    Only used for ballots that are not in the catalog (unpublished drafts);
+    published ones are served from src/core/ballot_catalog.py.
     """
-    cms_url = _require_cms_url()
+    cms_url = require_cms_url()
     url = (
         f"{cms_url}/api/ballots"
-        f"?where[status][equals]={status}&sort=-voteDate&limit=100"
-        f"&locale={locale}&fallback-locale={DEFAULT_LANGUAGE}"
+        f"?where[rkey][equals]={rkey}&limit=1&locale=all&depth=0"
     )
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url)
-    except httpx.RequestError as err:
-        # Network-layer failure — DNS, connection refused, timeout, etc.
-        # `str(err)` is often empty for some httpx errors; fall back to repr.
-        detail = str(err) or repr(err)
-        raise CMSError(
-            "cms_unreachable",
-            f"CMS request to /api/ballots failed: {detail}",
-        ) from err
-
-    if resp.status_code != 200:
-        body_preview = (resp.text or "").strip()[:300] or "<empty body>"
-        raise CMSError(
-            "cms_http_error",
-            f"CMS /api/ballots returned {resp.status_code}: {body_preview}",
-            status_code=resp.status_code,
-        )
-
-    try:
-        return resp.json().get("docs", [])
-    except ValueError as err:
-        raise CMSError(
-            "cms_invalid_response",
-            f"CMS /api/ballots returned non-JSON body: {(resp.text or '').strip()[:200]!r}",
-        ) from err
-
-
-async def _fetch_cms_ballot(rkey: str, locale: str) -> dict | None:
-    """Fetch a single ballot from CMS by rkey, in the requested locale."""
-    cms_url = _require_cms_url()
-    url = (
-        f"{cms_url}/api/ballots"
-        f"?where[rkey][equals]={rkey}&limit=1"
-        f"&locale={locale}&fallback-locale={DEFAULT_LANGUAGE}"
-    )
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.use("cms", timeout=30.0) as client:
             resp = await client.get(url)
     except httpx.RequestError as err:
         detail = str(err) or repr(err)
@@ -152,45 +91,35 @@ async def _fetch_cms_ballot(rkey: str, locale: str) -> dict | None:
     return docs[0] if docs else None
 
 
-async def _fetch_ballot_available_langs(rkey: str) -> list[str]:
-    """Determine which locales are filled in for a ballot by asking the CMS
-    for `?locale=all`. A locale counts as filled when its `title` is non-empty.
+# Draft fallback for rkeys the catalog does not know (drafts, typos, scanners):
+# signed-in callers only, concurrent lookups of one rkey share a CMS request,
+# and rkeys the CMS does not know either are remembered for
+# APPVIEW_BALLOT_DRAFT_MISS_TTL seconds (cleared on every catalog change).
+_draft_flight = SingleFlight("ballot.draft", timeout=30.0)
+_draft_misses: dict[str, float] = {}  # rkey -> monotonic expiry
+_DRAFT_MISSES_MAX = 10_000
+
+
+def _draft_miss_ttl() -> float:
+    return float(os.getenv("APPVIEW_BALLOT_DRAFT_MISS_TTL", "30"))
 
-    Falls back to [DEFAULT_LANGUAGE] on errors (non-blocking for the main flow).
-    """
-    try:
-        url = (
-            f"{CMS_INTERNAL_SERVER_URL}/api/ballots"
-            f"?where[rkey][equals]={rkey}&limit=1&locale=all&depth=0"
-        )
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(url)
-            if resp.status_code != 200:
-                return [DEFAULT_LANGUAGE]
-            docs = resp.json().get("docs", [])
-            if not docs:
-                return [DEFAULT_LANGUAGE]
-            doc = docs[0]
-            available: list[str] = []
-            # Payload returns `title` as either {de: "...", fr: "..."} (preferred)
-            # or per-locale subdocs depending on the version — handle both.
-            title_field = doc.get("title")
-            if isinstance(title_field, dict):
-                for code in SUPPORTED_LANGUAGES:
-                    val = title_field.get(code)
-                    if isinstance(val, str) and val.strip():
-                        available.append(code)
-            else:
-                for code in SUPPORTED_LANGUAGES:
-                    slot = doc.get(code)
-                    if isinstance(slot, dict):
-                        val = slot.get("title")
-                        if isinstance(val, str) and val.strip():
-                            available.append(code)
-            return available or [DEFAULT_LANGUAGE]
-    except Exception as err:
-        logger.warning(f"available-langs fetch failed for ballot {rkey}: {err}")
-        return [DEFAULT_LANGUAGE]
+
+async def _fetch_draft_ballot(rkey: str) -> dict | None:
+    """_fetch_cms_ballot behind the single-flight and the negative cache."""
+    expires = _draft_misses.get(rkey)
+    if expires is not None:
+        if expires > time.monotonic():
+            return None
+        del _draft_misses[rkey]
+    doc = await _draft_flight.do(rkey, lambda: _fetch_cms_ballot(rkey))
+    if doc is None:
+        if len(_draft_misses) >= _DRAFT_MISSES_MAX:
+            _draft_misses.clear()
+        _draft_misses[rkey] = time.monotonic() + _draft_miss_ttl()
+    return doc
+
+
+invalidation_bus.subscribe(invalidation_bus.BALLOT, lambda _key: _draft_misses.clear())
 
 
 def _extract_description_text(description) -> Optional[str]:
@@ -223,6 +152,8 @@ def _serialize_ballot(
     origin_lang = doc.get("originLanguage") or DEFAULT_LANGUAGE
     avail = available_langs if available_langs else [origin_lang]
 
+    counts = counts or {}
+    last_activity = counts.get("last_activity_at")
     out: dict = {
         "rkey": rkey,
         "title": doc.get("title", ""),
@@ -237,9 +168,13 @@ def _serialize_ballot(
         "createdAt": doc.get("createdAt"),
         "updatedAt": doc.get("updatedAt"),
         "communityDid": doc.get("communityDid"),
-        "argumentCount": (counts or {}).get("argument_count", 0),
-        "commentCount": (counts or {}).get("comment_count", 0),
-        "likeCount": (counts or {}).get("like_count", 0),
+        "argumentCount": counts.get("argument_count", 0),
+        "proCount": counts.get("pro_count", 0),
+        "contraCount": counts.get("contra_count", 0),
+        "commentCount": counts.get("comment_count", 0),
+        "participantCount": counts.get("participant_count", 0),
+        "likeCount": counts.get("like_count", 0),
+        "lastActivityAt": last_activity.isoformat() if last_activity else None,
         "viewer": {"like": viewer_like} if viewer_like else None,
     }
     return {k: v for k, v in out.items() if v is not None}
@@ -248,47 +183,21 @@ def _serialize_ballot(
 async def _get_ballot_counts(
     ballot_ids: list[str], viewer_did: str | None = None
 ) -> dict:
-    """Get argument/comment/like counts for ballots from AppView DB.
-    Returns {ballot_id: {argument_count, comment_count, like_count, viewer_like}}.
+    """Get argument/comment/participant counts for ballots from AppView DB
+    (app_ballot_stats, see src/core/ballot_stats.py).
+    Returns {ballot_id: {argument_count, pro_count, contra_count, comment_count,
+    participant_count, last_activity_at, like_count}}.
+
+    The counts are viewer-independent, so concurrent identical requests share
+    one query (the result is shared — read only).
     """
     if not ballot_ids:
         return {}
+    key = tuple(ballot_ids)
+    return await _counts_flight.do(key, lambda: ballot_stats.counts_of(list(key)))
 
-    db_pool = await get_pool()
-    async with db_pool.acquire() as conn:
-        arg_rows = await conn.fetch(
-            """
-            SELECT ga.ballot_rkey, COUNT(*) AS cnt
-            FROM app_arguments a
-            JOIN auth.community_accounts ga ON ga.did = a.did
-            WHERE ga.ballot_rkey = ANY($1) AND NOT a.deleted
-            GROUP BY ga.ballot_rkey
-            """,
-            ballot_ids,
-        )
-
-        comment_rows = await conn.fetch(
-            """
-            SELECT ga.ballot_rkey, COUNT(*) AS cnt
-            FROM app_comments c
-            JOIN app_arguments a ON a.uri = c.argument_uri
-            JOIN auth.community_accounts ga ON ga.did = a.did
-            WHERE ga.ballot_rkey = ANY($1) AND NOT c.deleted
-            GROUP BY ga.ballot_rkey
-            """,
-            ballot_ids,
-        )
-
-    result: dict = {}
-    for bid in ballot_ids:
-        result[bid] = {"argument_count": 0, "comment_count": 0, "like_count": 0}
-
-    for row in arg_rows:
-        result[row["ballot_rkey"]]["argument_count"] = row["cnt"]
-    for row in comment_rows:
-        result[row["ballot_rkey"]]["comment_count"] = row["cnt"]
 
-    return result
+_counts_flight = SingleFlight("ballot.counts", timeout=10.0)
 
 
 # -----------------------------------------------------------------------------
@@ -303,29 +212,44 @@ async def list_ballots(
     limit: int = Query(50),
     lang: Optional[str] = Query(None),
     accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
+    session: Optional[TSession] = Depends(optional_session_token),
 ):
     """List published ballots, localized to the requested language and
-    enriched with argument/comment counts."""
+    enriched with argument/comment counts. Also served anonymously in public
+    read mode (the payload has no viewer fields)."""
     requested_lang = resolve_requested_lang(lang, accept_language)
     viewer_did = session.did if session else None
 
     try:
-        cms_ballots = await _fetch_cms_ballots(requested_lang)
+        catalog = await ballot_catalog.get()
     except CMSError as err:
         logger.error(f"list_ballots: {err.category} — {err}")
         return JSONResponse(status_code=502, content=_cms_error_payload(err))
     except Exception as err:
-        logger.exception("list_ballots: unexpected error while fetching CMS")
+        logger.exception("list_ballots: unexpected error while loading the ballot catalog")
         return JSONResponse(
             status_code=500,
             content={"error": "internal_error", "details": str(err) or repr(err)},
         )
 
-    if not cms_ballots:
-        return JSONResponse(status_code=200, content={"cursor": None, "ballots": []})
+    if not catalog.docs:
+        return cache_control.apply(
+            JSONResponse(status_code=200, content={"cursor": None, "ballots": []}), viewer_did
+        )
+
+    ballot_rkeys = [ballot_catalog.doc_rkey(d) for d in catalog.docs]
 
-    ballot_rkeys = [b.get("rkey", str(b["id"])) for b in cms_ballots]
+    # CMS content (catalog stamp) + DB counts (ballot versions) unchanged → 304.
+    etag = None
+    try:
+        versions = await ballot_version.versions_of(ballot_rkeys)
+        etag = ballot_version.make_etag(
+            "ballot.list", catalog.stamp, sorted(versions.items()), requested_lang
+        )
+    except Exception as err:
+        logger.warning(f"list_ballots: version lookup failed: {err}")
+    if ballot_version.not_modified(request, etag):
+        return cache_control.apply(ballot_version.not_modified_response(etag), viewer_did)
 
     try:
         counts = await _get_ballot_counts(ballot_rkeys, viewer_did)
@@ -333,31 +257,18 @@ async def list_ballots(
         logger.warning(f"Failed to get ballot counts: {err}")
         counts = {}
 
-    # Fetch availableLangs for each ballot in parallel — these are independent
-    # CMS calls and the page typically holds 5–10 ballots, so concurrent dispatch
-    # keeps the overall response time close to a single CMS round-trip.
-    import asyncio
-
-    avail_map: dict[str, list[str]] = {}
-    avail_results = await asyncio.gather(
-        *[_fetch_ballot_available_langs(rkey) for rkey in ballot_rkeys],
-        return_exceptions=True,
-    )
-    for rkey, res in zip(ballot_rkeys, avail_results):
-        avail_map[rkey] = (
-            res if isinstance(res, list) else [DEFAULT_LANGUAGE]
-        )
-
     ballots = [
         _serialize_ballot(
-            b,
-            counts.get(b.get("rkey", str(b["id"]))),
-            available_langs=avail_map.get(b.get("rkey", str(b["id"]))),
+            ballot_catalog.localize(doc, requested_lang),
+            counts.get(rkey),
+            available_langs=catalog.langs.get(rkey),
         )
-        for b in cms_ballots
+        for rkey, doc in zip(ballot_rkeys, catalog.docs)
     ]
 
-    return JSONResponse(status_code=200, content={"cursor": None, "ballots": ballots})
+    return cache_control.apply(ballot_version.with_etag(
+        JSONResponse(status_code=200, content={"cursor": None, "ballots": ballots}), etag
+    ), viewer_did)
 
 
 # -----------------------------------------------------------------------------
@@ -371,37 +282,98 @@ async def get_ballot(
     request: Request,
     lang: Optional[str] = Query(None),
     accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
+    session: Optional[TSession] = Depends(optional_session_token),
 ):
     """Fetch a single ballot by rkey, localized to the requested language."""
     requested_lang = resolve_requested_lang(lang, accept_language)
     viewer_did = session.did if session else None
 
     try:
-        doc = await _fetch_cms_ballot(rkey, requested_lang)
+        catalog = await ballot_catalog.get()
     except CMSError as err:
         logger.error(f"get_ballot({rkey}): {err.category} — {err}")
         return JSONResponse(status_code=502, content=_cms_error_payload(err))
     except Exception as err:
-        logger.exception(f"get_ballot({rkey}): unexpected error while fetching CMS")
+        logger.exception(f"get_ballot({rkey}): unexpected error while loading the ballot catalog")
         return JSONResponse(
             status_code=500,
             content={"error": "internal_error", "details": str(err) or repr(err)},
         )
 
-    if not doc:
+    etag = None
+    doc_result = catalog.by_rkey.get(rkey)
+    published = doc_result is not None
+    if published:
+        # Published ballot: content from the catalog, counts from the DB.
+        etag = await ballot_version.ballot_etag(
+            rkey, "ballot.get", doc_result.get("updatedAt"), requested_lang
+        )
+        if ballot_version.not_modified(request, etag):
+            return cache_control.apply(ballot_version.not_modified_response(etag), viewer_did)
+        try:
+            counts = await _get_ballot_counts([rkey], viewer_did)
+        except Exception as err:
+            logger.warning(f"Failed to get ballot counts: {err}")
+            counts = {}
+    elif viewer_did is None:
+        # Drafts are editor previews: no CMS lookup for anonymous callers.
         return JSONResponse(
             status_code=404,
             content={"error": "not_found", "message": "Ballot not found"},
         )
+    else:
+        # Draft (not in the catalog): CMS fetch and DB counts are independent.
+        doc_result, counts_result = await asyncio.gather(
+            _fetch_draft_ballot(rkey),
+            _get_ballot_counts([rkey], viewer_did),
+            return_exceptions=True,
+        )
+        if isinstance(doc_result, CMSError):
+            logger.error(f"get_ballot({rkey}): {doc_result.category} — {doc_result}")
+            return JSONResponse(status_code=502, content=_cms_error_payload(doc_result))
+        if isinstance(doc_result, BaseException):
+            logger.error(f"get_ballot({rkey}): unexpected error while fetching CMS: {doc_result!r}")
+            return JSONResponse(
+                status_code=500,
+                content={"error": "internal_error", "details": str(doc_result) or repr(doc_result)},
+            )
+        if not doc_result:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "not_found", "message": "Ballot not found"},
+            )
+        if isinstance(counts_result, BaseException):
+            logger.warning(f"Failed to get ballot counts: {counts_result}")
+            counts = {}
+        else:
+            counts = counts_result
+
+    doc = ballot_catalog.localize(doc_result, requested_lang)
+    avail = ballot_catalog.available_langs(doc_result)
+    ballot = _serialize_ballot(doc, counts.get(rkey), available_langs=avail)
+    response = ballot_version.with_etag(
+        JSONResponse(status_code=200, content={"ballot": ballot}), etag
+    )
+    # Drafts (not in the catalog) are editor previews — never shared-cached.
+    return cache_control.apply(response, viewer_did) if published else response
 
-    try:
-        counts = await _get_ballot_counts([rkey], viewer_did)
-    except Exception as err:
-        logger.warning(f"Failed to get ballot counts: {err}")
-        counts = {}
 
-    avail = await _fetch_ballot_available_langs(rkey)
+# -----------------------------------------------------------------------------
+# POST /api/ballots/catalog/refresh  (CMS webhook)
+# -----------------------------------------------------------------------------
 
-    ballot = _serialize_ballot(doc, counts.get(rkey), available_langs=avail)
-    return JSONResponse(status_code=200, content={"ballot": ballot})
+
+@router.post("/ballots/catalog/refresh")
+async def refresh_ballot_catalog(
+    x_catalog_secret: Optional[str] = Header(None),
+):
+    """Called by the CMS after a ballot is saved or deleted. Reloads the catalog
+    in the background (the caller does not wait for the reload) and tells the
+    other replicas to do the same via the invalidation bus."""
+    if not CATALOG_WEBHOOK_SECRET:
+        return JSONResponse(status_code=404, content={"error": "not_found"})
+    if not hmac.compare_digest(x_catalog_secret or "", CATALOG_WEBHOOK_SECRET):
+        return JSONResponse(status_code=403, content={"error": "forbidden"})
+    ballot_catalog.schedule_refresh()
+    await invalidation_bus.publish(invalidation_bus.BALLOT)
+    return JSONResponse(status_code=202, content={"status": "scheduled"})
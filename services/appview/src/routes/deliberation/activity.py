@@ -21,6 +21,63 @@ router = APIRouter(prefix="/xrpc", tags=["poltr-activity"])
 # -----------------------------------------------------------------------------
 
 
+_ACTIVITY_TYPES = {
+    "comments": ("comment", "reply"),
+    "arguments": ("new_argument", "milestone"),
+}
+
+# The unread count is a badge ("99+"), so counting stops here.
+_UNREAD_CAP = 100
+
+_LATEST_SELECT = (
+    "(SELECT max(seq) FROM app_activity_log WHERE ballot_rkey = $1) AS latest_seq"
+)
+
+# Log entries (alias l) whose subject is still visible: the argument is not
+# deleted (inner join), nor the comment, a reply's parent exists and a
+# milestone's review status still holds. Shared by the feed and the unread
+# count so the badge never counts entries the feed does not show.
+_VISIBLE_JOINS = """
+        JOIN app_arguments a ON a.uri = l.argument_uri AND NOT a.deleted
+        LEFT JOIN app_comments c ON c.uri = l.comment_uri
+        LEFT JOIN app_comments pc ON pc.uri = c.parent_uri AND l.kind = 'reply'
+"""
+_VISIBLE_CONDITIONS = [
+    "(l.comment_uri IS NULL OR NOT c.deleted)",
+    "(l.kind <> 'reply' OR pc.uri IS NOT NULL)",
+    "(l.kind <> 'milestone' OR a.peerreview_status IN ('approved', 'rejected'))",
+]
+
+# $1 ballot, $2 viewer, $3 cap. Visible entries above the viewer's watermark
+# that are neither their own nor individually marked seen; walks
+# (ballot_rkey, seq).
+_UNREAD_SELECT = f"""
+    (SELECT count(*)::int FROM (
+        SELECT 1 FROM app_activity_log l
+        {_VISIBLE_JOINS}
+        WHERE l.ballot_rkey = $1
+          AND l.seq > COALESCE((SELECT seen_seq FROM app_activity_watermark
+                                WHERE did = $2 AND ballot_rkey = $1), 0)
+          AND l.actor_did IS DISTINCT FROM $2
+          AND NOT EXISTS (SELECT 1 FROM app_activity_seen s
+                          WHERE s.did = $2 AND s.activity_uri = l.activity_uri)
+          AND {" AND ".join(_VISIBLE_CONDITIONS)}
+        LIMIT $3
+    ) unread) AS unread_count
+"""
+
+
+def _parse_activity_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """(ts, seq) from a "<iso ts>::<seq>" cursor; None if malformed."""
+    parts = cursor.split("::", 1)
+    if len(parts) != 2:
+        return None
+    try:
+        return datetime.fromisoformat(parts[0].replace("Z", "+00:00")), int(parts[1])
+    except ValueError:
+        return None
+
+
 @router.get("/app.ch.poltr.activity.list")
 async def list_activity(
     request: Request,
@@ -30,8 +87,26 @@ async def list_activity(
     cursor: Optional[str] = Query(None),
     session: TSession = Depends(verify_session_token),
 ):
-    """List activity feed for a ballot (comments, replies, new arguments, milestones)."""
+    """List activity feed for a ballot (comments, replies, new arguments, milestones).
+
+    Served from app_activity_log (migration 021): one range scan over
+    (ballot_rkey, ts, seq) from the (ts, seq) keyset cursor, so a page costs
+    the same however long the ballot's history is and entries sharing a
+    timestamp are neither skipped nor repeated. The first page also carries
+    `latestSeq` and, for a viewer, `unreadCount` — entries by others above
+    the viewer's watermark (see markSeen).
+    """
+    after = None
+    if cursor:
+        after = _parse_activity_cursor(cursor)
+        if after is None:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "BadCursor", "message": "Malformed cursor"},
+            )
+
     params: list = [ballot_rkey]
+    conditions = ["l.ballot_rkey = $1", *_VISIBLE_CONDITIONS]
 
     viewer_did = session.did if session else None
 
@@ -39,170 +114,69 @@ async def list_activity(
         params.append(viewer_did)
         vp = f"${len(params)}"
         viewer_like_select = (
-            f"(SELECT uri FROM app_likes WHERE subject_uri = act.argument_uri"
+            f"(SELECT uri FROM app_likes WHERE subject_uri = l.argument_uri"
             f" AND did = {vp} AND NOT deleted LIMIT 1) AS viewer_argument_like"
         )
         viewer_seen_select = (
-            f"EXISTS(SELECT 1 FROM app_activity_seen WHERE activity_uri = act.activity_uri"
-            f" AND did = {vp}) AS viewer_seen"
+            f"(l.seq <= COALESCE(w.seen_seq, 0) OR EXISTS(SELECT 1 FROM app_activity_seen"
+            f" WHERE activity_uri = l.activity_uri AND did = {vp})) AS viewer_seen"
+        )
+        watermark_join = (
+            f"LEFT JOIN app_activity_watermark w ON w.did = {vp} AND w.ballot_rkey = l.ballot_rkey"
         )
     else:
         viewer_like_select = "NULL::text AS viewer_argument_like"
         viewer_seen_select = "false AS viewer_seen"
+        watermark_join = ""
 
-    outer_conditions: list[str] = []
-    if cursor:
-        try:
-            cursor_dt = datetime.fromisoformat(cursor.replace("Z", "+00:00"))
-            params.append(cursor_dt)
-            outer_conditions.append(f"act.activity_at < ${len(params)}")
-        except Exception:
-            pass
-
-    if filter == "comments":
-        outer_conditions.append("act.activity_type IN ('comment', 'reply')")
-    elif filter == "arguments":
-        outer_conditions.append("act.activity_type IN ('new_argument', 'milestone')")
-
-    outer_where = (
-        ("WHERE " + " AND ".join(outer_conditions)) if outer_conditions else ""
-    )
+    if after:
+        params.extend(after)
+        conditions.append(f"(l.ts, l.seq) < (${len(params) - 1}, ${len(params)})")
+
+    kinds = _ACTIVITY_TYPES.get(filter)
+    if kinds:
+        params.append(list(kinds))
+        conditions.append(f"l.kind = ANY(${len(params)}::text[])")
 
     params.append(limit)
     limit_param = f"${len(params)}"
 
     sql = f"""
-        WITH activities AS (
-            SELECT
-                a.uri AS activity_uri,
-                'new_argument'::text AS activity_type,
-                a.created_at AS activity_at,
-                a.uri AS argument_uri,
-                a.author_did AS actor_did,
-                a.title AS argument_title,
-                a.body AS argument_body,
-                a.type AS argument_type,
-                a.like_count AS argument_like_count,
-                a.comment_count AS argument_comment_count,
-                CASE WHEN a.source_type = 'official' THEN NULL ELSE a.peerreview_status END AS argument_peerreview_status,
-                a.rkey AS argument_rkey,
-                NULL::text AS comment_uri,
-                NULL::text AS comment_text,
-                NULL::int AS comment_like_count,
-                NULL::int AS comment_reply_count,
-                NULL::text AS parent_uri,
-                NULL::text AS parent_did,
-                NULL::text AS parent_text,
-                false AS parent_has_parent,
-                NULL::int AS parent_like_count,
-                NULL::int AS parent_reply_count
-            FROM app_arguments a
-            WHERE a.ballot_rkey = $1 AND NOT a.deleted
-
-            UNION ALL
-
-            SELECT
-                'milestone:' || a.uri AS activity_uri,
-                'milestone'::text AS activity_type,
-                a.indexed_at AS activity_at,
-                a.uri AS argument_uri,
-                a.author_did AS actor_did,
-                a.title AS argument_title,
-                NULL::text AS argument_body,
-                a.type AS argument_type,
-                a.like_count AS argument_like_count,
-                a.comment_count AS argument_comment_count,
-                CASE WHEN a.source_type = 'official' THEN NULL ELSE a.peerreview_status END AS argument_peerreview_status,
-                a.rkey AS argument_rkey,
-                NULL::text AS comment_uri,
-                NULL::text AS comment_text,
-                NULL::int AS comment_like_count,
-                NULL::int AS comment_reply_count,
-                NULL::text AS parent_uri,
-                NULL::text AS parent_did,
-                NULL::text AS parent_text,
-                false AS parent_has_parent,
-                NULL::int AS parent_like_count,
-                NULL::int AS parent_reply_count
-            FROM app_arguments a
-            -- "Community-bestätigt"- und "Community-verworfen"-Meilensteine nur
-            -- für User-Argumente, die das Begutachtungsverfahren durchlaufen haben.
-            WHERE a.ballot_rkey = $1 AND NOT a.deleted
-              AND a.peerreview_status IN ('approved', 'rejected')
-              AND a.source_type = 'user'
-
-            UNION ALL
-
-            SELECT
-                c.uri AS activity_uri,
-                'comment'::text AS activity_type,
-                c.created_at AS activity_at,
-                a.uri AS argument_uri,
-                c.did AS actor_did,
-                a.title AS argument_title,
-                NULL::text AS argument_body,
-                a.type AS argument_type,
-                a.like_count AS argument_like_count,
-                a.comment_count AS argument_comment_count,
-                CASE WHEN a.source_type = 'official' THEN NULL ELSE a.peerreview_status END AS argument_peerreview_status,
-                a.rkey AS argument_rkey,
-                c.uri AS comment_uri,
-                c.text AS comment_text,
-                c.like_count AS comment_like_count,
-                (SELECT count(*)::int FROM app_comments r WHERE r.parent_uri = c.uri AND NOT r.deleted) AS comment_reply_count,
-                NULL::text AS parent_uri,
-                NULL::text AS parent_did,
-                NULL::text AS parent_text,
-                false AS parent_has_parent,
-                NULL::int AS parent_like_count,
-                NULL::int AS parent_reply_count
-            FROM app_comments c
-            JOIN app_arguments a ON a.uri = c.argument_uri
-            WHERE c.ballot_rkey = $1 AND NOT c.deleted AND NOT a.deleted AND c.parent_uri IS NULL AND c.origin = 'intern'
-
-            UNION ALL
-
-            SELECT
-                c.uri AS activity_uri,
-                'reply'::text AS activity_type,
-                c.created_at AS activity_at,
-                a.uri AS argument_uri,
-                c.did AS actor_did,
-                a.title AS argument_title,
-                NULL::text AS argument_body,
-                a.type AS argument_type,
-                a.like_count AS argument_like_count,
-                a.comment_count AS argument_comment_count,
-                CASE WHEN a.source_type = 'official' THEN NULL ELSE a.peerreview_status END AS argument_peerreview_status,
-                a.rkey AS argument_rkey,
-                c.uri AS comment_uri,
-                c.text AS comment_text,
-                c.like_count AS comment_like_count,
-                (SELECT count(*)::int FROM app_comments r WHERE r.parent_uri = c.uri AND NOT r.deleted) AS comment_reply_count,
-                pc.uri AS parent_uri,
-                pc.did AS parent_did,
-                pc.text AS parent_text,
-                (pc.parent_uri IS NOT NULL) AS parent_has_parent,
-                pc.like_count AS parent_like_count,
-                (SELECT count(*)::int FROM app_comments r WHERE r.parent_uri = pc.uri AND NOT r.deleted) AS parent_reply_count
-            FROM app_comments c
-            JOIN app_arguments a ON a.uri = c.argument_uri
-            JOIN app_comments pc ON pc.uri = c.parent_uri
-            WHERE c.ballot_rkey = $1 AND NOT c.deleted AND NOT a.deleted AND c.parent_uri IS NOT NULL AND c.origin = 'intern'
-        )
         SELECT
-            act.*,
+            l.seq,
+            l.kind AS activity_type,
+            l.ts AS activity_at,
+            l.activity_uri,
+            l.argument_uri,
+            l.actor_did,
+            a.title AS argument_title,
+            CASE WHEN l.kind = 'new_argument' THEN a.body END AS argument_body,
+            a.type AS argument_type,
+            a.like_count AS argument_like_count,
+            a.comment_count AS argument_comment_count,
+            CASE WHEN a.source_type = 'official' THEN NULL ELSE a.peerreview_status END AS argument_peerreview_status,
+            a.rkey AS argument_rkey,
+            c.uri AS comment_uri,
+            c.text AS comment_text,
+            c.like_count AS comment_like_count,
+            pc.uri AS parent_uri,
+            pc.did AS parent_did,
+            pc.text AS parent_text,
+            (pc.parent_uri IS NOT NULL) AS parent_has_parent,
+            pc.like_count AS parent_like_count,
             ap.display_name AS actor_display_name,
             ap.canton AS actor_canton,
             ap.color AS actor_color,
             pp.display_name AS parent_display_name,
             {viewer_like_select},
             {viewer_seen_select}
-        FROM activities act
-        LEFT JOIN app_profiles ap ON ap.did = act.actor_did
-        LEFT JOIN app_profiles pp ON pp.did = act.parent_did
-        {outer_where}
-        ORDER BY act.activity_at DESC
+        FROM app_activity_log l
+        {_VISIBLE_JOINS}
+        LEFT JOIN app_profiles ap ON ap.did = l.actor_did
+        LEFT JOIN app_profiles pp ON pp.did = pc.did
+        {watermark_join}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY l.ts DESC, l.seq DESC
         LIMIT {limit_param};
     """
 
@@ -210,6 +184,33 @@ async def list_activity(
         db_pool = await get_pool()
         async with db_pool.acquire() as conn:
             rows = await conn.fetch(sql, *params)
+            # Reply counts for the comments on this page in one grouped read
+            # (app_comments_parent_uri_idx) instead of a subquery per row.
+            counted = list({
+                uri for r in rows for uri in (r["comment_uri"], r["parent_uri"]) if uri
+            })
+            reply_counts = {}
+            if counted:
+                reply_counts = {
+                    r["parent_uri"]: r["reply_count"]
+                    for r in await conn.fetch(
+                        """
+                        SELECT parent_uri, count(*)::int AS reply_count
+                        FROM app_comments
+                        WHERE parent_uri = ANY($1::text[]) AND NOT deleted
+                        GROUP BY parent_uri
+                        """,
+                        counted,
+                    )
+                }
+            head = None
+            if after is None and viewer_did:
+                head = await conn.fetchrow(
+                    f"SELECT {_LATEST_SELECT}, {_UNREAD_SELECT}",
+                    ballot_rkey, viewer_did, _UNREAD_CAP,
+                )
+            elif after is None:
+                head = await conn.fetchrow(f"SELECT {_LATEST_SELECT}", ballot_rkey)
 
         activities = []
         for r in rows:
@@ -251,7 +252,7 @@ async def list_activity(
                     "uri": row["comment_uri"],
                     "text": get_string(row, "comment_text") or "",
                     "likeCount": get_number(row, "comment_like_count") or 0,
-                    "replyCount": get_number(row, "comment_reply_count") or 0,
+                    "replyCount": reply_counts.get(row["comment_uri"], 0),
                 }
 
             if activity_type == "reply" and row.get("parent_uri"):
@@ -262,7 +263,7 @@ async def list_activity(
                     "text": get_string(row, "parent_text") or "",
                     "hasParent": bool(row.get("parent_has_parent")),
                     "likeCount": get_number(row, "parent_like_count") or 0,
-                    "replyCount": get_number(row, "parent_reply_count") or 0,
+                    "replyCount": reply_counts.get(row["parent_uri"], 0),
                 }
                 item["parent"] = {k: v for k, v in parent_raw.items() if v is not None}
 
@@ -277,15 +278,16 @@ async def list_activity(
             activities.append(item)
 
         next_cursor = None
-        if activities and len(activities) == limit:
-            last_at = activities[-1].get("activityAt")
-            if last_at:
-                next_cursor = last_at
-
-        return JSONResponse(
-            status_code=200,
-            content={"activities": activities, "cursor": next_cursor},
-        )
+        if rows and len(rows) == limit:
+            last = rows[-1]
+            next_cursor = f"{last['activity_at'].isoformat()}::{last['seq']}"
+
+        result: dict = {"activities": activities, "cursor": next_cursor}
+        if head is not None:
+            result["latestSeq"] = head["latest_seq"] or 0
+            if viewer_did:
+                result["unreadCount"] = head["unread_count"]
+        return JSONResponse(status_code=200, content=result)
     except Exception as err:
         logger.error(f"DB query failed: {err}")
         return JSONResponse(
@@ -303,27 +305,50 @@ async def mark_activity_seen(
     request: Request,
     session: TSession = Depends(verify_session_token),
 ):
-    """Mark activity items as seen for the authenticated user."""
+    """Mark activity items as seen for the authenticated user.
+
+    Body: `uris` (single items) and/or `ballotRkey` + `seq` — everything in
+    that ballot's feed up to `seq` (the `latestSeq` of activity.list) is seen.
+    The watermark only moves forward.
+    """
     body = await request.json()
     uris = body.get("uris", [])
+    ballot_rkey = body.get("ballotRkey")
+    seq = body.get("seq")
+    has_watermark = isinstance(ballot_rkey, str) and isinstance(seq, int) and seq >= 0
 
-    if not uris or not isinstance(uris, list):
+    if not isinstance(uris, list) or (not uris and not has_watermark):
         return JSONResponse(
             status_code=400,
-            content={"error": "invalid_request", "message": "uris array required"},
+            content={
+                "error": "invalid_request",
+                "message": "uris array or ballotRkey and seq required",
+            },
         )
 
     try:
         db_pool = await get_pool()
         async with db_pool.acquire() as conn:
-            await conn.executemany(
-                """
-                INSERT INTO app_activity_seen (did, activity_uri, seen_at)
-                VALUES ($1, $2, NOW())
-                ON CONFLICT (did, activity_uri) DO NOTHING
-                """,
-                [(session.did, uri) for uri in uris if isinstance(uri, str)],
-            )
+            if uris:
+                await conn.executemany(
+                    """
+                    INSERT INTO app_activity_seen (did, activity_uri, seen_at)
+                    VALUES ($1, $2, NOW())
+                    ON CONFLICT (did, activity_uri) DO NOTHING
+                    """,
+                    [(session.did, uri) for uri in uris if isinstance(uri, str)],
+                )
+            if has_watermark:
+                await conn.execute(
+                    """
+                    INSERT INTO app_activity_watermark (did, ballot_rkey, seen_seq)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (did, ballot_rkey) DO UPDATE SET
+                        seen_seq = GREATEST(app_activity_watermark.seen_seq, EXCLUDED.seen_seq),
+                        updated_at = now()
+                    """,
+                    session.did, ballot_rkey, seq,
+                )
         return JSONResponse(status_code=200, content={"success": True})
     except Exception as err:
         logger.error(f"DB query failed: {err}")
@@ -7,9 +7,9 @@ languages live in `langs`/`title`/`body`; further translations are inline in
 `translations` and resolved at read time via _lang.pick_translation().
 """
 
-import hashlib
 import json
 import os
+import re
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -18,12 +18,18 @@ from fastapi.responses import JSONResponse
 
 from src.atproto.atproto_api import pds_create_record
 from src.atproto.community import get_did_for_ballot
-from src.auth.middleware import TSession, verify_session_token
+from src.auth.middleware import TSession, optional_session_token, verify_session_token
+from src.core import ballot_version, cache_control, fast_json
 from src.core.db import get_pool
 from src.core.fastapi import logger, limiter
 from src.core.languages import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES_SET
 from src.core.lib import get_date_iso, get_number, get_string
+from src.core.payload_cache import PayloadCache
+from src.core.single_flight import SingleFlight
 from src.routes.deliberation._lang import pick_translation, resolve_requested_lang
+from src.routes.deliberation.likes import (
+    fetch_viewer_ratings, overlay_viewer_ratings, viewer_block, with_viewer_ratings,
+)
 from src.routes.deliberation.quota import QuotaExceeded, release, reserve, set_uri
 
 router = APIRouter(prefix="/xrpc", tags=["poltr-arguments"])
@@ -35,9 +41,42 @@ router = APIRouter(prefix="/xrpc", tags=["poltr-arguments"])
 
 
 def _serialize_argument_row(row: dict, peer_review_on: bool, requested_lang: str) -> dict:
-    """Convert a row from app_arguments (joined with profile + viewer_like)
-    into the API argument shape, with title/body localized to `requested_lang`.
-    """
+    """Convert a row from app_arguments (joined with the author profile) into
+    the viewer-independent API argument shape, with title/body localized to
+    `requested_lang`. The viewer block is overlaid afterwards
+    (likes.overlay_viewer_ratings)."""
+    return {**_argument_static(row, requested_lang), **_argument_dynamic(row, peer_review_on)}
+
+
+def _argument_dynamic(row: dict, peer_review_on: bool) -> dict:
+    """Fields that change without a new record: counters, review status."""
+    official = get_string(row, "source_type") == "official"
+    out = {
+        "likeCount": get_number(row, "like_count"),
+        "commentCount": get_number(row, "comment_count"),
+        # Official arguments are curated content and never go through peer
+        # review, so they carry no review status regardless of what the DB
+        # stored (the column is NOT NULL, so the indexer seeds 'approved').
+        "peerreviewStatus": (
+            get_string(row, "peerreview_status") if peer_review_on and not official else None
+        ),
+    }
+    return {k: v for k, v in out.items() if v is not None}
+
+
+def _argument_stamp(row: dict) -> tuple:
+    """Row columns the static part is built from (fast-path fragment key)."""
+    translations = row.get("translations")
+    return (
+        row.get("cid"), row.get("indexed_at"), row.get("translation_status"),
+        translations if isinstance(translations, str) else len(translations or ()),
+        row.get("author_display_name"), row.get("author_canton"), row.get("author_color"),
+    )
+
+
+def _argument_static(row: dict, requested_lang: str) -> dict:
+    """Fields that only change with the record, its translations or the
+    author profile."""
     source_type = get_string(row, "source_type") or "user"
     if source_type == "official":
         source_obj_raw = {
@@ -97,13 +136,6 @@ def _serialize_argument_row(row: dict, peer_review_on: bool, requested_lang: str
         record_raw["translationSource"] = localized["translationSource"]
     record = {k: v for k, v in record_raw.items() if v is not None}
 
-    viewer_obj = {}
-    if row.get("viewer_like"):
-        viewer_obj["like"] = row["viewer_like"]
-    viewer_preference = row.get("viewer_preference")
-    if viewer_preference is not None:
-        viewer_obj["preference"] = get_number(row, "viewer_preference")
-
     if source_type == "user":
         author_raw = {
             "did": get_string(row, "author_did") or "",
@@ -120,18 +152,7 @@ def _serialize_argument_row(row: dict, peer_review_on: bool, requested_lang: str
         "cid": get_string(row, "cid") or "",
         "record": record,
         "author": author,
-        "likeCount": get_number(row, "like_count"),
-        "commentCount": get_number(row, "comment_count"),
-        # Official arguments are curated content and never go through peer
-        # review, so they carry no review status regardless of what the DB
-        # stored (the column is NOT NULL, so the indexer seeds 'approved').
-        "peerreviewStatus": (
-            get_string(row, "peerreview_status")
-            if peer_review_on and source_type != "official"
-            else None
-        ),
         "indexedAt": get_date_iso(row, "indexed_at"),
-        "viewer": viewer_obj if viewer_obj else None,
         # Mirror the localization metadata at the top level so the Frontend
         # doesn't have to dig into `record` to render language badges.
         "availableLangs": localized.get("availableLangs"),
@@ -140,80 +161,91 @@ def _serialize_argument_row(row: dict, peer_review_on: bool, requested_lang: str
     return {k: v for k, v in arg_raw.items() if v is not None}
 
 
-# -----------------------------------------------------------------------------
-# app.ch.poltr.argument.list
-# -----------------------------------------------------------------------------
+_fragments = fast_json.FragmentCache("argument")
 
 
-@router.get("/app.ch.poltr.argument.list")
-async def list_arguments(
-    request: Request,
-    ballot_rkey: str = Query(...),
-    sort: str = Query("random"),
-    type: Optional[str] = Query(None),
-    source: Optional[str] = Query(
-        None,
-        description="Filter by argument source: 'user', 'official', 'organization' or 'all' (default).",
-    ),
-    limit: int = Query(100),
-    lang: Optional[str] = Query(None),
-    accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
-):
-    """List arguments for a ballot, localized to the requested language."""
-    requested_lang = resolve_requested_lang(lang, accept_language)
-    params = [ballot_rkey]
+def _argument_json(row: dict, peer_review_on: bool, requested_lang: str) -> bytes:
+    """Fast path: the argument as JSON bytes, static part from the fragment
+    cache."""
+    fragment = _fragments.render(
+        (row["uri"], requested_lang), _argument_stamp(row),
+        lambda: _argument_static(row, requested_lang),
+    )
+    return fast_json.close(fragment, _argument_dynamic(row, peer_review_on))
 
-    viewer_did = session.did if session else None
-    peer_review_on = os.getenv("APPVIEW_PEER_REVIEW_ENABLED", "false").lower() == "true"
 
-    # Type filter
+# -----------------------------------------------------------------------------
+# app.ch.poltr.argument.list
+# -----------------------------------------------------------------------------
+
+_SORT_MAP = {
+    "top": "a.like_count DESC",
+    "new": "a.created_at DESC",
+    "discussed": "a.comment_count DESC",
+}
+
+_list_flight = SingleFlight("argument.list", timeout=10.0)
+_list_pages = PayloadCache("argument.list")
+
+# Seeded shuffle (the default sort): each viewer gets a fixed order from
+# md5("<seed>:<uri>"), the seed being the viewer DID ("" for anonymous). It is
+# computed in SQL so only one page of rows is fetched and serialized, and pages
+# continue from a keyset cursor "<hash>::<uri>" instead of an offset: the order
+# never reshuffles, and arguments added meanwhile land in their hash slot.
+# COLLATE "C" makes the hex comparison bytewise, independent of the DB locale.
+_SHUFFLE_KEY = "md5({seed} || ':' || a.uri) COLLATE \"C\""
+_HASH_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _parse_shuffle_cursor(cursor: str) -> tuple[str, str] | None:
+    """(hash, uri) from a "<hash>::<uri>" cursor; None if malformed."""
+    parts = cursor.split("::", 1)
+    if len(parts) != 2 or not _HASH_RE.match(parts[0]) or not parts[1]:
+        return None
+    return parts[0], parts[1]
+
+
+async def _fetch_argument_rows(
+    ballot_rkey: str,
+    type: str | None,
+    source: str | None,
+    sort: str,
+    limit: int | None,
+    seed: str | None = None,
+    after: tuple[str, str] | None = None,
+) -> list:
+    """Argument rows (joined with the author profile), viewer-independent
+    except for the shuffle seed. With `seed` the rows come in seeded-shuffle
+    order with a `shuffle_key` column, starting after the `after` (hash, uri)
+    cursor. Shared between concurrent callers — treat the result as read-only."""
+    params: list = [ballot_rkey]
     type_filter = ""
-    if type in ("PRO", "CONTRA"):
+    if type:
         params.append(type)
         type_filter = f"AND a.type = ${len(params)}"
-
-    # Source filter
     source_filter = ""
-    if source in ("user", "official", "organization"):
+    if source:
         params.append(source)
         source_filter = f"AND a.source_type = ${len(params)}"
-
     # Peer-review filter: even rejected arguments are shown to everyone — the
     # frontend renders a distinct red "rejected" badge so they are visually
-    # marked instead of hidden. When peer review is disabled, show all.
-    if viewer_did:
-        params.append(viewer_did)
-        viewer_param = f"${len(params)}"
-        viewer_select = f""",
-            (
-                SELECT uri FROM app_likes
-                WHERE subject_uri = a.uri AND did = {viewer_param} AND NOT deleted
-                LIMIT 1
-            ) AS viewer_like,
-            (
-                SELECT preference FROM app_likes
-                WHERE subject_uri = a.uri AND did = {viewer_param} AND NOT deleted
-                LIMIT 1
-            ) AS viewer_preference"""
-    else:
-        viewer_select = ",\n            NULL AS viewer_like,\n            NULL AS viewer_preference"
-    review_filter = ""
-
-    # Sort order. Explicit sorts run in SQL; the default ("random") is a stable
-    # per-user shuffle applied in Python (see below) so each user gets their own
-    # fixed ordering that never reshuffles when arguments are added.
-    sort_map = {
-        "top": "a.like_count DESC",
-        "new": "a.created_at DESC",
-        "discussed": "a.comment_count DESC",
-    }
-    seeded_shuffle = sort not in sort_map
-    if seeded_shuffle:
-        order_by = "a.created_at ASC, a.uri"
-        limit_clause = ""
+    # marked instead of hidden.
+    shuffle_column = ""
+    cursor_filter = ""
+    if seed is not None:
+        params.append(seed)
+        shuffle_key = _SHUFFLE_KEY.format(seed=f"${len(params)}")
+        shuffle_column = f", {shuffle_key} AS shuffle_key"
+        order_by = f'{shuffle_key}, a.uri COLLATE "C"'
+        if after is not None:
+            params.extend(after)
+            cursor_filter = (
+                f'AND ({shuffle_key}, a.uri COLLATE "C") > (${len(params) - 1}, ${len(params)})'
+            )
     else:
-        order_by = sort_map[sort]
+        order_by = _SORT_MAP.get(sort, "a.created_at ASC, a.uri")
+    limit_clause = ""
+    if limit is not None:
         params.append(limit)
         limit_clause = f"LIMIT ${len(params)}"
 
@@ -222,36 +254,135 @@ async def list_arguments(
                p.display_name AS author_display_name,
                p.canton AS author_canton,
                p.color AS author_color
-               {viewer_select}
+               {shuffle_column}
         FROM app_arguments a
         LEFT JOIN app_profiles p ON p.did = a.author_did
         WHERE a.ballot_rkey = $1 AND NOT a.deleted
           {type_filter}
           {source_filter}
-          {review_filter}
+          {cursor_filter}
         ORDER BY {order_by}
         {limit_clause};
     """
+    db_pool = await get_pool()
+    async with db_pool.acquire() as conn:
+        return await conn.fetch(sql, *params)
 
-    try:
-        db_pool = await get_pool()
-        async with db_pool.acquire() as conn:
-            rows = await conn.fetch(sql, *params)
 
-        arguments = [
-            _serialize_argument_row(dict(r), peer_review_on, requested_lang) for r in rows
-        ]
+@router.get("/app.ch.poltr.argument.list")
+async def list_arguments(
+    request: Request,
+    ballot_rkey: str = Query(...),
+    sort: str = Query("random"),
+    type: Optional[str] = Query(None),
+    source: Optional[str] = Query(
+        None,
+        description="Filter by argument source: 'user', 'official', 'organization' or 'all' (default).",
+    ),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None,
+        description="Next page of the default (random) sort: the `cursor` of the previous response.",
+    ),
+    lang: Optional[str] = Query(None),
+    accept_language: Optional[str] = Header(None),
+    session: Optional[TSession] = Depends(optional_session_token),
+):
+    """List arguments for a ballot, localized to the requested language.
+    Anonymous (public read mode): no viewer fields, shared-cacheable."""
+    requested_lang = resolve_requested_lang(lang, accept_language)
+    viewer_did = session.did if session else None
+    peer_review_on = os.getenv("APPVIEW_PEER_REVIEW_ENABLED", "false").lower() == "true"
+
+    # Sort order. Explicit sorts are plain ORDER BYs; the default ("random") is
+    # a stable per-user shuffle (see _SHUFFLE_KEY) so each user gets their own
+    # fixed ordering that never reshuffles when arguments are added. Only the
+    # shuffle pages with a cursor.
+    seeded_shuffle = sort not in _SORT_MAP
+    type_key = type if type in ("PRO", "CONTRA") else None
+    source_key = source if source in ("user", "official", "organization") else None
+    sort_key = "random" if seeded_shuffle else sort
+    seed = (viewer_did or "") if seeded_shuffle else None
+    after = None
+    if seeded_shuffle and cursor:
+        after = _parse_shuffle_cursor(cursor)
+        if after is None:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "BadCursor", "message": "Malformed cursor"},
+            )
+
+    version = await ballot_version.current(ballot_rkey)
+    etag = ballot_version.etag_for(
+        ballot_rkey, version, "argument.list", sort_key, type_key, source_key, limit,
+        cursor if after else None, requested_lang, viewer_did, peer_review_on,
+    )
+    if ballot_version.not_modified(request, etag):
+        return cache_control.apply(ballot_version.not_modified_response(etag), viewer_did)
+
+    # Public page: everything that shapes it except the viewer. The shuffle
+    # seed is the viewer DID, so random pages of a signed-in viewer are their
+    # own — those only go through the single-flight and are never cached, or
+    # every viewer's pages would push the shared ones out of the cache.
+    fast = fast_json.enabled()
+    page_key = (
+        type_key, source_key, sort_key, limit, seed, after, requested_lang, peer_review_on, fast,
+    )
+    cacheable = not seed
+
+    async def build_page() -> dict:
+        rows = await _fetch_argument_rows(
+            ballot_rkey, type_key, source_key, sort_key, limit, seed, after
+        )
+        # A full page may have a successor.
+        next_cursor = None
+        if seeded_shuffle and rows and len(rows) == limit:
+            next_cursor = f"{rows[-1]['shuffle_key']}::{rows[-1]['uri']}"
+        if fast:
+            return {
+                "uris": [r["uri"] for r in rows],
+                "items": [_argument_json(r, peer_review_on, requested_lang) for r in rows],
+                "cursor": next_cursor,
+            }
+        page: dict = {
+            "arguments": [
+                _serialize_argument_row(r, peer_review_on, requested_lang) for r in rows
+            ]
+        }
+        if next_cursor:
+            page["cursor"] = next_cursor
+        return page
 
-        if seeded_shuffle:
-            seed = viewer_did or ""
-            arguments.sort(
-                key=lambda a: hashlib.md5(
-                    f"{seed}:{a['uri']}".encode()
-                ).hexdigest()
+    try:
+        page = _list_pages.get(ballot_rkey, version, page_key) if cacheable else None
+        if page is None:
+            # Concurrent identical requests share one query + serialization.
+            page = await _list_flight.do((ballot_rkey, version, page_key), build_page)
+            if cacheable:
+                _list_pages.put(ballot_rkey, version, page_key, page)
+
+        uris = page["uris"] if fast else [a["uri"] for a in page["arguments"]]
+        ratings = {}
+        if viewer_did and uris:
+            db_pool = await get_pool()
+            async with db_pool.acquire() as conn:
+                ratings = await fetch_viewer_ratings(conn, viewer_did, uris)
+
+        if fast:
+            items = [
+                fast_json.with_viewer(item, viewer_block(ratings[uri])) if uri in ratings else item
+                for uri, item in zip(page["uris"], page["items"])
+            ]
+            response = fast_json.RawJSONResponse(
+                fast_json.page("arguments", items, cursor=page["cursor"])
             )
-            arguments = arguments[:limit]
+        else:
+            content = page
+            if ratings:
+                content = {**page, "arguments": overlay_viewer_ratings(page["arguments"], ratings)}
+            response = JSONResponse(status_code=200, content=content)
 
-        return JSONResponse(status_code=200, content={"arguments": arguments})
+        return cache_control.apply(ballot_version.with_etag(response, etag), viewer_did)
     except Exception as err:
         logger.error(f"DB query failed: {err}")
         return JSONResponse(
@@ -328,47 +459,35 @@ async def get_argument(
     rkey: str = Query(...),
     lang: Optional[str] = Query(None),
     accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
+    session: Optional[TSession] = Depends(optional_session_token),
 ):
     """Fetch a single argument by (ballot_rkey, rkey), localized to the requested language."""
     requested_lang = resolve_requested_lang(lang, accept_language)
     viewer_did = session.did if session else None
     peer_review_on = os.getenv("APPVIEW_PEER_REVIEW_ENABLED", "false").lower() == "true"
 
-    params: list = [ballot_rkey, rkey]
-    if viewer_did:
-        params.append(viewer_did)
-        viewer_param = f"${len(params)}"
-        viewer_select = f""",
-            (
-                SELECT uri FROM app_likes
-                WHERE subject_uri = a.uri AND did = {viewer_param} AND NOT deleted
-                LIMIT 1
-            ) AS viewer_like,
-            (
-                SELECT preference FROM app_likes
-                WHERE subject_uri = a.uri AND did = {viewer_param} AND NOT deleted
-                LIMIT 1
-            ) AS viewer_preference"""
-    else:
-        viewer_select = ",\n            NULL AS viewer_like,\n            NULL AS viewer_preference"
-
-    sql = f"""
+    # Same viewer-independent row for everyone; the viewer's rating is overlaid.
+    sql = """
         SELECT a.*,
                p.display_name AS author_display_name,
                p.canton AS author_canton,
                p.color AS author_color
-               {viewer_select}
         FROM app_arguments a
         LEFT JOIN app_profiles p ON p.did = a.author_did
         WHERE a.ballot_rkey = $1 AND a.rkey = $2 AND NOT a.deleted
         LIMIT 1;
     """
 
+    etag = await ballot_version.ballot_etag(
+        ballot_rkey, "argument.get", rkey, requested_lang, viewer_did, peer_review_on,
+    )
+    if ballot_version.not_modified(request, etag):
+        return cache_control.apply(ballot_version.not_modified_response(etag), viewer_did)
+
     try:
         db_pool = await get_pool()
         async with db_pool.acquire() as conn:
-            row = await conn.fetchrow(sql, *params)
+            row = await conn.fetchrow(sql, ballot_rkey, rkey)
             if row is None:
                 return JSONResponse(
                     status_code=404,
@@ -377,12 +496,16 @@ async def get_argument(
             # Topic-Breadcrumbs: alle Knoten, an denen das Argument hängt, je mit
             # Pfad zur Wurzel (für die Taxonomie-Anzeige auf der Detailseite).
             path_rows = await conn.fetch(_TOPIC_PATH_SQL, row["uri"])
+            argument = (await with_viewer_ratings(
+                conn, [_serialize_argument_row(row, peer_review_on, requested_lang)], viewer_did
+            ))[0]
 
-        argument = _serialize_argument_row(dict(row), peer_review_on, requested_lang)
         topic_paths = _build_topic_paths(path_rows)
         if topic_paths:
             argument["topicPaths"] = topic_paths
-        return JSONResponse(status_code=200, content={"argument": argument})
+        return cache_control.apply(ballot_version.with_etag(
+            JSONResponse(status_code=200, content={"argument": argument}), etag
+        ), viewer_did)
     except Exception as err:
         logger.error(f"DB query failed: {err}")
         return JSONResponse(
@@ -17,12 +17,18 @@ from fastapi import APIRouter, Depends, Header, Query, Request
 from fastapi.responses import JSONResponse
 
 from src.atproto.atproto_api import pds_create_record
-from src.auth.middleware import TSession, verify_session_token
+from src.auth.middleware import TSession, optional_session_token, verify_session_token
+from src.core import ballot_version, cache_control, fast_json
 from src.core.db import get_pool
 from src.core.fastapi import logger, limiter
 from src.core.languages import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES_SET
 from src.core.lib import get_date_iso, get_number, get_string
+from src.core.payload_cache import PayloadCache
+from src.core.single_flight import SingleFlight
 from src.routes.deliberation._lang import resolve_requested_lang
+from src.routes.deliberation.likes import (
+    fetch_viewer_ratings, viewer_block, with_viewer_ratings,
+)
 from src.routes.deliberation.quota import QuotaExceeded, release, reserve, set_uri
 
 router = APIRouter(prefix="/xrpc", tags=["poltr-comments"])
@@ -30,12 +36,26 @@ router = APIRouter(prefix="/xrpc", tags=["poltr-comments"])
 
 def _serialize_comment_row(row: dict, requested_lang: str) -> dict:
     """Convert an app_comments row (with sidecar-translation LEFT JOIN) into
-    the API comment shape, localized to `requested_lang`.
+    the viewer-independent API comment shape, localized to `requested_lang`.
+    The viewer block is overlaid afterwards (likes.with_viewer_ratings)."""
+    return {**_comment_static(row, requested_lang), "likeCount": get_number(row, "like_count")}
+
+
+def _comment_stamp(row: dict) -> tuple:
+    """Row columns the static part is built from (fast-path fragment key)."""
+    return (
+        row.get("cid"), row.get("indexed_at"), row.get("t_body"), row.get("t_source"),
+        tuple(row.get("translation_langs") or ()), row.get("handle"), row.get("display_name"),
+        row.get("profile_display_name"), row.get("profile_canton"), row.get("profile_color"),
+    )
+
+
+def _comment_static(row: dict, requested_lang: str) -> dict:
+    """Everything but the like counter.
 
     The query is expected to provide:
       - c.* (incl. langs, translation_status)
       - p.* (profile fields, prefixed profile_)
-      - viewer_like (NULL or AT-URI)
       - t_lang, t_body, t_source (LEFT JOIN on the sidecar for requested_lang)
       - translation_langs (text[] of all available sidecar langs)
     """
@@ -56,10 +76,6 @@ def _serialize_comment_row(row: dict, requested_lang: str) -> dict:
         }
     author = {k: v for k, v in author_raw.items() if v is not None}
 
-    viewer_obj = {}
-    if row.get("viewer_like"):
-        viewer_obj["like"] = row["viewer_like"]
-
     origin_langs = row.get("langs")
     if not isinstance(origin_langs, list) or not origin_langs:
         origin_langs = [DEFAULT_LANGUAGE]
@@ -114,15 +130,26 @@ def _serialize_comment_row(row: dict, requested_lang: str) -> dict:
         "origin": origin_type,
         "parentUri": get_string(row, "parent_uri"),
         "argumentUri": get_string(row, "argument_uri") or "",
-        "likeCount": get_number(row, "like_count"),
         "indexedAt": get_date_iso(row, "indexed_at"),
-        "viewer": viewer_obj if viewer_obj else None,
         "availableLangs": available_langs,
         "translationSource": translation_source,
     }
     return {k: v for k, v in comment_raw.items() if v is not None}
 
 
+_fragments = fast_json.FragmentCache("comment")
+
+
+def _comment_json(row: dict, requested_lang: str) -> bytes:
+    """Fast path: the comment as JSON bytes, static part from the fragment
+    cache."""
+    fragment = _fragments.render(
+        (row["uri"], requested_lang), _comment_stamp(row),
+        lambda: _comment_static(row, requested_lang),
+    )
+    return fast_json.close(fragment, {"likeCount": get_number(row, "like_count")})
+
+
 # Shared SELECT fragment used by both list and get. `$N` placeholders are
 # filled in by the caller via _build_translation_join(requested_lang, idx).
 _COMMENT_BASE_COLUMNS = """
@@ -162,6 +189,12 @@ def _translation_select() -> str:
 # app.ch.poltr.comment.list
 # -----------------------------------------------------------------------------
 
+# Public payload: ALL comments of an argument, serialized, per (argument, lang)
+# and ballot version. The per-viewer shuffle, the limit and the viewer's likes
+# are applied on top, so signed-in viewers share the cached list.
+_list_flight = SingleFlight("comment.list", timeout=10.0)
+_list_payloads = PayloadCache("comment.list")
+
 
 @router.get("/app.ch.poltr.comment.list")
 async def list_comments(
@@ -170,30 +203,18 @@ async def list_comments(
     limit: int = Query(50),
     lang: Optional[str] = Query(None),
     accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
+    session: Optional[TSession] = Depends(optional_session_token),
 ):
-    """List comments for an argument, localized to the requested language."""
+    """List comments for an argument, localized to the requested language.
+    Anonymous (public read mode): no viewer fields, shared-cacheable."""
     requested_lang = resolve_requested_lang(lang, accept_language)
-    params: list = [argument_uri, requested_lang]   # $1 = argument_uri, $2 = requested_lang
-
     viewer_did = session.did if session else None
-    if viewer_did:
-        params.append(viewer_did)
-        viewer_param = f"${len(params)}"
-        viewer_select = f""",
-            (
-                SELECT uri FROM app_likes
-                WHERE subject_uri = c.uri AND did = {viewer_param} AND NOT deleted
-                LIMIT 1
-            ) AS viewer_like"""
-    else:
-        viewer_select = ",\n            NULL AS viewer_like"
 
+    # $1 = argument_uri, $2 = requested_lang
     sql = f"""
         SELECT
             {_COMMENT_BASE_COLUMNS},
             {_translation_select()}
-            {viewer_select}
         FROM app_comments c
         LEFT JOIN app_profiles p ON p.did = c.did
         {_translation_join("$2")}
@@ -201,20 +222,63 @@ async def list_comments(
         ORDER BY c.created_at ASC, c.uri;
     """
 
-    try:
+    found = await ballot_version.current_of_argument(argument_uri)
+    ballot_rkey, version = found if found else (None, None)
+    etag = (
+        ballot_version.etag_for(
+            ballot_rkey, version, argument_uri, "comment.list", limit, requested_lang, viewer_did
+        )
+        if found else None
+    )
+    if ballot_version.not_modified(request, etag):
+        return cache_control.apply(ballot_version.not_modified_response(etag), viewer_did)
+
+    fast = fast_json.enabled()
+
+    async def build_payload() -> list:
         db_pool = await get_pool()
         async with db_pool.acquire() as conn:
-            rows = await conn.fetch(sql, *params)
+            rows = await conn.fetch(sql, argument_uri, requested_lang)
+        if fast:
+            return [(r["uri"], _comment_json(r, requested_lang)) for r in rows]
+        return [_serialize_comment_row(r, requested_lang) for r in rows]
 
-        comments = [_serialize_comment_row(dict(r), requested_lang) for r in rows]
+    try:
+        payload_key = (argument_uri, requested_lang, fast)
+        payload = _list_payloads.get(ballot_rkey, version, payload_key)
+        if payload is None:
+            payload = await _list_flight.do((payload_key, version), build_payload)
+            _list_payloads.put(ballot_rkey, version, payload_key, payload)
 
         seed = viewer_did or ""
-        comments.sort(
-            key=lambda c: hashlib.md5(f"{seed}:{c['uri']}".encode()).hexdigest()
-        )
-        comments = comments[:limit]
-
-        return JSONResponse(status_code=200, content={"comments": comments})
+        uri_of = (lambda c: c[0]) if fast else (lambda c: c["uri"])
+        comments = sorted(
+            payload,
+            key=lambda c: hashlib.md5(f"{seed}:{uri_of(c)}".encode()).hexdigest(),
+        )[:limit]
+
+        if fast:
+            ratings = {}
+            if viewer_did and comments:
+                db_pool = await get_pool()
+                async with db_pool.acquire() as conn:
+                    ratings = await fetch_viewer_ratings(conn, viewer_did, [c[0] for c in comments])
+            items = [
+                fast_json.with_viewer(item, viewer_block(ratings[uri], with_preference=False))
+                if uri in ratings else item
+                for uri, item in comments
+            ]
+            response = fast_json.RawJSONResponse(fast_json.page("comments", items))
+        else:
+            if viewer_did and comments:
+                db_pool = await get_pool()
+                async with db_pool.acquire() as conn:
+                    comments = await with_viewer_ratings(
+                        conn, comments, viewer_did, with_preference=False
+                    )
+            response = JSONResponse(status_code=200, content={"comments": comments})
+
+        return cache_control.apply(ballot_version.with_etag(response, etag), viewer_did)
     except Exception as err:
         logger.error(f"DB query failed: {err}")
         return JSONResponse(
@@ -233,30 +297,17 @@ async def get_comment(
     uri: str = Query(...),
     lang: Optional[str] = Query(None),
     accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
+    session: Optional[TSession] = Depends(optional_session_token),
 ):
     """Get a single comment by URI with its parent argument info."""
     requested_lang = resolve_requested_lang(lang, accept_language)
-    params: list = [uri, requested_lang]   # $1 = comment uri, $2 = requested_lang
-
     viewer_did = session.did if session else None
-    if viewer_did:
-        params.append(viewer_did)
-        viewer_param = f"${len(params)}"
-        viewer_select = f""",
-            (
-                SELECT uri FROM app_likes
-                WHERE subject_uri = c.uri AND did = {viewer_param} AND NOT deleted
-                LIMIT 1
-            ) AS viewer_like"""
-    else:
-        viewer_select = ",\n            NULL::text AS viewer_like"
 
+    # $1 = comment uri, $2 = requested_lang
     sql = f"""
         SELECT
             {_COMMENT_BASE_COLUMNS},
-            {_translation_select()}
-            {viewer_select},
+            {_translation_select()},
             a.uri AS arg_uri, a.rkey AS arg_rkey, a.title AS arg_title,
             a.body AS arg_body, a.type AS arg_type,
             a.like_count AS arg_like_count, a.comment_count AS arg_comment_count,
@@ -272,16 +323,16 @@ async def get_comment(
     try:
         db_pool = await get_pool()
         async with db_pool.acquire() as conn:
-            row = await conn.fetchrow(sql, *params)
-
-        if not row:
-            return JSONResponse(
-                status_code=404,
-                content={"error": "not_found", "message": "Comment not found"},
-            )
-
-        row = dict(row)
-        comment = _serialize_comment_row(row, requested_lang)
+            row = await conn.fetchrow(sql, uri, requested_lang)
+            if not row:
+                return JSONResponse(
+                    status_code=404,
+                    content={"error": "not_found", "message": "Comment not found"},
+                )
+            comment = (await with_viewer_ratings(
+                conn, [_serialize_comment_row(row, requested_lang)], viewer_did,
+                with_preference=False,
+            ))[0]
 
         argument_raw = {
             "uri": get_string(row, "arg_uri") or "",
@@ -301,9 +352,9 @@ async def get_comment(
         }
         argument = {k: v for k, v in argument_raw.items() if v is not None}
 
-        return JSONResponse(
+        return cache_control.apply(JSONResponse(
             status_code=200, content={"comment": comment, "argument": argument}
-        )
+        ), viewer_did)
     except Exception as err:
         logger.error(f"DB query failed: {err}")
         return JSONResponse(
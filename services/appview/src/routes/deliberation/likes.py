@@ -15,6 +15,63 @@ from src.core.fastapi import logger
 router = APIRouter(prefix="/xrpc", tags=["poltr-likes"])
 
 
+async def fetch_viewer_ratings(conn, viewer_did: str, subject_uris: list[str]) -> dict:
+    """The viewer's own ratings of the given subjects:
+    {subject_uri: {"like": <rating AT-URI>, "preference": 0–100}}.
+
+    Lets list endpoints share one viewer-independent query across callers and
+    overlay the per-viewer part afterwards.
+    """
+    if not subject_uris:
+        return {}
+    rows = await conn.fetch(
+        """
+        SELECT DISTINCT ON (subject_uri) subject_uri, uri, preference
+        FROM app_likes
+        WHERE did = $1 AND subject_uri = ANY($2::text[]) AND NOT deleted
+        """,
+        viewer_did,
+        subject_uris,
+    )
+    return {
+        r["subject_uri"]: {"like": r["uri"], "preference": r["preference"]}
+        for r in rows
+    }
+
+
+def overlay_viewer_ratings(
+    items: list[dict], ratings: dict, *, with_preference: bool = True
+) -> list[dict]:
+    """Serialized items (no viewer fields) with the viewer's own rating merged
+    in as a `viewer` block. Rated items are copied, unrated ones returned as
+    they are — cached public payloads (src/core/payload_cache.py) stay
+    untouched."""
+    out = []
+    for item in items:
+        mine = ratings.get(item["uri"])
+        out.append({**item, "viewer": viewer_block(mine, with_preference)} if mine else item)
+    return out
+
+
+async def with_viewer_ratings(
+    conn, items: list[dict], viewer_did: str | None, *, with_preference: bool = True
+) -> list[dict]:
+    """fetch_viewer_ratings + overlay_viewer_ratings for serialized items.
+    Anonymous requests (no viewer_did) get the items back unchanged."""
+    if not viewer_did or not items:
+        return items
+    ratings = await fetch_viewer_ratings(conn, viewer_did, [i["uri"] for i in items])
+    return overlay_viewer_ratings(items, ratings, with_preference=with_preference)
+
+
+def viewer_block(mine: dict, with_preference: bool = True) -> dict:
+    """API `viewer` object for one fetch_viewer_ratings entry."""
+    viewer = {"like": mine["like"]}
+    if with_preference and mine["preference"] is not None:
+        viewer["preference"] = int(mine["preference"])
+    return viewer
+
+
 @router.post("/app.ch.poltr.content.rating")
 async def create_like(
     request: Request,
@@ -19,6 +19,7 @@ import httpx
 from fastapi import APIRouter, Depends, Header, Request
 from fastapi.responses import JSONResponse
 
+from src.core import http_clients
 from src.auth.middleware import TSession, verify_session_token
 from src.core.fastapi import logger, limiter
 from src.routes.deliberation._lang import resolve_requested_lang
@@ -40,7 +41,7 @@ async def _fetch_similar(ballot_rkey: str, lang: str, title: str, body: str,
         "title": title, "body": body, "type": stance, "limit": limit,
     }
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
+        async with http_clients.use("calculator", timeout=20.0) as client:
             resp = await client.post(url, json=payload)
     except httpx.RequestError as err:
         logger.warning("precheck: calculator unreachable: %s", err)
@@ -98,11 +99,15 @@ async def _fetch_stance(ballot_rkey: str, lang: str, title: str, body: str,
         "title": title, "body": body, "type": stance,
     }
     try:
-        async with httpx.AsyncClient(timeout=45.0) as client:
+        async with http_clients.use("calculator", timeout=45.0) as client:
             resp = await client.post(url, json=payload)
     except httpx.RequestError as err:
         logger.warning("precheck: stance calculator unreachable: %s", err)
         return {"status": "unavailable"}
+    if resp.status_code == 503:
+        # Chat-Kontingent des Calculators ausgelastet (Warte-Deadline überschritten).
+        logger.info("precheck: stance busy")
+        return {"status": "unavailable", "reason": "busy"}
     if resp.status_code != 200:
         logger.warning("precheck: stance returned %s: %s",
                        resp.status_code, resp.text[:200])
@@ -31,6 +31,7 @@ import httpx
 from fastapi import APIRouter, Query, Request, Depends
 from fastapi.responses import JSONResponse
 
+from src.core import http_clients
 from src.auth.middleware import TSession, verify_session_token
 from src.core.db import get_pool
 from src.core.fastapi import limiter
@@ -129,7 +130,7 @@ async def get_duplicate_candidate(
     if lang:
         params["lang"] = lang
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
+        async with http_clients.use("calculator", timeout=20.0) as client:
             resp = await client.get(url, params=params)
     except httpx.RequestError as err:
         logger.warning("duplicateCandidate: calculator unreachable: %s", err)
@@ -13,6 +13,7 @@ Antwort:
   { ballotRkey, tree: Node }
   Node = { id, key, name, description (intern, LLM-Klassifikation),
            introduction (voter-facing), depth, argumentCount (Teilbaum, distinct),
+           proCount / contraCount / participantCount (Teilbaum, distinct),
            arguments: [{uri, rkey, title, type, sourceType, likeCount,
                         availableLangs}], children: [Node, …] }
 """
@@ -21,17 +22,22 @@ import hashlib
 import json
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Header, Query
+import numpy as np
+from fastapi import APIRouter, Depends, Header, Query, Request
 from fastapi.responses import JSONResponse
 
-from src.auth.middleware import TSession, verify_session_token
+from src.auth.middleware import TSession, optional_session_token
+from src.core import ballot_version, cache_control
 from src.core.db import get_pool
 from src.core.fastapi import logger
+from src.core.single_flight import SingleFlight
+from src.core.taxonomy_tree import TaxonomyTree, factorize
 from src.routes.deliberation._lang import (
     pick_node_translation,
     pick_translation,
     resolve_requested_lang,
 )
+from src.routes.deliberation.likes import fetch_viewer_ratings
 
 router = APIRouter(prefix="/xrpc", tags=["poltr-taxonomy"])
 
@@ -73,20 +79,24 @@ def _shuffle_tree(node: dict, seed: str) -> None:
         _shuffle_tree(ch, seed)
 
 
-def _flatten_child(child: dict) -> dict:
+# Teilbaum-Aggregate je Knoten (gesetzt von _aggregate) mit ihren Leerwerten.
+_AGG_DEFAULTS = {
+    "argumentCount": 0, "proCount": 0, "contraCount": 0, "participantCount": 0,
+    "ratedCount": 0, "proLeaning": None, "dissent": 0.0,
+}
+_AGG_FIELDS = tuple(_AGG_DEFAULTS)
+
+
+def _flatten_child(child: dict, tree: TaxonomyTree, by_id: dict[int, dict]) -> dict:
     """Fasst den Teilbaum von `child` zu EINEM flachen Knoten zusammen: alle
-    Argumente des Teilbaums (Kind + alle Nachfahren) werden gesammelt, tiefere
-    Ebenen entfallen. Multi-Membership innerhalb des Teilbaums wird per uri
+    Argumente des Teilbaums (Kind + alle Nachfahren, Pre-Order) werden gesammelt,
+    tiefere Ebenen entfallen. Multi-Membership innerhalb des Teilbaums wird per uri
     dedupliziert (Reihenfolge bleibt erhalten)."""
     seen: dict[str, dict] = {}
-
-    def walk(n: dict) -> None:
-        for a in n["arguments"]:
+    for i in tree.subtree(tree.index[child["id"]]):
+        for a in by_id[tree.ids[i]]["arguments"]:
             seen.setdefault(a["uri"], a)
-        for c in n["children"]:
-            walk(c)
 
-    walk(child)
     return {
         "id": child["id"], "key": child["key"], "name": child["name"],
         "description": child["description"], "introduction": child.get("introduction"),
@@ -95,7 +105,10 @@ def _flatten_child(child: dict) -> dict:
         # ursprünglich eigene Unterthemen gab — das Frontend entscheidet damit
         # zwischen Drilldown („Mehr zum Unterthema") und inline „Mehr anzeigen".
         "hasChildren": len(child["children"]) > 0,
-        "children": [], "arguments": list(seen.values()), "argumentCount": 0,
+        "children": [], "arguments": list(seen.values()),
+        # Aggregate gelten für den ganzen Teilbaum (siehe _aggregate) — genau das,
+        # was der flache Knoten jetzt repräsentiert.
+        **{f: child[f] for f in _AGG_FIELDS},
     }
 
 
@@ -110,10 +123,7 @@ def _slim(node: dict) -> dict:
         "id": node["id"], "key": node["key"], "name": node["name"],
         "description": node["description"], "introduction": node.get("introduction"),
         "depth": node["depth"],
-        "argumentCount": node.get("argumentCount", 0),
-        "proLeaning": node.get("proLeaning"),
-        "dissent": node.get("dissent", 0.0),
-        "ratedCount": node.get("ratedCount", 0),
+        **{f: node.get(f, _AGG_DEFAULTS[f]) for f in _AGG_FIELDS},
         "arguments": [
             {"uri": a["uri"], "type": a["type"],
              "viewerPreference": a.get("viewerPreference")}
@@ -123,10 +133,18 @@ def _slim(node: dict) -> dict:
     }
 
 
-def _aggregate(node: dict, acc: set, arg_meta: dict) -> set:
-    """Rekursiv: setzt je Knoten `argumentCount` (distinct im Teilbaum) und die
-    Pro-Vorlage-Neigung `proLeaning` ∈ [-1, 1] (None, wenn keine aussagekräftig
-    bewerteten Argumente).
+def _aggregate(tree: TaxonomyTree, by_id: dict[int, dict],
+               by_node: dict[int, dict[str, dict]], arg_meta: dict,
+               authors: dict[str, str]) -> None:
+    """Setzt je Knoten (in `by_id`) die Teilbaum-Aggregate — alle distinct über
+    die Argumente des Teilbaums (Multi-Membership zählt einmal):
+    `argumentCount`, `proCount`/`contraCount`, `participantCount` (Autor:innen),
+    `ratedCount` und die Pro-Vorlage-Neigung `proLeaning` ∈ [-1, 1] (None, wenn
+    keine aussagekräftig bewerteten Argumente) samt `dissent`.
+
+    Vektorisiert über den flachen Baum (src/core/taxonomy_tree.py) statt per
+    Rekursion mit Set-Vereinigungen. Direkt an der Wurzel hängende Argumente (der
+    Alt-„andere"-Topf) zählen nirgends mit.
 
     Modell (UNIPOLAR): die Bewertung misst, wie stark ein Argument FÜR seine Seite
     spricht (0–100). Pro Argument ist `arg_meta[uri]` der Pro-Vorlage-Beitrag
@@ -135,45 +153,89 @@ def _aggregate(node: dict, acc: set, arg_meta: dict) -> set:
     nie über die Mitte. `pref = 0` = „spricht gar nicht dafür" = kein Beitrag.
     Beiträge werden nach positiver/negativer Seite gebündelt und normiert.
     (Vgl. services/frontend/src/lib/aggregate.ts + doc/AGGREGATION.md.)"""
-    local: set = set()
-    for a in node["arguments"]:
-        local.add(a["uri"])
-    for ch in node["children"]:
-        _aggregate(ch, local, arg_meta)
-    node["argumentCount"] = len(local)
+    idx: list[int] = []
+    uris: list[str] = []
+    types: list[str] = []
+    for nid, args in by_node.items():
+        i = tree.index.get(nid)
+        if i is None or i == tree.root:
+            continue
+        for uri, a in args.items():
+            idx.append(i)
+            uris.append(uri)
+            types.append(a["type"])
+    node = np.asarray(idx, dtype=np.int64)
+    key = factorize(uris)
+    contrib = np.array([arg_meta.get(u, np.nan) for u in uris], dtype=np.float64)
+    rated = ~np.isnan(contrib)
+    is_pro = np.array([t == "PRO" for t in types], dtype=bool)
+    author = np.array([u in authors for u in uris], dtype=bool)
+
+    counts = tree.distinct(node, key)
+    pros = tree.distinct(node[is_pro], key[is_pro])
+    cons = tree.distinct(node[~is_pro], key[~is_pro])
+    participants = tree.distinct(node[author], [authors[u] for u in uris if u in authors])
+    n_rated = tree.distinct(node[rated], key[rated])
     # Zustimmungs-Beiträge der bewerteten Argumente in Richtung Befürworter (pos)
     # bzw. Gegner (neg) bündeln. Neutrale (Beitrag 0) zählen als bewertet, tragen
     # aber keine Richtung bei.
-    pos = 0.0   # Masse Richtung Befürworter
-    neg = 0.0   # Masse Richtung Gegner
-    rated = 0
-    for uri in local:
-        contrib = arg_meta.get(uri)
-        if contrib is None:
-            continue
-        if contrib > 0:
-            pos += contrib
-        elif contrib < 0:
-            neg += -contrib
-        rated += 1
+    pos = tree.distinct(node[rated], key[rated], np.clip(contrib[rated], 0, None))
+    neg = tree.distinct(node[rated], key[rated], np.clip(-contrib[rated], 0, None))
     total = pos + neg
-    node["ratedCount"] = rated
-    # proLeaning ∈ [-1,1]: -1 = ganz Gegner-Seite, +1 = ganz Befürworter-Seite.
-    node["proLeaning"] = round((pos - neg) / total, 4) if total > 0 else None
-    # dissent ∈ [0,1]: 1 = beide Pole gleich stark (gespalten), 0 = einseitig.
-    node["dissent"] = round(2 * min(pos, neg) / total, 4) if total > 0 else 0.0
-    acc |= local
-    return local
+
+    for i, nid in enumerate(tree.ids):
+        t = float(total[i])
+        by_id[nid].update({
+            "argumentCount": int(counts[i]),
+            "proCount": int(pros[i]),
+            "contraCount": int(cons[i]),
+            "participantCount": int(participants[i]),
+            "ratedCount": int(n_rated[i]),
+            # proLeaning ∈ [-1,1]: -1 = ganz Gegner-Seite, +1 = ganz Befürworter-Seite.
+            "proLeaning": round((float(pos[i]) - float(neg[i])) / t, 4) if t > 0 else None,
+            # dissent ∈ [0,1]: 1 = beide Pole gleich stark (gespalten), 0 = einseitig.
+            "dissent": round(2 * min(float(pos[i]), float(neg[i])) / t, 4) if t > 0 else 0.0,
+        })
+
+
+_tree_flight = SingleFlight("taxonomy.get", timeout=10.0)
+
+
+async def _fetch_tree_rows(ballot_rkey: str) -> tuple[list, list]:
+    """Knoten und eingeordnete Argumente eines Ballots (ohne Viewer-Daten).
+    Wird zwischen gleichzeitigen Aufrufern geteilt — nur lesen."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        nodes = await conn.fetch(
+            """SELECT id, parent_id, key, name, description, introduction,
+                      depth, importance, langs, translations
+               FROM app_taxonomy_node WHERE ballot_rkey = $1
+               ORDER BY depth, node_order, id""",
+            ballot_rkey,
+        )
+        if not nodes:
+            return [], []
+        rows = await conn.fetch(
+            """SELECT m.node_id,
+                      a.uri, a.cid, a.rkey, a.title, a.body, a.type, a.source_type,
+                      a.like_count, a.langs, a.translations, a.author_did
+               FROM app_taxonomy_membership m
+               JOIN app_arguments a ON a.uri = m.argument_uri
+               WHERE m.ballot_rkey = $1 AND NOT a.deleted""",
+            ballot_rkey,
+        )
+    return nodes, rows
 
 
 @router.get("/app.ch.poltr.taxonomy.get")
 async def get_taxonomy(
+    request: Request,
     ballot_rkey: str = Query(...),
     topic: Optional[str] = Query(None),
     shape: Optional[str] = Query(None),
     lang: Optional[str] = Query(None),
     accept_language: Optional[str] = Header(None),
-    session: TSession = Depends(verify_session_token),
+    session: Optional[TSession] = Depends(optional_session_token),
 ):
     """Themen-Baum eines Ballots inkl. eingeordneter Argumente (lokalisiert).
     Immer Basis-Knoten + genau EINE Ebene Kinder; jedes Kind sammelt alle
@@ -183,44 +245,41 @@ async def get_taxonomy(
     - mit `topic` (Slug = node.key): Basis = dieses Topic → seine Subtopics; die
       3. Ebene entfällt (ihre Argumente landen im jeweiligen Subtopic).
 
-    Mit Session: je Knoten die zustimmungs-gewichtete Pro-Vorlage-Neigung des Viewers."""
+    Mit Session: je Knoten die zustimmungs-gewichtete Pro-Vorlage-Neigung des Viewers.
+    Anonym (Public-Read-Modus): ohne Viewer-Felder, öffentlich cachebar."""
     requested_lang = resolve_requested_lang(lang, accept_language)
     viewer_did = session.did if session else None
+    # Unveränderter Ballot (Versionszähler) → 304 ohne Baum-Abfrage.
+    etag = await ballot_version.ballot_etag(
+        ballot_rkey, "taxonomy.get", topic, shape, requested_lang, viewer_did
+    )
+    if ballot_version.not_modified(request, etag):
+        return cache_control.apply(ballot_version.not_modified_response(etag), viewer_did)
     try:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            nodes = await conn.fetch(
-                """SELECT id, parent_id, key, name, description, introduction,
-                          depth, importance, langs, translations
-                   FROM app_taxonomy_node WHERE ballot_rkey = $1
-                   ORDER BY depth, node_order, id""",
-                ballot_rkey,
+        # Knoten + Mitgliedschaften sind viewer-unabhängig: gleichzeitige
+        # Anfragen für denselben Ballot teilen sich EINE Abfrage.
+        nodes, rows = await _tree_flight.do(ballot_rkey, lambda: _fetch_tree_rows(ballot_rkey))
+        if not nodes:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "not_found",
+                         "message": f"Keine Taxonomie für Ballot {ballot_rkey}."},
             )
-            if not nodes:
-                return JSONResponse(
-                    status_code=404,
-                    content={"error": "not_found",
-                             "message": f"Keine Taxonomie für Ballot {ballot_rkey}."},
+        # Eigene Bewertungen des Viewers separat darüberlegen.
+        prefs: dict[str, int] = {}
+        if viewer_did and rows:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                ratings = await fetch_viewer_ratings(
+                    conn, viewer_did, list({r["uri"] for r in rows})
                 )
-            rows = await conn.fetch(
-                """SELECT m.node_id,
-                          a.uri, a.cid, a.rkey, a.title, a.body, a.type, a.source_type,
-                          a.like_count, a.langs, a.translations,
-                          CASE WHEN $2::text IS NULL THEN NULL ELSE (
-                              SELECT preference FROM app_likes
-                              WHERE subject_uri = a.uri AND did = $2 AND NOT deleted
-                              LIMIT 1
-                          ) END AS viewer_pref
-                   FROM app_taxonomy_membership m
-                   JOIN app_arguments a ON a.uri = m.argument_uri
-                   WHERE m.ballot_rkey = $1 AND NOT a.deleted""",
-                ballot_rkey, viewer_did,
-            )
+            prefs = {uri: v["preference"] for uri, v in ratings.items()}
 
         # node_id → { uri → arg }  (ein Argument je Knoten nur einmal)
         # arg_meta[uri] = Pro-Vorlage-Beitrag ∈ [-1,1] (siehe _aggregate / unten).
         by_node: dict[int, dict[str, dict]] = {}
         arg_meta: dict[str, tuple] = {}
+        authors: dict[str, str] = {}
         for r in rows:
             bucket = by_node.setdefault(r["node_id"], {})
             if r["uri"] in bucket:
@@ -232,7 +291,9 @@ async def get_taxonomy(
                 except (TypeError, ValueError):
                     tx = None
             loc = pick_translation(r["langs"], tx, r["title"], r["body"], requested_lang)
-            pref = r["viewer_pref"]
+            pref = prefs.get(r["uri"])
+            if r["author_did"]:
+                authors[r["uri"]] = r["author_did"]
             bucket[r["uri"]] = {
                 "uri": r["uri"],
                 "cid": r["cid"],
@@ -267,25 +328,19 @@ async def get_taxonomy(
                 "description": n["description"], "introduction": loc["introduction"],
                 "depth": n["depth"], "importance": n["importance"],
                 "availableLangs": loc.get("availableLangs"),
-                "children": [], "arguments": [], "argumentCount": 0,
+                "children": [], "arguments": [], **_AGG_DEFAULTS,
             }
 
         by_id: dict[int, dict] = {n["id"]: _node_dict(n) for n in nodes}
-        root = None
-        for n in nodes:
-            node = by_id[n["id"]]
-            if n["parent_id"] is None:
-                root = node
-            else:
-                parent = by_id.get(n["parent_id"])
-                if parent:
-                    parent["children"].append(node)
+        tree = TaxonomyTree([n["id"] for n in nodes], [n["parent_id"] for n in nodes])
+        root = tree.nest([by_id[nid] for nid in tree.ids])
 
         for nid, args in by_node.items():
             node = by_id.get(nid)
             if not node:
                 continue
             node["arguments"] = list(args.values())
+        _aggregate(tree, by_id, by_node, arg_meta, authors)
 
         # Basis-Knoten wählen: ohne `topic` die Wurzel (Hauptthemen), mit `topic`
         # der Knoten mit passendem Slug (key). Unbekannter Slug → 404.
@@ -331,29 +386,25 @@ async def get_taxonomy(
         # passen). Sie werden nur im CMS-„Nicht zugeordnet"-Bereich verwaltet.
         base_is_root = raw_by_id.get(base["id"], {}).get("parent_id") is None
         if shape == "full":
-            # Sunburst: voller verschachtelter Baum (NICHT flachklappen). Aggregate
-            # je Knoten über den ganzen Teilbaum, dann auf die Struktur-Felder
-            # reduzieren (ohne Argument-Arrays).
+            # Sunburst: voller verschachtelter Baum (NICHT flachklappen), auf die
+            # Struktur-Felder + Aggregate reduziert (ohne volle Argument-Objekte).
             base = {**base, "arguments": [] if base_is_root else base["arguments"]}
             _shuffle_tree(base, viewer_did or "")
-            _aggregate(base, set(), arg_meta)
             base = _slim(base)
         else:
             base = {
                 **base,
                 "arguments": [] if base_is_root else base["arguments"],
-                "children": [_flatten_child(c) for c in base["children"]],
+                "children": [_flatten_child(c, tree, by_id) for c in base["children"]],
             }
             # Reihenfolge: user-stabiler Shuffle der Geschwister-Themen und der
             # Argumente jedes Knotens (wie booklet argument.list, offizielle zuerst).
-            # Vor _aggregate, damit die Zähler unberührt bleiben.
             _shuffle_tree(base, viewer_did or "")
-            _aggregate(base, set(), arg_meta)
 
-        return JSONResponse(
+        return cache_control.apply(ballot_version.with_etag(JSONResponse(
             status_code=200,
             content={"ballotRkey": ballot_rkey, "tree": base, "breadcrumb": breadcrumb},
-        )
+        ), etag), viewer_did)
     except Exception as err:
         logger.error(f"taxonomy.get failed: {err}")
         return JSONResponse(
@@ -9,7 +9,7 @@ import asyncio
 import base64
 import os
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
@@ -56,6 +56,9 @@ class FakeConnection:
         self.executed.append(("fetchval", sql.strip(), params))
         return 1
 
+    def transaction(self):
+        return _FakeAcquire(self)  # no-op async context manager
+
     @staticmethod
     def _table_from_sql(sql):
         """Rough extraction of table name from SQL."""
@@ -68,16 +71,47 @@ class FakeConnection:
         return ""
 
 
+class ListConnection(FakeConnection):
+    """Store-driven stub for the list endpoints: `arguments` / `comments` rows,
+    the ballot `version` (default 1) and the viewers' ratings as
+    `likes` = {viewer_did: [{subject_uri, uri, preference}]}."""
+
+    async def fetchval(self, sql, *params):
+        self.executed.append(("fetchval", sql.strip(), params))
+        return self._store.get("version", 1)
+
+    async def fetchrow(self, sql, *params):
+        self.executed.append(("fetchrow", sql.strip(), params))
+        return {"ballot_rkey": "b1", "version": self._store.get("version", 1)}
+
+    async def fetch(self, sql, *params):
+        self.executed.append(("fetch", sql.strip(), params))
+        if "FROM app_arguments" in sql:
+            return self._store.get("arguments", [])
+        if "FROM app_comments" in sql:
+            return self._store.get("comments", [])
+        if "FROM app_likes" in sql:
+            return self._store.get("likes", {}).get(params[0], [])
+        return []
+
+
 class FakePool:
-    """Context-manager pool that yields a FakeConnection."""
+    """Context-manager pool that yields a FakeConnection — or a `conn_cls`
+    subclass with per-test query stubs, built with `conn_kwargs`:
+
+        pool = FakePool({"stats": rows}, conn_cls=StatsConnection)
+    """
 
-    def __init__(self, store: dict | None = None):
-        self._store = store or {}
+    def __init__(self, store: dict | None = None, *,
+                 conn_cls: type[FakeConnection] = FakeConnection, **conn_kwargs):
+        self._store = store if store is not None else {}
+        self._conn_cls = conn_cls
+        self._conn_kwargs = conn_kwargs
         self.last_conn: FakeConnection | None = None
         self.all_conns: list[FakeConnection] = []
 
     def acquire(self):
-        conn = FakeConnection(self._store)
+        conn = self._conn_cls(self._store, **self._conn_kwargs)
         self.last_conn = conn
         self.all_conns.append(conn)
         return _FakeAcquire(conn)
@@ -103,6 +137,24 @@ class _FakeAcquire:
 # Fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _reset_session_cache():
+    """Sessions validated in one test must not leak into the next."""
+    from src.auth import session_cache
+    session_cache.invalidate()
+    yield
+    session_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def _reset_payload_caches():
+    """List pages cached in one test must not leak into the next."""
+    from src.core import payload_cache
+    payload_cache.clear_all()
+    yield
+    payload_cache.clear_all()
+
+
 @pytest.fixture
 def fake_pool():
     """Return a factory: call with optional store dict to get a FakePool."""
@@ -126,7 +178,7 @@ def patch_email():
     with patch(
         "src.auth.magic_link_handler.email_service"
     ) as mock_email:
-        mock_email.send_confirmation_link = MagicMock(return_value=True)
+        mock_email.queue_confirmation_link = AsyncMock(return_value=True)
         yield mock_email
 
 
@@ -137,7 +189,7 @@ def patch_email_routes():
         "src.routes.auth.email_service",
         create=True,
     ) as mock_email:
-        mock_email.send_confirmation_link = MagicMock(return_value=True)
+        mock_email.queue_confirmation_link = AsyncMock(return_value=True)
         yield mock_email
 
 
@@ -0,0 +1,111 @@
+"""
+Micro-benchmark: CPU time to build one argument.list page, default path vs.
+the fast JSON path (src/core/fast_json.py). No DB, no HTTP.
+
+Rows are synthetic app_arguments rows (profile join, two inline
+translations) served in a non-origin language, so every row goes through
+the translation pick. Measured per request, with `--ratings` of the items
+rated by the viewer:
+
+  default      dict serializer + viewer overlay + JSONResponse (json.dumps)
+  fast/cold    fragments rendered from scratch (first read after a restart)
+  fast/warm    fragments reused, dynamic fields + overlay + concatenation
+               (page-cache miss after a like or comment bumped the version)
+
+    python -m tests.fast_json_bench --items 500 --repeat 200
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+
+from src.core import fast_json
+from src.routes.deliberation import arguments
+from src.routes.deliberation.likes import overlay_viewer_ratings, viewer_block
+
+
+def make_rows(n: int) -> list[dict]:
+    base = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        body = f"Argument {i}: " + "Die Vorlage stärkt die Kaufkraft der Haushalte. " * 6
+        rows.append({
+            "uri": f"at://did:plc:community/app.ch.poltr.ballot.argument/{i:06d}",
+            "cid": f"bafyrei{i:040d}", "rkey": f"{i:06d}",
+            "type": "PRO" if i % 2 else "CONTRA",
+            "ballot_uri": "at://did:plc:community/app.ch.poltr.ballot.entry/b1",
+            "ballot_rkey": "b1", "source_type": "user", "author_did": f"did:plc:user{i % 97}",
+            "title": f"Titel {i}", "body": body, "langs": ["de-CH"],
+            "translations": json.dumps([
+                {"lang": "fr-CH", "title": f"Titre {i}", "body": body, "source": "ai"},
+                {"lang": "it-CH", "title": f"Titolo {i}", "body": body, "source": "ai"},
+            ]),
+            "translation_status": "complete", "peerreview_status": "approved",
+            "like_count": i % 13, "comment_count": i % 5,
+            "created_at": base + timedelta(minutes=i), "indexed_at": base + timedelta(minutes=i),
+            "author_display_name": f"Pseudo {i % 97}", "author_canton": "ZH", "author_color": "#aa3366",
+        })
+    return rows
+
+
+def default_page(rows, ratings, lang):
+    items = [arguments._serialize_argument_row(r, True, lang) for r in rows]
+    return JSONResponse({"arguments": overlay_viewer_ratings(items, ratings)}).body
+
+
+def fast_page(rows, ratings, lang):
+    items = [arguments._argument_json(r, True, lang) for r in rows]
+    items = [
+        fast_json.with_viewer(item, viewer_block(ratings[r["uri"]])) if r["uri"] in ratings else item
+        for r, item in zip(rows, items)
+    ]
+    return fast_json.page("arguments", items)
+
+
+def cpu_ms(fn, repeat: int, before=None) -> float:
+    total = 0.0
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.process_time()
+        fn()
+        total += time.process_time() - start
+    return total / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--ratings", type=int, default=20)
+    parser.add_argument("--lang", default="fr-CH")
+    args = parser.parse_args()
+
+    rows = make_rows(args.items)
+    ratings = {
+        r["uri"]: {"like": f"at://did:plc:viewer/app.ch.poltr.content.rating/{i}", "preference": 70}
+        for i, r in enumerate(rows[: args.ratings])
+    }
+    # Same JSON either way (key order aside).
+    assert json.loads(default_page(rows, ratings, args.lang)) == json.loads(
+        fast_page(rows, ratings, args.lang)
+    )
+
+    results = {
+        "default": cpu_ms(lambda: default_page(rows, ratings, args.lang), args.repeat),
+        "fast/cold": cpu_ms(
+            lambda: fast_page(rows, ratings, args.lang), args.repeat,
+            before=arguments._fragments.clear,
+        ),
+        "fast/warm": cpu_ms(lambda: fast_page(rows, ratings, args.lang), args.repeat),
+    }
+    print(f"{args.items} items, {args.ratings} rated, lang={args.lang}, {args.repeat} runs")
+    for name, ms in results.items():
+        print(f"  {name:<10} {ms:8.3f} ms CPU/request  ({results['default'] / ms:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Tests for the warm PDS account pool (src/auth/account_pool.py) and its use in
+registration.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.atproto.provisioning import ProvisioningError
+from src.auth import account_pool
+from tests.conftest import FakeConnection, FakePool
+from tests.test_auth_register import FAKE_PSEUDONYM
+
+POOLED = {
+    "did": "did:plc:warm1", "handle": "userwarm1.id.poltr.ch",
+    "app_pw_ciphertext": b"ct", "app_pw_nonce": b"nonce",
+}
+
+
+@pytest.mark.asyncio
+async def test_registration_binds_a_pooled_account_without_provisioning():
+    pool = FakePool()
+    provision = AsyncMock()
+    bind = AsyncMock()
+
+    with (
+        patch("src.core.db.pool", pool),
+        patch("src.auth.register.generate_pseudonym", new_callable=AsyncMock, return_value=FAKE_PSEUDONYM),
+        patch("src.auth.account_pool.claim", new_callable=AsyncMock, return_value=POOLED),
+        patch("src.auth.register.provision_pds_account", provision),
+        patch("src.auth.register.bind_pool_account", bind),
+    ):
+        from src.auth.register import create_account
+
+        resp = await create_account("hmac")
+
+    assert resp.status_code == 200
+    provision.assert_not_called()
+    bind.assert_awaited_once_with("did:plc:warm1", FAKE_PSEUDONYM)
+    sql = [(q[1], q[2]) for q in pool.all_executed if q[0] == "execute"]
+    creds = next(p for s, p in sql if "INSERT INTO auth_creds" in s)
+    assert creds[:2] == ("did:plc:warm1", "userwarm1.id.poltr.ch")
+    assert any("DELETE FROM auth_pds_account_pool" in s for s, _ in sql)
+
+    # A failed bind puts the account back and reports the error.
+    release = AsyncMock()
+    with (
+        patch("src.core.db.pool", FakePool()),
+        patch("src.auth.register.generate_pseudonym", new_callable=AsyncMock, return_value=FAKE_PSEUDONYM),
+        patch("src.auth.account_pool.claim", new_callable=AsyncMock, return_value=POOLED),
+        patch("src.auth.account_pool.release", release),
+        patch("src.auth.register.bind_pool_account", AsyncMock(
+            side_effect=ProvisioningError("down", "registration_failed", 500))),
+    ):
+        resp = await create_account("hmac")
+    assert resp.status_code == 500
+    release.assert_awaited_once_with("did:plc:warm1")
+
+    # So does a failed AppView insert after a successful bind.
+    class FailingInsert(FakeConnection):
+        async def execute(self, sql, *params):
+            await super().execute(sql, *params)
+            if "INSERT INTO auth_creds" in sql:
+                raise RuntimeError("unique violation")
+
+    release = AsyncMock()
+    with (
+        patch("src.core.db.pool", FakePool(conn_cls=FailingInsert)),
+        patch("src.auth.register.generate_pseudonym", new_callable=AsyncMock, return_value=FAKE_PSEUDONYM),
+        patch("src.auth.account_pool.claim", new_callable=AsyncMock, return_value=POOLED),
+        patch("src.auth.account_pool.release", release),
+        patch("src.auth.register.bind_pool_account", AsyncMock()),
+        pytest.raises(RuntimeError),
+    ):
+        await create_account("hmac")
+    release.assert_awaited_once_with("did:plc:warm1")
+
+
+class RefillConnection(FakeConnection):
+    """Advisory lock + pool/account counts for the refill round."""
+
+    async def fetchval(self, sql, *params):
+        self.executed.append(("fetchval", sql.strip(), params))
+        if "pg_try_advisory_lock" in sql:
+            return True
+        if "status = 'ready'" in sql:
+            return self._store["ready"]
+        return self._store["accounts"] + self._store["ready"]
+
+
+@pytest.mark.asyncio
+async def test_refill_tops_up_to_target_within_account_limit(monkeypatch):
+    monkeypatch.setenv("APPVIEW_PDS_POOL_SIZE", "5")
+    monkeypatch.setenv("APPVIEW_PDS_POOL_CONCURRENCY", "2")
+    monkeypatch.setattr(account_pool, "MAX_PDS_ACCOUNTS", 50)
+    pool = FakePool({"ready": 1, "accounts": 46}, conn_cls=RefillConnection)
+
+    async def provision_one():
+        pool._store["ready"] += 1
+
+    monkeypatch.setattr(account_pool, "_provision_one", provision_one)
+    with patch("src.core.db.pool", pool):
+        # 46 users + 1 ready: only 3 more fit under MAX_PDS_ACCOUNTS=50.
+        assert await account_pool.refill_once() == 3
+    assert pool._store["ready"] == 4
+    sql = [q[1] for c in pool.all_conns for q in c.executed]
+    assert any("claimed_at < now()" in s for s in sql)  # stale claims released
+    assert "pg_advisory_unlock" in sql[-1]
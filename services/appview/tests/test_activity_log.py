@@ -0,0 +1,102 @@
+"""
+Tests for the activity feed served from app_activity_log: (ts, seq) keyset
+pages, unread count from the watermark, and markSeen advancing it.
+"""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.routes.deliberation.activity import list_activity, mark_activity_seen
+from tests.conftest import FakeConnection, FakePool
+
+VIEWER = "did:plc:viewer"
+TS = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+LATER = datetime(2026, 10, 1, 13, 0, tzinfo=timezone.utc)
+
+# Three entries share one timestamp — the old timestamp-only cursor lost them.
+LOG = [
+    {"seq": s, "activity_at": ts, "activity_type": "new_argument",
+     "activity_uri": f"at://did:plc:c/app.ch.poltr.ballot.argument/a{s}",
+     "argument_uri": f"at://did:plc:c/app.ch.poltr.ballot.argument/a{s}",
+     "actor_did": "did:plc:author", "argument_title": "T", "argument_rkey": f"a{s}",
+     "comment_uri": None, "parent_uri": None}
+    for s, ts in [(5, LATER), (4, TS), (3, TS), (2, TS), (1, TS)]
+]
+
+
+class ActivityConnection(FakeConnection):
+    """Applies the keyset filter and LIMIT of the feed query to LOG the way
+    Postgres would, from its bound parameters."""
+
+    async def fetch(self, sql, *params):
+        self.executed.append(("fetch", sql.strip(), params))
+        if "FROM app_activity_log l" not in sql:
+            return []
+        _, _viewer, *rest = params
+        limit = rest.pop()
+        rows = LOG
+        if rest:
+            rows = [r for r in rows if (r["activity_at"], r["seq"]) < tuple(rest)]
+        return rows[:limit]
+
+    async def fetchrow(self, sql, *params):
+        self.executed.append(("fetchrow", sql.strip(), params))
+        return {"latest_seq": 5, "unread_count": 3}
+
+
+async def _page(cursor=None, limit=2):
+    return await list_activity(
+        request=None, ballot_rkey="b1", filter="all", limit=limit, cursor=cursor,
+        session=SimpleNamespace(did=VIEWER),
+    )
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_equal_timestamps_once():
+    pool = FakePool({}, conn_cls=ActivityConnection)
+    seen, cursor, pages = [], None, []
+    with patch("src.core.db.pool", pool):
+        while True:
+            body = json.loads((await _page(cursor)).body)
+            pages.append(body)
+            seen += [a["activityUri"].rsplit("/", 1)[1] for a in body["activities"]]
+            cursor = body["cursor"]
+            if not cursor:
+                break
+
+    assert seen == ["a5", "a4", "a3", "a2", "a1"]
+    assert pages[0]["cursor"] == f"{TS.isoformat()}::4"
+    # Head fields only on the first page.
+    assert (pages[0]["latestSeq"], pages[0]["unreadCount"]) == (5, 3)
+    assert "unreadCount" not in pages[1]
+
+    feed = [q for c in pool.all_conns for q in c.executed
+            if q[0] == "fetch" and "FROM app_activity_log l" in q[1]]
+    assert "(l.ts, l.seq) <" in feed[1][1] and "UNION ALL" not in feed[1][1]
+    # The unread badge counts only what the feed can show (no deleted subjects).
+    (head,) = [q[1] for c in pool.all_conns for q in c.executed if "unread_count" in q[1]]
+    assert "NOT a.deleted" in head and "NOT c.deleted" in head
+
+    bad = await _page("2026-10-01T12:00:00+00:00")
+    assert bad.status_code == 400
+    assert json.loads(bad.body)["error"] == "BadCursor"
+
+
+@pytest.mark.asyncio
+async def test_mark_seen_advances_watermark_monotonically():
+    class _Request:
+        async def json(self):
+            return {"ballotRkey": "b1", "seq": 5}
+
+    pool = FakePool({}, conn_cls=ActivityConnection)
+    with patch("src.core.db.pool", pool):
+        res = await mark_activity_seen(_Request(), session=SimpleNamespace(did=VIEWER))
+
+    assert res.status_code == 200
+    (query,) = [q for c in pool.all_conns for q in c.executed]
+    assert "app_activity_watermark" in query[1] and "GREATEST" in query[1]
+    assert query[2] == (VIEWER, "b1", 5)
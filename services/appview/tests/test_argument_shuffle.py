@@ -0,0 +1,100 @@
+"""
+Tests for the seeded shuffle of argument.list (sort=random): ordering and
+keyset cursor run in SQL, one page at a time. Checks the cursor parser and the
+SQL + parameters _fetch_argument_rows builds; the ordering itself is Postgres'.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.routes.deliberation.arguments import (
+    _fetch_argument_rows, _parse_shuffle_cursor, list_arguments,
+)
+from tests.conftest import FakePool, ListConnection
+
+VIEWER = "did:plc:viewer"
+HASH = "0123456789abcdef0123456789abcdef"
+URI = "at://did:plc:c/app.ch.poltr.ballot.argument/a1"
+
+
+def _row(n: int) -> dict:
+    return {
+        "uri": f"at://did:plc:c/app.ch.poltr.ballot.argument/a{n}", "shuffle_key": f"{n:032x}",
+        "type": "PRO", "source_type": "official", "langs": ["de-CH"], "translations": [],
+        "title": "T", "body": "B",
+    }
+
+
+def _queries(pool) -> list[tuple[str, tuple]]:
+    return [(q[1], q[2]) for q in pool.all_executed if "FROM app_arguments" in q[1]]
+
+
+async def _page(cursor=None, limit=2):
+    return await list_arguments(
+        request=None, ballot_rkey="b1", sort="random", type=None, source=None,
+        limit=limit, cursor=cursor, lang="de-CH", accept_language=None,
+        session=SimpleNamespace(did=VIEWER),
+    )
+
+
+def test_parse_shuffle_cursor():
+    assert _parse_shuffle_cursor(f"{HASH}::{URI}") == (HASH, URI)
+    # Only the first separator splits: the URI part is taken as is.
+    assert _parse_shuffle_cursor(f"{HASH}::at://x::y") == (HASH, "at://x::y")
+    for bad in ("not-a-cursor", f"{HASH}::", f"{HASH}:{URI}", f"{HASH[:-1]}::{URI}",
+                f"{HASH.upper()}::{URI}", f"::{URI}"):
+        assert _parse_shuffle_cursor(bad) is None, bad
+
+
+@pytest.mark.asyncio
+async def test_shuffle_query_binds_seed_cursor_and_limit():
+    pool = FakePool(conn_cls=ListConnection)
+    with patch("src.core.db.pool", pool):
+        await _fetch_argument_rows("b1", "PRO", None, "random", 2, VIEWER, (HASH, URI))
+        await _fetch_argument_rows("b1", None, None, "top", None)
+
+    (shuffle_sql, shuffle_params), (top_sql, top_params) = _queries(pool)
+    assert shuffle_params == ("b1", "PRO", VIEWER, HASH, URI, 2)
+    key = "md5($3 || ':' || a.uri) COLLATE \"C\""
+    assert f"{key} AS shuffle_key" in shuffle_sql
+    assert f'AND ({key}, a.uri COLLATE "C") > ($4, $5)' in shuffle_sql
+    assert f'ORDER BY {key}, a.uri COLLATE "C"' in shuffle_sql
+    assert "LIMIT $6" in shuffle_sql and "OFFSET" not in shuffle_sql
+
+    assert top_params == ("b1",)
+    assert "md5(" not in top_sql and "LIMIT" not in top_sql
+    assert "ORDER BY a.like_count DESC" in top_sql
+
+
+@pytest.mark.asyncio
+async def test_cursor_round_trips_and_only_a_full_page_has_one():
+    store = {"arguments": [_row(1), _row(2)]}
+    pool = FakePool(store, conn_cls=ListConnection)
+    with patch("src.core.db.pool", pool):
+        first = json.loads((await _page()).body)
+        # len(rows) == limit → a cursor from the last row, even if nothing follows.
+        assert first["cursor"] == f"{_row(2)['shuffle_key']}::{_row(2)['uri']}"
+
+        store["arguments"] = [_row(3)]
+        second = json.loads((await _page(first["cursor"])).body)
+        assert "cursor" not in second  # short page: end of the list
+
+        bad = await _page("not-a-cursor")
+    assert bad.status_code == 400
+
+    (_, first_params), (_, second_params) = _queries(pool)
+    assert first_params == ("b1", VIEWER, 2)
+    assert second_params == ("b1", VIEWER, _row(2)["shuffle_key"], _row(2)["uri"], 2)
+
+
+@pytest.mark.asyncio
+async def test_limit_outside_bounds_is_rejected(client, monkeypatch):
+    monkeypatch.setenv("APPVIEW_PUBLIC_READ_ENABLED", "true")  # anonymous request
+    for limit in (0, -1, 501):
+        res = await client.get(
+            "/xrpc/app.ch.poltr.argument.list", params={"ballot_rkey": "b1", "limit": limit}
+        )
+        assert res.status_code == 422, limit
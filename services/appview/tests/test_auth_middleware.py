@@ -12,15 +12,17 @@ from tests.conftest import FakePool
 from src.auth.middleware import hash_token
 
 
-def make_session_row(token="valid-token", did="did:plc:abc", expired=False):
-    """Create a session row with hashed token (as stored in DB)."""
+def make_session_row(token="valid-token", did="did:plc:abc", expired=False,
+                     idle=timedelta(minutes=10)):
+    """Create a session row with hashed token (as stored in DB), last used
+    `idle` ago."""
     exp = datetime.utcnow() + (timedelta(days=-1) if expired else timedelta(days=7))
     return {
         "session_token": hash_token(token),
         "did": did,
         "user_data": json.dumps({"did": did, "handle": "user.poltr.info", "displayName": "user"}),
         "expires_at": exp,
-        "last_accessed_at": datetime.utcnow(),
+        "last_accessed_at": datetime.utcnow() - idle,
     }
 
 
@@ -42,11 +44,17 @@ async def test_valid_session_from_cookie():
         assert session.token == "good-token"
         assert session.access_token == ""
 
-        # Should have updated last_accessed_at
+        # last_accessed_at is written behind, not inline
         conn = pool.last_conn
         updates = [q for q in conn.executed if q[0] == "execute" and "UPDATE" in q[1]]
+        assert updates == []
+
+        from src.auth import session_cache
+        assert await session_cache.flush() == 1
+        updates = [q for q in pool.all_executed if q[0] == "execute" and "UPDATE" in q[1]]
         assert len(updates) == 1
         assert "auth_sessions" in updates[0][1]
+        assert updates[0][2][0] == [hash_token("good-token")]
 
 
 @pytest.mark.asyncio
@@ -121,3 +129,93 @@ async def test_expired_session_raises_401_and_deletes():
         deletes = [q for q in conn.executed if q[0] == "execute" and "DELETE" in q[1]]
         assert len(deletes) == 1
         assert "auth_sessions" in deletes[0][1]
+
+
+@pytest.mark.asyncio
+async def test_cached_session_skips_db():
+    """A second request with the same token is served from the session cache."""
+    row = make_session_row(token="hot-token")
+    pool = FakePool({"auth_sessions": [row]})
+
+    with patch("src.core.db.pool", pool):
+        from src.auth.middleware import verify_session_token
+
+        await verify_session_token(authorization=None, session_token="hot-token")
+        n_conns = len(pool.all_conns)
+        session = await verify_session_token(authorization=None, session_token="hot-token")
+
+        assert session.did == "did:plc:abc"
+        assert len(pool.all_conns) == n_conns
+
+
+@pytest.mark.asyncio
+async def test_touches_are_batched_into_one_update():
+    """Many sessions and repeated requests flush as a single UPDATE."""
+    rows = [make_session_row(token=f"tok-{i}", did=f"did:plc:{i}") for i in range(3)]
+    pool = FakePool({"auth_sessions": rows})
+
+    with patch("src.core.db.pool", pool):
+        from src.auth import session_cache
+        from src.auth.middleware import verify_session_token
+
+        for _ in range(2):
+            for i in range(3):
+                await verify_session_token(authorization=None, session_token=f"tok-{i}")
+
+        assert await session_cache.flush() == 3
+        updates = [q for q in pool.all_executed if q[0] == "execute" and "UPDATE" in q[1]]
+        assert len(updates) == 1
+        assert sorted(updates[0][2][0]) == sorted(hash_token(f"tok-{i}") for i in range(3))
+
+        # Within the touch interval nothing new is pending.
+        await verify_session_token(authorization=None, session_token="tok-0")
+        assert await session_cache.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_expiry_does_not_retouch_within_interval(monkeypatch):
+    """Re-caching after the entry TTL starts from the row's last_accessed_at:
+    a busy reader writes once per touch interval, not once per cache TTL."""
+    row = make_session_row(token="busy-token")
+    pool = FakePool({"auth_sessions": [row]})
+    monkeypatch.setenv("APPVIEW_SESSION_CACHE_TTL", "0")  # every request re-caches
+
+    with patch("src.core.db.pool", pool):
+        from src.auth import session_cache
+        from src.auth.middleware import verify_session_token
+
+        await verify_session_token(authorization=None, session_token="busy-token")
+        await verify_session_token(authorization=None, session_token="busy-token")
+        assert await session_cache.flush() == 1  # idle 10 min → one write
+        row["last_accessed_at"] = datetime.utcnow()  # what the flush wrote
+
+        for _ in range(3):
+            await verify_session_token(authorization=None, session_token="busy-token")
+        assert await session_cache.flush() == 0
+
+        row["last_accessed_at"] = datetime.utcnow() - timedelta(seconds=61)
+        await verify_session_token(authorization=None, session_token="busy-token")
+        assert await session_cache.flush() == 1
+
+
+@pytest.mark.asyncio
+async def test_revoked_session_is_reloaded_from_db():
+    """After invalidation (logout / NOTIFY) the DB decides again."""
+    from fastapi import HTTPException
+
+    row = make_session_row(token="gone-token")
+    store = {"auth_sessions": [row]}
+    pool = FakePool(store)
+
+    with patch("src.core.db.pool", pool):
+        from src.auth import session_cache
+        from src.auth.middleware import verify_session_token
+
+        await verify_session_token(authorization=None, session_token="gone-token")
+        store["auth_sessions"].clear()
+        session_cache.invalidate(did="did:plc:abc")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_session_token(authorization=None, session_token="gone-token")
+        assert exc_info.value.status_code == 401
+        assert session_cache.stats()["dirty"] == 0
@@ -0,0 +1,116 @@
+"""
+Tests for the auth purge job (src/auth/purge.py).
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from tests.conftest import FakeConnection, FakePool
+
+
+class PurgeConnection(FakeConnection):
+    """Answers the advisory lock and reports DELETE counts per table."""
+
+    def __init__(self, store, locked=True, deletes=None):
+        super().__init__(store)
+        self._locked = locked
+        self._deletes = deletes or {}
+
+    async def fetchval(self, sql, *params):
+        self.executed.append(("fetchval", sql.strip(), params))
+        return self._locked
+
+    async def execute(self, sql, *params):
+        self.executed.append(("execute", sql.strip(), params))
+        if sql.strip().startswith("DELETE"):
+            table = self._table_from_sql(sql)
+            queue = self._deletes.get(table, [])
+            return f"DELETE {queue.pop(0) if queue else 0}"
+        return "SELECT 1"
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_in_batches_until_short_batch(monkeypatch):
+    """Full batches repeat; a short batch ends the table."""
+    monkeypatch.setenv("APPVIEW_PURGE_BATCH_SIZE", "10")
+    pool = FakePool(conn_cls=PurgeConnection, deletes={
+        "auth_sessions": [10, 10, 3], "auth_pending_logins": [2],
+    })
+
+    with patch("src.core.db.pool", pool):
+        from src.auth.purge import purge_db
+
+        counts = await purge_db()
+
+    assert counts == {
+        "auth_sessions": 23,
+        "auth_pending_logins": 2,
+        "auth_pending_registrations": 0,
+        "auth_email_sends": 0,
+        "auth_email_outbox": 0,
+        "auth_pds_tokens": 0,
+    }
+    sql = [q[1] for q in pool.last_conn.executed]
+    assert sum("DELETE FROM auth_sessions" in s for s in sql) == 3
+    assert "pg_advisory_unlock" in sql[-1]
+
+
+@pytest.mark.asyncio
+async def test_purge_respects_max_batches(monkeypatch):
+    monkeypatch.setenv("APPVIEW_PURGE_BATCH_SIZE", "5")
+    monkeypatch.setenv("APPVIEW_PURGE_MAX_BATCHES", "2")
+    pool = FakePool(conn_cls=PurgeConnection, deletes={"auth_sessions": [5, 5, 5, 5]})
+
+    with patch("src.core.db.pool", pool):
+        from src.auth.purge import purge_db
+
+        counts = await purge_db()
+
+    assert counts["auth_sessions"] == 10
+
+
+@pytest.mark.asyncio
+async def test_purge_skips_db_when_lock_held_elsewhere():
+    """Another replica holds the lock → no deletes, memory still pruned."""
+    pool = FakePool(conn_cls=PurgeConnection, locked=False)
+
+    with patch("src.core.db.pool", pool):
+        from src.auth.purge import run_purge
+
+        result = await run_purge()
+
+    assert result["db"] is None
+    assert not any(q[1].startswith("DELETE") for q in pool.all_executed)
+    assert set(result["memory"]) == {"session_cache", "pds_token_cache", "peer_review_days"}
+
+
+def test_peer_review_days_pruned_to_today():
+    from src.arguments import peer_review_assign as pra
+
+    today = pra.datetime.now(pra.timezone.utc).date()
+    with patch.dict(pra._last_request_day, clear=True):
+        pra._last_request_day.update({
+            "did:plc:old": today - timedelta(days=1),
+            "did:plc:older": date(2020, 1, 1),
+            "did:plc:now": today,
+        })
+        assert pra.prune() == 2
+        assert list(pra._last_request_day) == ["did:plc:now"]
+
+
+def test_pds_token_cache_drops_expired():
+    import time
+
+    from src.atproto import atproto_api
+    from src.atproto.pds_tokens import Tokens
+
+    now = time.time()
+    with patch.dict(atproto_api.pds_tokens._tokens, clear=True):
+        atproto_api.pds_tokens._tokens.update({
+            "did:plc:stale": Tokens("jwt-a", "r-a", now - 1, now + 86400),
+            "did:plc:fresh": Tokens("jwt-b", "r-b", now + 3600, now + 86400),
+        })
+        assert atproto_api.prune_token_cache() == 1
+        assert list(atproto_api.pds_tokens._tokens) == ["did:plc:fresh"]
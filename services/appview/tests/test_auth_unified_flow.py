@@ -5,7 +5,7 @@ waitStatus and the purpose-agnostic short-code verification.
 
 import json
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, AsyncMock
 
 import pytest
 
@@ -44,7 +44,7 @@ async def test_start_registration_branch():
         patch("src.core.db.pool", pool),
         patch("src.auth.magic_link_handler.email_service") as mock_email,
     ):
-        mock_email.send_confirmation_link = MagicMock(return_value=True)
+        mock_email.queue_confirmation_link = AsyncMock(return_value=True)
 
         resp = await start_handler(StartData(email="new@test.com"))
 
@@ -52,7 +52,7 @@ async def test_start_registration_branch():
         body = json.loads(resp.body)
         assert body["success"] is True
         assert body["initiatorSecret"]  # handed back for the httpOnly cookie
-        assert mock_email.send_confirmation_link.call_args[1]["purpose"] == "registration"
+        assert mock_email.queue_confirmation_link.call_args[1]["purpose"] == "registration"
 
 
 @pytest.mark.asyncio
@@ -66,12 +66,12 @@ async def test_start_login_branch_upserts_one_code():
         patch("src.core.db.pool", pool),
         patch("src.auth.magic_link_handler.email_service") as mock_email,
     ):
-        mock_email.send_confirmation_link = MagicMock(return_value=True)
+        mock_email.queue_confirmation_link = AsyncMock(return_value=True)
 
         resp = await start_handler(StartData(email="user@test.com"))
 
         assert resp.status_code == 200
-        assert mock_email.send_confirmation_link.call_args[1]["purpose"] == "login"
+        assert mock_email.queue_confirmation_link.call_args[1]["purpose"] == "login"
         upserts = [
             q for q in pool.all_executed
             if "auth_pending_logins" in q[1] and "ON CONFLICT" in q[1]
@@ -95,12 +95,12 @@ async def test_start_login_over_per_email_cap_sends_nothing():
         patch("src.auth.magic_link_handler.email_service") as mock_email,
         patch.object(FakeConnection, "fetchval", over_cap),
     ):
-        mock_email.send_confirmation_link = MagicMock(return_value=True)
+        mock_email.queue_confirmation_link = AsyncMock(return_value=True)
 
         resp = await start_handler(StartData(email="user@test.com"))
 
         assert resp.status_code == 200  # neutral, enumeration-safe
-        mock_email.send_confirmation_link.assert_not_called()
+        mock_email.queue_confirmation_link.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -113,7 +113,7 @@ async def test_start_response_shape_identical_across_branches():
             patch("src.core.db.pool", pool),
             patch("src.auth.magic_link_handler.email_service") as mock_email,
         ):
-            mock_email.send_confirmation_link = MagicMock(return_value=True)
+            mock_email.queue_confirmation_link = AsyncMock(return_value=True)
             resp = await start_handler(StartData(email="user@test.com"))
             shapes.append(set(json.loads(resp.body).keys()))
     assert shapes[0] == shapes[1]
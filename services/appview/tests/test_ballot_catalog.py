@@ -0,0 +1,134 @@
+"""
+Tests for the ballot catalog cache (src/core/ballot_catalog.py).
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.core import ballot_catalog
+from src.core.ballot_catalog import CMSError
+
+
+DOC = {
+    "id": 1,
+    "rkey": "b1",
+    "title": {"de-CH": "Abstimmung", "fr-CH": "Votation", "it-CH": ""},
+    "topic": {"de-CH": "Umwelt"},
+    "description": {
+        "de-CH": {"root": {"children": [{"children": [{"text": "Text"}]}]}},
+    },
+    "voteDate": "2026-11-29",
+}
+
+
+@pytest.fixture(autouse=True)
+def _empty_catalog():
+    with patch.object(ballot_catalog, "_snapshot", None), \
+         patch.object(ballot_catalog, "_inflight", None):
+        yield
+
+
+def test_localize_falls_back_to_default_language():
+    fr = ballot_catalog.localize(DOC, "fr-CH")
+    assert fr["title"] == "Votation"
+    assert fr["topic"] == "Umwelt"
+    assert fr["description"] == {"root": {"children": [{"children": [{"text": "Text"}]}]}}
+    # Empty string counts as missing, like Payload's fallback-locale.
+    assert ballot_catalog.localize(DOC, "it-CH")["title"] == "Abstimmung"
+    assert ballot_catalog.available_langs(DOC) == ["de-CH", "fr-CH"]
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_while_one_reload_runs(monkeypatch):
+    monkeypatch.setenv("APPVIEW_BALLOT_CATALOG_TTL", "60")
+    calls = 0
+    release = asyncio.Event()
+
+    async def fake_fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return [dict(DOC, voteDate="2027-01-01")]
+
+    stale = ballot_catalog.Snapshot(docs=[DOC], loaded_at=0.0)
+    with patch.object(ballot_catalog, "_snapshot", stale), \
+         patch.object(ballot_catalog, "_fetch_all", fake_fetch):
+        first = await ballot_catalog.get()
+        second = await ballot_catalog.get()
+        assert first is stale and second is stale
+
+        release.set()
+        await ballot_catalog._inflight
+        fresh = await ballot_catalog.get()
+
+    assert calls == 1
+    assert fresh.by_rkey["b1"]["voteDate"] == "2027-01-01"
+
+
+@pytest.mark.asyncio
+async def test_cold_start_waits_and_failure_keeps_previous_snapshot():
+    async def down():
+        raise CMSError("cms_unreachable", "connection refused")
+
+    with patch.object(ballot_catalog, "_fetch_all", down):
+        with pytest.raises(CMSError):
+            await ballot_catalog.get()
+
+        previous = ballot_catalog.Snapshot(docs=[DOC], loaded_at=0.0)
+        ballot_catalog._snapshot = previous
+        with pytest.raises(CMSError):
+            await ballot_catalog.refresh()
+        assert ballot_catalog._snapshot is previous
+
+
+@pytest.mark.asyncio
+async def test_get_ballot_answers_500_json_on_unexpected_catalog_error():
+    from src.routes.ballots.ballots import get_ballot
+
+    async def broken():
+        raise RuntimeError("catalog exploded")
+
+    with patch("src.core.ballot_catalog.get", broken):
+        res = await get_ballot("b1", request=None, lang=None, accept_language=None, session=None)
+
+    assert res.status_code == 500
+    assert json.loads(res.body) == {"error": "internal_error", "details": "catalog exploded"}
+
+
+@pytest.mark.asyncio
+async def test_unknown_rkeys_do_not_hit_the_cms_per_request(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.routes.ballots import ballots
+
+    async def catalog():
+        return ballot_catalog.Snapshot(docs=[], loaded_at=0.0)
+
+    calls = []
+
+    async def fetch(rkey):
+        calls.append(rkey)
+        await asyncio.sleep(0)
+        return None
+
+    monkeypatch.setattr(ballots, "_draft_misses", {})
+    with patch("src.core.ballot_catalog.get", catalog), \
+         patch.object(ballots, "_fetch_cms_ballot", fetch), \
+         patch.object(ballots, "_get_ballot_counts", lambda *a: asyncio.sleep(0, {})):
+        anon = await ballots.get_ballot("nope", request=None, lang=None,
+                                        accept_language=None, session=None)
+        viewer = SimpleNamespace(did="did:plc:viewer")
+        first = await asyncio.gather(*(
+            ballots.get_ballot("nope", request=None, lang=None, accept_language=None,
+                               session=viewer)
+            for _ in range(3)
+        ))
+        again = await ballots.get_ballot("nope", request=None, lang=None,
+                                         accept_language=None, session=viewer)
+
+    assert anon.status_code == 404  # anonymous: no draft lookup at all
+    assert {r.status_code for r in first} == {404} and again.status_code == 404
+    assert calls == ["nope"]  # concurrent lookups shared, then negative-cached
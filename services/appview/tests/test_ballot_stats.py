@@ -0,0 +1,59 @@
+"""
+Tests for the trigger-maintained ballot counters (src/core/ballot_stats.py)
+and their use in the ballot endpoints.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.core import ballot_stats
+from src.routes.ballots.ballots import _get_ballot_counts, _serialize_ballot
+from tests.conftest import FakeConnection, FakePool
+
+LAST = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class StatsConnection(FakeConnection):
+    async def fetch(self, sql, *params):
+        self.executed.append(("fetch", sql.strip(), params))
+        return [r for r in self._store["stats"] if r["ballot_rkey"] in params[0]]
+
+    async def fetchval(self, sql, *params):
+        self.executed.append(("fetchval", sql.strip(), params))
+        return self._store["reconcile"].pop(0)
+
+
+@pytest.mark.asyncio
+async def test_ballot_counts_are_one_primary_key_read():
+    pool = FakePool({"stats": [{
+        "ballot_rkey": "b1", "argument_count": 5, "pro_count": 3, "contra_count": 2,
+        "comment_count": 7, "participant_count": 4, "last_activity_at": LAST,
+    }]}, conn_cls=StatsConnection)
+    with patch("src.core.db.pool", pool):
+        counts = await _get_ballot_counts(["b1", "b2"])
+
+    (query,) = [q for c in pool.all_conns for q in c.executed]
+    assert "FROM app_ballot_stats" in query[1] and "JOIN" not in query[1]
+    assert counts["b2"]["argument_count"] == 0  # no row yet → zeros
+
+    out = _serialize_ballot({"rkey": "b1"}, counts["b1"])
+    assert (out["argumentCount"], out["proCount"], out["contraCount"]) == (5, 3, 2)
+    assert (out["commentCount"], out["participantCount"]) == (7, 4)
+    assert out["lastActivityAt"] == LAST.isoformat()
+    assert "lastActivityAt" not in _serialize_ballot({"rkey": "b2"}, counts["b2"])
+
+
+@pytest.mark.asyncio
+async def test_reconcile_counts_corrections_and_skips_when_locked():
+    pool = FakePool({"reconcile": [3, None, 0]}, conn_cls=StatsConnection)
+    before = ballot_stats.stats()
+    with patch("src.core.db.pool", pool):
+        assert await ballot_stats.reconcile() == 3
+        assert await ballot_stats.reconcile() is None  # another replica holds the lock
+        assert await ballot_stats.reconcile() == 0
+    after = ballot_stats.stats()
+    assert after["reconciles"] - before["reconciles"] == 2
+    assert after["skipped"] - before["skipped"] == 1
+    assert after["corrected"] - before["corrected"] == 3
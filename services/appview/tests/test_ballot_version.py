@@ -0,0 +1,61 @@
+"""
+Tests for ETag / 304 handling (src/core/ballot_version.py).
+"""
+
+from unittest.mock import patch
+
+import pytest
+from starlette.requests import Request
+
+from src.core import ballot_version
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_if_none_match_parsing():
+    etag = ballot_version.make_etag("b1", 7, "argument.list", "de-CH")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert ballot_version.not_modified(_request(etag), etag)
+    assert ballot_version.not_modified(_request(f'"other", W/{etag}'), etag)
+    assert ballot_version.not_modified(_request("*"), etag)
+    assert not ballot_version.not_modified(_request('"other"'), etag)
+    assert not ballot_version.not_modified(_request(), etag)
+    assert not ballot_version.not_modified(_request(etag), None)
+    # Any input that shapes the body changes the tag.
+    assert etag != ballot_version.make_etag("b1", 8, "argument.list", "de-CH")
+    assert etag != ballot_version.make_etag("b1", 7, "argument.list", "fr-CH")
+
+
+@pytest.mark.asyncio
+async def test_argument_list_answers_304_before_the_list_query(patch_db):
+    from src.routes.deliberation.arguments import list_arguments
+
+    kwargs = dict(ballot_rkey="b1", sort="top", type=None, source=None, limit=100,
+                  lang="de-CH", accept_language=None, session=None)
+
+    first = await list_arguments(request=_request(), **kwargs)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    patch_db.all_conns.clear()
+    second = await list_arguments(request=_request(etag), **kwargs)
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    executed = [q[1] for q in patch_db.all_executed]
+    assert len(executed) == 1 and "app_ballot_version" in executed[0]
+
+    # A write bumps the version → the old tag no longer matches.
+    with patch.object(ballot_version, "version_of", return_value=2):
+        third = await list_arguments(request=_request(etag), **kwargs)
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_etags_can_be_disabled(patch_db, monkeypatch):
+    monkeypatch.setenv("APPVIEW_ETAGS_ENABLED", "false")
+    assert await ballot_version.ballot_etag("b1", "taxonomy.get") is None
+    assert patch_db.all_executed == []
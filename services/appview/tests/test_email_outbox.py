@@ -0,0 +1,145 @@
+"""
+Tests for the email outbox and its background sender (src/core/email_outbox.py).
+"""
+
+import base64
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.core import email_outbox
+from src.core.email_outbox import DomainLimiter, FileSink, PermanentEmailError
+from tests.conftest import FakeConnection, FakePool
+
+
+class OutboxConnection(FakeConnection):
+    """Keeps inserted outbox rows with their lease (`locked_until`): the claim
+    query leases the unclaimed ones, the renewal is fenced on the lease held."""
+
+    async def fetchval(self, sql, *params):
+        self.executed.append(("fetchval", sql.strip(), params))
+        rows = self._store.setdefault("outbox", [])
+        if "RETURNING locked_until" in sql:
+            outbox_id, held_until, lease = params
+            row = rows[outbox_id - 1]
+            now = datetime.utcnow()
+            if row["locked_until"] != held_until or held_until <= now:
+                return None
+            row["locked_until"] = now + timedelta(seconds=lease)
+            return row["locked_until"]
+        purpose, domain, ciphertext, nonce, expires_at = params
+        rows.append({
+            "id": len(rows) + 1, "recipient_domain": domain, "payload_ciphertext": ciphertext,
+            "payload_nonce": nonce, "attempts": 0, "expires_at": expires_at,
+            "locked_until": None,
+        })
+        return len(rows)
+
+    async def fetch(self, sql, *params):
+        self.executed.append(("fetch", sql.strip(), params))
+        limit, lease = params
+        claimed = [r for r in self._store.get("outbox", []) if r["locked_until"] is None][:limit]
+        for row in claimed:
+            row["locked_until"] = datetime.utcnow() + timedelta(seconds=lease)
+        return [dict(r) for r in claimed]
+
+
+@pytest.fixture
+def outbox_key(monkeypatch):
+    monkeypatch.setenv("APPVIEW_USER_CREDS_MASTER_KEY_B64", base64.b64encode(b"k" * 32).decode())
+
+
+def _updates(pool) -> list[str]:
+    return [q[1] for c in pool.all_conns for q in c.executed if q[0] == "execute"]
+
+
+@pytest.mark.asyncio
+async def test_queued_mail_is_encrypted_and_written_by_file_sink(outbox_key, tmp_path):
+    pool = FakePool({}, conn_cls=OutboxConnection)
+    expires = datetime.utcnow() + timedelta(minutes=10)
+    with patch("src.core.db.pool", pool):
+        await email_outbox.enqueue(
+            "alice@Example.org", "login", "Hi", "link: https://x/verify?token=t",
+            "<a href='https://x/verify?token=t'>go</a>", expires_at=expires,
+        )
+        row = pool._store["outbox"][0]
+        assert row["recipient_domain"] == "example.org"
+        assert b"alice" not in row["payload_ciphertext"]
+
+        assert await email_outbox.run_once(FileSink(str(tmp_path))) == 1
+
+    [eml] = tmp_path.glob("*.eml")
+    body = eml.read_text()
+    assert "To: alice@Example.org" in body and "text/html" in body
+    [update] = _updates(pool)
+    assert "status = 'sent'" in update and "payload_ciphertext = NULL" in update
+
+
+@pytest.mark.asyncio
+async def test_failures_retry_then_dead_letter_and_domains_are_rate_limited(
+    outbox_key, monkeypatch
+):
+    monkeypatch.setenv("APPVIEW_EMAIL_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("APPVIEW_EMAIL_DOMAIN_RATE_PER_MINUTE", "2")
+    monkeypatch.setattr(email_outbox, "_limiter", DomainLimiter())
+
+    class FlakySink(FileSink):
+        def __init__(self, error):
+            self.error = error
+
+        async def send(self, msg, payload):
+            raise self.error
+
+    pool = FakePool({}, conn_cls=OutboxConnection)
+    expires = datetime.utcnow() + timedelta(minutes=10)
+    with patch("src.core.db.pool", pool):
+        for _ in range(3):
+            await email_outbox.enqueue("a@x.ch", "login", "s", "t", expires_at=expires)
+        rows = list(pool._store["outbox"])
+        rows[1]["attempts"] = 2  # third failure → give up
+        await email_outbox.run_once(FlakySink(OSError("connection reset")))
+
+        await email_outbox.enqueue("b@y.ch", "login", "s", "t", expires_at=expires)
+        await email_outbox.run_once(FlakySink(PermanentEmailError("550 no such user")))
+
+    retry, gave_up, deferred, rejected = _updates(pool)
+    assert "next_attempt_at" in retry and "attempts + CASE" in retry
+    assert "status = 'dead'" in gave_up and "status = 'dead'" in rejected
+    # Third mail to x.ch within the minute: deferred, no attempt counted.
+    assert "next_attempt_at" in deferred
+    params = [q[2] for c in pool.all_conns for q in c.executed if q[0] == "execute"]
+    assert params[2][2] is None and 0 < params[2][1] <= 60
+    assert params[3][1].startswith("rejected: 550")
+
+    assert 4 <= email_outbox.backoff_seconds(1) <= 6
+    assert email_outbox.backoff_seconds(20) <= 300 * 1.2
+
+
+@pytest.mark.asyncio
+async def test_rows_whose_lease_expired_mid_batch_are_skipped(outbox_key, tmp_path, monkeypatch):
+    monkeypatch.setattr(email_outbox, "_limiter", DomainLimiter())
+    pool = FakePool({}, conn_cls=OutboxConnection)
+
+    class SlowSink(FileSink):
+        """The first send outlives the batch lease: row 2's lease runs out,
+        row 3 is re-claimed by another replica meanwhile."""
+
+        async def send(self, msg, payload):
+            rows = pool._store["outbox"]
+            if not list(self.directory.glob("*.eml")):
+                rows[1]["locked_until"] = datetime.utcnow() - timedelta(seconds=1)
+                rows[2]["locked_until"] = datetime.utcnow() + timedelta(minutes=2)
+            await super().send(msg, payload)
+
+    expires = datetime.utcnow() + timedelta(minutes=10)
+    with patch("src.core.db.pool", pool):
+        for to in ("a@x.ch", "b@y.ch", "c@z.ch", "d@w.ch"):
+            await email_outbox.enqueue(to, "login", "s", "t", expires_at=expires)
+        lost = email_outbox.stats()["lease_lost"]
+        assert await email_outbox.run_once(SlowSink(str(tmp_path))) == 4
+
+    sent = sorted(eml.read_text().split("To: ")[1].split("\n")[0] for eml in tmp_path.glob("*.eml"))
+    assert sent == ["a@x.ch", "d@w.ch"]
+    assert email_outbox.stats()["lease_lost"] == lost + 2
+    assert len([u for u in _updates(pool) if "status = 'sent'" in u]) == 2
@@ -0,0 +1,75 @@
+"""
+Tests for the fast JSON path of the list endpoints (src/core/fast_json.py).
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core import fast_json
+from tests.fast_json_bench import make_rows
+from src.routes.deliberation import arguments, comments
+from tests.conftest import FakePool, ListConnection
+
+COMMENT = {
+    "uri": "at://did:plc:u/app.ch.poltr.comment/c1", "cid": "cid1", "did": "did:plc:u",
+    "origin": "intern", "title": "", "text": "Original", "langs": ["de-CH"],
+    "argument_uri": "at://did:plc:c/app.ch.poltr.ballot.argument/a1", "like_count": 2,
+    "t_lang": "fr-CH", "t_body": "Traduit", "t_source": "ai", "translation_langs": ["fr-CH"],
+    "profile_display_name": "Pseudo", "profile_canton": "BE", "profile_color": "#123456",
+}
+
+
+async def _bodies(monkeypatch, fast: bool) -> tuple[dict, dict]:
+    monkeypatch.setenv("APPVIEW_FAST_JSON", "true" if fast else "false")
+    viewer = SimpleNamespace(did="did:plc:viewer")
+    rows = make_rows(3)
+    pool = FakePool({"arguments": rows, "comments": [COMMENT], "likes": {viewer.did: [
+        {"subject_uri": rows[1]["uri"], "uri": "at://viewer/like/1", "preference": 30},
+        {"subject_uri": COMMENT["uri"], "uri": "at://viewer/like/2", "preference": None},
+    ]}}, conn_cls=ListConnection)
+    with patch("src.core.db.pool", pool):
+        args = await arguments.list_arguments(
+            request=None, ballot_rkey="b1", sort="top", type=None, source=None, limit=10,
+            cursor=None, lang="fr-CH", accept_language=None, session=viewer,
+        )
+        comms = await comments.list_comments(
+            request=None, argument_uri=COMMENT["argument_uri"], limit=10, lang="fr-CH",
+            accept_language=None, session=viewer,
+        )
+    assert args.headers["content-type"] == comms.headers["content-type"] == "application/json"
+    return json.loads(args.body), json.loads(comms.body)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_returns_the_same_json_as_the_default_path(monkeypatch):
+    default = await _bodies(monkeypatch, fast=False)
+    fast = await _bodies(monkeypatch, fast=True)
+    assert fast == default
+    args, comms = fast
+    assert args["arguments"][1]["viewer"] == {"like": "at://viewer/like/1", "preference": 30}
+    assert comms["comments"][0]["viewer"] == {"like": "at://viewer/like/2"}
+    assert comms["comments"][0]["record"]["body"] == "Traduit"
+
+
+def test_fragments_rerender_when_the_row_changes():
+    cache = fast_json.FragmentCache("test.fragments")
+    row = make_rows(1)[0]
+
+    def render(r):
+        return cache.render(
+            (r["uri"], "de-CH"), arguments._argument_stamp(r),
+            lambda: arguments._argument_static(r, "de-CH"),
+        )
+
+    first = render(row)
+    assert render(dict(row, like_count=99)) is first  # counters are not in the fragment
+    edited = render(dict(row, cid="bafynew", title="Neu"))
+    assert edited is not first and b'"title":"Neu"' in edited
+    assert cache.stats() == {"hits": 1, "renders": 2, "entries": 1}
+
+    item = fast_json.close(first, {"likeCount": 3, "peerreviewStatus": None})
+    assert json.loads(fast_json.with_viewer(item, {"like": "x"}))["viewer"] == {"like": "x"}
+    assert json.loads(fast_json.page("arguments", [item], cursor="c"))["cursor"] == "c"
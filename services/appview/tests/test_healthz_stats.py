@@ -0,0 +1,37 @@
+"""
+Tests for the /healthz/* stats endpoints: gated by APPVIEW_STATS_SECRET, and
+no exception text in the response when a backing query fails.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.core import fastapi as app_mod
+
+
+def test_stats_endpoints_need_the_secret(monkeypatch):
+    monkeypatch.setattr(app_mod, "_STATS_SECRET", "")
+    with pytest.raises(HTTPException) as disabled:
+        app_mod._require_stats_secret("anything")
+    assert disabled.value.status_code == 404
+
+    monkeypatch.setattr(app_mod, "_STATS_SECRET", "s3cret")
+    for presented in (None, "wrong"):
+        with pytest.raises(HTTPException) as denied:
+            app_mod._require_stats_secret(presented)
+        assert denied.value.status_code == 403
+    app_mod._require_stats_secret("s3cret")
+
+
+@pytest.mark.asyncio
+async def test_failed_backlog_query_is_logged_not_returned():
+    failing = AsyncMock(side_effect=RuntimeError("password authentication failed for user appview"))
+    with patch("src.core.email_outbox.backlog", failing):
+        res = await app_mod.healthz_email()
+
+    body = json.loads(res.body)
+    assert body["status"] == "error" and body["outbox"] is None
+    assert "password" not in res.body.decode()
@@ -0,0 +1,64 @@
+"""
+Tests for the shared outbound HTTP client registry (src/core/http_clients.py).
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.core import http_clients
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    """Each test starts without clients (no network is touched, nothing to close)."""
+    with patch.dict(http_clients._clients, clear=True), \
+         patch.dict(http_clients._transports, clear=True):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_use_shares_one_client_per_target():
+    async with http_clients.use("cms", timeout=5.0) as a:
+        pass
+    async with http_clients.use("cms") as b:
+        pass
+    async with http_clients.use("calculator") as c:
+        pass
+    assert a._client is b._client
+    assert a._client is not c._client
+    assert not a._client.is_closed  # leaving the block does not close it
+
+
+@pytest.mark.asyncio
+async def test_call_site_timeout_and_metrics():
+    seen = {}
+
+    async def fake_handle(self, request):
+        seen["timeout"] = request.extensions.get("timeout")
+        if request.url.path == "/boom":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"ok": True}, request=request)
+
+    with patch.object(httpx.AsyncHTTPTransport, "handle_async_request", fake_handle):
+        async with http_clients.use("calculator", timeout=7.0) as client:
+            resp = await client.get("http://calc.test/ok")
+            assert resp.json() == {"ok": True}
+            assert seen["timeout"]["read"] == 7.0
+            with pytest.raises(httpx.ConnectError):
+                await client.post("http://calc.test/boom", json={})
+
+    stats = http_clients.stats()["calculator"]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert stats["inflight"] == 0
+    assert set(stats["pool"]) == {"open", "idle"}
+
+
+def test_env_overrides_limits(monkeypatch):
+    monkeypatch.setenv("APPVIEW_HTTP_CMS_MAX_CONNECTIONS", "3")
+    monkeypatch.setenv("APPVIEW_HTTP_CMS_HTTP2", "true")
+    spec = http_clients._spec("cms")
+    assert spec.max_connections == 3
+    assert spec.http2 is True
@@ -0,0 +1,66 @@
+"""
+Tests for the cross-replica invalidation bus (src/core/invalidation_bus.py).
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.atproto import atproto_api
+from src.atproto.pds_tokens import Tokens
+from src.auth import session_cache
+from src.core import ballot_catalog, invalidation_bus
+from src.core.invalidation_bus import Sequencer
+
+
+def _event(seq, kind, key=None) -> str:
+    return json.dumps({"s": seq, "t": kind, "k": key})
+
+
+def test_sequence_gaps_wait_for_late_events_then_flush(monkeypatch):
+    monkeypatch.setenv("APPVIEW_INVALIDATION_GAP_GRACE", "0")
+    seq = Sequencer()
+    assert not seq.observe(10)          # first event sets the baseline
+    assert not seq.observe(11)
+    assert not seq.observe(14)          # 12, 13 outstanding
+    assert set(seq.missing) == {12, 13}
+    assert not seq.observe(12)          # late, out of commit order
+    assert set(seq.missing) == {13}
+    time.sleep(0.001)
+    assert seq.expired()                # 13 never came → flush
+    assert not seq.missing and not seq.expired()
+    # A jump far beyond anything worth waiting for flushes right away.
+    assert seq.observe(14 + 5000)
+
+
+@pytest.mark.asyncio
+async def test_events_evict_and_gaps_flush_local_caches(monkeypatch):
+    reloads = []
+
+    async def fake_load():
+        reloads.append(1)
+
+    monkeypatch.setattr(ballot_catalog, "_load", fake_load)
+    expires = datetime.utcnow() + timedelta(days=1)
+    session_cache.put("h1", "did:plc:a", {}, expires)
+    session_cache.put("h2", "did:plc:b", {}, expires)
+    atproto_api.pds_tokens._tokens["did:plc:a"] = Tokens("jwt", "r", time.time() + 3600, time.time() + 86400)
+    flushes = invalidation_bus.stats()["flushes"]
+
+    seq = Sequencer()
+    invalidation_bus.handle_payload(seq, _event(1, invalidation_bus.SESSION, "h1"))
+    assert session_cache.get("h1") is None and session_cache.get("h2") is not None
+    invalidation_bus.handle_payload(seq, _event(2, invalidation_bus.PDS_TOKEN, "did:plc:a"))
+    assert "did:plc:a" not in atproto_api.pds_tokens._tokens
+
+    invalidation_bus.handle_payload(seq, "not json")
+    assert invalidation_bus.stats()["flushes"] == flushes
+
+    # Missed event (reconnect / expired gap) → every cache is dropped.
+    invalidation_bus.flush_all("test")
+    assert session_cache.get("h2") is None
+    await ballot_catalog.refresh()
+    assert reloads == [1]  # catalog reloads in the background, keeps its snapshot
+    assert invalidation_bus.stats()["flushes"] == flushes + 1
@@ -0,0 +1,88 @@
+"""
+Tests for the public payload cache + per-viewer overlay of argument.list
+(src/core/payload_cache.py).
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core.payload_cache import PayloadCache
+from tests.conftest import FakePool, ListConnection
+
+A1 = "at://did:plc:c/app.ch.poltr.ballot.argument/a1"
+A2 = "at://did:plc:c/app.ch.poltr.ballot.argument/a2"
+
+
+ROWS = [
+    {"uri": uri, "type": "PRO", "source_type": "official", "langs": ["de-CH"],
+     "translations": [], "title": "T", "body": "B", "like_count": 1}
+    for uri in (A1, A2)
+]
+
+
+async def _list(viewer=None, sort="top"):
+    from src.routes.deliberation.arguments import list_arguments
+
+    resp = await list_arguments(
+        request=None, ballot_rkey="b1", sort=sort, type=None, source=None, limit=100,
+        cursor=None, lang="de-CH", accept_language=None,
+        session=SimpleNamespace(did=viewer) if viewer else None,
+    )
+    return json.loads(resp.body)["arguments"]
+
+
+@pytest.mark.asyncio
+async def test_viewers_share_the_public_page_and_get_their_own_overlay():
+    pool = FakePool({"version": 3, "arguments": ROWS, "likes": {
+        "did:plc:alice": [{"subject_uri": A1, "uri": "at://alice/like/1", "preference": 80}],
+    }}, conn_cls=ListConnection)
+    with patch("src.core.db.pool", pool):
+        anon = await _list()
+        alice = await _list("did:plc:alice")
+        bob = await _list("did:plc:bob")
+        assert len([q for q in pool.all_executed if "FROM app_arguments" in q[1]]) == 1
+
+        # The overlay copied Alice's item; the cached page has no viewer block.
+        assert "viewer" not in (await _list())[0]
+
+        # A write bumps the ballot version → the next request rebuilds.
+        pool._store["version"] = 4
+        await _list("did:plc:bob")
+    assert len([q for q in pool.all_executed if "FROM app_arguments" in q[1]]) == 2
+
+    assert "viewer" not in anon[0] and "viewer" not in bob[0]
+    assert alice[0]["viewer"] == {"like": "at://alice/like/1", "preference": 80}
+    assert "viewer" not in alice[1]
+
+
+@pytest.mark.asyncio
+async def test_per_viewer_shuffle_pages_are_not_cached():
+    from src.routes.deliberation.arguments import _list_pages
+
+    pool = FakePool({"version": 3, "arguments": ROWS}, conn_cls=ListConnection)
+    with patch("src.core.db.pool", pool):
+        await _list("did:plc:alice", sort="random")
+        await _list("did:plc:alice", sort="random")
+        assert _list_pages.stats()["entries"] == 0
+        await _list(sort="random")  # anonymous shuffle: one shared page
+        await _list(sort="random")
+    assert _list_pages.stats()["entries"] == 1
+    assert len([q for q in pool.all_executed if "FROM app_arguments" in q[1]]) == 3
+
+
+def test_entries_are_version_stamped_and_bounded(monkeypatch):
+    monkeypatch.setenv("APPVIEW_PAYLOAD_CACHE_ENTRIES", "2")
+    cache = PayloadCache("test.pages")
+    cache.put("b1", 5, "p1", ["v5"])
+    cache.put("b1", 4, "p1", ["v4"])  # late build of an older version is ignored
+    assert cache.get("b1", 5, "p1") == ["v5"]
+    assert cache.get("b1", 6, "p1") is None  # newer version → stale, dropped
+    assert cache.get("b1", 5, "p1") is None
+
+    for key in ("p1", "p2", "p3"):
+        cache.put("b1", 1, key, [key])
+    assert cache.get("b1", 1, "p1") is None  # least recently used went first
+    assert cache.stats() == {"hits": 1, "misses": 2, "stale": 1, "evicted": 1, "entries": 2}
@@ -0,0 +1,122 @@
+"""
+Tests for the PDS token broker (src/atproto/pds_tokens.py).
+"""
+
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+import pytest
+
+from src.atproto.pds_creds import decrypt_user_tokens, encrypt_user_tokens
+from src.atproto.pds_tokens import TokenBroker, jwt_exp
+from tests.conftest import FakeConnection, FakePool
+
+DID = "did:plc:user"
+
+
+def _jwt(exp: float, tag: str) -> str:
+    claims = base64.urlsafe_b64encode(json.dumps({"exp": int(exp), "t": tag}).encode())
+    return f"h.{claims.decode().rstrip('=')}.s"
+
+
+class TokenConnection(FakeConnection):
+    """Keeps the upserted token row per DID."""
+
+    async def fetchrow(self, sql, *params):
+        self.executed.append(("fetchrow", sql.strip(), params))
+        return self._store["tokens"].get(params[0])
+
+    async def execute(self, sql, *params):
+        self.executed.append(("execute", sql.strip(), params))
+        if sql.strip().startswith("INSERT"):
+            did, ciphertext, nonce, _ = params
+            self._store["tokens"][did] = {
+                "tokens_ciphertext": ciphertext, "tokens_nonce": nonce,
+            }
+        return "INSERT 0 1"
+
+
+class FakePDS:
+    """createSession / refreshSession with configurable token lifetimes."""
+
+    def __init__(self, access_ttl=7200, reject_refresh=False):
+        self.calls = []
+        self.access_ttl = access_ttl
+        self.reject_refresh = reject_refresh
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit(".", 1)[-1]
+        self.calls.append(method)
+        await asyncio.sleep(0.01)  # let concurrent callers pile up
+        if method == "refreshSession" and self.reject_refresh:
+            return httpx.Response(400, json={"error": "ExpiredToken", "message": "expired"})
+        n = len(self.calls)
+        return httpx.Response(200, json={
+            "accessJwt": _jwt(time.time() + self.access_ttl, f"a{n}"),
+            "refreshJwt": _jwt(time.time() + 86400, f"r{n}"),
+        })
+
+
+def _broker(store: dict, passwords: list) -> TokenBroker:
+    async def load_password(did):
+        passwords.append(did)
+        return "pw"
+
+    pool = FakePool(store, conn_cls=TokenConnection)
+
+    async def get_pool():
+        return pool
+
+    return TokenBroker(
+        "test", table="auth_pds_tokens", pds_url=lambda: "https://pds.test",
+        load_password=load_password, encrypt=encrypt_user_tokens,
+        decrypt=decrypt_user_tokens, get_pool=get_pool,
+    )
+
+
+@pytest.fixture(autouse=True)
+def user_key(monkeypatch):
+    monkeypatch.setenv("APPVIEW_USER_CREDS_MASTER_KEY_B64", base64.b64encode(b"u" * 32).decode())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_login_then_refresh_instead_of_relogin():
+    # Access token inside the safety margin → every use after the first renews.
+    pds = FakePDS(access_ttl=60)
+    store, passwords = {"tokens": {}}, []
+    broker = _broker(store, passwords)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(pds.handler)) as client:
+        tokens = await asyncio.gather(*(broker.access_token(client, DID) for _ in range(5)))
+        assert len(set(tokens)) == 1
+        assert pds.calls == ["createSession"] and passwords == [DID]
+        assert b"pw" not in store["tokens"][DID]["tokens_ciphertext"]
+
+        await broker.access_token(client, DID)
+    assert pds.calls == ["createSession", "refreshSession"]
+    assert passwords == [DID]  # no second password decrypt
+    assert jwt_exp(tokens[0]) is not None
+
+
+@pytest.mark.asyncio
+async def test_stored_pair_survives_restart_and_rejected_refresh_falls_back_to_login():
+    pds = FakePDS()
+    store, passwords = {"tokens": {}}, []
+    async with httpx.AsyncClient(transport=httpx.MockTransport(pds.handler)) as client:
+        first = await _broker(store, passwords).access_token(client, DID)
+
+        # "Restart": a new broker over the same table reuses the stored pair.
+        restarted = _broker(store, passwords)
+        assert await restarted.access_token(client, DID) == first
+        assert pds.calls == ["createSession"]
+        assert restarted.stats()["loaded"] == 1
+
+        # Expired access + refresh rejected by the PDS → login again.
+        restarted._tokens[DID].access_exp = time.time() - 1
+        store["tokens"].clear()
+        pds.reject_refresh = True
+        assert await restarted.access_token(client, DID) != first
+    assert pds.calls == ["createSession", "refreshSession", "createSession"]
+    assert restarted.stats()["refresh_rejected"] == 1
@@ -0,0 +1,43 @@
+"""
+Tests for anonymous public reads and their Cache-Control headers
+(src/auth/middleware.optional_session_token, src/core/cache_control.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.auth import session_cache
+from src.auth.middleware import hash_token
+
+URL = "/xrpc/app.ch.poltr.argument.list?ballot_rkey=b1&sort=top"
+
+
+@pytest.mark.asyncio
+async def test_anonymous_reads_are_shared_cacheable(client, monkeypatch):
+    monkeypatch.setenv("APPVIEW_PUBLIC_READ_ENABLED", "true")
+    resp = await client.get(URL)
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"].startswith("public, max-age=0, s-maxage=")
+    assert "stale-while-revalidate=" in resp.headers["cache-control"]
+    assert "Cookie" in resp.headers["vary"]
+
+    # Revalidation keeps the shared-cache headers on the 304.
+    again = await client.get(URL, headers={"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["cache-control"] == resp.headers["cache-control"]
+
+
+@pytest.mark.asyncio
+async def test_public_reads_are_opt_in_and_sessions_stay_private(client, monkeypatch):
+    monkeypatch.delenv("APPVIEW_PUBLIC_READ_ENABLED", raising=False)
+    assert (await client.get(URL)).status_code == 401
+
+    monkeypatch.setenv("APPVIEW_PUBLIC_READ_ENABLED", "true")
+    session_cache.put(hash_token("tok"), "did:plc:viewer", {},
+                      datetime.utcnow() + timedelta(days=1))
+    resp = await client.get(URL, headers={"Authorization": "Bearer tok"})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "private, no-cache"
+    # An invalid token is still rejected, not downgraded to anonymous.
+    assert (await client.get(URL, headers={"Authorization": "Bearer nope"})).status_code == 401
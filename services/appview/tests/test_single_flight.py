@@ -0,0 +1,115 @@
+"""
+Tests for request coalescing (src/core/single_flight.py), including a small
+load test: a burst of identical argument.list requests runs the heavy query once.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+from tests.conftest import FakeConnection, FakePool
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_computation():
+    group = SingleFlight("test.share")
+    runs = 0
+
+    async def compute():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return [runs]
+
+    results = await asyncio.gather(*[group.do("k", compute) for _ in range(50)])
+    assert runs == 1
+    assert all(r is results[0] for r in results)
+
+    # Nothing is cached: the next call after completion computes again.
+    assert await group.do("k", compute) == [2]
+    assert group.stats() == {"calls": 51, "flights": 2, "coalesced": 49, "inflight": 0}
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_waiter_and_releases_key():
+    group = SingleFlight("test.error")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(*[group.do("k", boom) for _ in range(5)],
+                                   return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert group.stats()["flights"] == 1 and group.stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_waiter_cancellation():
+    group = SingleFlight("test.timeout", timeout=0.02)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await group.do("k", slow)
+    assert group.stats()["inflight"] == 0
+
+    # One waiter giving up must not cancel the computation for the others.
+    release = asyncio.Event()
+
+    async def gated():
+        await release.wait()
+        return "ok"
+
+    first = asyncio.create_task(group.do("g", gated, timeout=1.0))
+    second = asyncio.create_task(group.do("g", gated, timeout=1.0))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "ok"
+
+
+# ---------------------------------------------------------------------------
+# Load test: argument.list under a burst of identical requests
+# ---------------------------------------------------------------------------
+
+
+class SlowConnection(FakeConnection):
+    """Returns one argument row after a short delay, like a heavy query."""
+
+    async def fetch(self, sql, *params):
+        self.executed.append(("fetch", sql.strip(), params))
+        await asyncio.sleep(0.02)
+        if "FROM app_arguments" in sql:
+            return [{
+                "uri": "at://did:plc:c/app.ch.poltr.ballot.argument/a1",
+                "cid": "cid1", "title": "T", "body": "B", "type": "PRO",
+                "ballot_rkey": "b1", "langs": ["de-CH"], "translations": [],
+                "source_type": "user", "author_did": "did:plc:u",
+                "like_count": 0, "comment_count": 0,
+            }]
+        return []
+
+
+@pytest.mark.asyncio
+async def test_argument_list_burst_runs_query_once():
+    from src.routes.deliberation.arguments import list_arguments
+
+    pool = FakePool(conn_cls=SlowConnection)
+    burst = 200
+    with patch("src.core.db.pool", pool):
+        responses = await asyncio.gather(*[
+            list_arguments(
+                request=None, ballot_rkey="b1", sort="top", type=None, source=None,
+                limit=100, lang=None, accept_language=None, session=None,
+            )
+            for _ in range(burst)
+        ])
+
+    assert all(r.status_code == 200 for r in responses)
+    queries = [q for q in pool.all_executed if "FROM app_arguments" in q[1]]
+    # Without coalescing: one query per request (200).
+    assert len(queries) == 1
@@ -0,0 +1,79 @@
+"""TaxonomyTree.distinct must match a brute-force recursive set union — the
+aggregation it replaces in taxonomy.get — including multi-membership (one
+argument on several nodes of a subtree), weights and unreachable nodes."""
+
+import random
+
+import pytest
+
+from src.core.taxonomy_tree import TaxonomyTree, factorize
+
+
+def _random_tree(rng, n):
+    ids = [f"n{i}" for i in range(n)]
+    parents = [None] + [ids[rng.randrange(i)] for i in range(1, n)]
+    return ids, parents
+
+
+def _brute(ids, parents, occ, weight=None):
+    kids = {i: [] for i in ids}
+    for nid, pid in zip(ids, parents):
+        if pid is not None:
+            kids[pid].append(nid)
+    own = {i: set() for i in ids}
+    for nid, key in occ:
+        own[nid].add(key)
+
+    def keys(nid):
+        out = set(own[nid])
+        for c in kids[nid]:
+            out |= keys(c)
+        return out
+
+    return {nid: sum(weight(k) if weight else 1 for k in keys(nid)) for nid in ids}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_distinct_matches_brute_force(seed):
+    rng = random.Random(seed)
+    ids, parents = _random_tree(rng, 40)
+    occ = [(rng.choice(ids), f"u{rng.randrange(50)}") for _ in range(200)]
+    tree = TaxonomyTree(ids, parents)
+
+    counts = tree.distinct(tree.locate(n for n, _ in occ), [k for _, k in occ])
+    expected = _brute(ids, parents, occ)
+    assert {nid: int(counts[i]) for i, nid in enumerate(ids)} == expected
+
+    w = {f"u{k}": rng.choice([0.0, 0.25, 1.0]) for k in range(50)}
+    sums = tree.distinct(tree.locate(n for n, _ in occ), factorize(k for _, k in occ),
+                         [w[k] for _, k in occ])
+    expected_w = _brute(ids, parents, occ, weight=w.get)
+    for i, nid in enumerate(ids):
+        assert sums[i] == pytest.approx(expected_w[nid])
+
+
+def test_nest_and_subtree_keep_sibling_order():
+    tree = TaxonomyTree([1, 2, 3, 4], [None, 1, 1, 2])
+    nodes = [{"id": nid, "children": []} for nid in tree.ids]
+    root = tree.nest(nodes)
+    assert [c["id"] for c in root["children"]] == [2, 3]
+    assert [tree.ids[i] for i in tree.subtree(tree.index[2])] == [2, 4]
+
+
+def test_unreachable_nodes_aggregate_to_zero():
+    # 5 hangs off an unknown parent, so it is not reachable from the root.
+    tree = TaxonomyTree([1, 2, 5], [None, 1, 99])
+    counts = tree.distinct(tree.locate([2, 5, 5]), ["a", "b", "c"])
+    assert list(counts) == [1, 1, 0]
+    assert tree.subtree(tree.index[5]).size == 0
+
+
+def test_from_nested_roundtrip():
+    root = {"name": "r", "children": [
+        {"name": "a", "children": [{"name": "a1", "children": []}]},
+        {"name": "b", "children": []},
+    ]}
+    tree, flat = TaxonomyTree.from_nested(root)
+    assert [n["name"] for n in flat] == ["r", "a", "a1", "b"]
+    counts = tree.distinct([2, 3, 1], ["x", "y", "x"])
+    assert list(counts) == [2, 1, 1, 1]
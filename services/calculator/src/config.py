@@ -14,6 +14,14 @@ load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 # LLM (Top-down Themen-Hierarchie) → Sonnet.
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "").strip()
 LLM_MODEL = os.getenv("CALCULATOR_LLM_MODEL", "claude-sonnet-4-6")
+# Offline-Betrieb (src/llm/replay.py): "record" zeichnet die Tool-Antworten des
+# echten Clients als Fixtures auf, "replay" spielt sie ohne API-Key ab. Leer =
+# normaler Betrieb. Latenz simuliert im Replay die Antwortzeit je Call.
+LLM_MODE = os.getenv("CALCULATOR_LLM_MODE", "").strip().lower()
+LLM_FIXTURES_DIR = os.getenv(
+    "CALCULATOR_LLM_FIXTURES",
+    str(Path(__file__).resolve().parent.parent / "fixtures" / "llm"))
+LLM_REPLAY_LATENCY_MS = int(os.getenv("CALCULATOR_LLM_REPLAY_LATENCY_MS", "0"))
 
 # Server
 PORT = int(os.getenv("CALCULATOR_PORT", "3000"))
@@ -28,6 +36,13 @@ POSTGRES_URL = os.getenv("CALCULATOR_POSTGRES_URL") or os.getenv("APPVIEW_POSTGR
 # Beschreibung als Zusatzkontext für die Wurzelthemen zu lesen
 # (db.fetch_ballot_description). Ohne URL entfällt dieser Kontext.
 CMS_POSTGRES_URL = os.getenv("CALCULATOR_CMS_POSTGRES_URL") or os.getenv("CMS_DATABASE_URL")
+CMS_POOL_MAX = int(os.getenv("CALCULATOR_CMS_POOL_MAX", "4"))
+
+# Ballot-Kontext-Cache für die Stance-Vorprüfung (src/review/context.py):
+# Vorlagen-Beschreibung, Hauptthemen und Themen-Embeddings je Ballot + Sprache.
+# Invalidiert per NOTIFY (Indexer nach jedem Taxonomie-Snapshot); die TTL fängt
+# Änderungen ohne NOTIFY ab (CMS-Beschreibung, neue Themen-Embeddings).
+BALLOT_CONTEXT_TTL = float(os.getenv("CALCULATOR_BALLOT_CONTEXT_TTL", "600"))
 
 # -----------------------------------------------------------------------------
 # Embeddings (Infomaniak AI Tools, OpenAI-kompatibel) — siehe doc/infomaniak.md.
@@ -45,6 +60,15 @@ EMBEDDING_DIMENSIONS = int(os.getenv("CALCULATOR_EMBEDDING_DIMENSIONS", "1024")
 # Chat-Modell (Infomaniak Gemma, JSON-Prompt) für LLM-Checks beim Verfassen
 # (Stance-/Kohärenz-Check). Token + Product ID teilen sich Chat & Embeddings.
 REVIEW_MODEL = os.getenv("CALCULATOR_REVIEW_MODEL", "google/gemma-4-31B-it")
+# Chat-Scheduler (src/review/scheduler.py): max. gleichzeitige Chat-Calls, davon
+# für interaktive Vorprüfungen reserviert (Batch darf sie nie belegen), und wie
+# lange ein Call höchstens auf einen Slot wartet, bevor er mit „busy" scheitert
+# (Sekunden, 0 = unbegrenzt). Interaktiv deutlich unter dem 45-s-Timeout des
+# AppView-Precheck.
+CHAT_MAX_INFLIGHT = int(os.getenv("CALCULATOR_CHAT_MAX_INFLIGHT", "4"))
+CHAT_RESERVED_INTERACTIVE = int(os.getenv("CALCULATOR_CHAT_RESERVED_INTERACTIVE", "1"))
+CHAT_QUEUE_DEADLINE_INTERACTIVE = float(os.getenv("CALCULATOR_CHAT_DEADLINE_INTERACTIVE", "8"))
+CHAT_QUEUE_DEADLINE_BATCH = float(os.getenv("CALCULATOR_CHAT_DEADLINE_BATCH", "0"))
 
 EMBEDDING_RUN_LIMIT = int(os.getenv("CALCULATOR_EMBEDDING_RUN_LIMIT", "200"))   # Kandidaten je Quelle/Lauf
 EMBEDDING_BATCH_SIZE = int(os.getenv("CALCULATOR_EMBEDDING_BATCH_SIZE", "64"))  # Texte je API-Call (<100)
@@ -61,3 +85,26 @@ DEDUP_SIM_THRESHOLD = float(os.getenv("CALCULATOR_DEDUP_SIM_THRESHOLD", "0.66"))
 # (der einzige Embedding-Call für Themen — und nur dann).
 TOPIC_MAX_INLINE = int(os.getenv("CALCULATOR_TOPIC_MAX_INLINE", "7"))
 TOPIC_PRESELECT_K = int(os.getenv("CALCULATOR_TOPIC_PRESELECT_K", "7"))
+
+# Ergebnis-Cache der Stance-Vorprüfung (src/review/stance.py): gleicher Entwurf →
+# kein neuer Gemma-Call. TTL in Sekunden (0 = aus), max. Einträge (LRU).
+STANCE_CACHE_TTL = float(os.getenv("CALCULATOR_STANCE_CACHE_TTL", "1800"))
+STANCE_CACHE_MAX = int(os.getenv("CALCULATOR_STANCE_CACHE_MAX", "2000"))
+
+# Stance-Batch über einen ganzen Ballot (src/review/batch.py): parallele Worker
+# (der Chat-Scheduler begrenzt Batch-Calls zusätzlich) und Fortschritts-Log alle
+# N Gruppen.
+STANCE_BATCH_CONCURRENCY = int(os.getenv("CALCULATOR_STANCE_BATCH_CONCURRENCY", "3"))
+STANCE_BATCH_LOG_EVERY = int(os.getenv("CALCULATOR_STANCE_BATCH_LOG_EVERY", "50"))
+
+# Versionierter Editor-Baum (src/topdown/state.py): wie lange ein per `tree`
+# übergebener Baum für `version` + `diff` gehalten wird, und für wie viele
+# Ballots höchstens (LRU).
+TREE_STATE_TTL = float(os.getenv("CALCULATOR_TREE_STATE_TTL", str(6 * 3600)))
+TREE_STATE_MAX = int(os.getenv("CALCULATOR_TREE_STATE_MAX", "64"))
+
+# Clustering-first Unterthemen (/grow mit proposer="cluster", src/topdown/
+# clustering.py): unter dieser mittleren Silhouette (Kosinus) gilt ein Knoten als
+# kohärent und wird nicht gesplittet. Embeddings desselben Themas liegen eng
+# beieinander — die Werte sind klein; bei Bedarf an echten Vorlagen nachjustieren.
+CLUSTER_MIN_SILHOUETTE = float(os.getenv("CALCULATOR_CLUSTER_MIN_SILHOUETTE", "0.04"))
@@ -14,6 +14,7 @@ import re
 import asyncpg
 
 from src import config
+from src.core.taxonomy_tree import TaxonomyTree
 
 logger = logging.getLogger("calculator.db")
 
@@ -56,6 +57,43 @@ async def close_pool() -> None:
         pool = None
 
 
+# CMS-DB (Payload, read-only): eigener, kleiner Pool — im Lifespan geöffnet, damit
+# der Verbindungsaufbau zur zweiten DB nicht im Hot Path (Stance-Vorprüfung) liegt.
+cms_pool: asyncpg.Pool | None = None
+
+
+async def get_cms_pool() -> asyncpg.Pool | None:
+    """CMS-Pool oder None, wenn keine CMS-DB konfiguriert ist."""
+    global cms_pool
+    if not config.CMS_POSTGRES_URL:
+        return None
+    if cms_pool is None:
+        cms_pool = await asyncpg.create_pool(
+            config.CMS_POSTGRES_URL, min_size=1, max_size=config.CMS_POOL_MAX)
+    return cms_pool
+
+
+async def check_cms_connection() -> bool:
+    try:
+        p = await get_cms_pool()
+        if p is None:
+            return False
+        async with p.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+        logger.info("CMS DB connection ok")
+        return True
+    except Exception as err:
+        logger.warning("CMS DB connection failed: %s", err)
+        return False
+
+
+async def close_cms_pool() -> None:
+    global cms_pool
+    if cms_pool:
+        await cms_pool.close()
+        cms_pool = None
+
+
 def lexical_to_text(value) -> str:
     """Wandelt das Payload-/Lexical-richText-JSON (wie es in der CMS-DB-Spalte
     `ballots_locales.description` steht) in einfachen Text um. Akzeptiert ein
@@ -102,27 +140,26 @@ async def fetch_ballot_description(ballot_rkey: str) -> str | None:
     """Liest die amtliche Vorlagen-Beschreibung (richText) aus der CMS-DB und gibt
     sie als Plaintext zurück — bevorzugt in der Quellsprache (`origin_language`),
     sonst Deutsch. `None`, wenn keine CMS-DB konfiguriert ist oder nichts vorliegt."""
-    if not config.CMS_POSTGRES_URL:
+    cms = await get_cms_pool()
+    if cms is None:
         return None
-    conn = await asyncpg.connect(config.CMS_POSTGRES_URL)
     try:
-        row = await conn.fetchrow(
-            """SELECT
-                   (SELECT l.description FROM ballots_locales l
-                      WHERE l._parent_id = b.id
-                        AND l._locale::text = b.origin_language::text)
-                     AS desc_origin,
-                   (SELECT l.description FROM ballots_locales l
-                      WHERE l._parent_id = b.id AND l._locale::text = 'de')
-                     AS desc_de
-               FROM ballots b
-               WHERE b.rkey = $1""",
-            ballot_rkey)
+        async with cms.acquire() as conn:
+            row = await conn.fetchrow(
+                """SELECT
+                       (SELECT l.description FROM ballots_locales l
+                          WHERE l._parent_id = b.id
+                            AND l._locale::text = b.origin_language::text)
+                         AS desc_origin,
+                       (SELECT l.description FROM ballots_locales l
+                          WHERE l._parent_id = b.id AND l._locale::text = 'de')
+                         AS desc_de
+                   FROM ballots b
+                   WHERE b.rkey = $1""",
+                ballot_rkey)
     except asyncpg.PostgresError as err:
         logger.warning("Vorlagen-Beschreibung nicht lesbar (%s)", err)
         return None
-    finally:
-        await conn.close()
     if not row:
         return None
     text = lexical_to_text(row["desc_origin"] or row["desc_de"])
@@ -155,15 +192,8 @@ async def fetch_topic_tree(ballot_rkey: str) -> dict | None:
                   "children": [], "arguments": []}
         for n in nodes
     }
-    root = None
-    for n in nodes:
-        node = by_id[n["id"]]
-        if n["parent_id"] is None:
-            root = node
-        else:
-            parent = by_id.get(n["parent_id"])
-            if parent:
-                parent["children"].append(node)
+    tree = TaxonomyTree([n["id"] for n in nodes], [n["parent_id"] for n in nodes])
+    root = tree.nest([by_id[nid] for nid in tree.ids])
     for m in mems:
         node = by_id.get(m["node_id"])
         if node:
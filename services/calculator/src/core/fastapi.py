@@ -1,6 +1,7 @@
+import asyncio
 import os
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,6 +12,9 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 import src.core.db as db
+from src import config
+from src.review import batch as stance_batch
+from src.review import context as ballot_context
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
@@ -29,8 +33,20 @@ limiter = Limiter(key_func=get_remote_address)
 async def lifespan(app: FastAPI):
     # DB-Pool ist optional beim Start: fehlt die POSTGRES_URL, startet der Service
     # trotzdem (die /api/topdown/*-Endpoints brauchen ihn dann zur Laufzeit).
-    await db.check_db_connection()
+    db_ok = await db.check_db_connection()
+    # CMS-Pool (Vorlagen-Beschreibung) ebenfalls vorab öffnen — nicht erst in der
+    # ersten Stance-Vorprüfung. Ohne CMS-URL bleibt er aus.
+    if config.CMS_POSTGRES_URL:
+        await db.check_cms_connection()
+    # Ballot-Kontext-Cache: Invalidierung per LISTEN taxonomy_changed.
+    listener = asyncio.create_task(ballot_context.listen_forever()) if db_ok else None
     yield
+    await stance_batch.shutdown()  # Gespeichertes bleibt, Neustart setzt fort
+    if listener is not None:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    await db.close_cms_pool()
     await db.close_pool()
 
 
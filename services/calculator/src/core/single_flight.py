@@ -0,0 +1,47 @@
+"""
+Single-Flight: gleichzeitige Aufrufe mit demselben Schlüssel teilen sich EINE
+laufende Berechnung (Ballot-Kontext, Stance-Vorprüfung).
+
+    _flight = SingleFlight()
+    ctx = await _flight.do(key, lambda: _load(key))
+
+  - Der erste Aufruf startet `fn()` als eigenen Task; wer dazukommt, solange er
+    läuft, wartet auf dasselbe Ergebnis (bzw. dieselbe Exception).
+  - Kein Cache: nach Abschluss wird der Schlüssel freigegeben.
+  - Der Task ist per `asyncio.shield` geschützt — wird ein Aufrufer abgebrochen
+    (auch der erste), läuft die Berechnung für die übrigen weiter, statt allen
+    ein CancelledError zu schicken (wie `TokenBroker.access_token` im appview).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # abgerufen: Wartende werfen sie selbst
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """`fn()` einmal für alle gleichzeitigen Aufrufer von `key`."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._release(k, t))
+        return await asyncio.shield(task)
@@ -0,0 +1,185 @@
+"""Flat, array-backed taxonomy tree with vectorised subtree aggregation.
+
+Mirrored in services/appview/src/core/taxonomy_tree.py — keep both in sync.
+
+The tree is stored as a parent-index array plus a pre-order (Euler) numbering:
+every subtree is the contiguous range `order[tin[i]:tout[i]]`. Subtree sums are
+then prefix-sum differences instead of Python recursion.
+
+Distinct aggregation (an argument may sit on several nodes of one subtree via
+multi-membership) uses the classic "distinct keys in a subtree" identity: sort
+the occurrences of each key by pre-order position, add the key's weight at every
+occurrence and subtract it again at the LCA of each pair of consecutive
+occurrences. Every subtree containing the key then sums to exactly one weight.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, Iterable, Sequence
+
+import numpy as np
+
+
+def factorize(keys: Iterable[Hashable]) -> np.ndarray:
+    """Hashable keys → dense int codes (first occurrence order). Pass the codes
+    to `TaxonomyTree.distinct` when aggregating the same keys several times."""
+    codes: dict[Hashable, int] = {}
+    return np.fromiter((codes.setdefault(k, len(codes)) for k in keys), dtype=np.int64)
+
+
+class TaxonomyTree:
+    """Immutable tree over node ids. Siblings keep the order in which they were
+    passed in (rows are usually `ORDER BY depth, node_order, id`).
+
+    Nodes whose parent is unknown — and everything below them — are not
+    reachable from the root; they aggregate to zero and are left out of
+    `nest()`."""
+
+    __slots__ = ("ids", "index", "parent", "depth", "root", "order", "tin",
+                 "tout", "_kids")
+
+    def __init__(self, ids: Sequence[Hashable], parent_ids: Sequence[Hashable | None]):
+        self.ids = list(ids)
+        self.index = {nid: i for i, nid in enumerate(self.ids)}
+        n = len(self.ids)
+        parent = np.full(n, -1, dtype=np.int64)
+        kids: list[list[int]] = [[] for _ in range(n)]
+        root = -1
+        for i, pid in enumerate(parent_ids):
+            if pid is None:
+                if root < 0:
+                    root = i
+                continue
+            p = self.index.get(pid)
+            if p is not None and p != i:
+                parent[i] = p
+                kids[p].append(i)
+
+        depth = np.zeros(n, dtype=np.int64)
+        tin = np.full(n, -1, dtype=np.int64)
+        order: list[int] = []
+        stack = [root] if root >= 0 else []
+        while stack:
+            i = stack.pop()
+            tin[i] = len(order)
+            order.append(i)
+            for c in kids[i]:
+                depth[c] = depth[i] + 1
+            stack.extend(reversed(kids[i]))
+
+        reach = tin >= 0
+        size = reach.astype(np.int64)
+        for d in range(int(depth.max()) if n else 0, 0, -1):
+            m = reach & (depth == d)
+            np.add.at(size, parent[m], size[m])
+
+        self.parent = parent
+        self.depth = depth
+        self.root = root
+        self.order = np.asarray(order, dtype=np.int64)
+        self.tin = tin
+        self.tout = np.where(reach, tin + size, -1)
+        self._kids = kids
+
+    @classmethod
+    def from_nested(cls, root: dict, key: str = "children") -> tuple["TaxonomyTree", list[dict]]:
+        """Nested dict tree → (tree, node dicts). Node i of the tree is
+        `nodes[i]`; ids are the positions."""
+        nodes: list[dict] = []
+        parents: list[int | None] = []
+        stack: list[tuple[dict, int | None]] = [(root, None)]
+        while stack:
+            node, p = stack.pop()
+            i = len(nodes)
+            nodes.append(node)
+            parents.append(p)
+            stack.extend((ch, i) for ch in reversed(node.get(key) or []))
+        return cls(range(len(nodes)), parents), nodes
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def children(self, i: int) -> list[int]:
+        return self._kids[i]
+
+    def subtree(self, i: int) -> np.ndarray:
+        """Node indices of the subtree of `i` (pre-order, `i` first)."""
+        if self.tin[i] < 0:
+            return self.order[:0]
+        return self.order[self.tin[i]:self.tout[i]]
+
+    def locate(self, node_ids: Iterable[Hashable]) -> np.ndarray:
+        """Node ids → indices (-1 for unknown ids)."""
+        return np.fromiter((self.index.get(x, -1) for x in node_ids), dtype=np.int64)
+
+    def nest(self, nodes: Sequence[dict], key: str = "children") -> dict | None:
+        """Append every reachable node dict to its parent's `key` list (sibling
+        order preserved). `nodes[i]` belongs to node i. Returns the root dict."""
+        if self.root < 0:
+            return None
+        for i in self.order:
+            bucket = nodes[i][key]
+            for c in self._kids[i]:
+                bucket.append(nodes[c])
+        return nodes[self.root]
+
+    def _lca(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        a, b = a.copy(), b.copy()
+        swap = self.depth[a] < self.depth[b]
+        a[swap], b[swap] = b[swap], a[swap]
+        while True:
+            m = self.depth[a] > self.depth[b]
+            if not m.any():
+                break
+            a[m] = self.parent[a[m]]
+        while True:
+            m = a != b
+            if not m.any():
+                return a
+            a[m] = self.parent[a[m]]
+            b[m] = self.parent[b[m]]
+
+    def distinct(self, node_idx: Sequence[int] | np.ndarray,
+                 keys: Sequence[Hashable] | np.ndarray,
+                 weights: Sequence[float] | np.ndarray | None = None) -> np.ndarray:
+        """Per node: sum of `weights` over the DISTINCT keys occurring anywhere in
+        its subtree. Occurrence j is key `keys[j]` on node `node_idx[j]` (keys may
+        be pre-computed `factorize` codes); a key's weight must be the same on all
+        its occurrences. Without `weights` this is the distinct key count (int
+        array). Unreachable nodes and occurrences on them (or on index -1) count
+        as zero."""
+        n = len(self.ids)
+        node_idx = np.asarray(node_idx, dtype=np.int64)
+        if isinstance(keys, np.ndarray) and keys.dtype.kind in "iu":
+            codes = keys.astype(np.int64, copy=False)
+        else:
+            codes = factorize(keys)
+        w = (np.ones(len(node_idx)) if weights is None
+             else np.asarray(weights, dtype=np.float64))
+
+        valid = node_idx >= 0
+        valid[valid] = self.tin[node_idx[valid]] >= 0
+        node_idx, codes, w = node_idx[valid], codes[valid], w[valid]
+        pos = self.tin[node_idx]
+        o = np.lexsort((pos, codes))
+        node_idx, codes, w, pos = node_idx[o], codes[o], w[o], pos[o]
+        if len(pos):  # the same key twice on one node counts once
+            keep = np.ones(len(pos), dtype=bool)
+            keep[1:] = (codes[1:] != codes[:-1]) | (pos[1:] != pos[:-1])
+            node_idx, codes, w, pos = node_idx[keep], codes[keep], w[keep], pos[keep]
+
+        contrib = np.zeros(len(self.order) + 1)
+        np.add.at(contrib, pos, w)
+        same = codes[1:] == codes[:-1]
+        if same.any():
+            lca = self._lca(node_idx[:-1][same], node_idx[1:][same])
+            np.add.at(contrib, self.tin[lca], -w[1:][same])
+        csum = np.concatenate(([0.0], np.cumsum(contrib[:-1])))
+
+        out = np.zeros(n)
+        reach = self.tin >= 0
+        out[reach] = csum[self.tout[reach]] - csum[self.tin[reach]]
+        if weights is None:
+            return np.rint(out).astype(np.int64)
+        out[np.abs(out) < 1e-9] = 0.0
+        return out
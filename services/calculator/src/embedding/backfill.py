@@ -113,6 +113,10 @@ async def run_backfill() -> dict:
                 await conn.execute(
                     _UPSERT, stype, ref, lang, scope,
                     config.EMBEDDING_MODEL, vec_to_pg(vec), h)
+            # Neue Themen-Embeddings → Ballot-Kontext-Cache (src/review/context.py)
+            # der betroffenen Ballots verwerfen (zugestellt beim COMMIT).
+            for scope in sorted({w[3] for w in work if w[0] == TAXONOMY_NODE}):
+                await conn.execute("SELECT pg_notify('taxonomy_changed', $1)", scope)
 
     logger.info("embedding backfill: processed %d (subject,lang) pairs", len(work))
     return {"processed": len(work)}
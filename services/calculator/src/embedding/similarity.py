@@ -11,11 +11,13 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
+
 from src import config
 from src.core.db import get_pool
 from src.core.languages import DEFAULT_LANGUAGE, normalize_lang
 from src.embedding import infomaniak_client as ic
-from src.embedding.text import vec_to_pg
+from src.embedding.text import pg_to_vec, vec_to_pg
 
 logger = logging.getLogger("calculator.embedding.similarity")
 
@@ -148,16 +150,78 @@ LIMIT $4
 """
 
 
+# All main-topic vectors of a ballot in ONE language — for the ballot context
+# cache (src/review/context.py), which then ranks the preselection locally.
+_TOPIC_VECTORS_SQL = """
+SELECT n.name, e.embedding::text AS embedding
+FROM app_embeddings e
+JOIN app_taxonomy_node n ON n.id::text = e.subject_ref
+JOIN app_taxonomy_node p ON p.id = n.parent_id
+WHERE e.subject_type = 'taxonomy_node'
+  AND e.scope_rkey = $1
+  AND e.lang = $2
+  AND p.parent_id IS NULL
+ORDER BY n.node_order, n.id
+"""
+
+
+async def topic_vectors(ballot_rkey: str, *,
+                        lang: str | None = None) -> tuple[list[str], np.ndarray] | None:
+    """(names, row-normalized matrix) of the main-topic embeddings in `lang`,
+    or None if there are none."""
+    lang = normalize_lang(lang) or DEFAULT_LANGUAGE
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(_TOPIC_VECTORS_SQL, ballot_rkey, lang)
+    rows = [r for r in rows if r["name"]]
+    if not rows:
+        return None
+    m = np.asarray([pg_to_vec(r["embedding"]) for r in rows], dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return [r["name"] for r in rows], m / np.where(norms == 0, 1.0, norms)
+
+
 async def top_topic_names(ballot_rkey: str, title: str, body: str, *,
-                          lang: str | None = None, k: int = 7) -> list[str]:
+                          lang: str | None = None, k: int = 7,
+                          vectors: tuple[list[str], np.ndarray] | None = None) -> list[str]:
     """Die k inhaltlich nächsten Hauptthemen zum Draft (Vorauswahl, wenn eine
-    Vorlage viele Themen hat). Embeddet den Draft einmal."""
+    Vorlage viele Themen hat). Embeddet den Draft einmal. Mit `vectors` (aus
+    `topic_vectors`, gecacht) wird lokal gerankt statt per pgvector-Query."""
     lang = normalize_lang(lang) or DEFAULT_LANGUAGE
     text = f"{(title or '').strip()}\n\n{(body or '').strip()}".strip()
     if not text:
         return []
-    qvec = vec_to_pg((await ic.embed_texts([text]))[0])
+    qraw = (await ic.embed_texts([text]))[0]
+    if vectors is not None:
+        names, m = vectors
+        sims = m @ np.asarray(qraw, dtype=np.float32)  # cosine up to the constant |q|
+        return [names[i] for i in np.argsort(-sims, kind="stable")[:k]]
     pool = await get_pool()
     async with pool.acquire() as conn:
-        rows = await conn.fetch(_TOP_TOPICS_SQL, qvec, ballot_rkey, lang, k)
+        rows = await conn.fetch(_TOP_TOPICS_SQL, vec_to_pg(qraw), ballot_rkey, lang, k)
     return [r["name"] for r in rows if r["name"]]
+
+
+# Stored argument vectors in ONE language (one vector space) — input for the
+# clustering-first subtopic proposer (src/topdown/clustering.py).
+_VECTORS_SQL = """
+SELECT subject_ref, embedding::text AS embedding
+FROM app_embeddings
+WHERE subject_type = 'argument'
+  AND subject_ref = ANY($1::text[])
+  AND lang = $2
+  AND model = $3
+"""
+
+
+async def argument_vectors(uris: list[str], *, lang: str | None = None) -> dict[str, list[float]]:
+    """{uri: vector} for the given arguments in `lang` (default DEFAULT_LANGUAGE).
+    Arguments without an up-to-date embedding in that language are missing from
+    the result — callers must handle the gap."""
+    lang = normalize_lang(lang) or DEFAULT_LANGUAGE
+    if not uris:
+        return {}
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(_VECTORS_SQL, list(uris), lang, config.EMBEDDING_MODEL)
+    return {r["subject_ref"]: pg_to_vec(r["embedding"]) for r in rows}
@@ -76,3 +76,9 @@ def vec_to_pg(vec) -> str:
     """Format a float vector as a pgvector literal: '[0.1,0.2,...]'. Bound as
     text and cast `$n::vector` in SQL — avoids a pgvector codec / extra dep."""
     return "[" + ",".join(repr(float(x)) for x in vec) + "]"
+
+
+def pg_to_vec(value: str) -> list[float]:
+    """Inverse of vec_to_pg: parse a pgvector text literal ('[0.1,0.2,...]',
+    e.g. from `embedding::text`) into floats."""
+    return [float(x) for x in json.loads(value)]
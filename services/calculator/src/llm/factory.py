@@ -1,6 +1,7 @@
 """
 LLM-Auswahl: echter Anthropic-Client. Ohne ANTHROPIC_API_KEY schlägt der
-Service bewusst fehl (statt still wertlose Ergebnisse zu liefern).
+Service bewusst fehl (statt still wertlose Ergebnisse zu liefern) — ausser im
+Replay-Modus (CALCULATOR_LLM_MODE=replay), der aufgezeichnete Fixtures abspielt.
 """
 
 import logging
@@ -14,6 +15,12 @@ logger = logging.getLogger("calculator.llm")
 
 
 def get_llm() -> LLMClient:
+    if config.LLM_MODE == "replay":
+        from src.llm.replay import ReplayLLM
+
+        logger.info("Using ReplayLLM (fixtures=%s)", config.LLM_FIXTURES_DIR)
+        return ReplayLLM(config.LLM_FIXTURES_DIR, mode="replay",
+                         latency=config.LLM_REPLAY_LATENCY_MS / 1000)
     if not config.ANTHROPIC_API_KEY:
         logger.error("ANTHROPIC_API_KEY not set — refusing to run LLM operation.")
         raise HTTPException(
@@ -23,4 +30,9 @@ def get_llm() -> LLMClient:
     from src.llm.anthropic_client import AnthropicLLM
 
     logger.info("Using AnthropicLLM (model=%s)", config.LLM_MODEL)
+    if config.LLM_MODE == "record":
+        from src.llm.replay import ReplayLLM
+
+        logger.info("Recording LLM fixtures to %s", config.LLM_FIXTURES_DIR)
+        return ReplayLLM(config.LLM_FIXTURES_DIR, mode="record", inner=AnthropicLLM())
     return AnthropicLLM()
@@ -0,0 +1,159 @@
+"""
+Offline-LLMs mit der `_call`-Schnittstelle (forced tool-use) — für Benchmarks und
+Entwicklung ohne Anthropic-Key.
+
+  ReplayLLM     — record/replay: im Modus "record" wird ein echter Client
+                  (AnthropicLLM) gewrappt und jede Tool-Antwort als JSON-Fixture
+                  abgelegt (Schlüssel = Hash über Tool, System, User, max_tokens);
+                  im Modus "replay" kommen die Antworten deterministisch aus den
+                  Fixtures. Fehlt eine Fixture → `FixtureMissing`.
+  SyntheticLLM  — deterministischer Stand-in OHNE Fixtures: ordnet per Wort-
+                  Überlappung zu und schlägt Themen aus einem vorgegebenen Pool vor.
+                  Inhaltlich naiv, aber stabil — genug, um Batching/Nebenläufigkeit
+                  (Call-Zahlen, Laufzeit, Platzierungen) zu vergleichen.
+
+Beide simulieren optional Latenz (`latency` Sekunden je Call, im Worker-Thread).
+Aktiviert über `CALCULATOR_LLM_MODE` (siehe src/llm/factory.py) oder direkt im
+Benchmark (src/topdown/bench.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+from src.llm.base import LLMClient
+
+
+class FixtureMissing(LookupError):
+    """Replay ohne aufgezeichnete Antwort für genau diesen Prompt."""
+
+
+def fixture_key(tool: dict, user: str, system: str, max_tokens: int | None) -> str:
+    """Stabiler Schlüssel eines Calls (Tool-Schema inklusive — ändert sich das
+    Schema, muss neu aufgezeichnet werden)."""
+    payload = json.dumps(
+        {"tool": tool, "system": system, "user": user, "max_tokens": max_tokens},
+        ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayLLM(LLMClient):
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str | Path, *, mode: str = "replay",
+                 inner: LLMClient | None = None, latency: float = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown mode {mode!r}")
+        if mode == "record" and inner is None:
+            raise ValueError("record mode needs an inner LLM client")
+        self.dir = Path(fixtures_dir)
+        self.mode = mode
+        self.inner = inner
+        self.latency = latency
+        self.name = f"{mode}:{getattr(inner, 'name', 'fixtures')}"
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def _call(self, tool: dict, user: str, system: str,
+              max_tokens: int | None = None) -> dict | None:
+        key = fixture_key(tool, user, system, max_tokens)
+        path = self._path(key)
+        if self.mode == "record":
+            out = self.inner._call(tool, user, system, max_tokens=max_tokens)
+            self.dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(
+                {"tool": tool["name"], "response": out}, ensure_ascii=False, indent=1),
+                encoding="utf-8")
+            tmp.replace(path)
+            return out
+        if not path.exists():
+            raise FixtureMissing(f"no fixture for {tool['name']} call ({key[:12]}…)")
+        if self.latency:
+            time.sleep(self.latency)
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+
+
+_WORD = re.compile(r"\w{4,}")
+_GENAU = re.compile(r"genau (\d+) ")
+
+
+def _tokens(text: str) -> set[str]:
+    return {w.lower() for w in _WORD.findall(text or "")}
+
+
+class SyntheticLLM(LLMClient):
+    """Deterministischer Stand-in. `topics` = Pool [{name, description}], aus dem
+    `propose_topics`/`name_clusters` schöpfen (z.B. die Themen eines Korpus)."""
+
+    name = "synthetic"
+
+    def __init__(self, topics: list[dict] | None = None, *, latency: float = 0.0):
+        self.topics = [
+            {**t, "_tok": _tokens(f"{t.get('name', '')} {t.get('description', '')}")}
+            for t in (topics or []) if t.get("name")
+        ]
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _best(self, text: str, candidates: list[dict], k: int) -> list[dict]:
+        tok = _tokens(text)
+        scored = [(len(tok & c["_tok"]), c["name"], c) for c in candidates]
+        scored = [s for s in scored if s[0] > 0]
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [c for _, _, c in scored[:k]]
+
+    def _topic(self, t: dict, **extra) -> dict:
+        return {**extra, "name": t["name"], "description": t.get("description") or "",
+                "introduction": t.get("introduction") or t.get("description") or "",
+                "importance": 3}
+
+    def _call(self, tool: dict, user: str, system: str,
+              max_tokens: int | None = None) -> dict | None:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        kind = tool["name"]
+        if kind == "classify":
+            head, _, body = user.partition("\n\nArgumente:\n")
+            names = [ln[2:] for ln in head.splitlines() if ln.startswith("- ")]
+            cands = [{"name": n, "_tok": _tokens(n)} for n in names]
+            by_name = {t["name"]: t for t in self.topics}
+            for c in cands:  # Pool-Beschreibung mitnutzen, falls bekannt
+                c["_tok"] |= by_name.get(c["name"], {}).get("_tok", set())
+            out = []
+            for ln in body.splitlines():
+                m = re.match(r"\[(a\d+)\] (.*)", ln)
+                if not m:
+                    continue
+                best = self._best(m.group(2), cands, 1)
+                out.append({"id": m.group(1),
+                            "topic": best[0]["name"] if best else "andere",
+                            "confidence": 4 if best else 1})
+            return {"assignments": out}
+        if kind == "propose_topics":
+            m = _GENAU.search(system)
+            k = int(m.group(1)) if m else 5
+            picked = self._best(user, self.topics, k)
+            return {"topics": [self._topic(t) for t in picked] if len(picked) >= 2 else []}
+        if kind == "name_clusters":
+            out, used = [], set()
+            for block in user.split("\n\n"):
+                m = re.match(r"Gruppe (\d+)", block)
+                if not m:
+                    continue
+                free = [t for t in self.topics if t["name"] not in used]
+                best = self._best(block, free, 1)
+                if best:
+                    used.add(best[0]["name"])
+                    out.append(self._topic(best[0], cluster=int(m.group(1))))
+            return {"topics": out}
+        return None
@@ -0,0 +1,307 @@
+"""
+Stance-Batch: die Stance-/Kohärenz-/Thematik-Prüfung (src/review/stance.py) für
+ALLE Argumente eines Ballots — auch CMS-Importe und Argumente, die vor der
+Vorprüfung geschrieben wurden.
+
+Ablauf eines Laufs (`start` → Hintergrund-Task, ein Lauf je Ballot gleichzeitig):
+
+  1. Planen: alle nicht gelöschten PRO/CONTRA-Argumente lesen; je Argument den
+     Text-Hash bilden (derselbe Schlüssel wie der Ergebnis-Cache: Ballot,
+     Sprache, Position, normalisierter Text, Hauptthemen, Modell, Prompt-Version).
+     Argumente, deren gespeichertes Ergebnis denselben Hash hat, werden
+     übersprungen (`force` wertet alles neu aus).
+  2. Gruppieren: Argumente mit identischem Prompt (gleicher Hash) teilen sich
+     EINEN Gemma-Call — das Ergebnis wird für alle gespeichert.
+  3. Auswerten: `STANCE_BATCH_CONCURRENCY` Worker arbeiten die Gruppen ab, jeder
+     Call mit Scheduler-Priorität "batch" (interaktive Vorprüfungen haben Vorrang).
+  4. Speichern: pro Gruppe sofort nach `app_stance_review` (Schlüssel Argument +
+     Modell + Prompt-Version) — ein abgebrochener Lauf setzt beim nächsten Start
+     dort fort, wo er aufgehört hat (Schritt 1 überspringt das Erledigte).
+
+Fehlgeschlagene Gruppen werden nicht gespeichert (nächster Lauf versucht sie
+erneut). Fortschritt: `status(ballot_rkey)` (→ GET /api/review/stance/batch/…).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+
+from src import config
+from src.core.db import get_pool
+from src.core.languages import DEFAULT_LANGUAGE, normalize_lang
+from src.review import context as ballot_context
+from src.review import infomaniak_chat as chat
+from src.review import stance as stance_check
+from src.review.scheduler import BATCH
+
+logger = logging.getLogger("calculator.review.batch")
+
+_ARGS_SQL = """
+SELECT uri, title, body, type, langs FROM app_arguments
+WHERE ballot_rkey = $1 AND NOT deleted AND type IN ('PRO', 'CONTRA')
+ORDER BY created_at ASC, uri ASC
+"""
+
+_DONE_SQL = """
+SELECT argument_uri, text_hash FROM app_stance_review
+WHERE ballot_rkey = $1 AND model = $2 AND prompt_version = $3
+"""
+
+_UPSERT = """
+INSERT INTO app_stance_review
+    (argument_uri, model, prompt_version, ballot_rkey, lang, text_hash, declared,
+     severity, reads_as, matches_selected, is_argument, on_topic, topic, tone,
+     single_thought, feedback, run_id, evaluated_at)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, now())
+ON CONFLICT (argument_uri, model, prompt_version) DO UPDATE SET
+    ballot_rkey      = EXCLUDED.ballot_rkey,
+    lang             = EXCLUDED.lang,
+    text_hash        = EXCLUDED.text_hash,
+    declared         = EXCLUDED.declared,
+    severity         = EXCLUDED.severity,
+    reads_as         = EXCLUDED.reads_as,
+    matches_selected = EXCLUDED.matches_selected,
+    is_argument      = EXCLUDED.is_argument,
+    on_topic         = EXCLUDED.on_topic,
+    topic            = EXCLUDED.topic,
+    tone             = EXCLUDED.tone,
+    single_thought   = EXCLUDED.single_thought,
+    feedback         = EXCLUDED.feedback,
+    run_id           = EXCLUDED.run_id,
+    evaluated_at     = now()
+"""
+
+_RESULT_COLUMNS = (
+    "argument_uri, model, prompt_version, lang, declared, severity, reads_as, "
+    "matches_selected, is_argument, on_topic, topic, tone, single_thought, "
+    "feedback, run_id, evaluated_at")
+
+
+@dataclass
+class _Group:
+    key: str
+    lang: str
+    declared: str
+    title: str
+    body: str
+    uris: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BatchRun:
+    run_id: str
+    ballot_rkey: str
+    model: str
+    prompt_version: str
+    force: bool = False
+    state: str = "planning"     # planning | running | done | failed | cancelled
+    total: int = 0              # PRO/CONTRA-Argumente des Ballots
+    skipped: int = 0            # unverändert seit der letzten Auswertung
+    pending: int = 0            # auszuwerten
+    groups: int = 0             # davon verschiedene Prompts (= Gemma-Calls)
+    groups_done: int = 0
+    evaluated: int = 0          # gespeicherte Argumente
+    failed: int = 0             # Argumente in fehlgeschlagenen Gruppen
+    last_error: str | None = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    def as_dict(self) -> dict:
+        out = asdict(self)
+        end = self.finished_at or time.time()
+        out["elapsed_s"] = round(end - self.started_at, 1)
+        remaining = self.groups - self.groups_done
+        if self.state == "running" and self.groups_done and remaining:
+            per = (end - self.started_at) / self.groups_done
+            out["eta_s"] = round(per * remaining, 1)
+        else:
+            out["eta_s"] = None
+        return out
+
+
+_runs: dict[str, BatchRun] = {}       # Ballot → letzter Lauf
+_tasks: dict[str, asyncio.Task] = {}  # Ballot → laufender Task
+
+
+def _argument_lang(langs) -> str:
+    for lang in langs or []:
+        nl = normalize_lang(lang) if isinstance(lang, str) else None
+        if nl:
+            return nl
+    return DEFAULT_LANGUAGE
+
+
+async def _plan(conn, run: BatchRun) -> list[_Group]:
+    rows = await conn.fetch(_ARGS_SQL, run.ballot_rkey)
+    done = {} if run.force else {
+        r["argument_uri"]: r["text_hash"]
+        for r in await conn.fetch(_DONE_SQL, run.ballot_rkey, run.model, run.prompt_version)}
+    topics: dict[str, list[str]] = {}
+    groups: dict[str, _Group] = {}
+    run.total = len(rows)
+    for r in rows:
+        lang = _argument_lang(r["langs"])
+        if lang not in topics:
+            topics[lang] = (await ballot_context.get(run.ballot_rkey, lang)).topics
+        title, body, declared = r["title"] or "", r["body"] or "", r["type"]
+        if not (title.strip() or body.strip()):
+            run.skipped += 1
+            continue
+        key = stance_check._cache_key(run.ballot_rkey, lang, declared, title, body,
+                                      topics[lang])
+        if done.get(r["uri"]) == key:
+            run.skipped += 1
+            continue
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = _Group(key, lang, declared, title, body)
+        g.uris.append(r["uri"])
+    run.pending = sum(len(g.uris) for g in groups.values())
+    run.groups = len(groups)
+    return list(groups.values())
+
+
+async def _store(pool, run: BatchRun, g: _Group, res: dict) -> None:
+    async with pool.acquire() as conn:
+        await conn.executemany(_UPSERT, [
+            (uri, run.model, run.prompt_version, run.ballot_rkey, g.lang, g.key,
+             g.declared, res.get("severity"), res.get("reads_as"),
+             res.get("matches_selected"), res.get("is_argument"), res.get("on_topic"),
+             res.get("topic"), res.get("tone"), res.get("single_thought"),
+             res.get("feedback"), run.run_id)
+            for uri in g.uris])
+
+
+async def _worker(pool, run: BatchRun, queue: asyncio.Queue) -> None:
+    while True:
+        try:
+            g = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            res = await stance_check.check_stance(
+                run.ballot_rkey, g.title, g.body, g.declared, lang=g.lang,
+                use_cache=False, priority=BATCH)
+            await _store(pool, run, g, res)
+            run.evaluated += len(g.uris)
+        except Exception as err:
+            run.failed += len(g.uris)
+            run.last_error = str(err)[:300]
+            logger.warning("stance batch %s: group failed (%d args): %s",
+                           run.ballot_rkey, len(g.uris), err)
+        run.groups_done += 1
+        every = max(1, config.STANCE_BATCH_LOG_EVERY)
+        if run.groups_done % every == 0 or run.groups_done == run.groups:
+            logger.info("stance batch %s: %d/%d groups, %d evaluated, %d failed",
+                        run.ballot_rkey, run.groups_done, run.groups,
+                        run.evaluated, run.failed)
+
+
+async def run_batch(run: BatchRun) -> BatchRun:
+    """Einen Lauf vollständig ausführen (planen, auswerten, speichern)."""
+    try:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            groups = await _plan(conn, run)
+        logger.info("stance batch %s: %d args, %d skipped, %d pending in %d groups",
+                    run.ballot_rkey, run.total, run.skipped, run.pending, run.groups)
+        run.state = "running"
+        queue: asyncio.Queue = asyncio.Queue()
+        for g in groups:
+            queue.put_nowait(g)
+        workers = max(1, min(config.STANCE_BATCH_CONCURRENCY, len(groups)))
+        await asyncio.gather(*(_worker(pool, run, queue) for _ in range(workers)))
+        run.state = "done"
+    except asyncio.CancelledError:
+        run.state = "cancelled"
+        raise
+    except Exception as err:
+        run.state = "failed"
+        run.last_error = str(err)[:300]
+        logger.error("stance batch %s failed: %s", run.ballot_rkey, err)
+    finally:
+        run.finished_at = time.time()
+    return run
+
+
+def start(ballot_rkey: str, *, force: bool = False) -> BatchRun:
+    """Lauf im Hintergrund starten. Läuft für den Ballot schon einer, wird dieser
+    zurückgegeben (kein zweiter Lauf)."""
+    task = _tasks.get(ballot_rkey)
+    if task is not None and not task.done():
+        return _runs[ballot_rkey]
+    if not chat.is_configured():
+        raise RuntimeError("Infomaniak-Chat nicht konfiguriert")
+    run = BatchRun(run_id=uuid.uuid4().hex[:12], ballot_rkey=ballot_rkey,
+                   model=config.REVIEW_MODEL,
+                   prompt_version=stance_check.PROMPT_VERSION, force=force)
+    _runs[ballot_rkey] = run
+    task = asyncio.create_task(run_batch(run))
+    _tasks[ballot_rkey] = task
+    task.add_done_callback(_forget)
+    return run
+
+
+def _forget(task: asyncio.Task) -> None:
+    for ballot, t in list(_tasks.items()):
+        if t is task:
+            del _tasks[ballot]
+
+
+def status(ballot_rkey: str) -> dict | None:
+    run = _runs.get(ballot_rkey)
+    return run.as_dict() if run is not None else None
+
+
+def cancel(ballot_rkey: str) -> bool:
+    task = _tasks.get(ballot_rkey)
+    if task is None or task.done():
+        return False
+    task.cancel()
+    return True
+
+
+async def shutdown() -> None:
+    """Laufende Läufe abbrechen (Lifespan-Ende). Bereits Gespeichertes bleibt;
+    der nächste Start setzt dort fort."""
+    tasks = [t for t in _tasks.values() if not t.done()]
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def fetch_results(ballot_rkey: str, *, model: str | None = None,
+                        prompt_version: str | None = None, severity: str | None = None,
+                        mismatch_only: bool = False, off_topic_only: bool = False,
+                        limit: int = 100, offset: int = 0) -> list[dict]:
+    """Gespeicherte Ergebnisse eines Ballots für Reviewer, filterbar nach Modell,
+    Prompt-Version und Befund. Neueste Auswertung zuerst."""
+    where = ["ballot_rkey = $1"]
+    params: list = [ballot_rkey]
+    for col, val in (("model", model), ("prompt_version", prompt_version),
+                     ("severity", severity)):
+        if val:
+            params.append(val)
+            where.append(f"{col} = ${len(params)}")
+    if mismatch_only:
+        where.append("NOT matches_selected")
+    if off_topic_only:
+        where.append("NOT on_topic")
+    params += [limit, offset]
+    sql = (f"SELECT {_RESULT_COLUMNS} FROM app_stance_review "
+           f"WHERE {' AND '.join(where)} "
+           f"ORDER BY evaluated_at DESC, argument_uri ASC "
+           f"LIMIT ${len(params) - 1} OFFSET ${len(params)}")
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(sql, *params)
+    out = []
+    for r in rows:
+        d = dict(r)
+        d["evaluated_at"] = d["evaluated_at"].isoformat() if d["evaluated_at"] else None
+        out.append(d)
+    return out
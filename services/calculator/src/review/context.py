@@ -0,0 +1,135 @@
+"""
+Ballot-Kontext für die Stance-Vorprüfung — gecacht je Ballot + Sprache.
+
+Bisher las jede Vorprüfung die Vorlagen-Beschreibung (neue Verbindung zur CMS-DB)
+und die Hauptthemen neu. Hier werden sie EINMAL geladen und für
+`BALLOT_CONTEXT_TTL` Sekunden gehalten:
+
+  description    — amtliche Vorlagen-Beschreibung (CMS, Plaintext) oder None
+  topics         — Namen der Hauptthemen (Anzeige-Reihenfolge)
+  topic_vectors  — (Namen, normierte Matrix) der Themen-Embeddings in der Sprache;
+                   nur geladen, wenn es mehr als TOPIC_MAX_INLINE Themen gibt
+                   (sonst braucht die Vorprüfung keine Vorauswahl)
+
+Invalidierung: der Indexer schickt nach jedem projizierten Taxonomie-Snapshot
+`NOTIFY taxonomy_changed, '<ballot_rkey>'`; `listen_forever` (Lifespan-Task)
+verwirft dann die Einträge des Ballots. Nach einem Verbindungsabbruch wird beim
+Wiederverbinden der ganze Cache verworfen (verpasste NOTIFYs). Die TTL fängt
+Änderungen ohne NOTIFY ab (Beschreibung im CMS, neue Themen-Embeddings).
+
+Gleichzeitige Misses für denselben Schlüssel laden nur einmal. Jedes Teil lädt
+fehlertolerant (Kontext ist optional, nie blockierend) — ein Teilfehler wird
+nur kurz (`_ERROR_TTL`) gecacht.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from src import config
+from src.core import db
+from src.core.languages import DEFAULT_LANGUAGE, normalize_lang
+from src.core.single_flight import SingleFlight
+from src.embedding import similarity as sim
+
+logger = logging.getLogger("calculator.review.context")
+
+NOTIFY_CHANNEL = "taxonomy_changed"
+_ERROR_TTL = 30.0
+_RECONNECT_DELAY = 5.0
+
+
+@dataclass(frozen=True)
+class BallotContext:
+    description: str | None
+    topics: list[str]
+    topic_vectors: tuple | None
+    expires: float
+
+
+_cache: dict[tuple[str, str], BallotContext] = {}
+_loading = SingleFlight()
+
+
+async def _load(ballot_rkey: str, lang: str) -> BallotContext:
+    ttl = config.BALLOT_CONTEXT_TTL
+    try:
+        description = await db.fetch_ballot_description(ballot_rkey)
+    except Exception as err:
+        logger.warning("ballot context: description unavailable: %s", err)
+        description, ttl = None, min(ttl, _ERROR_TTL)
+    try:
+        topics = await db.fetch_top_level_topics(ballot_rkey)
+    except Exception as err:
+        logger.warning("ballot context: topics unavailable: %s", err)
+        topics, ttl = [], min(ttl, _ERROR_TTL)
+    vectors = None
+    if len(topics) > config.TOPIC_MAX_INLINE:
+        try:
+            vectors = await sim.topic_vectors(ballot_rkey, lang=lang)
+        except Exception as err:
+            logger.warning("ballot context: topic vectors unavailable: %s", err)
+            ttl = min(ttl, _ERROR_TTL)
+    return BallotContext(description, topics, vectors, time.monotonic() + ttl)
+
+
+async def get(ballot_rkey: str, lang: str | None = None) -> BallotContext:
+    """Gecachter Kontext für (Ballot, Sprache); lädt bei Miss/Ablauf."""
+    key = (ballot_rkey, normalize_lang(lang) or DEFAULT_LANGUAGE)
+    hit = _cache.get(key)
+    if hit is not None and hit.expires > time.monotonic():
+        return hit
+
+    async def load() -> BallotContext:
+        ctx = await _load(*key)
+        _cache[key] = ctx
+        return ctx
+
+    return await _loading.do(key, load)
+
+
+def invalidate(ballot_rkey: str | None = None) -> None:
+    """Einträge eines Ballots (oder alle) verwerfen."""
+    if ballot_rkey is None:
+        _cache.clear()
+        return
+    for key in [k for k in _cache if k[0] == ballot_rkey]:
+        _cache.pop(key, None)
+
+
+async def listen_forever() -> None:
+    """LISTEN auf `taxonomy_changed` (AppView-DB) — als Lifespan-Task. Hält eine
+    eigene Verbindung aus dem Pool und verbindet nach Fehlern neu."""
+
+    def _on_notify(_conn, _pid, _channel, payload):
+        invalidate(payload or None)
+
+    while True:
+        pool = conn = None
+        try:
+            pool = await db.get_pool()
+            conn = await pool.acquire()
+            await conn.add_listener(NOTIFY_CHANNEL, _on_notify)
+            invalidate()  # während der Verbindungslücke verpasste NOTIFYs
+            logger.info("Ballot context cache: LISTEN %s", NOTIFY_CHANNEL)
+            while not conn.is_closed():
+                await asyncio.sleep(_RECONNECT_DELAY)
+            logger.warning("Ballot context cache: LISTEN connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.warning("Ballot context cache: LISTEN failed (%s) — retrying", err)
+        finally:
+            if conn is not None:
+                try:
+                    await conn.remove_listener(NOTIFY_CHANNEL, _on_notify)
+                except Exception:
+                    pass
+                try:
+                    await pool.release(conn)
+                except Exception:
+                    pass
+        await asyncio.sleep(_RECONNECT_DELAY)
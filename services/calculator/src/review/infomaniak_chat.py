@@ -6,6 +6,10 @@ Ausgabe per Prompt erzwingen und robust parsen (Gemma verpackt JSON oft in
 ```-Fences). Mechanik wie die frühere src/llm/infomaniak_chat.py; Retry-Muster wie
 der Übersetzungs-Worker. Token + Product ID teilen sich Chat & Embeddings
 (CALCULATOR_EMBEDDING_*). Siehe doc/infomaniak.md.
+
+Jeder Call läuft über den prozessweiten Scheduler (src/review/scheduler.py):
+`priority` ("interactive" | "batch") + `ballot` steuern Reihenfolge und
+Fairness; wer zu lange auf einen Slot wartet, bekommt `ChatBusy`.
 """
 
 from __future__ import annotations
@@ -18,6 +22,7 @@ import re
 import httpx
 
 from src import config
+from src.review.scheduler import INTERACTIVE, default_deadline, scheduler
 
 logger = logging.getLogger("calculator.review.chat")
 
@@ -73,8 +78,10 @@ async def _post_with_retry(client: httpx.AsyncClient, payload: dict, headers: di
 
 
 async def chat_json(system: str, user: str, *, model: str,
-                    max_tokens: int = 500, temperature: float = 0.1) -> dict:
-    """Eine Chat-Completion mit JSON-Antwort. Wirft bei Konfig-/Netz-/Parse-Fehler."""
+                    max_tokens: int = 500, temperature: float = 0.1,
+                    priority: str = INTERACTIVE, ballot: str | None = None) -> dict:
+    """Eine Chat-Completion mit JSON-Antwort. Wirft bei Konfig-/Netz-/Parse-Fehler
+    und `ChatBusy`, wenn innerhalb der Deadline kein Slot frei wird."""
     if not is_configured():
         raise RuntimeError(
             "Infomaniak chat not configured (CALCULATOR_EMBEDDING_PRODUCT_ID / _API_KEY).")
@@ -91,7 +98,8 @@ async def chat_json(system: str, user: str, *, model: str,
         "Authorization": f"Bearer {config.EMBEDDING_API_KEY}",
         "Content-Type": "application/json",
     }
-    async with httpx.AsyncClient(timeout=40.0) as client:
-        resp = await _post_with_retry(client, payload, headers)
+    async with scheduler.slot(priority, ballot=ballot, deadline=default_deadline(priority)):
+        async with httpx.AsyncClient(timeout=40.0) as client:
+            resp = await _post_with_retry(client, payload, headers)
     content = resp.json()["choices"][0]["message"]["content"]
     return extract_json(content)
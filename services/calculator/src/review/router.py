@@ -1,16 +1,20 @@
 """
 REST-Endpoint für LLM-Checks beim Verfassen (erweiterbar). MVP: Stance-/Kohärenz-
-Check. INTERN ONLY (Ingress auf /api/topdown beschränkt — siehe doc/CALCULATOR_EXPOSURE.md).
+Check, dazu der Stance-Batch über einen ganzen Ballot (src/review/batch.py).
+INTERN ONLY (Ingress auf /api/topdown beschränkt — siehe doc/CALCULATOR_EXPOSURE.md).
 """
 
 from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from src.review import batch as stance_batch
 from src.review import stance as stance_check
+from src.review.scheduler import ChatBusy, scheduler
 
 logger = logging.getLogger("calculator.review.router")
 
@@ -23,6 +27,12 @@ class StanceRequest(BaseModel):
     body: str = ""
     type: str | None = None  # gewählte Position 'PRO'|'CONTRA'
     lang: str | None = None
+    no_cache: bool = False  # Ergebnis-Cache umgehen (Evaluationsläufe)
+
+
+class StanceBatchRequest(BaseModel):
+    ballot_rkey: str
+    force: bool = False  # auch unveränderte (bereits ausgewertete) Argumente neu prüfen
 
 
 @router.post("/stance")
@@ -30,7 +40,74 @@ async def stance_endpoint(req: StanceRequest):
     """Beurteilt Stance-Stimmigkeit + Kohärenz + Thematik eines Entwurfs (konservativ)."""
     try:
         return await stance_check.check_stance(
-            req.ballot_rkey, req.title, req.body, req.type, lang=req.lang)
+            req.ballot_rkey, req.title, req.body, req.type, lang=req.lang,
+            use_cache=not req.no_cache)
+    except ChatBusy as err:
+        # Typisiert: der Aufrufer (AppView-Precheck) zeigt „gerade ausgelastet"
+        # statt in seinen eigenen Timeout zu laufen.
+        logger.warning("review stance busy: %s", err)
+        return JSONResponse(status_code=503, headers={"Retry-After": "5"},
+                            content={"error": "busy", "waited": round(err.waited, 1)})
     except Exception as err:
         logger.error("review stance failed: %s", err)
         raise HTTPException(status_code=502, detail=f"stance fehlgeschlagen: {err}") from err
+
+
+@router.get("/stance/cache")
+async def stance_cache_stats():
+    """Trefferquote + Grösse des Stance-Ergebnis-Caches (seit Prozessstart)."""
+    return stance_check.cache_stats()
+
+
+@router.get("/scheduler")
+async def scheduler_stats():
+    """Chat-Scheduler: belegte Slots, Queue-Tiefe und Wartezeiten je Priorität."""
+    return scheduler.stats()
+
+
+@router.post("/stance/batch", status_code=202)
+async def stance_batch_start(req: StanceBatchRequest):
+    """Stance-Prüfung aller Argumente eines Ballots im Hintergrund starten (bzw.
+    den laufenden Lauf zurückgeben). Setzt nach einem Abbruch automatisch fort."""
+    try:
+        run = stance_batch.start(req.ballot_rkey, force=req.force)
+    except RuntimeError as err:
+        raise HTTPException(status_code=503, detail=str(err)) from err
+    return run.as_dict()
+
+
+@router.get("/stance/batch/{ballot_rkey}")
+async def stance_batch_status(ballot_rkey: str):
+    """Fortschritt des letzten Laufs (seit Prozessstart)."""
+    st = stance_batch.status(ballot_rkey)
+    if st is None:
+        raise HTTPException(status_code=404, detail="kein Lauf für diesen Ballot")
+    return st
+
+
+@router.delete("/stance/batch/{ballot_rkey}")
+async def stance_batch_cancel(ballot_rkey: str):
+    """Laufenden Lauf abbrechen (Gespeichertes bleibt, Neustart setzt fort)."""
+    return {"cancelled": stance_batch.cancel(ballot_rkey)}
+
+
+@router.get("/stance/results")
+async def stance_results(
+    ballot_rkey: str = Query(...),
+    model: str | None = Query(None),
+    prompt_version: str | None = Query(None, description="Default: alle Versionen."),
+    severity: str | None = Query(None, description="'ok' | 'hint' | 'warn'"),
+    mismatch_only: bool = Query(False, description="Nur Position ≠ gewählte Seite."),
+    off_topic_only: bool = Query(False),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """Gespeicherte Batch-Ergebnisse für Reviewer (filterbar nach Modell/Prompt-Version)."""
+    return {
+        "ballot_rkey": ballot_rkey,
+        "prompt_version": stance_check.PROMPT_VERSION,
+        "results": await stance_batch.fetch_results(
+            ballot_rkey, model=model, prompt_version=prompt_version, severity=severity,
+            mismatch_only=mismatch_only, off_topic_only=off_topic_only,
+            limit=limit, offset=offset),
+    }
@@ -0,0 +1,182 @@
+"""
+Prozessweiter Scheduler für Infomaniak-Chat-Calls (Gemma) — Prioritäten,
+Nebenläufigkeits-Limit, Warte-Deadline, Fairness je Ballot.
+
+Interaktive Stance-Vorprüfungen und Batch-Läufe teilen sich das Chat-Kontingent.
+Jeder Call holt vorher einen Slot (`async with scheduler.slot(...)`):
+
+  - höchstens `CHAT_MAX_INFLIGHT` Calls gleichzeitig; Batch-Calls dürfen davon
+    höchstens `CHAT_MAX_INFLIGHT - CHAT_RESERVED_INTERACTIVE` belegen — ein
+    voller Batch-Lauf lässt also immer Slots für Vorprüfungen frei,
+  - freie Slots gehen zuerst an `interactive`, dann an `batch`,
+  - innerhalb einer Priorität reihum je Ballot (ein grosser Ballot-Lauf hungert
+    andere Ballots nicht aus), je Ballot FIFO,
+  - wer länger als seine Deadline wartet, bekommt `ChatBusy` (schnell scheitern
+    statt im 45-s-Timeout des Aufrufers zu landen).
+
+`stats()` liefert Queue-Tiefe, belegte Slots und Wartezeiten (→ GET
+/api/review/scheduler).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from src import config
+
+logger = logging.getLogger("calculator.review.scheduler")
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+
+class ChatBusy(Exception):
+    """Kein Chat-Slot innerhalb der Warte-Deadline frei."""
+
+    def __init__(self, priority: str, waited: float):
+        super().__init__(f"chat busy ({priority}, waited {waited:.1f}s)")
+        self.priority = priority
+        self.waited = waited
+
+
+class _Waiter:
+    __slots__ = ("fut", "priority", "ballot", "since")
+
+    def __init__(self, priority: str, ballot: str):
+        self.fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.priority = priority
+        self.ballot = ballot
+        self.since = time.monotonic()
+
+
+class ChatScheduler:
+    def __init__(self, *, max_inflight: int, reserved_interactive: int = 0):
+        self.max_inflight = max(1, max_inflight)
+        self.reserved_interactive = min(max(0, reserved_interactive), self.max_inflight - 1)
+        self._inflight = {p: 0 for p in PRIORITIES}
+        # Priorität → Ballot → FIFO der Wartenden (Reihenfolge der Ballots = Rotation).
+        self._queues: dict[str, OrderedDict[str, deque[_Waiter]]] = {
+            p: OrderedDict() for p in PRIORITIES}
+        self._waits = {p: deque(maxlen=500) for p in PRIORITIES}
+        self._counts = {p: {"granted": 0, "busy": 0} for p in PRIORITIES}
+
+    # ------------------------------------------------------------------ Slots
+    def _total_inflight(self) -> int:
+        return sum(self._inflight.values())
+
+    def _may_start(self, priority: str) -> bool:
+        if self._total_inflight() >= self.max_inflight:
+            return False
+        if priority == BATCH:
+            return self._inflight[BATCH] < self.max_inflight - self.reserved_interactive
+        return True
+
+    def _pop_next(self, priority: str) -> _Waiter | None:
+        queues = self._queues[priority]
+        while queues:
+            ballot, q = next(iter(queues.items()))
+            waiter = q.popleft()
+            # Ballot ans Ende der Rotation (oder raus, wenn leer).
+            del queues[ballot]
+            if q:
+                queues[ballot] = q
+            if not waiter.fut.done():
+                return waiter
+        return None
+
+    def _dispatch(self) -> None:
+        for priority in PRIORITIES:
+            while self._queues[priority] and self._may_start(priority):
+                waiter = self._pop_next(priority)
+                if waiter is None:
+                    break
+                self._grant(waiter.priority, time.monotonic() - waiter.since)
+                waiter.fut.set_result(None)
+
+    def _grant(self, priority: str, waited: float) -> None:
+        self._inflight[priority] += 1
+        self._counts[priority]["granted"] += 1
+        self._waits[priority].append(waited)
+
+    def _release(self, priority: str) -> None:
+        self._inflight[priority] -= 1
+        self._dispatch()
+
+    def _discard(self, waiter: _Waiter) -> None:
+        q = self._queues[waiter.priority].get(waiter.ballot)
+        if q is None:
+            return
+        try:
+            q.remove(waiter)
+        except ValueError:
+            return
+        if not q:
+            del self._queues[waiter.priority][waiter.ballot]
+
+    @asynccontextmanager
+    async def slot(self, priority: str = INTERACTIVE, *, ballot: str | None = None,
+                   deadline: float | None = None):
+        """Einen Chat-Slot belegen. `deadline` = max. Wartezeit in Sekunden
+        (None = warten, bis ein Slot frei ist). Wirft `ChatBusy`."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"unknown priority {priority!r}")
+        queued = any(self._queues[p] for p in PRIORITIES[:PRIORITIES.index(priority) + 1])
+        if not queued and self._may_start(priority):
+            self._grant(priority, 0.0)
+        else:
+            waiter = _Waiter(priority, ballot or "")
+            self._queues[priority].setdefault(waiter.ballot, deque()).append(waiter)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.fut), timeout=deadline)
+            except asyncio.TimeoutError:
+                if not waiter.fut.done():
+                    waiter.fut.cancel()
+                    self._discard(waiter)
+                    self._counts[priority]["busy"] += 1
+                    raise ChatBusy(priority, time.monotonic() - waiter.since) from None
+                # Slot kam genau beim Timeout — behalten.
+            except BaseException:
+                if waiter.fut.done() and not waiter.fut.cancelled():
+                    self._release(priority)  # Slot schon vergeben → zurückgeben
+                else:
+                    waiter.fut.cancel()
+                    self._discard(waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    # ---------------------------------------------------------------- Metriken
+    def stats(self) -> dict:
+        out: dict = {"max_inflight": self.max_inflight,
+                     "reserved_interactive": self.reserved_interactive}
+        for p in PRIORITIES:
+            waits = sorted(self._waits[p])
+            queued = sum(len(q) for q in self._queues[p].values())
+            out[p] = {
+                "inflight": self._inflight[p],
+                "queued": queued,
+                "queued_ballots": len(self._queues[p]),
+                **self._counts[p],
+                "wait_avg_s": round(sum(waits) / len(waits), 3) if waits else None,
+                "wait_p95_s": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else None,
+                "wait_max_s": round(waits[-1], 3) if waits else None,
+            }
+        return out
+
+
+scheduler = ChatScheduler(max_inflight=config.CHAT_MAX_INFLIGHT,
+                          reserved_interactive=config.CHAT_RESERVED_INTERACTIVE)
+
+
+def default_deadline(priority: str) -> float | None:
+    """Standard-Wartedeadline je Priorität (Konfig; <= 0 = unbegrenzt)."""
+    d = (config.CHAT_QUEUE_DEADLINE_INTERACTIVE if priority == INTERACTIVE
+         else config.CHAT_QUEUE_DEADLINE_BATCH)
+    return d if d > 0 else None
@@ -14,17 +14,30 @@ Embedding die nächsten `TOPIC_PRESELECT_K` vor (einziger Themen-Embedding-Call)
 
 Bewusst ZURÜCKHALTEND, kein Inhalts-/Meinungsurteil (Civic-Speech). Severity
 (Position+Kohärenz) wird deterministisch im Code abgeleitet, nicht vom LLM.
+
+Ergebnis-Cache: wiederholtes „Prüfen" desselben Entwurfs kostet keinen weiteren
+Gemma-Call. Schlüssel = Hash über (Ballot, Sprache, gewählte Position,
+normalisierter Titel/Text, Hauptthemen, Modell, Prompt-Version); TTL
+`STANCE_CACHE_TTL`, LRU-begrenzt. Gleichzeitige identische Anfragen teilen sich
+EINEN laufenden Call. `use_cache=False` umgeht den Cache (Evaluationsläufe).
+Trefferquote: `cache_stats()` (→ GET /api/review/stance/cache).
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import time
+from collections import OrderedDict
 
 from src import config
-from src.core import db
 from src.core.languages import DEFAULT_LANGUAGE, normalize_lang
+from src.core.single_flight import SingleFlight
 from src.embedding import similarity as sim
+from src.review import context as ballot_context
 from src.review import infomaniak_chat as chat
+from src.review.scheduler import INTERACTIVE
 
 logger = logging.getLogger("calculator.review.stance")
 
@@ -83,6 +96,57 @@ def _user_prompt(ballot_ctx: str | None, declared: str, title: str, body: str,
     )
 
 
+# Ändert sich der System-Prompt, ändert sich die Version — alte Cache-Einträge
+# werden dann nicht mehr getroffen.
+PROMPT_VERSION = hashlib.sha256(_SYSTEM.encode("utf-8")).hexdigest()[:12]
+
+_results: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_inflight = SingleFlight()
+_stats = {"hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0}
+
+
+def _cache_key(ballot_rkey: str, lang: str, declared: str, title: str, body: str,
+               topics: list[str]) -> str:
+    payload = json.dumps({
+        "ballot": ballot_rkey, "lang": lang, "declared": declared,
+        "title": " ".join(title.split()), "body": " ".join(body.split()),
+        "topics": topics, "model": config.REVIEW_MODEL, "prompt": PROMPT_VERSION,
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cached(key: str) -> dict | None:
+    hit = _results.get(key)
+    if hit is None:
+        return None
+    if hit[0] <= time.monotonic():
+        _results.pop(key, None)
+        return None
+    _results.move_to_end(key)
+    return hit[1]
+
+
+def _store(key: str, result: dict) -> None:
+    _results[key] = (time.monotonic() + config.STANCE_CACHE_TTL, result)
+    _results.move_to_end(key)
+    while len(_results) > config.STANCE_CACHE_MAX:
+        _results.popitem(last=False)
+
+
+def cache_stats() -> dict:
+    """Zähler seit Prozessstart + aktuelle Grösse. `hit_rate` = (hits + coalesced)
+    / alle Anfragen mit Cache."""
+    served = _stats["hits"] + _stats["coalesced"]
+    total = served + _stats["misses"]
+    return {**_stats, "size": len(_results), "inflight": len(_inflight),
+            "hit_rate": round(served / total, 4) if total else None,
+            "ttl": config.STANCE_CACHE_TTL, "prompt_version": PROMPT_VERSION}
+
+
+def clear_cache() -> None:
+    _results.clear()
+
+
 def _resolve_topic(topic_raw, themes: list[str]) -> str | None:
     """LLM-Antwort auf die erlaubten Werte zwingen: exakter Themenname (case-
     insensitiv) → Original; sonst „ANDERES". Ohne Themenliste → None."""
@@ -100,7 +164,11 @@ def _resolve_topic(topic_raw, themes: list[str]) -> str | None:
 
 
 async def check_stance(ballot_rkey: str, title: str, body: str,
-                       declared_type: str | None, *, lang: str | None = None) -> dict:
+                       declared_type: str | None, *, lang: str | None = None,
+                       use_cache: bool = True, priority: str = INTERACTIVE) -> dict:
+    """Stance-/Kohärenz-/Thematik-Check eines Entwurfs. `priority` = Scheduler-
+    Priorität des Chat-Calls (Batch-Läufe: "batch"). Wirft `ChatBusy`, wenn kein
+    Chat-Slot rechtzeitig frei wird (nicht gecacht)."""
     lang = normalize_lang(lang) or DEFAULT_LANGUAGE
     declared = (declared_type or "").strip().upper()
     if declared not in ("PRO", "CONTRA"):
@@ -109,25 +177,45 @@ async def check_stance(ballot_rkey: str, title: str, body: str,
     if not has_text or declared is None:
         return {"status": "ok", "severity": "ok", "topic": None}  # nichts zu prüfen
 
-    try:
-        ballot_ctx = await db.fetch_ballot_description(ballot_rkey)
-    except Exception as err:  # CMS-Kontext optional — nie blockierend
-        logger.warning("stance: ballot context unavailable: %s", err)
-        ballot_ctx = None
+    # Beschreibung + Hauptthemen (+ Themen-Embeddings) aus dem Ballot-Kontext-
+    # Cache (src/review/context.py) — nicht bei jeder Vorprüfung neu aus zwei DBs.
+    ctx = await ballot_context.get(ballot_rkey, lang)
+
+    if not use_cache or config.STANCE_CACHE_TTL <= 0:
+        _stats["bypassed"] += 1
+        return await _check(ctx, ballot_rkey, title, body, declared, lang, priority)
+
+    key = _cache_key(ballot_rkey, lang, declared, title or "", body or "", ctx.topics)
+    hit = _cached(key)
+    if hit is not None:
+        _stats["hits"] += 1
+        return dict(hit)
+    _stats["coalesced" if key in _inflight else "misses"] += 1
+
+    async def compute() -> dict:
+        # Fehler werden nicht gecacht, aber an alle Wartenden gegeben.
+        result = await _check(ctx, ballot_rkey, title, body, declared, lang, priority)
+        _store(key, result)
+        return result
+
+    return dict(await _inflight.do(key, compute))
+
+
+async def _check(ctx, ballot_rkey: str, title: str, body: str, declared: str,
+                 lang: str, priority: str) -> dict:
+    """Der eigentliche Check (ein Gemma-Call, ggf. ein Embedding-Call)."""
+    ballot_ctx = ctx.description
 
     # Hauptthemen für die Zuordnung. Bis MAX_INLINE alle; sonst Embedding-Vorauswahl.
-    try:
-        themes = await db.fetch_top_level_topics(ballot_rkey)
-        if len(themes) > config.TOPIC_MAX_INLINE:
-            try:
-                themes = await sim.top_topic_names(
-                    ballot_rkey, title, body, lang=lang, k=config.TOPIC_PRESELECT_K)
-            except Exception as err:
-                logger.warning("stance: topic preselect failed: %s", err)
-                themes = themes[: config.TOPIC_PRESELECT_K]
-    except Exception as err:
-        logger.warning("stance: topics unavailable: %s", err)
-        themes = []
+    themes = list(ctx.topics)
+    if len(themes) > config.TOPIC_MAX_INLINE:
+        try:
+            themes = await sim.top_topic_names(
+                ballot_rkey, title, body, lang=lang, k=config.TOPIC_PRESELECT_K,
+                vectors=ctx.topic_vectors)
+        except Exception as err:
+            logger.warning("stance: topic preselect failed: %s", err)
+            themes = themes[: config.TOPIC_PRESELECT_K]
 
     lang_name = _LANG_NAMES.get(lang, "Deutsch")
     obj = await chat.chat_json(
@@ -135,6 +223,8 @@ async def check_stance(ballot_rkey: str, title: str, body: str,
         _user_prompt(ballot_ctx, declared, (title or "").strip(),
                      (body or "").strip(), lang_name, themes),
         model=config.REVIEW_MODEL,
+        priority=priority,
+        ballot=ballot_rkey,
     )
 
     reads_as = str(obj.get("reads_as", "")).strip().lower()
@@ -0,0 +1,256 @@
+"""
+Offline-Benchmark der Top-down-Pipeline (induce → classify → grow) — ohne
+Anthropic-Key und ohne DB.
+
+Grundlage ist ein exportierter Baum (Default `topdown_args_663.json`, Format von
+`prototype.run_args`: Knoten mit `own_args`). Die Korpus-JSONs enthalten nur
+URIs, keine Texte; daher bekommt jedes Argument einen synthetischen Text aus Name +
+Beschreibung seines Korpus-Themas (plus etwas deterministischem Rauschen aus einem
+Nachbarthema). Die erste Zuordnung je Wurzelthema gilt als offiziell (Seed).
+
+Die Phasen laufen über dieselben Funktionen wie die Endpoints
+(`router._iter_classify`, `router._iter_grow`). Gemessen werden je Skalierung
+(`--scale 1,4,16` vervielfacht die Community-Argumente): Laufzeit, LLM-Calls,
+Übereinstimmung der Wurzel-Platzierung mit dem Korpus und die Stabilität der
+Platzierungen über `--repeat` Läufe bzw. gegen eine gespeicherte `--baseline`.
+
+LLM: `--mode synthetic` (Default, src/llm/replay.SyntheticLLM), `--mode record
+--fixtures <dir>` (einmal live gegen Anthropic laufen und jede Antwort als
+Fixture ablegen) oder `--mode replay --fixtures <dir>` (diese Antworten
+abspielen). Die Fixtures sind auf die Prompts DIESES Benchmarks geschlüsselt
+(synthetische Texte), daher immer mit demselben Korpus/Skalierung/Optionen
+aufzeichnen, mit denen später abgespielt wird. `--record-from synthetic`
+zeichnet den SyntheticLLM statt Anthropic auf (ohne Key, z.B. für
+tests/fixtures/bench_663). `--latency-ms` simuliert die Antwortzeit je Call —
+damit werden Nebenläufigkeits-/Batching-Änderungen an Laufzeit und Call-Zahl
+sichtbar, ohne Geld auszugeben.
+
+    python -m src.topdown.bench --scale 1,4 --latency-ms 20 --save /tmp/base.json
+    python -m src.topdown.bench --scale 1,4 --latency-ms 20 --baseline /tmp/base.json
+    python -m src.topdown.bench --scale 1 --repeat 1 --mode record --fixtures /tmp/fx
+    python -m src.topdown.bench --scale 1 --mode replay --fixtures /tmp/fx
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from src.llm.replay import ReplayLLM, SyntheticLLM
+from src.topdown import prototype as proto
+from src.topdown import router
+
+_DEFAULT_CORPUS = Path(__file__).resolve().parents[2] / "topdown_args_663.json"
+
+
+def load_corpus(path: str | Path) -> tuple[list[dict], list[dict]]:
+    """Korpus → (topics [{name, description, root}], args [{argument_uri, text,
+    stance, source_type, truth_root}]). Texte synthetisch (siehe Modul-Doc)."""
+    tree = json.loads(Path(path).read_text(encoding="utf-8"))
+    topics: list[dict] = []
+    owned: list[tuple[str, dict]] = []
+
+    def walk(node: dict, root_name: str | None):
+        for ch in node.get("children", []) or []:
+            rn = root_name or ch.get("name")
+            t = {"name": ch.get("name"), "description": ch.get("description") or "", "root": rn}
+            topics.append(t)
+            for uri in ch.get("own_args", []) or []:
+                owned.append((uri, t))
+            walk(ch, rn)
+
+    walk(tree, None)
+    rng = random.Random(663)
+    seen_roots: set[str] = set()
+    args: list[dict] = []
+    for i, (uri, t) in enumerate(owned):
+        noise = rng.choice(topics)["description"].split()[:3]
+        official = t["root"] not in seen_roots
+        seen_roots.add(t["root"])
+        args.append({
+            "argument_uri": uri,
+            "text": f"{t['name']}. {t['description']} {' '.join(noise)}",
+            "stance": "pro" if i % 2 else "contra",
+            "source_type": "official" if official else "community",
+            "truth_root": t["root"],
+        })
+    return topics, args
+
+
+def scale_up(args: list[dict], factor: int) -> list[dict]:
+    """Community-Argumente `factor`-fach vervielfältigen (neue URIs, leicht
+    variierte Texte); offizielle bleiben einfach."""
+    out = [a for a in args if a["source_type"] == "official"]
+    community = [a for a in args if a["source_type"] != "official"]
+    for k in range(factor):
+        for a in community:
+            words = a["text"].split()
+            rot = k % max(1, len(words))
+            out.append({**a, "argument_uri": f"{a['argument_uri']}#{k}",
+                        "text": " ".join(words[rot:] + words[:rot])})
+    return out
+
+
+def _with_uids(node: dict, seq: list[int]) -> dict:
+    seq[0] += 1
+    node["uid"] = f"n{seq[0]}"
+    for ch in node.get("children", []):
+        _with_uids(ch, seq)
+    return node
+
+
+def _paths(node: dict, prefix: tuple = ()) -> dict[str, str]:
+    """{argument_uri: 'Wurzelthema/…/Thema'} für alle Memberships."""
+    out = {a["argument_uri"]: "/".join(prefix) or "(Wurzel)"
+           for a in node.get("arguments", [])}
+    for ch in node.get("children", []):
+        out.update(_paths(ch, prefix + (ch["name"],)))
+    return out
+
+
+def run_once(llm, args: list[dict], *, chunk_size: int | None,
+             threshold: int) -> dict:
+    """Ein kompletter Durchlauf. Rückgabe: Metriken je Phase + Platzierungen."""
+    official = [a for a in args if a["source_type"] == "official"]
+    community = [a for a in args if a["source_type"] != "official"]
+    seed = "\n\n".join(f"- {a['text']}" for a in official)
+    metrics: dict = {}
+
+    t0, c0 = time.perf_counter(), llm.calls
+    roots = proto.propose_roots(llm, seed)
+    conf: dict = {}
+    assign = proto.classify_arguments(llm, [r["name"] for r in roots], official, conf_out=conf)
+    tree = _with_uids(proto._distribute_args(roots, official, assign), [0])
+    metrics["induce"] = {"seconds": time.perf_counter() - t0, "llm_calls": llm.calls - c0,
+                         "roots": len(roots)}
+
+    t0, c0 = time.perf_counter(), llm.calls
+    req = router.ClassifyRequest(ballot_rkey="bench", tree=tree)
+    by_uid: dict = {}
+
+    def index(n: dict):
+        by_uid[n["uid"]] = n
+        for ch in n.get("children", []):
+            index(ch)
+
+    index(tree)
+    placed = 0
+    for ev in router._iter_classify(llm, req, tree, community, chunk_size=chunk_size):
+        for add in ev.get("additions", []):
+            by_uid[add["uid"]]["arguments"].append(
+                {"argument_uri": add["argument_uri"], "stance": add["stance"],
+                 "confidence": add["confidence"]})
+            placed += 1
+    metrics["classify"] = {"seconds": time.perf_counter() - t0, "llm_calls": llm.calls - c0,
+                           "placed": placed, "arguments": len(community)}
+
+    t0, c0 = time.perf_counter(), llm.calls
+    greq = router.GrowRequest(ballot_rkey="bench", tree=tree, threshold=threshold)
+    candidates = proto.overfull_candidates_args(tree, greq.threshold, greq.max_depth)
+    texts = {a["argument_uri"]: a["text"] for a in args}
+    splits = [ev for ev in router._iter_grow(llm, greq, candidates, texts)
+              if ev["event"] == "split"]
+    metrics["grow"] = {"seconds": time.perf_counter() - t0, "llm_calls": llm.calls - c0,
+                       "candidates": len(candidates), "splits": len(splits)}
+
+    placements = _paths(tree)
+    truth = {a["argument_uri"]: a["truth_root"] for a in args}
+    hits = sum(1 for uri, p in placements.items() if p.split("/")[0] == truth.get(uri))
+    metrics["root_agreement"] = hits / len(args) if args else 1.0
+    return {"metrics": metrics, "placements": placements,
+            "splits": {ev["uid"]: sorted(ev["children"]) for ev in splits}}
+
+
+def _stability(runs: list[dict]) -> float:
+    """Anteil Argumente mit identischer Platzierung in ALLEN Läufen."""
+    if len(runs) < 2:
+        return 1.0
+    first = runs[0]
+    same = sum(1 for uri, p in first.items() if all(r.get(uri) == p for r in runs[1:]))
+    return same / len(first) if first else 1.0
+
+
+def make_llm(mode: str, topics: list[dict], *, fixtures: str | None = None,
+             latency: float = 0.0, record_from: str = "anthropic"):
+    """LLM für einen Lauf: synthetic | record (live → Fixtures) | replay."""
+    if mode == "synthetic":
+        return SyntheticLLM(topics, latency=latency)
+    if not fixtures:
+        raise ValueError(f"--mode {mode} braucht --fixtures")
+    if mode == "replay":
+        return ReplayLLM(fixtures, latency=latency)
+    if record_from == "synthetic":
+        inner = SyntheticLLM(topics)
+    else:
+        from src.llm.anthropic_client import AnthropicLLM
+
+        inner = AnthropicLLM()
+    return ReplayLLM(fixtures, mode="record", inner=inner)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.topdown.bench")
+    ap.add_argument("--corpus", default=str(_DEFAULT_CORPUS))
+    ap.add_argument("--scale", default="1,4", help="Vervielfachung der Community, z.B. 1,4,16")
+    ap.add_argument("--repeat", type=int, default=2)
+    ap.add_argument("--mode", choices=("synthetic", "record", "replay"), default="synthetic")
+    ap.add_argument("--fixtures", help="Fixture-Verzeichnis (--mode record/replay)")
+    ap.add_argument("--record-from", choices=("anthropic", "synthetic"), default="anthropic",
+                    help="Quelle der Antworten bei --mode record")
+    ap.add_argument("--latency-ms", type=int, default=0)
+    ap.add_argument("--chunk-size", type=int, default=0,
+                    help="Schrittgrösse wie /classify/stream (0 = eine Gruppe je Schritt)")
+    ap.add_argument("--threshold", type=int, default=10, help="Split-Schwelle wie /grow")
+    ap.add_argument("--save", help="Ergebnis (inkl. Platzierungen) als JSON schreiben")
+    ap.add_argument("--baseline", help="Platzierungen mit einem früheren --save vergleichen")
+    opts = ap.parse_args(argv)
+
+    if opts.mode != "synthetic" and not opts.fixtures:
+        ap.error(f"--mode {opts.mode} braucht --fixtures")
+    topics, base_args = load_corpus(opts.corpus)
+    latency = opts.latency_ms / 1000
+    baseline = json.loads(Path(opts.baseline).read_text()) if opts.baseline else None
+    report: dict = {"corpus": opts.corpus, "mode": opts.mode, "latency_ms": opts.latency_ms,
+                    "scales": {}}
+
+    for factor in [int(x) for x in opts.scale.split(",") if x.strip()]:
+        args = scale_up(base_args, factor)
+        runs = []
+        for _ in range(max(1, opts.repeat)):
+            llm = proto._CountingLLM(make_llm(
+                opts.mode, topics, fixtures=opts.fixtures, latency=latency,
+                record_from=opts.record_from))
+            runs.append(run_once(llm, args, chunk_size=opts.chunk_size or None,
+                                 threshold=opts.threshold))
+        entry = {
+            "arguments": len(args),
+            "metrics": runs[0]["metrics"],
+            "stability": _stability([r["placements"] for r in runs]),
+            "placements": runs[0]["placements"],
+        }
+        if baseline and str(factor) in baseline.get("scales", {}):
+            entry["baseline_agreement"] = _stability(
+                [baseline["scales"][str(factor)]["placements"], runs[0]["placements"]])
+        report["scales"][str(factor)] = entry
+
+        m = entry["metrics"]
+        line = (f"x{factor:<3} {len(args):>6} args | "
+                + " | ".join(f"{ph} {m[ph]['seconds']:.3f}s/{m[ph]['llm_calls']} calls"
+                             for ph in ("induce", "classify", "grow"))
+                + f" | root-agree {m['root_agreement']:.0%} | stable {entry['stability']:.0%}")
+        if "baseline_agreement" in entry:
+            line += f" | vs baseline {entry['baseline_agreement']:.0%}"
+        print(line)
+
+    if opts.save:
+        Path(opts.save).write_text(json.dumps(report, ensure_ascii=False, indent=1),
+                                   encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
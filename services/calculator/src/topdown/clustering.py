@@ -0,0 +1,235 @@
+"""
+Clustering-first Unterthemen-Vorschlag (Alternative zu `propose_topics`).
+
+Statt dem LLM eine Stichprobe der Argumenttexte zu geben und es Unterthemen
+ERFINDEN zu lassen, werden die gespeicherten Argument-Embeddings (app_embeddings,
+eine Sprache = ein Vektorraum) geclustert:
+
+  1. sphärisches k-means (Kosinus) mit k-means++-Init und fixem Seed,
+  2. k per Silhouette (Kosinus-Distanz) aus 2..max_k gewählt; liegt die beste
+     Silhouette unter `min_silhouette`, gilt der Knoten als kohärent → kein Split,
+  3. das LLM BENENNT nur noch jedes Cluster anhand weniger zentroid-naher
+     Beispiele (ein Call je Knoten, kein classify-Call).
+
+Die Zuordnung ergibt sich direkt aus den Clustern — reproduzierbar und auch für
+Knoten mit tausenden Argumenten billig. Argumente ohne (aktuelles) Embedding
+werden per `classify_arguments` auf die benannten Cluster verteilt.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from src import config
+from src.topdown import prototype as proto
+
+_SEED = 0
+
+_NAME_CLUSTERS_TOOL = {
+    "name": "name_clusters",
+    "description": "Benenne die vorgegebenen Argument-Gruppen.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "topics": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "cluster": {"type": "integer", "description": "Gruppen-Nummer wie vorgegeben"},
+                        **proto._PROPOSE_TOOL["input_schema"]["properties"]["topics"]["items"]["properties"],
+                    },
+                    "required": ["cluster", "name", "description", "introduction", "importance"],
+                },
+            }
+        },
+        "required": ["topics"],
+    },
+}
+
+_SYS_NAME_CLUSTERS = (
+    "Die Argumente eines Themenfelds einer Abstimmungsdebatte wurden bereits "
+    "inhaltlich GRUPPIERT. Unten stehen je Gruppe (Nummer) einige typische Argumente. "
+    "Gib JEDER Gruppe — Nummer übernehmen — einen kurzen, inhaltlichen Themennamen "
+    "(spezifischer als das Oberthema, NICHT pro/contra) und 1 Satz, was darunterfällt. "
+    "Die Namen müssen sich klar unterscheiden. Schweizer Rechtschreibung (ss statt ß)."
+    + proto._IMPORTANCE_NOTE
+    + proto._INTRODUCTION_NOTE
+)
+
+# Wurzel (neue Hauptäste): dieselbe Aufgabe, aber die Gruppen sind Argumente, die
+# in KEIN bestehendes Themenfeld passten — Namen so breit wie die Wurzelthemen
+# (Gegenstück zu proto._SYS_NEW_BRANCHES).
+_SYS_NAME_ROOT_CLUSTERS = (
+    "Die folgenden Argumente einer Abstimmungsdebatte passten in KEINES der "
+    "bestehenden Themenfelder und wurden bereits inhaltlich GRUPPIERT. Unten stehen "
+    "je Gruppe (Nummer) einige typische Argumente. Gib JEDER Gruppe — Nummer "
+    "übernehmen — den Namen eines NEUEN, eigenständigen Themenfelds (so breit und "
+    "inhaltlich wie die bestehenden Wurzelthemen — nicht pro/contra) und 1 Satz, was "
+    "darunterfällt. Die Namen müssen sich klar unterscheiden. Schweizer "
+    "Rechtschreibung (ss statt ß)."
+    + proto._IMPORTANCE_NOTE
+    + proto._INTRODUCTION_NOTE
+)
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms == 0, 1.0, norms)
+
+
+def kmeans(x: np.ndarray, k: int, *, n_init: int = 4, iters: int = 50,
+           seed: int = _SEED) -> tuple[np.ndarray, np.ndarray]:
+    """Sphärisches k-means auf zeilennormierten Vektoren. Rückgabe: (labels,
+    zentroide). Deterministisch für gegebenen `seed`; von `n_init` Läufen gewinnt
+    der mit der höchsten Gesamtähnlichkeit."""
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    best: tuple[float, np.ndarray, np.ndarray] | None = None
+    for _ in range(n_init):
+        # k-means++: weitere Zentren proportional zur (Kosinus-)Distanz ziehen.
+        centers = [int(rng.integers(n))]
+        dist = 1.0 - x @ x[centers[0]]
+        for _ in range(1, k):
+            p = np.clip(dist, 0, None)
+            total = p.sum()
+            idx = int(rng.choice(n, p=p / total)) if total > 0 else int(rng.integers(n))
+            centers.append(idx)
+            dist = np.minimum(dist, 1.0 - x @ x[idx])
+        c = x[centers].copy()
+        labels = np.full(n, -1)
+        for _ in range(iters):
+            new = np.argmax(x @ c.T, axis=1)
+            if np.array_equal(new, labels):
+                break
+            labels = new
+            for j in range(k):
+                members = x[labels == j]
+                # Leeres Cluster → den am schlechtesten passenden Punkt übernehmen.
+                c[j] = members.mean(axis=0) if len(members) else x[np.argmin((x @ c.T).max(axis=1))]
+            c = _normalize(c)
+        score = float((x @ c.T)[np.arange(n), labels].sum())
+        if best is None or score > best[0]:
+            best = (score, labels, c)
+    return best[1], best[2]
+
+
+def silhouette(x: np.ndarray, labels: np.ndarray, *, sample: int = 1000,
+               seed: int = _SEED) -> float:
+    """Mittlere Silhouette (Kosinus-Distanz) — bei grossen Knoten auf einer
+    deterministischen Stichprobe von `sample` Punkten (O(n²) sonst)."""
+    n = len(x)
+    if n > sample:
+        idx = np.random.default_rng(seed).choice(n, size=sample, replace=False)
+        x, labels = x[idx], labels[idx]
+    ks, labels = np.unique(labels, return_inverse=True)
+    if len(ks) < 2:
+        return -1.0
+    onehot = np.eye(len(ks), dtype=x.dtype)[labels]   # n × K
+    sizes = onehot.sum(axis=0)
+    sums = (1.0 - x @ x.T) @ onehot                   # Distanzsumme je Punkt/Cluster
+    rows = np.arange(len(x))
+    own_size = sizes[labels] - 1
+    a = np.divide(sums[rows, labels], own_size, out=np.zeros(len(x)), where=own_size > 0)
+    mean_other = sums / sizes
+    mean_other[rows, labels] = np.inf
+    b = mean_other.min(axis=1)
+    denom = np.maximum(a, b)
+    s = np.divide(b - a, denom, out=np.zeros(len(x)), where=denom > 0)
+    s[own_size == 0] = 0.0  # Singleton: Silhouette 0 (Konvention)
+    return float(s.mean())
+
+
+def choose_clusters(vectors: list[list[float]], *, max_k: int = 4,
+                    min_silhouette: float | None = None,
+                    min_size: int = 2) -> tuple[np.ndarray, np.ndarray] | None:
+    """Bestes k aus 2..max_k per Silhouette. None, wenn es keinen tragfähigen
+    Split gibt (zu wenige Punkte, Silhouette unter der Schwelle oder ein Cluster
+    kleiner als `min_size`)."""
+    min_silhouette = (config.CLUSTER_MIN_SILHOUETTE
+                      if min_silhouette is None else min_silhouette)
+    x = _normalize(np.asarray(vectors, dtype=np.float32))
+    best: tuple[float, np.ndarray, np.ndarray] | None = None
+    for k in range(2, min(max_k, len(x) // min_size) + 1):
+        labels, centers = kmeans(x, k)
+        if np.bincount(labels, minlength=k).min() < min_size:
+            continue
+        s = silhouette(x, labels)
+        if best is None or s > best[0]:
+            best = (s, labels, centers)
+    if best is None or best[0] < min_silhouette:
+        return None
+    return best[1], best[2]
+
+
+def exemplars(vectors: list[list[float]], labels: np.ndarray, centers: np.ndarray,
+              m: int = 5) -> dict[int, list[int]]:
+    """Je Cluster die Indizes der `m` zentroid-nächsten Punkte."""
+    x = _normalize(np.asarray(vectors, dtype=np.float32))
+    out: dict[int, list[int]] = {}
+    for j in range(len(centers)):
+        idx = np.flatnonzero(labels == j)
+        sims = x[idx] @ centers[j]
+        out[j] = [int(i) for i in idx[np.argsort(-sims)[:m]]]
+    return out
+
+
+def propose_by_clusters(
+    llm,
+    items: list[dict],
+    vectors: dict[str, list[float]],
+    *,
+    max_k: int = 4,
+    n_exemplars: int = 5,
+    is_root: bool = False,
+) -> tuple[list[dict] | None, dict[str, str] | None]:
+    """Unterthemen für `items` ([{uri, text}]) über die Embeddings in `vectors`
+    ({uri: Vektor}). Rückgabe wie der LLM-Pfad in /grow: (subtopics, assign
+    {uri: name|'andere'}) oder (None, None), wenn nicht gesplittet wird.
+    `is_root`: die Gruppen werden als neue Hauptäste benannt (ein einzelner
+    reicht), sonst als Unterthemen (mindestens zwei)."""
+    with_vec = sorted((it for it in items if it["uri"] in vectors), key=lambda it: it["uri"])
+    if len(with_vec) < 4:  # mind. 2 Cluster à 2 Argumente
+        return None, None
+    vecs = [vectors[it["uri"]] for it in with_vec]
+    chosen = choose_clusters(vecs, max_k=max_k)
+    if chosen is None:
+        return None, None
+    labels, centers = chosen
+
+    blocks = []
+    for j, idxs in exemplars(vecs, labels, centers, n_exemplars).items():
+        lines = "\n".join(
+            f"- {' '.join((with_vec[i].get('text') or '').split())[:300]}" for i in idxs)
+        blocks.append(f"Gruppe {j + 1} ({int((labels == j).sum())} Argumente):\n{lines}")
+    system = _SYS_NAME_ROOT_CLUSTERS if is_root else _SYS_NAME_CLUSTERS
+    out = llm._call(_NAME_CLUSTERS_TOOL, "\n\n".join(blocks), system,
+                    max_tokens=1500) or {}
+
+    names: dict[int, str] = {}
+    subs: list[dict] = []
+    for t in out.get("topics", []):
+        name = (t.get("name") or "").strip()
+        try:
+            j = int(t.get("cluster")) - 1
+        except (TypeError, ValueError):
+            continue
+        if not name or not 0 <= j < len(centers) or j in names:
+            continue
+        names[j] = name
+        if all(s["name"] != name for s in subs):
+            subs.append({
+                "name": name,
+                "description": t.get("description", ""),
+                "introduction": t.get("introduction", ""),
+                "importance": proto._clamp_importance(t.get("importance")),
+            })
+    if len(subs) < (1 if is_root else 2):
+        return None, None
+
+    # Unbenannte Cluster bleiben am Elternknoten ('andere').
+    assign = {it["uri"]: names.get(int(labels[i]), "andere") for i, it in enumerate(with_vec)}
+    missing = [it for it in items if it["uri"] not in vectors]
+    if missing:
+        assign.update(proto.classify_arguments(llm, [s["name"] for s in subs], missing))
+    return subs, assign
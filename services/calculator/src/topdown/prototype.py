@@ -20,9 +20,11 @@ from __future__ import annotations
 import asyncio
 import json
 import sys
+import threading
 from collections import defaultdict
 
 from src.core import db
+from src.core.taxonomy_tree import TaxonomyTree
 from src.llm import get_llm
 
 # Knoten ab dieser Tiefe werden nicht weiter gesplittet (Finanzierung → Steuern
@@ -254,15 +256,27 @@ def classify_arguments(
     return res
 
 
+class Cancelled(Exception):
+    """Der Auftraggeber ist weg (z.B. Client-Disconnect beim Streaming) — keine
+    weiteren LLM-Calls mehr absetzen."""
+
+
 class _CountingLLM:
-    """Dünner Wrapper, der die LLM-Calls zählt (für Transparenz/Endpoint)."""
+    """Dünner Wrapper, der die LLM-Calls zählt (für Transparenz/Endpoint).
+
+    Mit `cancel` (threading.Event) wird VOR jedem Call geprüft, ob abgebrochen
+    wurde — dann `Cancelled` statt eines weiteren (bezahlten) Calls. Ein bereits
+    laufender Call läuft zu Ende."""
 
-    def __init__(self, llm):
+    def __init__(self, llm, cancel: threading.Event | None = None):
         self._llm = llm
         self.calls = 0
         self.name = getattr(llm, "name", "?")
+        self.cancel = cancel
 
     def _call(self, *a, **k):
+        if self.cancel is not None and self.cancel.is_set():
+            raise Cancelled()
         self.calls += 1
         return self._llm._call(*a, **k)
 
@@ -362,31 +376,34 @@ def induce_tree_args(
 def serialize_node_args(node: dict) -> dict:
     """Argument-Knoten → saubere API-Form (camelCase, Counts). `arguments` =
     [{argument_uri, stance, confidence}]. `argumentCount` = distinct Argumente im
-    Teilbaum (jedes Argument hängt an genau einem Knoten)."""
-
-    def collect(n: dict) -> set:
-        s = {a["argument_uri"] for a in n.get("arguments", [])}
-        for ch in n.get("children", []):
-            s |= collect(ch)
-        return s
+    Teilbaum (jedes Argument hängt an genau einem Knoten) — vektorisiert über den
+    flachen Baum (src/core/taxonomy_tree.py) statt per Set-Vereinigung je Knoten."""
+    tree, flat = TaxonomyTree.from_nested(node)
+    idx = [i for i, n in enumerate(flat) for _ in n.get("arguments", [])]
+    uris = [a["argument_uri"] for n in flat for a in n.get("arguments", [])]
+    counts = tree.distinct(idx, uris)
+    count_of = {id(n): int(c) for n, c in zip(flat, counts)}
+
+    def ser(n: dict) -> dict:
+        return {
+            "name": n.get("name"),
+            "description": n.get("description") or None,
+            "introduction": n.get("introduction") or None,
+            "importance": n.get("importance"),
+            "argumentCount": count_of[id(n)],
+            "directCount": len(n.get("arguments", [])),
+            "children": [ser(ch) for ch in n.get("children", [])],
+            "arguments": [
+                {
+                    "argument_uri": a["argument_uri"],
+                    "stance": a.get("stance"),
+                    "confidence": a.get("confidence"),
+                }
+                for a in n.get("arguments", [])
+            ],
+        }
 
-    return {
-        "name": node.get("name"),
-        "description": node.get("description") or None,
-        "introduction": node.get("introduction") or None,
-        "importance": node.get("importance"),
-        "argumentCount": len(collect(node)),
-        "directCount": len(node.get("arguments", [])),
-        "children": [serialize_node_args(ch) for ch in node.get("children", [])],
-        "arguments": [
-            {
-                "argument_uri": a["argument_uri"],
-                "stance": a.get("stance"),
-                "confidence": a.get("confidence"),
-            }
-            for a in node.get("arguments", [])
-        ],
-    }
+    return ser(node)
 
 
 async def load_arguments(ballot_rkey: str, limit: int | None = None) -> dict:
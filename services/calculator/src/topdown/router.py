@@ -4,6 +4,8 @@ REST-Endpoints für die Top-down Themen-Hierarchie.
   POST /api/topdown/induce    — Baum NEU bauen (LLM) und persistieren (ersetzt).
   POST /api/topdown/classify  — neue Argumente inkrementell in den BESTEHENDEN
                                 Baum einsortieren (Q4), ohne ihn neu zu bauen.
+  POST /api/topdown/grow      — überladene Knoten in Unterthemen aufteilen.
+       …/classify/stream, …/grow/stream — dasselbe als NDJSON-Fortschritt.
   GET  /api/topdown/tree      — den persistierten Baum eines Ballots lesen.
 
 Einheit = ARGUMENT: jedes Argument hängt an GENAU EINEM Knoten (Thema).
@@ -16,14 +18,21 @@ kommen später separat oben drauf.
 
 from __future__ import annotations
 import asyncio
+import json
 import logging
+import threading
+from typing import Iterator, Literal
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.core import db
+from src.embedding import similarity as sim
 from src.llm import get_llm
+from src.topdown import clustering
 from src.topdown import prototype as proto
+from src.topdown import state as tree_state
 
 logger = logging.getLogger("calculator.topdown")
 
@@ -133,101 +142,265 @@ def _placed_argument_uris(node: dict) -> set:
     return uris
 
 
-class ClassifyRequest(BaseModel):
-    ballot_rkey: str = Field(..., description="Ballot, dessen Argumente eingehängt werden.")
-    tree: dict = Field(
-        ..., description="Aktueller (editierter) Baum aus dem State-Editor; je Knoten "
+class TreeDiff(BaseModel):
+    upsert: list[dict] = Field(
+        default_factory=list,
+        description="Neue/geänderte Knoten OHNE children: {uid, parent (uid), index, "
+        "name, description, introduction, importance, key, id, arguments:[…]}.")
+    remove: list[str] = Field(default_factory=list, description="Gelöschte Knoten-uids.")
+
+
+class EditorTreeRequest(BaseModel):
+    """Baum aus dem State-Editor: ENTWEDER voll (`tree` + `base_version`, liefert
+    eine `version`) ODER `version` + `diff` gegen den zuletzt übermittelten Stand."""
+
+    ballot_rkey: str
+    tree: dict | None = Field(
+        None, description="Aktueller (editierter) Baum aus dem State-Editor; je Knoten "
         "{uid, name, children, arguments:[…]}. Bestimmt Struktur UND welche Argumente "
         "schon verortet sind.")
+    base_version: str | None = Field(
+        None, description="Zu `tree`: die Version, die der Editor geladen hat (GET "
+        "/tree bzw. letzte Antwort). Pflicht, sobald der Calculator für den Ballot "
+        "einen Stand hält; ist es nicht mehr die aktuelle → 409.")
+    version: str | None = Field(
+        None, description="Version aus einer früheren Antwort (statt `tree`).")
+    diff: TreeDiff | None = Field(
+        None, description="Änderungen seit `version` (nur zusammen mit `version`).")
+
+
+def _stale(err: tree_state.StaleVersion) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"Der Baum wurde zwischenzeitlich von einem anderen Editor geändert "
+        f"(aktuelle Version {err.current}) — bitte neu laden.")
+
+
+def _resolve_tree(req: EditorTreeRequest) -> tuple[dict, str | None]:
+    """(Nested-Baum, version) zur Anfrage. Voller Baum → neue Version (ersetzt
+    den gecachten Stand, wenn `base_version` dessen Version ist); `version` +
+    `diff` → Diff anwenden. Veraltete Version → 409, unbekannte/abgelaufene →
+    404 (Editor schickt dann wieder `tree`)."""
+    if req.tree is not None:
+        try:
+            version, _ = tree_state.store.open(req.ballot_rkey, req.tree, req.base_version)
+        except tree_state.StaleVersion as err:
+            raise _stale(err) from err
+        except tree_state.InvalidDiff:
+            return req.tree, None  # z.B. Baum ohne uids → ohne Versionierung
+        return req.tree, version
+    if not req.version:
+        raise HTTPException(
+            status_code=422, detail="Entweder `tree` oder `version` (+ `diff`) angeben.")
+    diff = req.diff or TreeDiff()
+    try:
+        version, tree = tree_state.store.apply(
+            req.ballot_rkey, req.version, diff.upsert, diff.remove)
+    except tree_state.UnknownTree as err:
+        raise HTTPException(
+            status_code=404,
+            detail="Baum-Version unbekannt oder abgelaufen — bitte den ganzen Baum "
+            "(`tree`) schicken.") from err
+    except tree_state.StaleVersion as err:
+        raise _stale(err) from err
+    except tree_state.InvalidDiff as err:
+        raise HTTPException(status_code=422, detail=f"Ungültiger diff: {err}") from err
+    return tree, version
+
+
+def _with_version(events: Iterator[dict], version: str | None) -> Iterator[dict]:
+    """Die Baum-Version ans `summary` hängen (für den nächsten Diff)."""
+    for ev in events:
+        if ev["event"] == "summary" and version:
+            ev = {**ev, "version": version}
+        yield ev
+
+
+class ClassifyRequest(EditorTreeRequest):
+    ballot_rkey: str = Field(..., description="Ballot, dessen Argumente eingehängt werden.")
 
     model_config = {"json_schema_extra": {"examples": [{"ballot_rkey": "663.1", "tree": {}}]}}
 
 
+def _additions(group: list[dict], placements: dict, confs: dict,
+               stance_by: dict) -> list[dict]:
+    """Platzierungen eines Schritts → `additions` [{uid, argument_uri, stance,
+    confidence}] zum Mergen in den State."""
+    return [
+        {"uid": placements[a["argument_uri"]], "argument_uri": a["argument_uri"],
+         "stance": stance_by.get(a["argument_uri"]),
+         "confidence": confs.get(a["argument_uri"])}
+        for a in group if a["argument_uri"] in placements
+    ]
+
+
+async def _classify_unplaced(ballot_rkey: str, tree: dict) -> list[dict]:
+    placed = _placed_argument_uris(tree)
+    all_args = await db.fetch_arguments(ballot_rkey)
+    return [a for a in all_args if a["argument_uri"] not in placed]
+
+
+def _iter_classify(llm, req: ClassifyRequest, tree: dict, unplaced: list[dict], *,
+                   chunk_size: int | None = None) -> Iterator[dict]:
+    """Sortiert die unverorteten Argumente ein — ZUERST die offiziellen, DANACH
+    die Community — und liefert je Schritt ein `placements`-Event, am Ende ein
+    `summary`. Ohne `chunk_size` ist jede Gruppe EIN Schritt (so wenige LLM-Calls
+    wie möglich); mit `chunk_size` kommen Zwischenstände früher (Streaming)."""
+    stance_by = {a["argument_uri"]: a["stance"] for a in unplaced}
+    groups = (
+        ("official", [a for a in unplaced if a.get("source_type") == "official"]),
+        ("community", [a for a in unplaced if a.get("source_type") != "official"]),
+    )
+    counts = {"official": 0, "community": 0}
+    done = 0
+    for label, group in groups:
+        size = chunk_size or len(group) or 1
+        for start in range(0, len(group), size):
+            chunk = group[start:start + size]
+            confs: dict = {}
+            placements = proto.classify_incremental_args(
+                llm, tree, [{"uri": a["argument_uri"], "text": a["text"]} for a in chunk],
+                conf_out=confs)
+            adds = _additions(chunk, placements, confs, stance_by)
+            counts[label] += len(adds)
+            done += len(chunk)
+            yield {"event": "placements", "group": label, "additions": adds,
+                   "done": done, "total": len(unplaced), "llm_calls": llm.calls}
+    yield {
+        "event": "summary",
+        "ballot_rkey": req.ballot_rkey,
+        "llm": getattr(llm, "name", "?"),
+        "llm_calls": llm.calls,
+        "placed": counts["official"] + counts["community"],
+        "placed_official": counts["official"],
+        "placed_community": counts["community"],
+    }
+
+
+def _ndjson(obj: dict) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _stream_events(events: Iterator[dict], cancel: threading.Event) -> StreamingResponse:
+    """NDJSON-Antwort: jeder Schritt des (synchronen, LLM-lastigen) Iterators
+    läuft in einem Worker-Thread und wird sofort als Zeile geschrieben. Trennt der
+    Client die Verbindung, bricht Starlette den Generator ab → `cancel` wird
+    gesetzt, und `_CountingLLM` setzt keine weiteren LLM-Calls mehr ab."""
+    end = object()
+
+    async def body():
+        try:
+            while True:
+                try:
+                    ev = await asyncio.to_thread(next, events, end)
+                except proto.Cancelled:
+                    return
+                except Exception as err:
+                    logger.error("Streaming-Schritt fehlgeschlagen (%s)", err)
+                    yield _ndjson({"event": "error", "detail": str(err)})
+                    return
+                if ev is end:
+                    return
+                yield _ndjson(ev)
+        finally:
+            cancel.set()
+
+    # X-Accel-Buffering: der nginx-Ingress soll die Zeilen nicht puffern.
+    return StreamingResponse(body(), media_type="application/x-ndjson",
+                             headers={"X-Accel-Buffering": "no"})
+
+
 @router.post("/classify")
 async def classify_propose(req: ClassifyRequest):
     """Vorschlag (kein Schreiben): sortiert die im übergebenen Baum noch nicht
     verorteten Argumente top-down in dessen Struktur ein. ZUERST die offiziellen,
     DANACH die Community-Argumente. Rückgabe: `additions` =
     [{uid, argument_uri, stance, confidence}] zum Mergen in den State."""
-    placed = _placed_argument_uris(req.tree)
-    all_args = await db.fetch_arguments(req.ballot_rkey)
-    unplaced = [a for a in all_args if a["argument_uri"] not in placed]
+    tree, version = _resolve_tree(req)
+    unplaced = await _classify_unplaced(req.ballot_rkey, tree)
     if not unplaced:
         return {"ballot_rkey": req.ballot_rkey, "additions": [],
                 "placed": 0, "placed_official": 0, "placed_community": 0,
-                "llm_calls": 0, "message": "Keine unverorteten Argumente."}
-
-    official = [a for a in unplaced if a.get("source_type") == "official"]
-    community = [a for a in unplaced if a.get("source_type") != "official"]
-    stance_by = {a["argument_uri"]: a["stance"] for a in unplaced}
+                "llm_calls": 0, "message": "Keine unverorteten Argumente.",
+                "version": version}
 
     llm = proto._CountingLLM(get_llm())
-    placements: dict[str, object] = {}
-    confs: dict[str, object] = {}
-
-    def _classify_group(group: list[dict]):
-        items = [{"uri": a["argument_uri"], "text": a["text"]}
-                 for a in group if a["argument_uri"] not in placements]
-        if items:
-            placements.update(
-                proto.classify_incremental_args(llm, req.tree, items, conf_out=confs))
-
     try:
-        await asyncio.to_thread(_classify_group, official)
-        await asyncio.to_thread(_classify_group, community)
+        events = await asyncio.to_thread(
+            list, _with_version(_iter_classify(llm, req, tree, unplaced), version))
     except Exception as err:
         logger.error("Einsortieren (propose) fehlgeschlagen (%s)", err)
         raise HTTPException(status_code=502, detail=f"Einsortieren fehlgeschlagen: {err}") from err
 
-    def _adds(group: list[dict]) -> list[dict]:
-        return [
-            {"uid": placements[a["argument_uri"]], "argument_uri": a["argument_uri"],
-             "stance": stance_by.get(a["argument_uri"]),
-             "confidence": confs.get(a["argument_uri"])}
-            for a in group if a["argument_uri"] in placements
-        ]
+    summary = {k: v for k, v in events[-1].items() if k != "event"}
+    # Offizielle vor Community — entspricht der Reihenfolge der Schritte.
+    summary["additions"] = [a for ev in events[:-1] for a in ev["additions"]]
+    return summary
 
-    adds_off, adds_com = _adds(official), _adds(community)
-    return {
-        "ballot_rkey": req.ballot_rkey,
-        "llm": getattr(llm, "name", "?"),
-        "llm_calls": llm.calls,
-        "placed": len(adds_off) + len(adds_com),
-        "placed_official": len(adds_off),
-        "placed_community": len(adds_com),
-        "additions": adds_off + adds_com,
-    }
+
+class ClassifyStreamRequest(ClassifyRequest):
+    chunk_size: int = Field(
+        40, ge=1, le=1000,
+        description="Argumente je Schritt (= je NDJSON-Zeile). Kleiner → früheres "
+        "Feedback, aber ggf. mehr LLM-Calls in den tieferen Ebenen.")
 
 
-class GrowRequest(BaseModel):
+@router.post("/classify/stream")
+async def classify_propose_stream(req: ClassifyStreamRequest):
+    """Wie /classify, aber als NDJSON-Stream: je Schritt eine Zeile
+    `{"event":"placements", additions, done, total, llm_calls}`, zum Schluss
+    `{"event":"summary", …}` (bei einem Fehler `{"event":"error", detail}`).
+    Ein Disconnect des Clients bricht die restlichen LLM-Calls ab."""
+    tree, version = _resolve_tree(req)
+    unplaced = await _classify_unplaced(req.ballot_rkey, tree)
+    cancel = threading.Event()
+    if not unplaced:
+        events = iter([{"event": "summary", "ballot_rkey": req.ballot_rkey,
+                        "placed": 0, "placed_official": 0, "placed_community": 0,
+                        "llm_calls": 0, "message": "Keine unverorteten Argumente."}])
+        return _stream_events(_with_version(events, version), cancel)
+    llm = proto._CountingLLM(get_llm(), cancel=cancel)
+    events = _iter_classify(llm, req, tree, unplaced, chunk_size=req.chunk_size)
+    return _stream_events(_with_version(events, version), cancel)
+
+
+class GrowRequest(EditorTreeRequest):
     ballot_rkey: str = Field(..., description="Ballot (für Logging/Antwort).")
-    tree: dict = Field(..., description="Aktueller (editierter) Baum aus dem State-Editor.")
     threshold: int = Field(
         10, ge=2, le=200,
         description="Ab so vielen DIREKTEN Primär-Argumenten wird ein Knoten gesplittet.")
     max_depth: int = Field(
         proto.MAX_DEPTH, ge=1, le=8,
         description="Knoten ab dieser Tiefe werden nicht weiter gesplittet.")
+    proposer: Literal["llm", "cluster"] = Field(
+        "llm",
+        description="'llm' = Unterthemen aus einer Stichprobe der Texte erfinden lassen; "
+        "'cluster' = Argument-Embeddings clustern (k per Silhouette) und das LLM nur "
+        "die Cluster benennen lassen — reproduzierbar, billiger, auch für sehr grosse "
+        "Knoten. Argumente ohne Embedding werden per LLM zugeordnet.")
 
     model_config = {"json_schema_extra": {"examples": [{"ballot_rkey": "663.1", "tree": {}}]}}
 
 
-@router.post("/grow")
-async def grow_propose(req: GrowRequest):
-    """Vorschlag (kein Schreiben): überladene Knoten des übergebenen Baums per LLM
-    in Unterthemen aufteilen. Rückgabe: `splits` = [{uid, kind, subtopics, assign,
-    children}], wobei `assign` = {argument_uri: subtopic-name}."""
-    candidates = proto.overfull_candidates_args(req.tree, req.threshold, req.max_depth)
-    if not candidates:
-        return {"ballot_rkey": req.ballot_rkey, "splits": [],
-                "candidates": 0, "llm_calls": 0,
-                "message": "Kein Knoten über der Schwelle."}
+async def _grow_vectors(req: GrowRequest, candidates: list[dict]) -> dict | None:
+    """Für proposer='cluster': die Embeddings aller Kandidaten-Argumente vorab
+    laden (eine Query; der Split selbst läuft synchron im Worker-Thread)."""
+    if req.proposer != "cluster":
+        return None
+    uris = sorted({u for c in candidates for u in c["arguments"]})
+    return await sim.argument_vectors(uris)
 
-    texts = await db.fetch_argument_texts(req.ballot_rkey)
-    llm = proto._CountingLLM(get_llm())
+
+def _iter_grow(llm, req: GrowRequest, candidates: list[dict],
+               texts: dict[str, str], vectors: dict | None = None) -> Iterator[dict]:
+    """Je Kandidat ein Event — `split` (Vorschlag) oder `skipped` (kohärent bzw.
+    Fehler) — und am Ende ein `summary`. Ein fehlgeschlagener Kandidat bricht den
+    Lauf nicht ab."""
 
     def _propose_and_classify(arg_uris: list[str], is_root: bool):
         items = [{"uri": u, "text": texts.get(u, "")} for u in arg_uris]
+        if vectors is not None:
+            return clustering.propose_by_clusters(llm, items, vectors, is_root=is_root)
         system = proto._SYS_NEW_BRANCHES if is_root else proto._SYS_SUBS
         listing = "\n".join(f"- {(texts.get(u, '') or '')[:200]}" for u in arg_uris)
         subs = proto.propose_topics(llm, system, "Argumente:\n" + listing)
@@ -236,43 +409,101 @@ async def grow_propose(req: GrowRequest):
         assign = proto.classify_arguments(llm, [s["name"] for s in subs], items)
         return subs, assign
 
-    splits = []
-    for cand in candidates:
+    n_splits = 0
+    for i, cand in enumerate(candidates, start=1):
+        progress = {"done": i, "total": len(candidates), "llm_calls": llm.calls}
         try:
-            subs, assign = await asyncio.to_thread(
-                _propose_and_classify, cand["arguments"], cand["is_root"])
+            subs, assign = _propose_and_classify(cand["arguments"], cand["is_root"])
+        except proto.Cancelled:
+            raise
         except Exception as err:
             logger.error("Split-Vorschlag für Knoten %s fehlgeschlagen (%s)",
                          cand["uid"], err)
-            continue
+            subs = assign = None
+        progress["llm_calls"] = llm.calls
         if not subs:
+            yield {"event": "skipped", "uid": cand["uid"], **progress}
             continue
         used = {t for t in assign.values() if t != "andere"}
-        splits.append({
+        n_splits += 1
+        yield {
+            "event": "split",
             "uid": cand["uid"],
             "kind": "neue-hauptaeste" if cand["is_root"] else "unterthemen",
             "subtopics": subs,
             "assign": assign,
             "children": [s["name"] for s in subs if s["name"] in used],
-        })
-
-    return {
+            **progress,
+        }
+    yield {
+        "event": "summary",
         "ballot_rkey": req.ballot_rkey,
         "llm": getattr(llm, "name", "?"),
         "llm_calls": llm.calls,
         "candidates": len(candidates),
-        "splits": splits,
+        "splits": n_splits,
     }
 
 
+_NO_CANDIDATES = {"splits": [], "candidates": 0, "llm_calls": 0,
+                  "message": "Kein Knoten über der Schwelle."}
+
+
+@router.post("/grow")
+async def grow_propose(req: GrowRequest):
+    """Vorschlag (kein Schreiben): überladene Knoten des übergebenen Baums per LLM
+    in Unterthemen aufteilen. Rückgabe: `splits` = [{uid, kind, subtopics, assign,
+    children}], wobei `assign` = {argument_uri: subtopic-name}."""
+    tree, version = _resolve_tree(req)
+    candidates = proto.overfull_candidates_args(tree, req.threshold, req.max_depth)
+    if not candidates:
+        return {"ballot_rkey": req.ballot_rkey, **_NO_CANDIDATES, "version": version}
+
+    texts = await db.fetch_argument_texts(req.ballot_rkey)
+    vectors = await _grow_vectors(req, candidates)
+    llm = proto._CountingLLM(get_llm())
+    events = await asyncio.to_thread(
+        list, _with_version(_iter_grow(llm, req, candidates, texts, vectors), version))
+
+    summary = {k: v for k, v in events[-1].items() if k != "event"}
+    summary["splits"] = [
+        {k: ev[k] for k in ("uid", "kind", "subtopics", "assign", "children")}
+        for ev in events[:-1] if ev["event"] == "split"
+    ]
+    return summary
+
+
+@router.post("/grow/stream")
+async def grow_propose_stream(req: GrowRequest):
+    """Wie /grow, aber als NDJSON-Stream: je Kandidat `{"event":"split", …}` bzw.
+    `{"event":"skipped", uid}` mit `done`/`total`/`llm_calls`, zum Schluss
+    `{"event":"summary", splits:<Anzahl>, …}`. Ein Disconnect des Clients bricht
+    die restlichen LLM-Calls ab."""
+    tree, version = _resolve_tree(req)
+    candidates = proto.overfull_candidates_args(tree, req.threshold, req.max_depth)
+    cancel = threading.Event()
+    if not candidates:
+        events = iter([{"event": "summary", "ballot_rkey": req.ballot_rkey,
+                        **_NO_CANDIDATES, "splits": 0}])
+        return _stream_events(_with_version(events, version), cancel)
+    texts = await db.fetch_argument_texts(req.ballot_rkey)
+    vectors = await _grow_vectors(req, candidates)
+    llm = proto._CountingLLM(get_llm(), cancel=cancel)
+    events = _iter_grow(llm, req, candidates, texts, vectors)
+    return _stream_events(_with_version(events, version), cancel)
+
+
 @router.get("/tree")
 async def get_tree(ballot_rkey: str = Query(...)):
-    """Den persistierten Themen-Baum eines Ballots lesen (kein LLM)."""
+    """Den persistierten Themen-Baum eines Ballots lesen (kein LLM). `version`
+    ist der aktuelle Editor-Stand im Calculator (None = keiner) — der Editor
+    schickt ihn als `base_version` mit seinem ersten vollen Baum."""
     root = await db.fetch_topic_tree(ballot_rkey)
     if root is None:
         raise HTTPException(status_code=404,
                             detail=f"Kein Baum für Ballot {ballot_rkey}.")
-    return {"ballot_rkey": ballot_rkey, "tree": root}
+    return {"ballot_rkey": ballot_rkey, "tree": root,
+            "version": tree_state.store.head(ballot_rkey)}
 
 
 @router.get("/status")
@@ -0,0 +1,194 @@
+"""
+Versionierter Editor-Baum pro Ballot (In-Process-Cache) für die State-Editor-
+Endpoints (/classify, /grow und deren /stream-Varianten).
+
+Der CMS-Editor schickt den ganzen Baum EINMAL (`tree`) und bekommt ein `version`-
+Token zurück. Danach reicht `version` + `diff` (nur geänderte/neue Knoten und
+gelöschte uids) — der Calculator hält den Baum flach (uid → Knoten) und baut die
+Nested-Form für die Klassifikation selbst. Ein `diff` gegen eine veraltete
+Version wird mit `StaleVersion` (→ 409) abgelehnt: zwei Editoren überschreiben
+sich nicht still. Dasselbe gilt für einen vollen Baum: er trägt `base_version`
+(die Version, die der Editor geladen hat, siehe GET /tree) und ersetzt den
+Stand nur, wenn das noch die aktuelle ist. Unbekannte/abgelaufene Bäume → `UnknownTree` (→ 404); der
+Editor schickt dann wieder den ganzen Baum.
+
+Bewusst nur im Speicher (Calculator = reines Compute, single replica): nach einem
+Neustart schickt der Editor einmal den vollen Baum, mehr nicht. Persistiert wird
+weiterhin ausschliesslich über den CMS-Snapshot.
+"""
+
+from __future__ import annotations
+
+import secrets
+import time
+from collections import OrderedDict
+
+from src import config
+
+# Felder eines Knotens, die der Editor schickt (ohne children — die ergeben sich
+# aus parent + index).
+NODE_FIELDS = ("uid", "id", "key", "name", "description", "introduction",
+               "importance", "arguments")
+
+
+class UnknownTree(Exception):
+    """Kein (oder abgelaufener) Baum für diesen Ballot."""
+
+
+class StaleVersion(Exception):
+    """`diff` gegen eine Version, die nicht mehr die aktuelle ist."""
+
+    def __init__(self, current: str):
+        super().__init__(f"stale version (current: {current})")
+        self.current = current
+
+
+class InvalidDiff(ValueError):
+    """Diff ergibt keinen gültigen Baum (fehlender Elternknoten, Zyklus, …)."""
+
+
+class _Entry:
+    __slots__ = ("epoch", "seq", "nodes", "root", "touched")
+
+    def __init__(self, nodes: dict[str, dict], root: str):
+        self.epoch = secrets.token_hex(4)
+        self.seq = 1
+        self.nodes = nodes
+        self.root = root
+        self.touched = time.monotonic()
+
+    @property
+    def version(self) -> str:
+        return f"{self.epoch}.{self.seq}"
+
+
+def flatten(tree: dict) -> tuple[dict[str, dict], str]:
+    """Nested-Baum (je Knoten `uid`) → ({uid: Knoten mit parent/index}, root_uid)."""
+    nodes: dict[str, dict] = {}
+
+    def walk(node: dict, parent: str | None, index: int) -> str:
+        uid = node.get("uid")
+        if uid is None or str(uid) in nodes:
+            raise InvalidDiff(f"Knoten ohne/mit doppelter uid: {uid!r}")
+        uid = str(uid)
+        flat = {k: node.get(k) for k in NODE_FIELDS}
+        flat["uid"] = uid
+        flat["arguments"] = list(node.get("arguments") or [])
+        flat["parent"], flat["index"] = parent, index
+        nodes[uid] = flat
+        for i, ch in enumerate(node.get("children") or []):
+            walk(ch, uid, i)
+        return uid
+
+    root = walk(tree, None, 0)
+    return nodes, root
+
+
+def build(nodes: dict[str, dict], root: str) -> dict:
+    """Flache Knoten → Nested-Baum (Form wie vom Editor geschickt)."""
+    children: dict[str, list[dict]] = {}
+    for n in nodes.values():
+        if n["parent"] is not None:
+            children.setdefault(n["parent"], []).append(n)
+
+    def make(uid: str) -> dict:
+        n = nodes[uid]
+        out = {k: n.get(k) for k in NODE_FIELDS}
+        kids = sorted(children.get(uid, []), key=lambda c: c.get("index") or 0)
+        out["children"] = [make(c["uid"]) for c in kids]
+        return out
+
+    return make(root)
+
+
+def _check(nodes: dict[str, dict], root: str) -> None:
+    """Jeder Knoten muss über existierende Eltern ohne Zyklus zur Wurzel führen."""
+    if root not in nodes or nodes[root]["parent"] is not None:
+        raise InvalidDiff("Wurzel fehlt oder hat einen Elternknoten.")
+    for uid in nodes:
+        seen = {uid}
+        cur = nodes[uid]["parent"]
+        while cur is not None:
+            if cur not in nodes:
+                raise InvalidDiff(f"Elternknoten {cur!r} von {uid!r} existiert nicht.")
+            if cur in seen:
+                raise InvalidDiff(f"Zyklus bei Knoten {uid!r}.")
+            seen.add(cur)
+            cur = nodes[cur]["parent"]
+
+
+class TreeStore:
+    """Versionierte Editor-Bäume, je Ballot einer. LRU-begrenzt + TTL."""
+
+    def __init__(self, *, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def _get(self, ballot_rkey: str) -> _Entry:
+        entry = self._entries.get(ballot_rkey)
+        if entry is None or time.monotonic() - entry.touched > self.ttl:
+            self._entries.pop(ballot_rkey, None)
+            raise UnknownTree(ballot_rkey)
+        entry.touched = time.monotonic()
+        self._entries.move_to_end(ballot_rkey)
+        return entry
+
+    def head(self, ballot_rkey: str) -> str | None:
+        """Aktuelle Version des Ballots, None wenn keiner (mehr) gecacht ist."""
+        try:
+            return self._get(ballot_rkey).version
+        except UnknownTree:
+            return None
+
+    def open(self, ballot_rkey: str, tree: dict,
+             base_version: str | None = None) -> tuple[str, dict]:
+        """Vollen Baum übernehmen (ersetzt einen bestehenden, aber nur wenn
+        `base_version` dessen aktuelle Version ist — sonst `StaleVersion`).
+        Rückgabe: (version, normalisierter Nested-Baum)."""
+        current = self.head(ballot_rkey)
+        if current is not None and base_version != current:
+            raise StaleVersion(current)
+        nodes, root = flatten(tree)
+        entry = _Entry(nodes, root)
+        self._entries[ballot_rkey] = entry
+        self._entries.move_to_end(ballot_rkey)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry.version, build(nodes, root)
+
+    def apply(self, ballot_rkey: str, version: str, upsert: list[dict],
+              remove: list[str]) -> tuple[str, dict]:
+        """`diff` auf die Version `version` anwenden. Wirft `UnknownTree`,
+        `StaleVersion` oder `InvalidDiff`. Rückgabe: (neue version, Nested-Baum).
+        Ein leerer Diff lässt die Version unverändert."""
+        entry = self._get(ballot_rkey)
+        if version != entry.version:
+            raise StaleVersion(entry.version)
+        if not upsert and not remove:
+            return entry.version, build(entry.nodes, entry.root)
+        nodes = dict(entry.nodes)
+        for uid in remove:
+            nodes.pop(str(uid), None)
+        for raw in upsert:
+            uid = raw.get("uid")
+            if uid is None:
+                raise InvalidDiff("upsert-Knoten ohne uid.")
+            uid = str(uid)
+            flat = {k: raw.get(k) for k in NODE_FIELDS}
+            flat["uid"] = uid
+            flat["arguments"] = list(raw.get("arguments") or [])
+            flat["parent"] = None if raw.get("parent") is None else str(raw["parent"])
+            flat["index"] = raw.get("index") or 0
+            nodes[uid] = flat
+        # Kinder gelöschter Knoten dürfen nicht verwaist zurückbleiben.
+        _check(nodes, entry.root)
+        entry.nodes = nodes
+        entry.seq += 1
+        return entry.version, build(nodes, entry.root)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+store = TreeStore(ttl=config.TREE_STATE_TTL, max_entries=config.TREE_STATE_MAX)
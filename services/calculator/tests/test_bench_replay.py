@@ -0,0 +1,39 @@
+"""
+Replay der Top-down-Pipeline aus eingecheckten Fixtures (src/topdown/bench.py,
+src/llm/replay.py) — ohne Anthropic-Key und ohne DB.
+
+tests/fixtures/bench_663 ist aufgezeichnet mit
+    python -m src.topdown.bench --scale 1 --repeat 1 --threshold 2 \\
+        --mode record --record-from synthetic --fixtures tests/fixtures/bench_663
+Ändern sich Prompts oder Tool-Schemas, schlägt der Test mit FixtureMissing fehl
+→ neu aufzeichnen.
+"""
+
+from pathlib import Path
+
+from src.topdown import bench
+from src.topdown import prototype as proto
+
+FIXTURES = Path(__file__).parent / "fixtures" / "bench_663"
+
+
+def _run(mode: str, **kw) -> tuple[dict, int]:
+    topics, args = bench.load_corpus(bench._DEFAULT_CORPUS)
+    llm = proto._CountingLLM(bench.make_llm(mode, topics, **kw))
+    return bench.run_once(llm, bench.scale_up(args, 1), chunk_size=None, threshold=2), llm.calls
+
+
+def test_replay_matches_recorded_run():
+    live, live_calls = _run("synthetic")
+    replayed, calls = _run("replay", fixtures=str(FIXTURES))
+
+    assert calls == live_calls == len(list(FIXTURES.glob("*.json")))
+    assert replayed["placements"] == live["placements"]
+    assert replayed["splits"] == live["splits"]
+    assert replayed["metrics"]["grow"]["splits"] > 0  # grow-Pfad läuft mit
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    recorded, _ = _run("record", fixtures=str(tmp_path), record_from="synthetic")
+    replayed, _ = _run("replay", fixtures=str(tmp_path))
+    assert replayed["placements"] == recorded["placements"]
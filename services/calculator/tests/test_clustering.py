@@ -0,0 +1,62 @@
+"""
+Clustering-first Unterthemen (src/topdown/clustering.py): k-means und k-Wahl
+sind reproduzierbar, die Silhouette erkennt klar getrennte Gruppen.
+"""
+
+import numpy as np
+
+from src.topdown.clustering import _normalize, choose_clusters, kmeans, silhouette
+
+
+def _blobs(k: int = 3, per: int = 20, dim: int = 16, noise: float = 0.05,
+           seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """k klar getrennte Richtungen (Achsen) mit etwas Rauschen, zeilennormiert."""
+    rng = np.random.default_rng(seed)
+    truth = np.repeat(np.arange(k), per)
+    x = np.eye(dim, dtype=np.float32)[truth] + rng.normal(0, noise, (k * per, dim))
+    return _normalize(x.astype(np.float32)), truth
+
+
+def _same_partition(a: np.ndarray, b: np.ndarray) -> bool:
+    pairs = set(zip(a.tolist(), b.tolist()))
+    return len(pairs) == len(set(a.tolist())) == len(set(b.tolist()))
+
+
+def test_same_vectors_and_seed_give_the_same_clustering():
+    x, _ = _blobs()
+    labels1, centers1 = kmeans(x, 3, seed=3)
+    labels2, centers2 = kmeans(x, 3, seed=3)
+    assert np.array_equal(labels1, labels2)
+    assert np.allclose(centers1, centers2)
+
+    vectors = x.tolist()
+    first = choose_clusters(vectors, max_k=5, min_silhouette=0.0)
+    second = choose_clusters(vectors, max_k=5, min_silhouette=0.0)
+    assert first is not None and second is not None
+    assert len(first[1]) == len(second[1])  # gleiches k
+    assert np.array_equal(first[0], second[0])
+
+
+def test_silhouette_separates_clear_clusters_from_noise():
+    x, truth = _blobs()
+    assert silhouette(x, truth) > 0.8
+    shuffled = np.random.default_rng(1).permutation(truth)
+    assert abs(silhouette(x, shuffled)) < 0.1
+    assert silhouette(x, np.zeros(len(x), dtype=int)) == -1.0  # ein Cluster
+
+    # Stichprobe bei grossen Knoten: deterministisch und nahe am vollen Wert.
+    assert silhouette(x, truth, sample=30) == silhouette(x, truth, sample=30)
+    assert abs(silhouette(x, truth, sample=30) - silhouette(x, truth)) < 0.1
+
+
+def test_choose_clusters_finds_the_true_k():
+    x, truth = _blobs(k=3)
+    chosen = choose_clusters(x.tolist(), max_k=5, min_silhouette=0.5)
+    assert chosen is not None
+    labels, centers = chosen
+    assert len(centers) == 3
+    assert _same_partition(labels, truth)
+
+    # Eine einzige Punktwolke ist kohärent → kein Split.
+    cloud, _ = _blobs(k=1, per=40)
+    assert choose_clusters(cloud.tolist(), max_k=4, min_silhouette=0.5) is None
@@ -0,0 +1,159 @@
+"""
+ChatScheduler (src/review/scheduler.py): Reserve für interaktive Calls,
+Warte-Deadline, Rückgabe abgebrochener Slots, Rotation je Ballot und der
+Timeout-Race bei der Vergabe.
+"""
+
+import asyncio
+
+import pytest
+
+from src.review import scheduler as sched
+from src.review.scheduler import BATCH, INTERACTIVE, ChatBusy, ChatScheduler
+
+
+async def _hold(s: ChatScheduler, priority: str, release: asyncio.Event, *,
+                ballot: str | None = None, log: list | None = None, name: str = ""):
+    async with s.slot(priority, ballot=ballot):
+        if log is not None:
+            log.append(name)
+        await release.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_interactive_gets_a_slot_while_batch_is_saturated():
+    async def scenario():
+        s = ChatScheduler(max_inflight=3, reserved_interactive=1)
+        release = asyncio.Event()
+        holders = [asyncio.create_task(_hold(s, BATCH, release)) for _ in range(3)]
+        await _settle()
+        assert s.stats()[BATCH]["inflight"] == 2
+        assert s.stats()[BATCH]["queued"] == 1  # dritter Batch wartet
+
+        async with s.slot(INTERACTIVE, deadline=0.01):
+            assert s.stats()[INTERACTIVE]["inflight"] == 1
+
+        release.set()
+        await asyncio.gather(*holders)
+        assert s.stats()[BATCH]["inflight"] == s.stats()[INTERACTIVE]["inflight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_busy_after_deadline():
+    async def scenario():
+        s = ChatScheduler(max_inflight=2, reserved_interactive=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(s, BATCH, release))
+        await _settle()
+
+        with pytest.raises(ChatBusy) as err:
+            async with s.slot(BATCH, ballot="b1", deadline=0.02):
+                pytest.fail("slot granted despite saturation")
+
+        assert err.value.priority == BATCH and err.value.waited >= 0.02
+        stats = s.stats()[BATCH]
+        assert stats["busy"] == 1 and stats["queued"] == 0 and stats["queued_ballots"] == 0
+        release.set()
+        await holder
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_gives_back_its_slot():
+    async def scenario():
+        s = ChatScheduler(max_inflight=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(s, BATCH, release))
+        await _settle()
+
+        # Abbruch in der Queue: der Waiter verschwindet, der Slot geht weiter.
+        queued = asyncio.create_task(_hold(s, BATCH, asyncio.Event(), ballot="a"))
+        log = []
+        nxt = asyncio.create_task(_hold(s, BATCH, release, ballot="b", log=log, name="b"))
+        await _settle()
+        queued.cancel()
+        await _settle()
+        assert s.stats()[BATCH]["queued"] == 1
+
+        # Abbruch nach der Vergabe, bevor der Waiter läuft: Slot zurückgeben.
+        late = asyncio.create_task(_hold(s, BATCH, asyncio.Event(), ballot="c"))
+        await _settle()
+        release.set()
+        await holder  # vergibt an "b"; "b" läuft durch und vergibt an "c"
+        await nxt
+        assert log == ["b"]
+        assert s.stats()[BATCH]["inflight"] == 1  # "c" hat den Slot, wartet
+        late.cancel()
+        await _settle()
+        assert s.stats()[BATCH]["inflight"] == 0
+
+        s2 = ChatScheduler(max_inflight=1)
+        gate = asyncio.Event()
+        holder2 = asyncio.create_task(_hold(s2, BATCH, gate))
+        await _settle()
+        waiter = asyncio.create_task(_hold(s2, BATCH, asyncio.Event()))
+        await _settle()
+        gate.set()
+        await holder2                   # _dispatch setzt das Future des Waiters …
+        waiter.cancel()                 # … der Task wird abgebrochen, bevor er läuft
+        await _settle()
+        assert waiter.cancelled()
+        assert s2.stats()[BATCH]["inflight"] == 0
+        async with s2.slot(BATCH, deadline=0.01):
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_round_robin_per_ballot():
+    async def scenario():
+        s = ChatScheduler(max_inflight=1)
+        log: list[str] = []
+        gates = {}
+
+        async def job(ballot, name):
+            gates[name] = asyncio.Event()
+            async with s.slot(BATCH, ballot=ballot):
+                log.append(name)
+                await gates[name].wait()
+
+        tasks = [asyncio.create_task(job(b, n)) for b, n in
+                 [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("c", "c1")]]
+        await _settle()
+        for _ in tasks:
+            gates[log[-1]].set()
+            await _settle()
+        await asyncio.gather(*tasks)
+
+        # a1 sofort, danach reihum: b/c kommen vor den restlichen a-Calls dran.
+        assert log == ["a1", "a2", "b1", "c1", "a3"]
+
+    asyncio.run(scenario())
+
+
+def test_slot_granted_at_timeout_is_kept(monkeypatch):
+    async def scenario():
+        s = ChatScheduler(max_inflight=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(s, BATCH, release))
+        await _settle()
+
+        async def racing_wait_for(aw, timeout):
+            # Der Slot wird frei und vergeben, genau während die Deadline abläuft.
+            release.set()
+            await holder
+            assert aw.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(sched.asyncio, "wait_for", racing_wait_for)
+        async with s.slot(BATCH, deadline=0.01):
+            assert s.stats()[BATCH]["inflight"] == 1
+        stats = s.stats()[BATCH]
+        assert stats["busy"] == 0 and stats["inflight"] == 0 and stats["granted"] == 2
+
+    asyncio.run(scenario())
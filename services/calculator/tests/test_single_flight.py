@@ -0,0 +1,35 @@
+"""
+SingleFlight (src/core/single_flight.py): geteilte Berechnung für Ballot-Kontext
+und Stance-Vorprüfung — ein abgebrochener Aufrufer bricht sie nicht für alle ab.
+"""
+
+import asyncio
+
+from src.core.single_flight import SingleFlight
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "ctx"
+
+        leader = asyncio.create_task(flight.do("b1", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("b1", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "ctx"
+        assert leader.cancelled()
+        assert calls == 1 and "b1" not in flight
+
+    asyncio.run(scenario())
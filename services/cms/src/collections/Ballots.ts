@@ -1,6 +1,7 @@
 import type { CollectionConfig } from 'payload'
 import { APIError, addDataAndFileToRequest } from 'payload'
-import { publishTaxonomySnapshot } from '../lib/atproto-publish'
+import { latestSnapshotVersion, publishTaxonomySnapshot } from '../lib/atproto-publish'
+import { notifyBallotCatalogChanged } from '../lib/appview-catalog'
 
 export const Ballots: CollectionConfig = {
   slug: 'ballots',
@@ -30,8 +31,11 @@ export const Ballots: CollectionConfig = {
       // → kein neuer Record (Dedup über Content-Hash).
       //
       // Wird vom Ballot-Editor (components/TaxonomyPanel.tsx) beim „Persistieren"
-      // aufgerufen: POST /api/ballots/taxonomy-snapshot  Body: { ballotRkey, tree }
-      // (tree = strukturelle Wurzel mit children, wie toServer(root) sie liefert).
+      // aufgerufen: POST /api/ballots/taxonomy-snapshot  Body: { ballotRkey, tree,
+      // baseVersion } (tree = strukturelle Wurzel mit children, wie toServer(root)
+      // sie liefert; baseVersion = geladene Snapshot-Version, 0 = keine). Ist sie
+      // nicht mehr die aktuelle → 409, statt die Änderungen eines anderen Editors
+      // still zu überschreiben.
       path: '/taxonomy-snapshot',
       method: 'post',
       handler: async (req) => {
@@ -39,7 +43,11 @@ export const Ballots: CollectionConfig = {
           return Response.json({ error: 'Nicht angemeldet.' }, { status: 401 })
         }
         await addDataAndFileToRequest(req)
-        const data = (req.data || {}) as { ballotRkey?: unknown; tree?: unknown }
+        const data = (req.data || {}) as {
+          ballotRkey?: unknown
+          tree?: unknown
+          baseVersion?: unknown
+        }
         const ballotRkey = String(data.ballotRkey ?? '').trim()
         if (!ballotRkey) {
           return Response.json({ error: 'ballotRkey ist erforderlich.' }, { status: 400 })
@@ -47,9 +55,22 @@ export const Ballots: CollectionConfig = {
         if (!data.tree || typeof data.tree !== 'object') {
           return Response.json({ error: 'tree (Wurzelknoten) ist erforderlich.' }, { status: 400 })
         }
+        const baseVersion = data.baseVersion
+        if (typeof baseVersion !== 'number' || !Number.isInteger(baseVersion) || baseVersion < 0) {
+          return Response.json({ error: 'baseVersion ist erforderlich.' }, { status: 400 })
+        }
         try {
           // eslint-disable-next-line @typescript-eslint/no-explicit-any
-          const result = await publishTaxonomySnapshot(ballotRkey, data.tree as any)
+          const result = await publishTaxonomySnapshot(ballotRkey, data.tree as any, baseVersion)
+          if (result.status === 'conflict') {
+            return Response.json(
+              {
+                ...result,
+                error: `Der Baum wurde zwischenzeitlich gespeichert (Snapshot v${result.version}) — bitte neu laden.`,
+              },
+              { status: 409 },
+            )
+          }
           return Response.json(result)
         } catch (err) {
           const message = err instanceof Error ? err.message : String(err)
@@ -58,6 +79,23 @@ export const Ballots: CollectionConfig = {
         }
       },
     },
+    {
+      // Aktuelle Snapshot-Version (0 = keine) — der Editor lädt sie mit dem Baum
+      // und schickt sie beim Persistieren als baseVersion zurück.
+      // GET /api/ballots/taxonomy-snapshot?ballotRkey=…
+      path: '/taxonomy-snapshot',
+      method: 'get',
+      handler: async (req) => {
+        if (!req.user) {
+          return Response.json({ error: 'Nicht angemeldet.' }, { status: 401 })
+        }
+        const ballotRkey = String(req.query?.ballotRkey ?? '').trim()
+        if (!ballotRkey) {
+          return Response.json({ error: 'ballotRkey ist erforderlich.' }, { status: 400 })
+        }
+        return Response.json({ ballotRkey, version: await latestSnapshotVersion(ballotRkey) })
+      },
+    },
   ],
   fields: [
     // --- Sidebar fields (rendered in the sidebar across all tabs) ---
@@ -295,6 +333,14 @@ export const Ballots: CollectionConfig = {
   ],
   hooks: {
     afterChange: [
+      ({ doc, context }) => {
+        // Reload the AppView ballot catalog now instead of after its TTL —
+        // once per save: the inner payload.update() of the publish hook
+        // below re-enters afterChange with skipPublishHook.
+        if (context?.skipPublishHook) return doc
+        notifyBallotCatalogChanged()
+        return doc
+      },
       async ({ doc, req, context }) => {
         // Skip recursive invocations from the inner payload.update() below.
         if (context?.skipPublishHook) return doc
@@ -352,5 +398,11 @@ export const Ballots: CollectionConfig = {
         return doc
       },
     ],
+    afterDelete: [
+      ({ doc }) => {
+        notifyBallotCatalogChanged()
+        return doc
+      },
+    ],
   },
 }
@@ -61,16 +61,69 @@ type UnplacedEntry = {
   fully_missing: boolean
 }
 
+/** Fehler vom Calculator inkl. HTTP-Status (404/409 beim Baum-Diff relevant). */
+class CalcError extends Error {
+  status: number
+  constructor(message: string, status: number) {
+    super(message)
+    this.status = status
+  }
+}
+
 async function calc(path: string, init?: RequestInit) {
   const res = await fetch(`${CALC}${path}`, {
     ...init,
     headers: { 'Content-Type': 'application/json', ...(init?.headers || {}) },
   })
   const body = await res.json().catch(() => ({}))
-  if (!res.ok) throw new Error(body?.detail || `${res.status} ${res.statusText}`)
+  if (!res.ok) throw new CalcError(body?.detail || `${res.status} ${res.statusText}`, res.status)
   return body
 }
 
+// eslint-disable-next-line @typescript-eslint/no-explicit-any -- Events sind freies JSON (wie `calc`)
+type StreamEvent = Record<string, any>
+
+/** NDJSON-Variante (/classify/stream, /grow/stream): ruft `onEvent` je Zeile auf,
+ *  sobald sie ankommt, und gibt das abschliessende `summary`-Event zurück. Ein
+ *  `error`-Event wird geworfen. Abbrechen (signal) beendet serverseitig die
+ *  restlichen LLM-Calls. */
+async function calcStream(
+  path: string,
+  body: unknown,
+  onEvent: (ev: StreamEvent) => void,
+  signal?: AbortSignal,
+): Promise<StreamEvent> {
+  const res = await fetch(`${CALC}${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+    signal,
+  })
+  if (!res.ok || !res.body) {
+    const b = await res.json().catch(() => ({}))
+    throw new CalcError(b?.detail || `${res.status} ${res.statusText}`, res.status)
+  }
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buf = ''
+  let finished = false
+  while (!finished) {
+    const { done, value } = await reader.read()
+    finished = done
+    buf += done ? decoder.decode() : decoder.decode(value, { stream: true })
+    const lines = buf.split('\n')
+    buf = done ? '' : (lines.pop() ?? '')
+    for (const line of lines) {
+      if (!line.trim()) continue
+      const ev: StreamEvent = JSON.parse(line)
+      if (ev.event === 'error') throw new Error(ev.detail || 'Stream-Fehler')
+      if (ev.event === 'summary') return ev
+      onEvent(ev)
+    }
+  }
+  throw new Error('Stream ohne Abschluss beendet.')
+}
+
 // --- Pure Baum-Helfer (operieren auf geklonten Bäumen) -----------------------
 
 let _uidSeq = 0
@@ -205,6 +258,27 @@ function toServer(n: ENode): Record<string, unknown> {
   }
 }
 
+/** Server-Form flach: uid → serialisierter Knoten (ohne children, mit parent/index)
+ *  — Basis für den Diff gegen den zuletzt an den Calculator geschickten Stand. */
+function flatServer(n: ENode): Map<string, string> {
+  const out = new Map<string, string>()
+  const walk = (node: ENode, parent: string | null, index: number) => {
+    const { children: _c, ...rest } = toServer(node)
+    void _c
+    out.set(node.uid, JSON.stringify({ ...rest, parent, index }))
+    node.children.forEach((ch, i) => walk(ch, node.uid, i))
+  }
+  walk(n, null, 0)
+  return out
+}
+
+/** Diff zweier flacher Stände: geänderte/neue Knoten + gelöschte uids. */
+function diffFlat(prev: Map<string, string>, cur: Map<string, string>) {
+  const upsert = [...cur].filter(([uid, v]) => prev.get(uid) !== v).map(([, v]) => JSON.parse(v))
+  const remove = [...prev.keys()].filter((uid) => !cur.has(uid))
+  return { upsert, remove }
+}
+
 /** Editor-Baum → Export-Form (ohne uid/id). */
 function toExport(n: ENode): Record<string, unknown> {
   const { uid: _u, id: _i, ...rest } = toServer(n) as Record<string, unknown>
@@ -294,6 +368,51 @@ export const TaxonomyPanelField: React.FC = () => {
   const [err, setErr] = useState<string | null>(null)
   const [nTopics, setNTopics] = useState<number | null>(null) // gewünschte Anzahl Wurzelthemen (leer = Default 4–7)
   const fileRef = useRef<HTMLInputElement | null>(null)
+  // Laufender LLM-Stream: beim Verlassen des Editors abbrechen → der Calculator
+  // stoppt die restlichen LLM-Calls.
+  const abortRef = useRef<AbortController | null>(null)
+  const streamAbort = () => {
+    abortRef.current?.abort()
+    abortRef.current = new AbortController()
+    return abortRef.current.signal
+  }
+  useEffect(() => () => abortRef.current?.abort(), [])
+  // Zuletzt an den Calculator übermittelter Baum-Stand (version + flache Form):
+  // Folge-Calls schicken nur noch den Diff statt des ganzen Baums.
+  const syncRef = useRef<{ version: string; flat: Map<string, string> } | null>(null)
+  // Calculator-Version, auf der unser Baum beruht (GET /tree bzw. letzte
+  // Antwort): geht als `base_version` mit jedem vollen Baum mit.
+  const baseRef = useRef<string | null>(null)
+  // Snapshot-Version, auf der der geladene Baum beruht → `baseVersion` beim
+  // Persistieren (409, falls inzwischen ein anderer Editor gespeichert hat).
+  const snapVersionRef = useRef<number | null>(null)
+
+  /** Stream-Call mit dem aktuellen Baum — als Diff, falls der Calculator unseren
+   *  letzten Stand kennt, sonst voll. 404 (Stand abgelaufen) → einmal voll
+   *  nachschicken; 409 (anderer Editor) → Fehler, bis der Baum neu geladen ist. */
+  const streamWithTree = async (
+    path: string,
+    tree: ENode,
+    onEvent: (ev: StreamEvent) => void,
+  ): Promise<StreamEvent> => {
+    const flat = flatServer(tree)
+    const body = (sync: typeof syncRef.current) =>
+      sync
+        ? { ballot_rkey: rkey, version: sync.version, diff: diffFlat(sync.flat, flat) }
+        : { ballot_rkey: rkey, tree: toServer(tree), base_version: baseRef.current }
+    let r: StreamEvent
+    try {
+      r = await calcStream(path, body(syncRef.current), onEvent, streamAbort())
+    } catch (e) {
+      const retry = e instanceof CalcError && e.status === 404 && !!syncRef.current
+      syncRef.current = null
+      if (!retry) throw e
+      r = await calcStream(path, body(null), onEvent, streamAbort())
+    }
+    syncRef.current = r.version ? { version: r.version, flat } : null
+    if (r.version) baseRef.current = r.version
+    return r
+  }
 
   useEffect(() => {
     if (!id) return
@@ -304,11 +423,22 @@ export const TaxonomyPanelField: React.FC = () => {
   }, [id])
 
   const load = useCallback(async (rk: string) => {
+    // Version VOR dem Baum lesen: ist der Baum schon neuer, gibt es höchstens
+    // einen unnötigen 409, nie ein stilles Überschreiben.
+    snapVersionRef.current = await fetch(
+      `/api/ballots/taxonomy-snapshot?ballotRkey=${encodeURIComponent(rk)}`,
+      { credentials: 'include' },
+    )
+      .then((r) => (r.ok ? r.json() : null))
+      .then((d) => (typeof d?.version === 'number' ? d.version : null))
+      .catch(() => null)
     try {
       const t = await calc(`/api/topdown/tree?ballot_rkey=${encodeURIComponent(rk)}`).catch(
         () => null,
       )
       setRoot(t?.tree ? withUids(t.tree) : null)
+      baseRef.current = t?.version ?? null
+      syncRef.current = null
       setDirty(false)
     } catch {
       setRoot(null)
@@ -448,25 +578,26 @@ export const TaxonomyPanelField: React.FC = () => {
     run('classify', async () => {
       if (!root) return
       // Sortiert alle noch nicht verorteten Argumente in den State-Baum ein —
-      // offiziell vor Community. Klassifiziert direkt auf dem Argumenttext.
-      const r = await calc('/api/topdown/classify', {
-        method: 'POST',
-        body: JSON.stringify({ ballot_rkey: rkey, tree: toServer(root) }),
+      // offiziell vor Community. Klassifiziert direkt auf dem Argumenttext. Die
+      // Vorschläge kommen schrittweise (NDJSON) und werden sofort gemergt.
+      const r = await streamWithTree('/api/topdown/classify/stream', root, (ev) => {
+        if (!ev.additions?.length) return
+        mutate((rt) => {
+          const idx = indexByUid(rt)
+          for (const a of ev.additions) {
+            const node = idx.get(a.uid)
+            if (node)
+              mergeInto(node.arguments, [
+                { argument_uri: a.argument_uri, stance: a.stance, confidence: a.confidence ?? null },
+              ])
+          }
+        })
+        setMsg(`Einsortieren: ${ev.done}/${ev.total} Argumente (${ev.llm_calls} Calls) …`)
       })
-      if (!r.additions?.length) {
+      if (!r.placed) {
         setMsg(r.message || 'Keine unverorteten Argumente.')
         return
       }
-      mutate((rt) => {
-        const idx = indexByUid(rt)
-        for (const a of r.additions) {
-          const node = idx.get(a.uid)
-          if (node)
-            mergeInto(node.arguments, [
-              { argument_uri: a.argument_uri, stance: a.stance, confidence: a.confidence ?? null },
-            ])
-        }
-      })
       setMsg(
         `+${r.placed} Argumente eingehängt (offiziell ${r.placed_official}, Community ${r.placed_community}). Mit „Persistieren" sichern.`,
       )
@@ -475,24 +606,19 @@ export const TaxonomyPanelField: React.FC = () => {
   const wachsenLassen = () =>
     run('grow', async () => {
       if (!root) return
-      const r = await calc('/api/topdown/grow', {
-        method: 'POST',
-        body: JSON.stringify({ ballot_rkey: rkey, tree: toServer(root) }),
+      const r = await streamWithTree('/api/topdown/grow/stream', root, (ev) => {
+        if (ev.event === 'split')
+          mutate((rt) => {
+            const node = indexByUid(rt).get(ev.uid)
+            if (node) applySplit(node, ev.subtopics, ev.assign)
+          })
+        setMsg(`Wachsen: ${ev.done}/${ev.total} Knoten geprüft (${ev.llm_calls} Calls) …`)
       })
-      if (!r.splits?.length) {
+      if (!r.splits) {
         setMsg(r.message || 'Kein Knoten über der Schwelle.')
         return
       }
-      mutate((rt) => {
-        const idx = indexByUid(rt)
-        for (const sp of r.splits) {
-          const node = idx.get(sp.uid)
-          if (node) applySplit(node, sp.subtopics, sp.assign)
-        }
-      })
-      setMsg(
-        `${r.splits.length} Knoten gesplittet (${r.llm_calls} Calls). Mit „Persistieren" sichern.`,
-      )
+      setMsg(`${r.splits} Knoten gesplittet (${r.llm_calls} Calls). Mit „Persistieren" sichern.`)
     })
 
   // --- Nicht zugeordnet: lokal aus dem State entfernen, was zugeordnet wurde ---
@@ -571,16 +697,22 @@ export const TaxonomyPanelField: React.FC = () => {
   const persist = () =>
     run('save', async () => {
       if (!root) return
+      if (snapVersionRef.current === null) throw new Error('Snapshot-Version unbekannt — bitte neu laden.')
       const expected = countNodes(root) // echte Knoten (ohne Wurzel)
       const res = await fetch('/api/ballots/taxonomy-snapshot', {
         method: 'POST',
         credentials: 'include',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ ballotRkey: rkey, tree: toServer(root) }),
+        body: JSON.stringify({
+          ballotRkey: rkey,
+          tree: toServer(root),
+          baseVersion: snapVersionRef.current,
+        }),
       })
       const snap = await res.json().catch(() => ({}))
       if (!res.ok) throw new Error(snap?.error || `${res.status} ${res.statusText}`)
       setDirty(false)
+      snapVersionRef.current = snap.version ?? snapVersionRef.current
 
       if (snap.status === 'skipped') {
         setMsg(`Unverändert — Snapshot v${snap.version} bleibt aktuell.`)
@@ -0,0 +1,30 @@
+/**
+ * Tells the AppView that the ballot catalog changed, so its in-process cache
+ * (services/appview/src/core/ballot_catalog.py) reloads right away instead of
+ * after its TTL.
+ *
+ * Best effort: never throws, never blocks the save. Disabled unless both
+ * APPVIEW_INTERNAL_URL and BALLOT_CATALOG_WEBHOOK_SECRET are set.
+ */
+
+// Payload commits the transaction after the hooks have run — give the commit a
+// moment before the AppView re-reads the ballots.
+const DELAY_MS = 1000
+
+export function notifyBallotCatalogChanged(): void {
+  const appviewUrl = process.env.APPVIEW_INTERNAL_URL
+  const secret = process.env.BALLOT_CATALOG_WEBHOOK_SECRET
+  if (!appviewUrl || !secret) return
+
+  setTimeout(() => {
+    fetch(`${appviewUrl}/api/ballots/catalog/refresh`, {
+      method: 'POST',
+      headers: { 'X-Catalog-Secret': secret },
+      signal: AbortSignal.timeout(5000),
+    })
+      .then((resp) => {
+        if (!resp.ok) console.warn(`ballot catalog webhook: AppView answered ${resp.status}`)
+      })
+      .catch((err) => console.warn(`ballot catalog webhook failed: ${err}`))
+  }, DELAY_MS)
+}
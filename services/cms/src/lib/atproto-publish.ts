@@ -742,7 +742,13 @@ async function recordSnapshot(
   }
 }
 
+/** Version des letzten Snapshots (0 = noch keiner) — Basis für `baseVersion`. */
+export async function latestSnapshotVersion(ballotRkey: string): Promise<number> {
+  return (await lastSnapshot(ballotRkey))?.version ?? 0
+}
+
 export type SnapshotResult =
+  | { status: 'conflict'; version: number }
   | { status: 'skipped'; version: number; reason: 'unchanged' }
   | { status: 'empty'; reason: 'no_tree' }
   | { status: 'published'; version: number; uri: string; cid: string; nodes: number; arguments: number }
@@ -760,10 +766,15 @@ export type SnapshotResult =
  * - Dedup: ist der Baum identisch zum letzten Snapshot (Content-Hash inkl.
  *   Geschwister-Reihenfolge), wird kein neuer Record geschrieben.
  * - Verkettet über `prev` (uri+cid) die Versionshistorie.
+ * - `baseVersion` = die Snapshot-Version, auf der der Editor-Baum beruht. Ist
+ *   inzwischen eine neuere geschrieben worden (anderer Editor), wird nichts
+ *   überschrieben → `conflict` mit der aktuellen Version. Ohne `baseVersion`
+ *   (Backfill) keine Prüfung.
  */
 export async function publishTaxonomySnapshot(
   ballotRkey: string,
   root: CalcTreeNode | null | undefined,
+  baseVersion?: number,
 ): Promise<SnapshotResult> {
   if (!root || !(root.children && root.children.length)) {
     return { status: 'empty', reason: 'no_tree' }
@@ -773,6 +784,9 @@ export async function publishTaxonomySnapshot(
   const hash = contentHash(nodes)
 
   const prev = await lastSnapshot(ballotRkey)
+  if (baseVersion !== undefined && (prev?.version ?? 0) !== baseVersion) {
+    return { status: 'conflict', version: prev?.version ?? 0 }
+  }
   if (prev && prev.content_hash === hash) {
     return { status: 'skipped', version: prev.version, reason: 'unchanged' }
   }
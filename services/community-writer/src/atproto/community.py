@@ -6,21 +6,22 @@ stored in the community_accounts table (encrypted with the same master
 key used for user app passwords).
 """
 
-import asyncio
 import logging
 import os
 
 import httpx
 
 from src.shared import db
-from src.shared.pds_creds import decrypt_community_password
+from src.shared.pds_creds import (
+    decrypt_community_password,
+    decrypt_community_tokens,
+    encrypt_community_tokens,
+)
+from src.shared.pds_tokens import TokenBroker
 from src.shared.errors import from_network_error, from_response
 
 logger = logging.getLogger("community_pds")
 
-# Per-DID session cache: did -> (access_jwt, expires_at)
-_sessions: dict[str, tuple[str, float]] = {}
-
 
 def _pds_internal_url() -> str:
     return os.getenv("PDS_INTERNAL_URL", "http://pds.poltr.svc.cluster.local")
@@ -39,37 +40,23 @@ async def _get_community_password(did: str) -> str:
     return decrypt_community_password(row["pw_ciphertext"], row["pw_nonce"])
 
 
-async def _create_session(client: httpx.AsyncClient, did: str) -> str:
-    """Create a PDS session for a community account. Returns access JWT."""
-    password = await _get_community_password(did)
-
-    try:
-        resp = await client.post(
-            f"{_pds_internal_url()}/xrpc/com.atproto.server.createSession",
-            json={"identifier": did, "password": password},
-        )
-    except httpx.RequestError as exc:
-        raise from_network_error(exc, op="community.createSession", did=did) from exc
-    if resp.status_code != 200:
-        logger.error(
-            f"Community createSession failed for {did} ({resp.status_code}): {resp.text}"
-        )
-        raise from_response(resp, op="community.createSession", did=did)
-
-    access_jwt = resp.json()["accessJwt"]
-    expires_at = asyncio.get_event_loop().time() + 90 * 60
-    _sessions[did] = (access_jwt, expires_at)
-    return access_jwt
+# Access/refresh tokens per community DID: refreshSession instead of re-login,
+# single-flight, persisted encrypted in community_pds_tokens (see pds_tokens.py).
+_tokens = TokenBroker(
+    "community",
+    table="community_pds_tokens",
+    pds_url=_pds_internal_url,
+    load_password=_get_community_password,
+    encrypt=encrypt_community_tokens,
+    decrypt=decrypt_community_tokens,
+    get_pool=lambda: db.get_pool(),
+)
 
 
 async def get_community_token(client: httpx.AsyncClient, did: str) -> str:
-    """Get a valid community access token for the given DID, creating a new session if expired."""
-    now = asyncio.get_event_loop().time()
-    cached = _sessions.get(did)
-
-    if cached and now < cached[1]:
-        return cached[0]
-    return await _create_session(client, did)
+    """Get a valid community access token for the given DID (refreshed or
+    logged in again by the broker when needed)."""
+    return await _tokens.access_token(client, did)
 
 
 async def create_community_record(
@@ -45,6 +45,25 @@ def decrypt_app_password(ciphertext: bytes, nonce: bytes) -> str:
     return _decrypt(ciphertext, nonce, _load_key(USER_KEY_ENV))
 
 
+# --- Email outbox (auth_email_outbox) — appview only, same USER key ----------
+# Recipient address + magic link of a queued mail; wiped once sent.
+def encrypt_outbox_payload(plaintext: str) -> tuple[bytes, bytes]:
+    return _encrypt(plaintext, _load_key(USER_KEY_ENV))
+
+
+def decrypt_outbox_payload(ciphertext: bytes, nonce: bytes) -> str:
+    return _decrypt(ciphertext, nonce, _load_key(USER_KEY_ENV))
+
+
+# PDS session tokens of user accounts (auth_pds_tokens, src/atproto/pds_tokens.py).
+def encrypt_user_tokens(plaintext: str) -> tuple[bytes, bytes]:
+    return _encrypt(plaintext, _load_key(USER_KEY_ENV))
+
+
+def decrypt_user_tokens(ciphertext: bytes, nonce: bytes) -> str:
+    return _decrypt(ciphertext, nonce, _load_key(USER_KEY_ENV))
+
+
 # --- COMMUNITY-Creds (community_accounts) — writer/CMS/appview-gov path ----
 def encrypt_community_password(plaintext: str) -> tuple[bytes, bytes]:
     return _encrypt(plaintext, _load_key(COMMUNITY_KEY_ENV))
@@ -52,3 +71,12 @@ def encrypt_community_password(plaintext: str) -> tuple[bytes, bytes]:
 
 def decrypt_community_password(ciphertext: bytes, nonce: bytes) -> str:
     return _decrypt(ciphertext, nonce, _load_key(COMMUNITY_KEY_ENV))
+
+
+# PDS session tokens of community accounts (community_pds_tokens, writer).
+def encrypt_community_tokens(plaintext: str) -> tuple[bytes, bytes]:
+    return _encrypt(plaintext, _load_key(COMMUNITY_KEY_ENV))
+
+
+def decrypt_community_tokens(ciphertext: bytes, nonce: bytes) -> str:
+    return _decrypt(ciphertext, nonce, _load_key(COMMUNITY_KEY_ENV))
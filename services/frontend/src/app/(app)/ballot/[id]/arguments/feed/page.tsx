@@ -5,7 +5,7 @@ import { useRouter, useParams } from "next/navigation";
 import { useTranslations } from "next-intl";
 import { useAuth } from "@/lib/AuthContext";
 import { getBallot, listActivity, markActivitySeen } from "@/lib/agent";
-import { loadCached } from "@/lib/pageCache";
+import { loadCached, patchCached } from "@/lib/pageCache";
 import { useScrollRestore } from "@/lib/scrollRestore";
 import { formatDate, formatRelativeTime } from "@/lib/utils";
 import type { Ballot, ActivityItem } from "@/types/ballots";
@@ -464,6 +464,7 @@ function BallotFeedContent() {
   const [cursor, setCursor] = useState<string | undefined>();
   const [hasMore, setHasMore] = useState(false);
   const [loadingMore, setLoadingMore] = useState(false);
+  const [unreadCount, setUnreadCount] = useState(0);
 
   const [filter, setFilter] = useState<"all" | "comments" | "arguments">("all");
   const [showAddModal, setShowAddModal] = useState(false);
@@ -524,6 +525,21 @@ function BallotFeedContent() {
           : await listActivity(id, selectedFilter, currentCursor);
         if (reset) {
           setActivities(result.activities);
+          setUnreadCount(result.unreadCount ?? 0);
+          // Viewing the first page of the unfiltered feed marks everything up
+          // to latestSeq as seen (watermark): the badge resets on the next
+          // visit, while the items keep their "new" marker for this one.
+          // latestSeq spans all kinds, so a filtered tab must not move it.
+          if (selectedFilter === "all" && result.latestSeq) {
+            markActivitySeen([], { ballotRkey: id, seq: result.latestSeq })
+              .then(() =>
+                patchCached<typeof result>(
+                  `feed:activity:${id}:${selectedFilter}`,
+                  (page) => ({ ...page, unreadCount: 0 }),
+                ),
+              )
+              .catch(console.error);
+          }
         } else {
           setActivities((prev) => [...prev, ...result.activities]);
         }
@@ -549,7 +565,11 @@ function BallotFeedContent() {
 
   const handleCardClick = useCallback(
     (item: ActivityItem) => {
-      markActivitySeen([item.activityUri]).catch(console.error);
+      // The unfiltered feed is already seen via the watermark; a filtered
+      // tab does not move it, so there the opened item is marked by URI.
+      if (filter !== "all" && !item.viewer?.seen) {
+        markActivitySeen([item.activityUri]).catch(console.error);
+      }
       setActivities((acts) =>
         acts.map((a) =>
           a.activityUri === item.activityUri
@@ -568,7 +588,7 @@ function BallotFeedContent() {
         openArgument(item.argument.rkey);
       }
     },
-    [openArgument, openComment],
+    [filter, openArgument, openComment],
   );
 
   useScrollRestore(!ballotLoading && !activityLoading && !!ballot);
@@ -716,6 +736,14 @@ function BallotFeedContent() {
               </SelectContent>
             </Select>
 
+            {unreadCount > 0 && (
+              <Badge variant="default" className="mr-auto">
+                {t("unread", {
+                  count: unreadCount >= 100 ? "99+" : String(unreadCount),
+                })}
+              </Badge>
+            )}
+
             <Button
               size="sm"
               className="hidden sm:inline-flex"
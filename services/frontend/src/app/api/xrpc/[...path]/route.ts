@@ -41,6 +41,12 @@ async function proxyRequest(request: NextRequest, { params }: { params: Promise<
     headers['Content-Type'] = contentType;
   }
 
+  // Revalidation (ETag → 304) for the AppView's cacheable reads
+  const ifNoneMatch = request.headers.get('if-none-match');
+  if (ifNoneMatch) {
+    headers['If-None-Match'] = ifNoneMatch;
+  }
+
   // Read session cookie and forward as Bearer token
   const sessionToken = request.cookies.get('poltr_session')?.value;
   if (sessionToken) {
@@ -69,13 +75,21 @@ async function proxyRequest(request: NextRequest, { params }: { params: Promise<
 
   const responseBody = await res.text();
 
-  const response = new NextResponse(responseBody, {
+  const response = new NextResponse(res.status === 304 ? null : responseBody, {
     status: res.status,
     headers: {
       'Content-Type': res.headers.get('Content-Type') || 'application/json',
     },
   });
 
+  // Pass the AppView's caching headers through: anonymous reads are
+  // `public, s-maxage=…` so a front cache/CDN can share them; personal
+  // responses stay `private`.
+  for (const name of ['ETag', 'Cache-Control', 'Vary']) {
+    const value = res.headers.get(name);
+    if (value) response.headers.set(name, value);
+  }
+
   // If the appview says the session is invalid/expired, clear the cookie
   // so the frontend stops sending a stale token.
   if (res.status === 401 && sessionToken) {
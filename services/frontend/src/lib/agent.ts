@@ -359,7 +359,7 @@ export async function listActivity(
   filter?: 'all' | 'comments' | 'arguments',
   cursor?: string,
   limit = 30,
-): Promise<{ activities: ActivityItem[]; cursor?: string }> {
+): Promise<{ activities: ActivityItem[]; cursor?: string; latestSeq?: number; unreadCount?: number }> {
   const authenticatedFetch = getAuthenticatedFetch();
   const params = new URLSearchParams({ ballot_rkey: ballotRkey, limit: String(limit) });
   if (filter && filter !== 'all') params.set('filter', filter);
@@ -369,13 +369,16 @@ export async function listActivity(
   return res.json();
 }
 
-export async function markActivitySeen(uris: string[]): Promise<void> {
-  if (uris.length === 0) return;
+export async function markActivitySeen(
+  uris: string[],
+  upTo?: { ballotRkey: string; seq: number },
+): Promise<void> {
+  if (uris.length === 0 && !upTo) return;
   const authenticatedFetch = getAuthenticatedFetch();
   await authenticatedFetch('/api/xrpc/app.ch.poltr.activity.markSeen', {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ uris }),
+    body: JSON.stringify({ uris, ...upTo }),
   });
 }
 
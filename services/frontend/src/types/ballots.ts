@@ -33,8 +33,12 @@ export interface Ballot {
   /** Bridge to the deliberation layer: community account DID for this ballot. */
   communityDid?: string;
   argumentCount?: number;
+  proCount?: number;
+  contraCount?: number;
   commentCount?: number;
+  participantCount?: number;
   likeCount?: number;
+  lastActivityAt?: string;
   viewer?: { like?: string };
 }
 
@@ -306,6 +310,11 @@ export interface TaxonomyNode {
   depth: number;
   /** distinct Argumente im ganzen Teilbaum (für „X Argumente"). */
   argumentCount: number;
+  /** distinct Pro- bzw. Contra-Argumente im Teilbaum. */
+  proCount?: number;
+  contraCount?: number;
+  /** distinct Autor:innen der Argumente im Teilbaum (offizielle ohne Autor:in). */
+  participantCount?: number;
   /** Relevanz-gewichtete Pro-Vorlage-Neigung des Viewers ∈ [-1,1] (null = keine Bewertung). */
   proLeaning?: number | null;
   /** Dissens ∈ [0,1]: 1 = beide Pole gleich stark bewertet (gespalten). */
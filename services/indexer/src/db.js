@@ -523,6 +523,10 @@ export async function projectTaxonomySnapshotDb(params) {
       }
     }
 
+    // 6. Tell LISTENing services (calculator ballot-context cache) that this
+    //    ballot's taxonomy changed. Delivered on COMMIT, dropped on ROLLBACK.
+    await client.query("SELECT pg_notify('taxonomy_changed', $1)", [ballotRkey]);
+
     await client.query("COMMIT");
     console.log(
       `Projected taxonomy snapshot for ballot ${ballotRkey}: ${snapNodes.length} node(s)`,